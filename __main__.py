@@ -4,7 +4,9 @@ Herald Autonomous Trading System
 Main orchestrator implementing the Phase 2 autonomous trading loop.
 """
 
+import os
 import sys
+import json
 import time
 import signal as sig_module
 import logging
@@ -13,7 +15,6 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from herald.connector.mt5_connector import mt5
-import pandas as pd
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -24,12 +25,23 @@ from herald.connector.mt5_connector import MT5Connector, ConnectionConfig
 from herald.data.layer import DataLayer
 from herald.strategy.base import Strategy, SignalType
 from herald.execution.engine import ExecutionEngine, OrderRequest, OrderType, OrderStatus
+from herald.execution.pipeline import OrderPipeline
+from herald.execution.idempotency import IdempotencyStore
 from herald.risk.manager import RiskManager, RiskLimits
 from herald.position.manager import PositionManager
 from herald.position.trade_manager import TradeManager, TradeAdoptionPolicy
 from herald.persistence.database import Database, TradeRecord, SignalRecord
-from herald.observability.logger import setup_logger
+from herald.persistence.bar_archive import BarArchive
+from herald.persistence.shared_bars import SharedBarStore
+from herald.persistence.journal import TradingJournal, restore_state
+from herald.persistence.maintenance import DatabaseMaintenance
+from herald.observability.logger import setup_logger, shutdown_logging
 from herald.observability.metrics import MetricsCollector
+from herald.observability.prometheus import PrometheusExporter
+from herald.observability.health import HealthChecker
+from herald.observability.http_server import ObservabilityServer
+from herald.observability.profiler import LoopProfiler
+from herald.observability.sampler import StackSampler
 
 # Exit strategies
 from herald.exit.trailing_stop import TrailingStop
@@ -43,6 +55,7 @@ from herald.indicators.macd import MACD
 from herald.indicators.bollinger import BollingerBands
 from herald.indicators.stochastic import Stochastic
 from herald.indicators.adx import ADX
+from herald.indicators.pipeline import compute_indicators, strategy_sma_windows
 
 
 # Global shutdown flag
@@ -101,6 +114,21 @@ def load_indicators(indicator_configs: Dict[str, Any]) -> List:
     return indicators
 
 
+def component_params(component_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten a {"type": ..., "params": {...}} config block.
+    
+    Args:
+        component_config: Strategy or exit strategy configuration
+        
+    Returns:
+        Top-level keys overridden by the nested params
+    """
+    params = {key: value for key, value in component_config.items() if key != 'params'}
+    params.update(component_config.get('params') or {})
+    return params
+
+
 def load_strategy(strategy_config: Dict[str, Any]) -> Strategy:
     """
     Load and configure trading strategy.
@@ -116,7 +144,7 @@ def load_strategy(strategy_config: Dict[str, Any]) -> Strategy:
     strategy_type = strategy_config['type'].lower()
     
     if strategy_type == 'sma_crossover':
-        return SmaCrossover(config=strategy_config)
+        return SmaCrossover(config=component_params(strategy_config))
     else:
         raise ValueError(f"Unknown strategy type: {strategy_type}")
 
@@ -147,7 +175,7 @@ def load_exit_strategies(exit_configs: Dict[str, Any]) -> List:
             enabled = exit_config.get('enabled', True)
             
             if exit_type in exit_map and enabled:
-                strategy = exit_map[exit_type](exit_config)
+                strategy = exit_map[exit_type](component_params(exit_config))
                 exit_strategies.append(strategy)
     else:
         # Dict format: {"trailing_stop": {...}, "time_based": {...}}
@@ -156,7 +184,7 @@ def load_exit_strategies(exit_configs: Dict[str, Any]) -> List:
             enabled = config.get('enabled', True)
             
             if exit_type_lower in exit_map and enabled:
-                strategy = exit_map[exit_type_lower](config)
+                strategy = exit_map[exit_type_lower](component_params(config))
                 exit_strategies.append(strategy)
             
     # Sort by priority (highest first)
@@ -165,6 +193,145 @@ def load_exit_strategies(exit_configs: Dict[str, Any]) -> List:
     return exit_strategies
 
 
+def handle_order_result(signal, result, strategy, position_manager, database, logger, journal=None):
+    """
+    Track and record the outcome of an entry order.
+    
+    Args:
+        signal: Signal that produced the order
+        result: ExecutionResult from the engine or order pipeline
+        strategy: Active strategy (for the signal record)
+        position_manager: PositionManager tracking open positions
+        database: Database for signal/trade records
+        logger: Logger instance
+        journal: Optional TradingJournal recording the fill
+    """
+    if result.status == OrderStatus.FILLED:
+        logger.info(
+            f"Order filled: ticket={result.order_id}, "
+            f"price={result.fill_price:.5f}"
+        )
+        
+        # Track position
+        position_info = position_manager.track_position(
+            result,
+            signal_metadata=signal.metadata
+        )
+        if journal is not None and position_info is not None:
+            journal.record_fill(position_info, signal_id=signal.id)
+        
+        # Record in database
+        strategy_name = strategy.__class__.__name__
+        signal_record = SignalRecord(
+            signal_id=signal.id,
+            timestamp=signal.timestamp,
+            symbol=signal.symbol,
+            timeframe=signal.timeframe,
+            side=signal.side.name,
+            action=signal.action,
+            confidence=signal.confidence,
+            price=result.fill_price,
+            stop_loss=signal.stop_loss,
+            take_profit=signal.take_profit,
+            reason=signal.reason,
+            strategy_name=strategy_name,
+            metadata=json.dumps(signal.metadata, default=str),
+            executed=True,
+            execution_timestamp=datetime.now()
+        )
+        database.record_signal(signal_record)
+        
+        trade_record = TradeRecord(
+            signal_id=signal.id,
+            order_id=result.order_id,
+            symbol=signal.symbol,
+            side=signal.side.name,
+            entry_price=result.fill_price,
+            volume=result.filled_volume,
+            stop_loss=signal.stop_loss,
+            take_profit=signal.take_profit,
+            entry_time=datetime.now(),
+            strategy_name=strategy_name,
+            commission=result.commission
+        )
+        database.record_trade(trade_record)
+    else:
+        logger.error(
+            f"Order failed: {result.status.name} - {result.message}"
+        )
+
+
+def fetch_rates(connector, bar_archive, symbol, timeframe, timeframe_name, count, refresh_bars):
+    """
+    Fetch the lookback window, reading closed history from the bar archive.
+    
+    When the archive already holds the window, only the newest
+    `refresh_bars` bars are requested from the terminal; they must overlap
+    the archived tail, otherwise the full window is fetched. Closed bars
+    (all but the forming one) are appended to the archive.
+    
+    Args:
+        connector: MT5Connector instance
+        bar_archive: BarArchive, or None to always fetch the full window
+        symbol: Trading symbol
+        timeframe: MT5 timeframe constant
+        timeframe_name: Timeframe label used as the archive partition
+        count: Lookback window in bars
+        refresh_bars: Bars requested from the terminal on an archive hit
+        
+    Returns:
+        List of rate dictionaries (oldest first), or None
+    """
+    rates = None
+    fetched = None
+    if bar_archive is not None and refresh_bars < count:
+        history = bar_archive.tail_rates(symbol, timeframe_name, count)
+        if len(history) >= count - 1:
+            fetched = connector.get_rates(symbol=symbol, timeframe=timeframe, count=refresh_bars)
+            if fetched and fetched[0]['time'] <= history[-1]['time']:
+                first_new = fetched[0]['time']
+                rates = [bar for bar in history if bar['time'] < first_new] + list(fetched)
+                rates = rates[-count:]
+    
+    if rates is None:
+        fetched = rates = connector.get_rates(symbol=symbol, timeframe=timeframe, count=count)
+    
+    if bar_archive is not None and fetched and len(fetched) > 1:
+        bar_archive.append(symbol, timeframe_name, fetched[:-1])
+    
+    return rates
+
+
+def publish_observability(server, exporter, health_checker, connector, position_manager):
+    """
+    Refresh exporter gauges and publish a snapshot for the HTTP endpoints.
+    
+    Runs on the trading thread at observability.publish_interval_secs so
+    scrapes only ever read the cached snapshot.
+    
+    Args:
+        server: ObservabilityServer serving the snapshot
+        exporter: PrometheusExporter rendering metrics
+        health_checker: HealthChecker computing readiness
+        connector: MT5Connector instance
+        position_manager: PositionManager for open position gauges
+    """
+    connected = connector.is_connected()
+    account_info = connector.get_account_info() if connected else None
+    
+    exporter.set_connection_status(connected)
+    if account_info:
+        exporter.set_account_balance(account_info['balance'], account_info['equity'])
+    positions = position_manager.get_positions()
+    exporter.set_open_positions(len(positions), sum(p.volume for p in positions))
+    pnl_by_symbol: Dict[str, float] = {}
+    for p in positions:
+        pnl_by_symbol[p.symbol] = pnl_by_symbol.get(p.symbol, 0.0) + p.unrealized_pnl
+    exporter.set_unrealized_pnl(pnl_by_symbol)
+    
+    server.publish(exporter.export_text(), health_checker.readiness_from(connected, account_info))
+
+
 def main():
     """Main autonomous trading loop for Phase 2."""
     
@@ -198,8 +365,8 @@ def main():
     parser.add_argument('--dry-run', action='store_true', 
                        help="Dry run mode (simulate orders without placing them)")
     parser.add_argument('--mindset', type=str, default=None,
-                       choices=['aggressive', 'balanced', 'conservative'],
-                       help="Trading mindset/risk profile (aggressive, balanced, conservative)")
+                       help="Trading mindset/risk profile (aggressive, balanced, conservative) "
+                            "or path to a mindset JSON file")
     parser.add_argument('--version', action='version', version=f"Herald {__version__}")
     args = parser.parse_args()
     
@@ -263,12 +430,32 @@ def main():
         
         # 4. Execution Engine
         logger.info("Initializing execution engine...")
-        execution_engine = ExecutionEngine(connector)
+        execution_config = config.get('execution', {})
+        idempotency_store = IdempotencyStore(
+            path=execution_config.get('idempotency_path', 'herald_orders.jsonl'),
+            max_entries=execution_config.get('idempotency_max_entries', 10000),
+            ttl_secs=execution_config.get('idempotency_ttl_hours', 168.0) * 3600
+        )
+        execution_engine = ExecutionEngine(
+            connector,
+            account_check_ttl_secs=execution_config.get('account_check_ttl_secs', 5.0),
+            idempotency_store=idempotency_store
+        )
         
         # 5. Position Manager
         logger.info("Initializing position manager...")
         position_manager = PositionManager(connector, execution_engine)
         
+        # 5a. Order pipeline (asynchronous order submission)
+        order_pipeline = None
+        if execution_config.get('async_orders', False) and not args.dry_run:
+            order_pipeline = OrderPipeline(
+                execution_engine,
+                max_in_flight=execution_config.get('max_in_flight', 1),
+                max_queue=execution_config.get('max_queue', 64)
+            )
+            order_pipeline.start()
+        
         # 5b. Trade Manager (for adopting external trades)
         trade_adoption_config = config.get('orphan_trades', {})
         trade_adoption_policy = TradeAdoptionPolicy(
@@ -287,12 +474,82 @@ def main():
         
         # 6. Persistence
         logger.info("Initializing database...")
-        db_path = config.get('database', {}).get('path', 'herald.db')
-        database = Database(db_path)
+        database_config = config.get('database', {})
+        database = Database(
+            database_config.get('path', 'herald.db'),
+            async_writes=database_config.get('async_writes', True),
+            durability=database_config.get('durability', 'normal'),
+            batch_size=database_config.get('batch_size', 256),
+            max_batch_delay_ms=database_config.get('max_batch_delay_ms', 20.0)
+        )
+        maintenance = None
+        if database_config.get('maintenance_enabled', True):
+            maintenance = DatabaseMaintenance(
+                database_config.get('path', 'herald.db'),
+                interval_secs=database_config.get('maintenance_interval_secs', 300.0),
+                raw_retention_days=database_config.get('metrics_retention_days', 7.0)
+            )
+            maintenance.start()
+        bar_archive = None
+        if database_config.get('archive_enabled', True):
+            bar_archive = BarArchive(database_config.get('archive_path', 'data/bars'))
+            logger.info(f"Bar archive: {bar_archive.root}")
+        shared_bars = None
+        if database_config.get('shared_bars_enabled', False):
+            shared_bars = SharedBarStore(prefix=database_config.get('shared_bars_prefix', 'herald'))
+        
+        # 6b. Trading journal (state recovery across restarts)
+        journal = None
+        journal_config = config.get('journal', {})
+        if journal_config.get('enabled', True):
+            journal = TradingJournal(
+                journal_config.get('path', 'journal'),
+                durability=journal_config.get('durability', 'normal'),
+                snapshot_every=journal_config.get('snapshot_every', 1000)
+            )
         
         # 7. Metrics
         logger.info("Initializing metrics collector...")
-        metrics = MetricsCollector()
+        metrics = MetricsCollector(database=database)
+        
+        # 7b. Prometheus / health endpoints
+        observability_config = config.get('observability', {})
+        prometheus_exporter = PrometheusExporter()
+        prometheus_exporter.attach_execution_metrics(execution_engine.metrics)
+        health_checker = HealthChecker(connector, database)
+        observability_server = None
+        if observability_config.get('http_enabled', False):
+            poll = config.get('trading', {}).get('poll_interval', 60)
+            observability_server = ObservabilityServer(
+                host=observability_config.get('http_host', '127.0.0.1'),
+                port=observability_config.get('http_port', 9108),
+                stale_after_secs=observability_config.get('stale_after_secs') or 3 * poll
+            )
+            observability_server.start()
+        publish_interval = observability_config.get('publish_interval_secs', 5.0)
+        last_publish = 0.0
+        
+        # 7c. Loop stage profiler
+        profiler = LoopProfiler(
+            enabled=observability_config.get('profiler_enabled', True),
+            window=observability_config.get('profiler_window', 512),
+            budgets_ms=observability_config.get('stage_budgets_ms') or {},
+            exporter=prometheus_exporter,
+            database=database,
+            persist_every_loops=observability_config.get('profiler_persist_every_loops', 100)
+        )
+        
+        # 7d. On-demand stack sampler (SIGUSR1 toggles it on the running loop)
+        stack_sampler = StackSampler(
+            interval_ms=observability_config.get('sampler_interval_ms', 5.0),
+            duration_secs=observability_config.get('sampler_duration_secs', 30.0),
+            output_dir=observability_config.get('sampler_output_dir', 'profiles'),
+            mode=observability_config.get('sampler_mode', 'wall')
+        )
+        if stack_sampler.install_signal():
+            logger.info(f"Send SIGUSR1 to PID {os.getpid()} to start/stop a stack profile")
+        if observability_config.get('sampler_on_start', False):
+            stack_sampler.start()
         
         # 8. Load indicators
         logger.info("Loading indicators...")
@@ -326,8 +583,18 @@ def main():
         logger.info(f"Connected to MT5 account {account_info['login']}")
         logger.info(f"Balance: {account_info['balance']:.2f}, Equity: {account_info['equity']:.2f}")
         
+        # Restore submitted order tags so a restart cannot resubmit the same signal
+        execution_engine.rebuild_idempotency(execution_config.get('idempotency_rebuild_hours', 24.0))
+        
+        # Restore positions, exit strategy state and daily P&L from the journal
+        if journal is not None:
+            restored = restore_state(journal.recover(), position_manager, exit_strategies, risk_manager)
+            journal.start()
+            if restored > 0:
+                logger.info(f"Restored {restored} position(s) from journal")
+        
         # Reconcile any existing Herald positions from previous session
-        reconciled = position_manager.reconcile_positions()
+        reconciled = position_manager.reconcile_positions(execution_engine.magic_number)
         if reconciled > 0:
             logger.info(f"Reconciled {reconciled} existing Herald position(s)")
         
@@ -347,6 +614,12 @@ def main():
     timeframe = getattr(mt5, trading_config.get('timeframe'))
     poll_interval = trading_config.get('poll_interval', 60)
     lookback_bars = trading_config.get('lookback_bars', 500)
+    timeframe_name = trading_config.get('timeframe')
+    
+    # Bar history: full lookback once, then only the last closed and forming bar
+    store_bars = config.get('database', {}).get('store_bars', True)
+    bars_stored = False
+    archive_refresh_bars = config.get('database', {}).get('archive_refresh_bars', 10)
     
     logger.info(f"Trading configuration: {symbol} on {config['trading']['timeframe']}")
     logger.info(f"Poll interval: {poll_interval}s, Lookback: {lookback_bars} bars")
@@ -366,13 +639,13 @@ def main():
             loop_count += 1
             loop_start = datetime.now()
             logger.debug(f"Loop #{loop_count} started at {loop_start}")
+            profiler.begin_loop()
             
             # 4. Market data ingestion
             try:
-                rates = connector.get_rates(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    count=lookback_bars
+                rates = fetch_rates(
+                    connector, bar_archive, symbol, timeframe, timeframe_name,
+                    lookback_bars, archive_refresh_bars
                 )
                 
                 if rates is None or len(rates) == 0:
@@ -383,31 +656,26 @@ def main():
                 df = data_layer.normalize_rates(rates, symbol=symbol)
                 logger.debug(f"Retrieved {len(df)} bars for {symbol}")
                 
+                if store_bars:
+                    database.record_bars_bulk(symbol, timeframe_name, df if not bars_stored else df.iloc[-2:])
+                    bars_stored = True
+                
             except Exception as e:
                 logger.error(f"Market data error: {e}", exc_info=True)
                 time.sleep(poll_interval)
                 continue
                 
+            profiler.lap("market_data")
+            
             # 5. Calculate indicators
             try:
-                # Calculate SMA indicators for strategy (required by sma_crossover)
-                df['sma_20'] = df['close'].rolling(window=20).mean()
-                df['sma_50'] = df['close'].rolling(window=50).mean()
-                
-                # Calculate ATR for stop loss calculation
-                high_low = df['high'] - df['low']
-                high_close = (df['high'] - df['close'].shift()).abs()
-                low_close = (df['low'] - df['close'].shift()).abs()
-                true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-                df['atr'] = true_range.rolling(window=14).mean()
+                # Strategy SMAs, ATR for stop loss calculation, and configured indicators
+                df = compute_indicators(
+                    df, indicators,
+                    sma_windows=strategy_sma_windows(strategy),
+                    atr_period=getattr(strategy, 'atr_period', 14)
+                )
                 
-                # Calculate additional indicators from config
-                for indicator in indicators:
-                    indicator_data = indicator.calculate(df)
-                    # Merge indicator data into main DataFrame
-                    if indicator_data is not None:
-                        df = df.join(indicator_data, how='left')
-                        
                 logger.debug(f"Calculated SMA, ATR, and {len(indicators)} additional indicators")
                 
             except Exception as e:
@@ -415,6 +683,15 @@ def main():
                 time.sleep(poll_interval)
                 continue
                 
+            # Bars and indicators for worker processes (read-only shared memory)
+            if shared_bars is not None:
+                try:
+                    shared_bars.publish(symbol, timeframe_name, df)
+                except Exception as e:
+                    logger.warning(f"Shared bar publish failed: {e}")
+                    
+            profiler.lap("indicators")
+            
             # 6. Generate strategy signals
             try:
                 current_bar = df.iloc[-1]
@@ -425,17 +702,37 @@ def main():
                         f"Signal generated: {signal.side.name} {signal.symbol} "
                         f"(confidence: {signal.confidence:.2f})"
                     )
+                    if journal is not None:
+                        journal.record_signal(signal)
                     
             except Exception as e:
                 logger.error(f"Strategy signal error: {e}", exc_info=True)
                 signal = None
                 
+            profiler.lap("strategy")
+            
+            # 6b. Handle orders completed by the pipeline (before risk checks count positions)
+            if order_pipeline is not None:
+                for completed in order_pipeline.drain_completed():
+                    try:
+                        handle_order_result(
+                            completed.context, completed.result, strategy,
+                            position_manager, database, logger, journal
+                        )
+                    except Exception as e:
+                        logger.error(f"Order result handling error: {e}", exc_info=True)
+                        
+            profiler.lap("order_results")
+            
             # 7. Process entry signals
             if signal and signal.side in [SignalType.LONG, SignalType.SHORT]:
                 try:
                     # Get current account info and positions
                     account_info = connector.get_account_info()
                     current_positions = len(position_manager.get_positions(symbol=symbol))
+                    if order_pipeline is not None:
+                        # Orders still at the broker count against position limits
+                        current_positions += order_pipeline.pending_count(symbol)
                     
                     # Risk approval
                     approved, reason, position_size = risk_manager.approve(
@@ -443,6 +740,7 @@ def main():
                         account_info=account_info,
                         current_positions=current_positions
                     )
+                    profiler.lap("risk")
                     
                     if approved:
                         logger.info(f"Risk approved: {position_size:.2f} lots - {reason}")
@@ -459,55 +757,20 @@ def main():
                                 tp=signal.take_profit
                             )
                             
-                            # Execute order
-                            logger.info(f"Placing {order_req.side} order for {order_req.volume} lots")
-                            result = execution_engine.place_order(order_req)
-                            
-                            if result.status == OrderStatus.FILLED:
-                                logger.info(
-                                    f"Order filled: ticket={result.order_id}, "
-                                    f"price={result.fill_price:.5f}"
-                                )
-                                
-                                # Track position
-                                position_info = position_manager.track_position(
-                                    result,
-                                    metadata=signal.metadata
-                                )
-                                
-                                # Record in database
-                                signal_record = SignalRecord(
-                                    timestamp=signal.timestamp,
-                                    symbol=signal.symbol,
-                                    side=signal.side.name,
-                                    confidence=signal.confidence,
-                                    price=result.fill_price,
-                                    stop_loss=signal.stop_loss,
-                                    take_profit=signal.take_profit,
-                                    strategy_name=strategy.__class__.__name__,
-                                    metadata=signal.metadata,
-                                    executed=True,
-                                    execution_timestamp=datetime.now()
-                                )
-                                database.record_signal(signal_record)
-                                
-                                trade_record = TradeRecord(
-                                    signal_id=signal.id,
-                                    order_id=result.order_id,
-                                    symbol=signal.symbol,
-                                    side=signal.side.name,
-                                    entry_price=result.fill_price,
-                                    volume=result.filled_volume,
-                                    stop_loss=signal.stop_loss,
-                                    take_profit=signal.take_profit,
-                                    entry_time=datetime.now(),
-                                    commission=result.commission
-                                )
-                                database.record_trade(trade_record)
-                                
+                            if order_pipeline is not None:
+                                # Fills are handled when the pipeline reports completion
+                                logger.info(f"Queueing {order_req.side} order for {order_req.volume} lots")
+                                if journal is not None:
+                                    journal.record_order(order_req)
+                                order_pipeline.submit(order_req, context=signal)
                             else:
-                                logger.error(
-                                    f"Order failed: {result.status.name} - {result.message}"
+                                # Execute order
+                                logger.info(f"Placing {order_req.side} order for {order_req.volume} lots")
+                                if journal is not None:
+                                    journal.record_order(order_req)
+                                result = execution_engine.place_order(order_req)
+                                handle_order_result(
+                                    signal, result, strategy, position_manager, database, logger, journal
                                 )
                         else:
                             logger.info("[DRY RUN] Would place order here")
@@ -517,6 +780,8 @@ def main():
                 except Exception as e:
                     logger.error(f"Order execution error: {e}", exc_info=True)
             
+            profiler.lap("execution")
+            
             # 7b. Scan and adopt external trades
             try:
                 if trade_adoption_policy.enabled:
@@ -526,6 +791,8 @@ def main():
             except Exception as e:
                 logger.error(f"Trade adoption scan error: {e}", exc_info=True)
                     
+            profiler.lap("adoption")
+            
             # 8. Monitor positions and check exits
             try:
                 positions = position_manager.monitor_positions()
@@ -589,10 +856,24 @@ def main():
                                             profit=position.unrealized_pnl,
                                             symbol=position.symbol
                                         )
+                                        prometheus_exporter.record_trade(
+                                            position.unrealized_pnl, symbol=position.symbol
+                                        )
                                         
                                         # Update risk manager
                                         risk_manager.record_trade_result(position.unrealized_pnl)
                                         
+                                        if journal is not None:
+                                            remaining = None
+                                            if exit_signal.partial_volume:
+                                                remaining = round(position.volume - exit_signal.partial_volume, 2)
+                                            journal.record_exit(
+                                                position.ticket, exit_signal.reason,
+                                                price=close_result.fill_price,
+                                                profit=position.unrealized_pnl,
+                                                remaining_volume=remaining
+                                            )
+                                        
                                     else:
                                         logger.error(
                                             f"Failed to close position {position.ticket}: "
@@ -603,10 +884,23 @@ def main():
                                     
                                 # Exit after first strategy triggers (highest priority wins)
                                 break
+
+                    # Push queued server-side trailing stops to MT5 in one batch
+                    if not args.dry_run:
+                        for exit_strategy in exit_strategies:
+                            if getattr(exit_strategy, 'server_side', False):
+                                exit_strategy.flush_modifications(execution_engine)
                                 
+                # Journal opened/modified/vanished positions and exit state changes
+                if journal is not None:
+                    journal.sync_positions(position_manager.get_positions())
+                    journal.record_exit_states(exit_strategies)
+
             except Exception as e:
                 logger.error(f"Position monitoring error: {e}", exc_info=True)
                 
+            profiler.lap("exits")
+            
             # 9. Health monitoring
             try:
                 if not connector.is_connected():
@@ -615,7 +909,7 @@ def main():
                     if connector.reconnect():
                         logger.info("Reconnection successful")
                         # Reconcile positions after reconnect
-                        reconciled = position_manager.reconcile_positions()
+                        reconciled = position_manager.reconcile_positions(execution_engine.magic_number)
                         logger.info(f"Reconciled {reconciled} positions")
                     else:
                         logger.error("Reconnection failed")
@@ -624,16 +918,33 @@ def main():
             except Exception as e:
                 logger.error(f"Health check error: {e}", exc_info=True)
                 
+            profiler.lap("health")
+            
+            # 9b. Publish observability snapshot (served by the HTTP thread)
+            if observability_server is not None and time.monotonic() - last_publish >= publish_interval:
+                try:
+                    publish_observability(
+                        observability_server, prometheus_exporter, health_checker,
+                        connector, position_manager
+                    )
+                    last_publish = time.monotonic()
+                except Exception as e:
+                    logger.error(f"Observability publish error: {e}", exc_info=True)
+                
+            profiler.lap("publish")
+            
             # Performance monitoring
             if loop_count % 100 == 0:
                 logger.info(f"Performance metrics after {loop_count} loops:")
                 metrics.print_summary()
+                profiler.log_summary()
                 
                 # Position statistics
                 stats = position_manager.get_statistics()
                 logger.info(f"Position stats: {stats}")
                 
             # 10. Wait for next cycle
+            profiler.end_loop()
             loop_duration = (datetime.now() - loop_start).total_seconds()
             logger.debug(f"Loop completed in {loop_duration:.2f}s")
             
@@ -651,16 +962,44 @@ def main():
         logger.info("Initiating graceful shutdown...")
         
         try:
+            # Let queued orders finish so their positions are tracked before closing
+            if order_pipeline is not None:
+                order_pipeline.stop(timeout=10.0)
+                for completed in order_pipeline.drain_completed():
+                    handle_order_result(
+                        completed.context, completed.result, strategy,
+                        position_manager, database, logger, journal
+                    )
+                    
             # Close all open positions
             if not args.dry_run:
                 logger.info("Closing all open positions...")
-                close_results = position_manager.close_all_positions("System shutdown")
-                logger.info(f"Closed {len(close_results)} positions")
+                close_report = position_manager.close_all_positions("System shutdown")
+                logger.info(
+                    f"Closed {close_report.closed}/{close_report.requested} positions "
+                    f"in {close_report.total_ms:.1f}ms (latency: {close_report.latency_stats()})"
+                )
                 
             # Print final metrics
             logger.info("Final performance metrics:")
             metrics.print_summary()
             
+            idempotency_store.close()
+            stack_sampler.stop()
+            
+            # Commit queued signal/trade/metric writes before exiting
+            if maintenance is not None:
+                maintenance.stop()
+            database.close()
+            if journal is not None:
+                journal.sync_positions(position_manager.get_positions())
+                journal.close()
+            if shared_bars is not None:
+                shared_bars.close()
+            
+            if observability_server is not None:
+                observability_server.stop()
+            
             # Disconnect from MT5
             connector.disconnect()
             logger.info("Disconnected from MT5")
@@ -671,6 +1010,7 @@ def main():
         logger.info("=" * 70)
         logger.info("Herald Autonomous Trading System - Stopped")
         logger.info("=" * 70)
+        shutdown_logging()
         
     return 0
 
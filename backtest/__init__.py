@@ -0,0 +1,19 @@
+"""
+Backtest Module
+
+Historical simulation of strategies, risk limits and exit strategies.
+"""
+
+from .engine import BacktestEngine, BacktestResult, FillModel, bars_frame
+from .optimizer import Optimizer, OptimizationResult, ParameterSpace, walk_forward_splits
+
+__all__ = [
+    "BacktestEngine",
+    "BacktestResult",
+    "FillModel",
+    "bars_frame",
+    "Optimizer",
+    "OptimizationResult",
+    "ParameterSpace",
+    "walk_forward_splits",
+]
@@ -0,0 +1,423 @@
+"""
+Backtest Engine
+
+Replays historical bars through the same objects the trading loop uses:
+indicators are computed once over the whole history with the shared
+indicator pipeline (vectorized pandas calls), then bars are walked in
+order through Strategy.on_bar, RiskManager.approve and the exit
+strategies, with a FillModel standing in for the broker.
+
+Per-bar work is kept to plain Python values: indicator columns are turned
+into lists once, each bar is handed to the strategy as a lightweight
+mapping, and equity is written into a preallocated numpy array. Strategies
+that implement Strategy.generate_signals() skip on_bar() entirely: their
+signal table is computed up front and looked up by bar position.
+
+Bar prices are taken as bid prices (as in MT5 rates); longs enter at the
+ask (bid + spread) and shorts exit at the ask. Signals are evaluated on
+closed bars, so by default entries fill at the next bar's open. Broker-side
+stop loss / take profit levels are checked against each bar's high and low
+(stop first when both are touched in one bar). Server-side trailing stops
+are evaluated client-side at bar close.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from herald.indicators.pipeline import compute_indicators, strategy_sma_windows
+from herald.position.manager import PositionInfo
+from herald.risk.manager import RiskManager, RiskLimits
+from herald.strategy.base import Strategy, SignalType
+
+
+class BarView(dict):
+    """One bar as a mapping of column -> value, with the bar time as .name (like a DataFrame row)."""
+
+    __slots__ = ('name',)
+
+
+@dataclass
+class FillModel:
+    """
+    Simulated broker execution.
+
+    Attributes:
+        spread: Ask minus bid, in price units
+        slippage: Adverse slippage per fill, in price units
+        commission_per_lot: Commission per lot per side (account currency)
+        contract_size: Units per lot (P&L = price move * volume * contract_size)
+        fill_on_next_open: Fill entries at the next bar's open (False: at the signal bar's close)
+    """
+    spread: float = 0.0
+    slippage: float = 0.0
+    commission_per_lot: float = 0.0
+    contract_size: float = 100000.0
+    fill_on_next_open: bool = True
+
+    def entry_price(self, is_long: bool, bid: float) -> float:
+        """Fill price for opening at the given bid."""
+        return bid + self.spread + self.slippage if is_long else bid - self.slippage
+
+    def exit_price(self, is_long: bool, bid: float) -> float:
+        """Fill price for closing at the given bid."""
+        return bid - self.slippage if is_long else bid + self.spread + self.slippage
+
+    def profit(self, is_long: bool, entry: float, exit: float, volume: float) -> float:
+        """Gross profit of a fill pair."""
+        move = exit - entry if is_long else entry - exit
+        return move * volume * self.contract_size
+
+
+@dataclass
+class BacktestResult:
+    """
+    Backtest output.
+
+    Attributes:
+        trades: One row per (partial) close: ticket, side, volume, entry/exit
+            time and price, profit (net of commission), commission, exit_reason, signal_id
+        equity: Equity after each bar, indexed by bar time
+        initial_balance: Starting balance
+        signals: Number of entry signals generated
+    """
+    trades: pd.DataFrame
+    equity: pd.Series
+    initial_balance: float
+    signals: int = 0
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Headline statistics.
+
+        Returns:
+            Dict with trades, net_profit, win_rate, profit_factor,
+            max_drawdown, max_drawdown_pct, sharpe_ratio (daily, annualized)
+        """
+        profit = self.trades['profit'].to_numpy(dtype=float)
+        gross_profit = profit[profit > 0].sum()
+        gross_loss = -profit[profit < 0].sum()
+        equity = self.equity.to_numpy(dtype=float)
+        peak = np.maximum.accumulate(np.concatenate(([self.initial_balance], equity)))[1:]
+        drawdown = peak - equity
+        worst = int(np.argmax(drawdown)) if len(drawdown) else 0
+        daily = self.equity.resample('1D').last().dropna()
+        returns = daily.pct_change().dropna().to_numpy()
+        std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+        return {
+            'trades': len(profit),
+            'net_profit': float(profit.sum()),
+            'win_rate': float((profit > 0).mean()) if len(profit) else 0.0,
+            'profit_factor': float(gross_profit / gross_loss) if gross_loss > 0 else 0.0,
+            'max_drawdown': float(drawdown[worst]) if len(drawdown) else 0.0,
+            'max_drawdown_pct': float(drawdown[worst] / peak[worst]) if len(drawdown) and peak[worst] else 0.0,
+            'sharpe_ratio': float(returns.mean() / std * np.sqrt(252)) if std > 0 else 0.0,
+        }
+
+
+@dataclass
+class _Entry:
+    """An approved signal waiting for its fill."""
+    signal: Any
+    volume: float
+    is_long: bool
+
+
+@dataclass
+class _Trade:
+    """Simulator state of one open position."""
+    position: PositionInfo
+    is_long: bool
+    signal_id: str
+    commission_rate: float = 0.0
+    exits: List[tuple] = field(default_factory=list)
+
+
+TRADE_COLUMNS = [
+    'ticket', 'side', 'volume', 'entry_time', 'entry_price', 'exit_time', 'exit_price',
+    'profit', 'commission', 'exit_reason', 'signal_id',
+]
+
+
+def bars_frame(rates) -> pd.DataFrame:
+    """
+    DataFrame for a backtest from MT5 rates (e.g. BarArchive.read()).
+
+    Args:
+        rates: RATES_DTYPE array or anything persistence.bar_archive.to_rates accepts
+
+    Returns:
+        Frame indexed by bar time (naive UTC) with open, high, low, close,
+        volume (tick volume) and spread columns
+    """
+    from herald.persistence.bar_archive import to_rates
+
+    rates = to_rates(rates)
+    return pd.DataFrame(
+        {
+            'open': rates['open'],
+            'high': rates['high'],
+            'low': rates['low'],
+            'close': rates['close'],
+            'volume': rates['tick_volume'].astype(np.int64),
+            'spread': rates['spread'],
+        },
+        index=pd.DatetimeIndex(rates['time'].astype('datetime64[s]'), name='time')
+    )
+
+
+class BacktestEngine:
+    """
+    Bar-replay backtester for a strategy, its risk limits and exit strategies.
+
+    Usage:
+        engine = BacktestEngine(SmaCrossover(config), exit_strategies=[TrailingStop({})])
+        result = engine.run(bars_frame(archive.read("EURUSD", "M1", start, end)))
+        print(result.summary())
+    """
+
+    def __init__(
+        self,
+        strategy: Strategy,
+        risk_manager: Optional[RiskManager] = None,
+        exit_strategies: Sequence = (),
+        indicators: Sequence = (),
+        fill_model: Optional[FillModel] = None,
+        initial_balance: float = 10000.0,
+        symbol: Optional[str] = None
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            strategy: Strategy instance (state is reset before each run)
+            risk_manager: Risk manager for approvals and sizing (default limits if None)
+            exit_strategies: Exit strategies, evaluated in priority order
+            indicators: Configured Indicator instances joined onto the bars
+            fill_model: Execution model (default: no costs, next-open fills)
+            initial_balance: Starting account balance
+            symbol: Symbol for positions (default: strategy config 'symbol')
+        """
+        self.strategy = strategy
+        self.risk_manager = risk_manager or RiskManager(RiskLimits())
+        self.exit_strategies = sorted(exit_strategies, key=lambda x: x.priority, reverse=True)
+        self.indicators = list(indicators)
+        self.fill_model = fill_model or FillModel()
+        self.initial_balance = initial_balance
+        self.symbol = symbol or strategy.config.get('symbol', 'UNKNOWN')
+        self.logger = logging.getLogger("herald.backtest")
+
+        for exit_strategy in self.exit_strategies:
+            if getattr(exit_strategy, 'server_side', False):
+                self.logger.info("%s: server-side mode evaluated at bar close in backtests", exit_strategy.name)
+                exit_strategy.server_side = False
+
+    def prepare(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute indicator columns once over the full history.
+
+        Args:
+            bars: Frame with DatetimeIndex and open, high, low, close, volume
+
+        Returns:
+            Frame with the strategy's SMAs, ATR and configured indicators
+        """
+        return compute_indicators(
+            bars.copy(), self.indicators,
+            sma_windows=strategy_sma_windows(self.strategy),
+            atr_period=getattr(self.strategy, 'atr_period', 14)
+        )
+
+    def run(self, bars: pd.DataFrame, prepared: bool = False) -> BacktestResult:
+        """
+        Replay bars and simulate trading.
+
+        Args:
+            bars: Bar frame (see bars_frame())
+            prepared: bars already carry indicator columns (skip prepare())
+
+        Returns:
+            BacktestResult
+        """
+        df = bars if prepared else self.prepare(bars)
+        self.strategy.reset()
+        for exit_strategy in self.exit_strategies:
+            exit_strategy.reset()
+
+        fill = self.fill_model
+        columns = list(df.columns)
+        times = df.index.to_pydatetime().tolist()
+        opens = df['open'].tolist()
+        highs = df['high'].tolist()
+        lows = df['low'].tolist()
+        closes = df['close'].tolist()
+        atrs = df['atr'].tolist() if 'atr' in df.columns else [None] * len(df)
+        rows = zip(*(df[column].tolist() for column in columns))
+        equity = np.empty(len(df))
+
+        self._balance = self.initial_balance
+        self._open: List[_Trade] = []
+        self._closed: List[tuple] = []
+        self._next_ticket = 1
+        pending: List[_Entry] = []
+        signals = 0
+        on_bar = self.strategy.on_bar
+        table_rows = self._signal_rows(df)
+
+        for i, values in enumerate(rows):
+            now = times[i]
+
+            # Entries approved on the previous bar fill at this open
+            if pending:
+                for entry in pending:
+                    self._fill_entry(entry, opens[i], now)
+                pending = []
+
+            # Broker-side SL/TP inside the bar
+            if self._open:
+                self._check_stops(opens[i], highs[i], lows[i], now)
+
+            if table_rows is None:
+                bar = BarView(zip(columns, values))
+                bar.name = now
+                signal = on_bar(bar)
+            else:
+                bar = None
+                row = table_rows.get(i)
+                signal = self.strategy.table_signal(now, row) if row is not None else None
+            if signal is not None and signal.side in (SignalType.LONG, SignalType.SHORT):
+                signals += 1
+                entry = self._approve(signal, len(self._open) + len(pending), closes[i], now)
+                if entry is not None:
+                    if fill.fill_on_next_open:
+                        pending.append(entry)
+                    else:
+                        self._fill_entry(entry, closes[i], now)
+
+            if self._open:
+                if bar is None:
+                    bar = BarView(zip(columns, values))
+                    bar.name = now
+                self._check_exits(bar, closes[i], atrs[i], now)
+
+            equity[i] = self._balance + sum(trade.position.unrealized_pnl for trade in self._open)
+
+        trades = pd.DataFrame(self._closed, columns=TRADE_COLUMNS)
+        return BacktestResult(
+            trades=trades,
+            equity=pd.Series(equity, index=df.index, name='equity'),
+            initial_balance=self.initial_balance,
+            signals=signals
+        )
+
+    def _signal_rows(self, df: pd.DataFrame) -> Optional[Dict[int, Dict[str, Any]]]:
+        """Bar position -> signal table row, or None without a batch path."""
+        table = self.strategy.generate_signals(df)
+        if table is None:
+            return None
+        positions = df.index.get_indexer(table.index).tolist()
+        return dict(zip(positions, table.to_dict('records')))
+
+    def _account(self) -> Dict[str, Any]:
+        equity = self._balance + sum(trade.position.unrealized_pnl for trade in self._open)
+        return {'balance': self._balance, 'equity': equity, 'trade_allowed': True}
+
+    def _approve(self, signal, open_count: int, close: float, now: datetime) -> Optional[_Entry]:
+        approved, reason, volume = self.risk_manager.approve(
+            signal, self._account(), open_count, today=now.date()
+        )
+        if not approved:
+            return None
+        return _Entry(signal=signal, volume=volume, is_long=signal.side == SignalType.LONG)
+
+    def _fill_entry(self, entry: _Entry, bid: float, now: datetime):
+        fill = self.fill_model
+        signal = entry.signal
+        price = fill.entry_price(entry.is_long, bid)
+        position = PositionInfo(
+            ticket=self._next_ticket,
+            symbol=self.symbol,
+            side="BUY" if entry.is_long else "SELL",
+            volume=entry.volume,
+            open_price=price,
+            open_time=now,
+            stop_loss=signal.stop_loss or 0.0,
+            take_profit=signal.take_profit or 0.0,
+            current_price=price,
+        )
+        self._next_ticket += 1
+        self._open.append(_Trade(position, entry.is_long, signal.id, fill.commission_per_lot))
+
+    def _close(self, trade: _Trade, price: float, now: datetime, reason: str, volume: Optional[float] = None):
+        """Realize a full or partial close at a fill price."""
+        position = trade.position
+        volume = position.volume if volume is None else min(volume, position.volume)
+        commission = 2 * trade.commission_rate * volume
+        profit = self.fill_model.profit(trade.is_long, position.open_price, price, volume) - commission
+        self._balance += profit
+        self._closed.append((
+            position.ticket, position.side, volume, position.open_time, position.open_price,
+            now, price, profit, commission, reason, trade.signal_id
+        ))
+        self.risk_manager.record_trade_result(profit)
+
+        remaining = round(position.volume - volume, 8)
+        if remaining > 0:
+            position.volume = remaining
+            return
+        self._open.remove(trade)
+        for exit_strategy in self.exit_strategies:
+            remove = getattr(exit_strategy, 'remove_position', None)
+            if remove is not None:
+                remove(position.ticket)
+
+    def _check_stops(self, open_: float, high: float, low: float, now: datetime):
+        spread = self.fill_model.spread
+        slippage = self.fill_model.slippage
+        for trade in list(self._open):
+            position = trade.position
+            sl, tp = position.stop_loss, position.take_profit
+            if trade.is_long:
+                if sl and low <= sl:
+                    self._close(trade, min(open_, sl) - slippage, now, "SL")
+                elif tp and high >= tp:
+                    self._close(trade, max(open_, tp), now, "TP")
+            else:
+                ask_open, ask_high, ask_low = open_ + spread, high + spread, low + spread
+                if sl and ask_high >= sl:
+                    self._close(trade, max(ask_open, sl) + slippage, now, "SL")
+                elif tp and ask_low <= tp:
+                    self._close(trade, min(ask_open, tp), now, "TP")
+
+    def _check_exits(self, bar: BarView, close: float, atr: Optional[float], now: datetime):
+        fill = self.fill_model
+        account = self._account()
+        indicators = {'atr': atr}
+        for trade in list(self._open):
+            position = trade.position
+            price = fill.exit_price(trade.is_long, close)
+            position.current_price = price
+            position.unrealized_pnl = fill.profit(trade.is_long, position.open_price, price, position.volume)
+            exit_data = {
+                'current_price': price,
+                'current_data': bar,
+                'account_info': account,
+                'indicators': indicators,
+                'timestamp': now,
+            }
+            for exit_strategy in self.exit_strategies:
+                if not exit_strategy.is_enabled():
+                    continue
+                exit_signal = exit_strategy.should_exit(position, exit_data)
+                if exit_signal:
+                    self._close(trade, price, now, exit_signal.reason, exit_signal.partial_volume)
+                    break
+        for trade in self._open:
+            position = trade.position
+            price = fill.exit_price(trade.is_long, close)
+            position.current_price = price
+            position.unrealized_pnl = fill.profit(trade.is_long, position.open_price, price, position.volume)
@@ -0,0 +1,674 @@
+"""
+Parameter Optimizer
+
+Walk-forward sweeps of strategy, risk and exit parameters over archived
+bars, writing the winning parameters as a mindset file.
+
+The parent computes every distinct SMA/ATR column the parameter sets need
+once, over the full history (rolling indicators only look back, so a
+window sliced out of them equals the live values), and publishes them with
+the bars in a SharedBarStore segment. Workers attach read-only and slice
+zero-copy frames per task, so parameter sets are the only thing pickled.
+
+Each fold picks the parameter set with the best in-sample objective and
+scores it on the following out-of-sample window; the parameters chosen on
+the most recent fold become the mindset.
+
+Usage:
+    herald-optimize --symbol EURUSD --timeframe M1 --space space.json \\
+        --objective sharpe_ratio --name eurusd_m1 --output mindsets
+
+    space.json:
+        {
+            "strategy": {"short_window": [5, 10, 20], "long_window": [30, 50, 100]},
+            "risk": {"max_position_size_pct": [0.01, 0.02]},
+            "exit_strategies": {"time_based": {"max_hold_hours": [12, 24]}}
+        }
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from copy import deepcopy
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from herald.backtest.engine import BacktestEngine, FillModel, bars_frame
+from herald.config.mindsets import MINDSETS, load_mindset, save_mindset
+from herald.exit import AdverseMovementExit, ProfitTargetExit, TimeBasedExit, TrailingStop
+from herald.indicators.pipeline import atr_column, sma_columns
+from herald.persistence.bar_archive import to_rates
+from herald.persistence.shared_bars import SharedBarStore, SharedBars
+from herald.risk.manager import RiskLimits, RiskManager
+from herald.strategy.sma_crossover import SmaCrossover
+
+
+STRATEGIES = {
+    'sma_crossover': SmaCrossover,
+}
+
+# Exit strategy types, as in herald.__main__.load_exit_strategies()
+EXIT_STRATEGIES = {
+    'trailing_stop': TrailingStop,
+    'time_based': TimeBasedExit,
+    'profit_target': ProfitTargetExit,
+    'adverse_movement': AdverseMovementExit,
+}
+
+
+def _calmar(summary: Dict[str, float]) -> float:
+    if summary['max_drawdown'] > 0:
+        return summary['net_profit'] / summary['max_drawdown']
+    return summary['net_profit']
+
+
+# Objective name -> score of a BacktestResult.summary() (higher is better)
+OBJECTIVES = {
+    'sharpe_ratio': lambda summary: summary['sharpe_ratio'],
+    'net_profit': lambda summary: summary['net_profit'],
+    'profit_factor': lambda summary: summary['profit_factor'],
+    'calmar': _calmar,
+}
+
+SECTIONS = ('strategy', 'risk', 'exit_strategies')
+
+# SharedBarStore timeframe key of the published bars
+SEGMENT = 'optimizer'
+
+# RiskLimits fields herald.__main__ reads from config['risk']
+RISK_LIMIT_KEYS = (
+    'max_position_size_pct', 'max_total_exposure_pct', 'max_daily_loss_pct',
+    'max_positions_per_symbol', 'max_total_positions', 'min_risk_reward_ratio',
+)
+
+
+@dataclass
+class ParameterSpace:
+    """
+    Candidate values per parameter.
+
+    Attributes:
+        strategy: Strategy parameter -> values
+        risk: Risk limit (RISK_LIMIT_KEYS) -> values
+        exit_strategies: Exit strategy type -> parameter -> values
+    """
+    strategy: Dict[str, List[Any]] = field(default_factory=dict)
+    risk: Dict[str, List[Any]] = field(default_factory=dict)
+    exit_strategies: Dict[str, Dict[str, List[Any]]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> 'ParameterSpace':
+        """
+        Build a space from its JSON form.
+
+        Args:
+            spec: Dict with optional strategy, risk and exit_strategies sections
+
+        Returns:
+            ParameterSpace
+
+        Raises:
+            ValueError: On unknown sections, risk fields or exit types
+        """
+        unknown = set(spec) - set(SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown parameter sections: {', '.join(sorted(unknown))}")
+        bad_risk = set(spec.get('risk', {})) - set(RISK_LIMIT_KEYS)
+        if bad_risk:
+            raise ValueError(f"Unknown risk limits: {', '.join(sorted(bad_risk))}")
+        bad_exits = set(spec.get('exit_strategies', {})) - set(EXIT_STRATEGIES)
+        if bad_exits:
+            raise ValueError(f"Unknown exit strategies: {', '.join(sorted(bad_exits))}")
+        return cls(**{section: deepcopy(spec.get(section, {})) for section in SECTIONS})
+
+    def _axes(self) -> List[Tuple[Tuple[str, ...], List[Any]]]:
+        axes = [(('strategy', name), values) for name, values in self.strategy.items()]
+        axes += [(('risk', name), values) for name, values in self.risk.items()]
+        for exit_type, params in self.exit_strategies.items():
+            axes += [(('exit_strategies', exit_type, name), values) for name, values in params.items()]
+        return axes
+
+    def size(self) -> int:
+        """Number of grid points."""
+        return math.prod(len(values) for _, values in self._axes())
+
+    @staticmethod
+    def _params(axes, choice: Sequence[Any]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {'strategy': {}, 'risk': {}, 'exit_strategies': {}}
+        for (path, _), value in zip(axes, choice):
+            target = params
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+        return params
+
+    def grid(self) -> Iterator[Dict[str, Any]]:
+        """
+        Every combination of values.
+
+        Yields:
+            Parameter set: {'strategy': {...}, 'risk': {...}, 'exit_strategies': {type: {...}}}
+        """
+        axes = self._axes()
+        for choice in itertools.product(*(values for _, values in axes)):
+            yield self._params(axes, choice)
+
+    def sample(self, count: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Distinct random grid points (without building the grid).
+
+        Args:
+            count: Number of parameter sets (capped at the grid size)
+            seed: Random seed
+
+        Returns:
+            List of parameter sets
+        """
+        axes = self._axes()
+        size = self.size()
+        picks = random.Random(seed).sample(range(size), min(count, size))
+        sets = []
+        for index in picks:
+            choice = []
+            for _, values in reversed(axes):
+                index, position = divmod(index, len(values))
+                choice.append(values[position])
+            sets.append(self._params(axes, choice[::-1]))
+        return sets
+
+
+def walk_forward_splits(
+    length: int,
+    folds: int = 4,
+    train_ratio: float = 0.7,
+    anchored: bool = False
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Train/test windows over bar positions.
+
+    Test windows are consecutive and cover the end of the data; each is
+    preceded by a training window train_ratio / (1 - train_ratio) times
+    its length (or by all earlier bars when anchored).
+
+    Args:
+        length: Number of bars
+        folds: Number of train/test pairs
+        train_ratio: Share of a rolling window used for training
+        anchored: Train from the first bar in every fold
+
+    Returns:
+        List of (train_start, train_end, test_start, test_end), end exclusive
+    """
+    if folds < 1 or not 0 < train_ratio < 1:
+        raise ValueError("folds must be >= 1 and train_ratio in (0, 1)")
+    train_span = train_ratio / (1 - train_ratio)
+    test_bars = int(length / (folds + train_span))
+    train_bars = length - folds * test_bars
+    if test_bars < 1:
+        raise ValueError(f"{length} bars are too few for {folds} folds")
+    splits = []
+    for fold in range(folds):
+        test_start = train_bars + fold * test_bars
+        train_start = 0 if anchored else test_start - train_bars
+        splits.append((train_start, test_start, test_start, test_start + test_bars))
+    return splits
+
+
+def merge_params(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Parameter set with override values on top of base (per section and exit type)."""
+    merged = deepcopy(base)
+    for section in ('strategy', 'risk'):
+        merged.setdefault(section, {}).update(override.get(section, {}))
+    exits = merged.setdefault('exit_strategies', {})
+    for exit_type, params in override.get('exit_strategies', {}).items():
+        exits.setdefault(exit_type, {}).update(params)
+    return merged
+
+
+def is_valid(strategy_type: str, params: Dict[str, Any]) -> bool:
+    """False for parameter sets the strategy cannot trade (e.g. fast SMA >= slow SMA)."""
+    if strategy_type == 'sma_crossover':
+        strategy = params.get('strategy', {})
+        return strategy.get('short_window', 20) < strategy.get('long_window', 50)
+    return True
+
+
+@dataclass
+class OptimizationResult:
+    """
+    Walk-forward optimization output.
+
+    Attributes:
+        best: Parameter set chosen on the most recent fold (base values included)
+        folds: Per fold: windows, chosen parameters, in-sample score and out-of-sample summary
+        out_of_sample: Totals across the out-of-sample windows
+        objective: Objective name
+        evaluated: Number of backtests run
+    """
+    best: Dict[str, Any]
+    folds: List[Dict[str, Any]]
+    out_of_sample: Dict[str, float]
+    objective: str
+    evaluated: int
+
+    def to_mindset(
+        self,
+        name: str,
+        base: Dict[str, Any],
+        strategy_type: str = 'sma_crossover',
+        description: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Mindset with the chosen parameters on top of a base mindset.
+
+        Args:
+            name: Mindset name
+            base: Base mindset (trading settings etc. are kept)
+            strategy_type: Strategy the parameters belong to
+            description: Mindset description
+
+        Returns:
+            Mindset dict (the optimization section is informational)
+        """
+        mindset = deepcopy(base)
+        mindset['name'] = name
+        mindset['description'] = description or (
+            f"Walk-forward optimized ({self.objective}, {len(self.folds)} folds)."
+        )
+        mindset.setdefault('strategy', {})[strategy_type] = deepcopy(self.best['strategy'])
+        mindset.setdefault('risk', {}).update(self.best['risk'])
+        if self.best['exit_strategies']:
+            mindset['exit_strategies'] = deepcopy(self.best['exit_strategies'])
+        mindset['optimization'] = {
+            'objective': self.objective,
+            'evaluated': self.evaluated,
+            'folds': self.folds,
+            'out_of_sample': self.out_of_sample,
+        }
+        return mindset
+
+
+# Worker process state (set by _init_worker)
+_worker: Dict[str, Any] = {}
+
+BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def _indicator_periods(params: Dict[str, Any]) -> Tuple[int, int, int]:
+    """(short SMA, long SMA, ATR) periods of a parameter set, with SmaCrossover's defaults and aliases."""
+    strategy = params['strategy']
+    return (
+        strategy.get('short_window', strategy.get('fast_period', 20)),
+        strategy.get('long_window', strategy.get('slow_period', 50)),
+        strategy.get('atr_period', strategy.get('atr', 14)),
+    )
+
+
+def indicator_frame(rates, candidates: Sequence[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Bars plus every indicator column the candidates read, computed once.
+
+    Args:
+        rates: RATES_DTYPE bars
+        candidates: Parameter sets
+
+    Returns:
+        Frame with bar columns, sma_<window> and atr_<period> columns
+    """
+    frame = bars_frame(rates)[list(BAR_COLUMNS)]
+    periods = [_indicator_periods(params) for params in candidates]
+    sma_columns(frame, sorted({window for short, long, _ in periods for window in (short, long)}))
+    for period in sorted({atr for _, _, atr in periods}):
+        atr_column(frame, period, column=f'atr_{period}')
+    return frame
+
+
+def _init_worker(prefix: str, symbol: str, settings: Dict[str, Any]):
+    """Attach read-only to the published bars and keep per-process settings."""
+    herald_logger = logging.getLogger("herald")
+    bars = SharedBars.attach(symbol, SEGMENT, prefix)
+    _, arrays = bars.arrays()
+    _worker.clear()
+    _worker.update(settings)
+    _worker['log_level'] = herald_logger.level
+    _worker['bars'] = bars
+    _worker['index'] = pd.DatetimeIndex(arrays.pop('time').view('datetime64[ns]'))
+    _worker['arrays'] = arrays
+    # Rejected signals and exits would otherwise log once per bar per task
+    herald_logger.setLevel(logging.ERROR)
+
+
+def _release_worker():
+    """Detach from the shared bars (in-process runs)."""
+    logging.getLogger("herald").setLevel(_worker.get('log_level', logging.NOTSET))
+    bars = _worker.pop('bars', None)
+    _worker.clear()
+    if bars is not None:
+        bars.close()
+
+
+def _evaluate(task: Tuple[Dict[str, Any], int, int]) -> Dict[str, float]:
+    """Backtest one parameter set on bars[start:end]."""
+    params, start, end = task
+    strategy_type = _worker['strategy_type']
+    strategy = STRATEGIES[strategy_type]({**params['strategy'], 'symbol': _worker['symbol']})
+
+    # Zero-copy slices of the shared columns
+    arrays = _worker['arrays']
+    short, long, atr = _indicator_periods(params)
+    columns = {column: arrays[column][start:end] for column in BAR_COLUMNS}
+    for window in (short, long):
+        columns[f'sma_{window}'] = arrays[f'sma_{window}'][start:end]
+    columns['atr'] = arrays[f'atr_{atr}'][start:end]
+    frame = pd.DataFrame(columns, index=_worker['index'][start:end], copy=False)
+
+    risk = RiskManager(RiskLimits(**{k: v for k, v in params['risk'].items() if k in RISK_LIMIT_KEYS}))
+    exits = [
+        EXIT_STRATEGIES[exit_type](dict(exit_params))
+        for exit_type, exit_params in params['exit_strategies'].items()
+        if exit_params.get('enabled', True)
+    ]
+    engine = BacktestEngine(
+        strategy, risk, exit_strategies=exits, fill_model=_worker['fill_model'],
+        initial_balance=_worker['initial_balance'], symbol=_worker['symbol']
+    )
+    return engine.run(frame, prepared=True).summary()
+
+
+class Optimizer:
+    """
+    Walk-forward optimizer over a ParameterSpace.
+
+    Usage:
+        space = ParameterSpace.from_dict({'strategy': {'short_window': [5, 10], 'long_window': [30, 50]}})
+        result = Optimizer(space, objective='calmar').run(archive.read("EURUSD", "M1"))
+        save_mindset(result.to_mindset("eurusd_m1", MINDSETS["balanced"]), "mindsets/eurusd_m1.json")
+    """
+
+    def __init__(
+        self,
+        space: ParameterSpace,
+        base_params: Optional[Dict[str, Any]] = None,
+        strategy_type: str = 'sma_crossover',
+        objective: str = 'sharpe_ratio',
+        folds: int = 4,
+        train_ratio: float = 0.7,
+        anchored: bool = False,
+        samples: Optional[int] = None,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
+        fill_model: Optional[FillModel] = None,
+        initial_balance: float = 10000.0,
+        symbol: str = 'UNKNOWN',
+        min_trades: int = 1
+    ):
+        """
+        Initialize optimizer.
+
+        Args:
+            space: Parameter values to sweep
+            base_params: Fixed values under the sweep ({'strategy', 'risk', 'exit_strategies'})
+            strategy_type: Strategy to optimize
+            objective: Key of OBJECTIVES
+            folds: Walk-forward folds
+            train_ratio: Training share of each rolling window
+            anchored: Train every fold from the first bar
+            samples: Random sample size (None = full grid)
+            seed: Random sampling seed
+            workers: Worker processes (None = all cores, 1 = in-process)
+            fill_model: Execution model for every backtest
+            initial_balance: Starting balance of every backtest
+            symbol: Symbol the bars belong to
+            min_trades: In-sample trades required for a parameter set to be chosen
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective '{objective}'. Available: {', '.join(OBJECTIVES)}")
+        if strategy_type not in STRATEGIES:
+            raise ValueError(f"Unknown strategy type: {strategy_type}")
+        self.space = space
+        self.base_params = merge_params({'strategy': {}, 'risk': {}, 'exit_strategies': {}}, base_params or {})
+        self.strategy_type = strategy_type
+        self.objective = objective
+        self.folds = folds
+        self.train_ratio = train_ratio
+        self.anchored = anchored
+        self.samples = samples
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.fill_model = fill_model or FillModel()
+        self.initial_balance = initial_balance
+        self.symbol = symbol
+        self.min_trades = min_trades
+        self.logger = logging.getLogger("herald.backtest.optimizer")
+
+    def candidates(self) -> List[Dict[str, Any]]:
+        """Valid parameter sets to evaluate, base values included."""
+        swept = self.space.sample(self.samples, self.seed) if self.samples else self.space.grid()
+        sets = [merge_params(self.base_params, params) for params in swept]
+        return [params for params in sets if is_valid(self.strategy_type, params)]
+
+    def _score(self, summary: Dict[str, float]) -> float:
+        if summary['trades'] < self.min_trades:
+            return float('-inf')
+        return OBJECTIVES[self.objective](summary)
+
+    def run(self, rates) -> OptimizationResult:
+        """
+        Sweep the space over walk-forward splits of the bars.
+
+        Args:
+            rates: Bars (RATES_DTYPE array, e.g. BarArchive.read(), or anything to_rates() accepts)
+
+        Returns:
+            OptimizationResult
+        """
+        rates = np.ascontiguousarray(to_rates(rates))
+        splits = walk_forward_splits(len(rates), self.folds, self.train_ratio, self.anchored)
+        candidates = self.candidates()
+        if not candidates:
+            raise ValueError("Parameter space has no valid parameter sets")
+
+        settings = {
+            'strategy_type': self.strategy_type,
+            'symbol': self.symbol,
+            'fill_model': self.fill_model,
+            'initial_balance': self.initial_balance,
+        }
+        train_tasks = [(i, fold) for i in range(len(candidates)) for fold in range(len(splits))]
+        self.logger.info(
+            "Optimizing %d parameter sets x %d folds on %d bars with %d workers",
+            len(candidates), len(splits), len(rates), self.workers
+        )
+
+        store = SharedBarStore(prefix=f"herald-optimizer-{os.getpid()}")
+        try:
+            store.publish(self.symbol, SEGMENT, indicator_frame(rates, candidates))
+            with self._mapper(store.prefix, settings) as mapper:
+                train = mapper(
+                    [(candidates[i], splits[fold][0], splits[fold][1]) for i, fold in train_tasks]
+                )
+                scores = {}
+                for (i, fold), summary in zip(train_tasks, train):
+                    scores[(i, fold)] = self._score(summary)
+
+                chosen = []
+                for fold in range(len(splits)):
+                    best = max(range(len(candidates)), key=lambda i: scores[(i, fold)])
+                    if scores[(best, fold)] == float('-inf'):
+                        self.logger.warning("Fold %d: no parameter set reached %d trades", fold, self.min_trades)
+                    chosen.append(best)
+                tests = mapper(
+                    [(candidates[i], splits[fold][2], splits[fold][3]) for fold, i in enumerate(chosen)]
+                )
+        finally:
+            store.close()
+
+        times = rates['time']
+        fold_reports = []
+        for fold, (i, summary) in enumerate(zip(chosen, tests)):
+            train_start, train_end, test_start, test_end = splits[fold]
+            fold_reports.append({
+                'train': [_iso(times[train_start]), _iso(times[train_end - 1])],
+                'test': [_iso(times[test_start]), _iso(times[test_end - 1])],
+                'params': candidates[i],
+                'in_sample_score': scores[(i, fold)],
+                'out_of_sample': summary,
+            })
+
+        return OptimizationResult(
+            best=candidates[chosen[-1]],
+            folds=fold_reports,
+            out_of_sample=_combine(tests),
+            objective=self.objective,
+            evaluated=len(train_tasks) + len(tests)
+        )
+
+    @contextmanager
+    def _mapper(self, prefix: str, settings: Dict[str, Any]):
+        """Yield a function mapping _evaluate over tasks, in worker processes or in-process."""
+        if self.workers <= 1:
+            _init_worker(prefix, self.symbol, settings)
+            try:
+                yield lambda tasks: [_evaluate(task) for task in tasks]
+            finally:
+                _release_worker()
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(prefix, self.symbol, settings)
+        ) as executor:
+            yield lambda tasks: list(executor.map(
+                _evaluate, tasks, chunksize=max(1, len(tasks) // (self.workers * 4))
+            ))
+
+
+def _iso(epoch_seconds) -> str:
+    return datetime.fromtimestamp(int(epoch_seconds), tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _combine(summaries: List[Dict[str, float]]) -> Dict[str, float]:
+    """Totals over out-of-sample windows."""
+    return {
+        'trades': sum(s['trades'] for s in summaries),
+        'net_profit': sum(s['net_profit'] for s in summaries),
+        'max_drawdown': max(s['max_drawdown'] for s in summaries),
+        'mean_sharpe_ratio': sum(s['sharpe_ratio'] for s in summaries) / len(summaries),
+        'profitable_folds': sum(1 for s in summaries if s['net_profit'] > 0),
+    }
+
+
+def _epoch(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Walk-forward parameter optimization over archived bars",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  herald-optimize --symbol EURUSD --timeframe M1 --space space.json --name eurusd_m1
+  herald-optimize --symbol XAUUSD --timeframe M5 --space space.json --samples 200 \\
+      --objective calmar --base conservative --name gold_calmar --spread 0.2
+        """
+    )
+    parser.add_argument('--archive', type=str, default='data/bars', help='Bar archive root')
+    parser.add_argument('--symbol', type=str, required=True, help='Trading symbol')
+    parser.add_argument('--timeframe', type=str, required=True, help='Timeframe label (e.g. M1)')
+    parser.add_argument('--start', type=str, default=None, help='First bar (ISO date, UTC)')
+    parser.add_argument('--end', type=str, default=None, help='Last bar (ISO date, UTC)')
+    parser.add_argument('--space', type=str, required=True, help='Parameter space JSON file')
+    parser.add_argument('--strategy', type=str, default='sma_crossover', choices=sorted(STRATEGIES))
+    parser.add_argument('--base', type=str, default='balanced',
+                        help='Mindset name or file the parameters are applied on')
+    parser.add_argument('--objective', type=str, default='sharpe_ratio', choices=sorted(OBJECTIVES))
+    parser.add_argument('--folds', type=int, default=4, help='Walk-forward folds')
+    parser.add_argument('--train-ratio', type=float, default=0.7, help='Training share of each window')
+    parser.add_argument('--anchored', action='store_true', help='Train every fold from the first bar')
+    parser.add_argument('--samples', type=int, default=None, help='Random sample size (default: full grid)')
+    parser.add_argument('--seed', type=int, default=None, help='Random sampling seed')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--min-trades', type=int, default=10, help='In-sample trades required')
+    parser.add_argument('--spread', type=float, default=0.0, help='Spread in price units')
+    parser.add_argument('--slippage', type=float, default=0.0, help='Slippage per fill in price units')
+    parser.add_argument('--commission', type=float, default=0.0, help='Commission per lot per side')
+    parser.add_argument('--contract-size', type=float, default=100000.0, help='Units per lot')
+    parser.add_argument('--balance', type=float, default=10000.0, help='Initial balance')
+    parser.add_argument('--name', type=str, required=True, help='Name of the mindset to write')
+    parser.add_argument('--output', type=str, default='mindsets', help='Output directory')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    from herald.persistence.bar_archive import BarArchive
+
+    with open(args.space, 'r', encoding='utf-8') as f:
+        space = ParameterSpace.from_dict(json.load(f))
+    base = deepcopy(MINDSETS[args.base]) if args.base in MINDSETS else load_mindset(args.base)
+
+    rates = BarArchive(args.archive).read(args.symbol, args.timeframe, _epoch(args.start), _epoch(args.end))
+    if len(rates) == 0:
+        print(f"No archived bars for {args.symbol} {args.timeframe}")
+        return 1
+
+    optimizer = Optimizer(
+        space,
+        base_params={
+            'strategy': base.get('strategy', {}).get(args.strategy, {}),
+            'risk': base.get('risk', {}),
+            'exit_strategies': base.get('exit_strategies', {}),
+        },
+        strategy_type=args.strategy,
+        objective=args.objective,
+        folds=args.folds,
+        train_ratio=args.train_ratio,
+        anchored=args.anchored,
+        samples=args.samples,
+        seed=args.seed,
+        workers=args.workers,
+        fill_model=FillModel(
+            spread=args.spread, slippage=args.slippage,
+            commission_per_lot=args.commission, contract_size=args.contract_size
+        ),
+        initial_balance=args.balance,
+        symbol=args.symbol,
+        min_trades=args.min_trades
+    )
+    result = optimizer.run(rates)
+
+    mindset = result.to_mindset(
+        args.name, base, args.strategy,
+        description=(
+            f"Walk-forward optimized on {args.symbol} {args.timeframe} "
+            f"({args.objective}, {args.folds} folds, base {base['name']})."
+        )
+    )
+    path = save_mindset(mindset, os.path.join(args.output, f"{args.name}.json"))
+
+    print(f"✓ Mindset written: {path}")
+    print(f"  - Parameters: {json.dumps(result.best['strategy'])}")
+    print(f"  - Out of sample: {json.dumps(result.out_of_sample)}")
+    print(f"  - Use with: herald --config config.json --mindset {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,12 @@
 """Herald configuration module"""
 
-from .mindsets import MINDSETS, apply_mindset, get_mindset_info, list_mindsets
+from .mindsets import MINDSETS, apply_mindset, get_mindset_info, list_mindsets, load_mindset, save_mindset
 
 __all__ = [
     "MINDSETS",
     "apply_mindset",
     "get_mindset_info", 
     "list_mindsets",
+    "load_mindset",
+    "save_mindset",
 ]
@@ -13,8 +13,13 @@ Usage:
     config = apply_mindset(base_config, "balanced")
     
     # Or use CLI: python -m herald --mindset balanced
+    
+Mindsets can also be JSON files with the same structure (for example the
+output of the backtest optimizer): pass the file path instead of a name.
 """
 
+import json
+import os
 from typing import Dict, Any
 from copy import deepcopy
 
@@ -138,6 +143,58 @@ MINDSETS: Dict[str, Dict[str, Any]] = {
 }
 
 
+def load_mindset(path: str) -> Dict[str, Any]:
+    """
+    Load a mindset from a JSON file.
+    
+    Args:
+        path: Mindset file path
+        
+    Returns:
+        Mindset configuration dict
+        
+    Raises:
+        ValueError: If the file has no name
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        mindset = json.load(f)
+    if not mindset.get("name"):
+        raise ValueError(f"Mindset file {path} has no name")
+    return mindset
+
+
+def save_mindset(mindset: Dict[str, Any], path: str) -> str:
+    """
+    Write a mindset to a JSON file.
+    
+    Args:
+        mindset: Mindset configuration dict (must have a name)
+        path: Output file path
+        
+    Returns:
+        The path written
+    """
+    if not mindset.get("name"):
+        raise ValueError("Mindset has no name")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(mindset, f, indent=2, default=str)
+        f.write("\n")
+    return path
+
+
+def _resolve(mindset_name: str) -> Dict[str, Any]:
+    """Preset by name, or a mindset file by path."""
+    if mindset_name.lower() in MINDSETS:
+        return MINDSETS[mindset_name.lower()]
+    if os.path.isfile(mindset_name):
+        return load_mindset(mindset_name)
+    available = ", ".join(MINDSETS.keys())
+    raise ValueError(f"Unknown mindset '{mindset_name}'. Available: {available} or a mindset file")
+
+
 def apply_mindset(config: Dict[str, Any], mindset_name: str) -> Dict[str, Any]:
     """
     Apply a mindset preset to a configuration.
@@ -147,7 +204,8 @@ def apply_mindset(config: Dict[str, Any], mindset_name: str) -> Dict[str, Any]:
     
     Args:
         config: Base configuration dictionary
-        mindset_name: One of "aggressive", "balanced", "conservative"
+        mindset_name: One of "aggressive", "balanced", "conservative", or
+            the path of a mindset JSON file
         
     Returns:
         New configuration dict with mindset applied
@@ -155,13 +213,7 @@ def apply_mindset(config: Dict[str, Any], mindset_name: str) -> Dict[str, Any]:
     Raises:
         ValueError: If mindset_name is not recognized
     """
-    mindset_name = mindset_name.lower()
-    
-    if mindset_name not in MINDSETS:
-        available = ", ".join(MINDSETS.keys())
-        raise ValueError(f"Unknown mindset '{mindset_name}'. Available: {available}")
-    
-    mindset = MINDSETS[mindset_name]
+    mindset = _resolve(mindset_name)
     result = deepcopy(config)
     
     # Apply risk settings
@@ -180,6 +232,20 @@ def apply_mindset(config: Dict[str, Any], mindset_name: str) -> Dict[str, Any]:
                 result["strategy"]["params"] = {}
             result["strategy"]["params"].update(mindset["strategy"][strategy_type])
     
+    # Apply exit strategy settings (list or dict config format)
+    if "exit_strategies" in mindset:
+        exits = result.get("exit_strategies") or []
+        for exit_type, params in mindset["exit_strategies"].items():
+            if isinstance(exits, dict):
+                entry = exits.setdefault(exit_type, {})
+            else:
+                entry = next((e for e in exits if e.get("type", "").lower() == exit_type), None)
+                if entry is None:
+                    entry = {"type": exit_type, "enabled": True}
+                    exits.append(entry)
+            entry.setdefault("params", {}).update(params)
+        result["exit_strategies"] = exits
+    
     # Apply trading settings
     if "trading" in mindset:
         if "trading" not in result:
@@ -191,7 +257,7 @@ def apply_mindset(config: Dict[str, Any], mindset_name: str) -> Dict[str, Any]:
         result["confidence_threshold"] = mindset["confidence_threshold"]
     
     # Mark which mindset was applied
-    result["_mindset"] = mindset_name
+    result["_mindset"] = mindset["name"]
     
     return result
 
@@ -201,15 +267,12 @@ def get_mindset_info(mindset_name: str) -> Dict[str, Any]:
     Get information about a specific mindset.
     
     Args:
-        mindset_name: Mindset name
+        mindset_name: Mindset name or mindset file path
         
     Returns:
         Mindset configuration dict
     """
-    mindset_name = mindset_name.lower()
-    if mindset_name not in MINDSETS:
-        raise ValueError(f"Unknown mindset: {mindset_name}")
-    return MINDSETS[mindset_name]
+    return _resolve(mindset_name)
 
 
 def list_mindsets() -> Dict[str, str]:
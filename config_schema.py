@@ -51,6 +51,44 @@ class StrategyConfig(BaseModel):
     params: Dict[str, Any] = Field(default_factory=dict)
 
 
+class ExecutionConfig(BaseModel):
+    """Configuration for order execution."""
+    async_orders: bool = False  # Submit orders through the background OrderPipeline
+    max_in_flight: int = 1  # Concurrent orders at the broker
+    max_queue: int = 64  # Queued orders before submissions are rejected
+    account_check_ttl_secs: float = 5.0  # Reuse of the trade_allowed account check
+    idempotency_path: Optional[str] = "herald_orders.jsonl"  # Submitted client tags (None = memory only)
+    idempotency_max_entries: int = 10000
+    idempotency_ttl_hours: float = 168.0
+    idempotency_rebuild_hours: float = 24.0  # Deal history scanned at startup
+
+
+class ObservabilityConfig(BaseModel):
+    """Configuration for the embedded /metrics, /healthz and /readyz server."""
+    http_enabled: bool = False
+    http_host: str = "127.0.0.1"
+    http_port: int = 9108
+    publish_interval_secs: float = 5.0  # Minimum time between snapshot refreshes from the loop
+    stale_after_secs: Optional[float] = None  # None = 3x poll interval
+    profiler_enabled: bool = True  # Per-stage loop timing
+    profiler_window: int = 512  # Samples kept per stage for p50/p95/p99
+    profiler_persist_every_loops: int = 100  # Loops between DB snapshots (0 = never)
+    stage_budgets_ms: Dict[str, float] = Field(default_factory=dict)  # e.g. {"market_data": 250}
+    sampler_on_start: bool = False  # Start a stack profile at startup (SIGUSR1 toggles at runtime)
+    sampler_mode: str = "wall"  # wall (portable) or cpu (SIGPROF, POSIX only)
+    sampler_interval_ms: float = 5.0
+    sampler_duration_secs: float = 30.0
+    sampler_output_dir: str = "profiles"
+
+
+class JournalConfig(BaseModel):
+    """Configuration for the trading journal (state recovery across restarts)."""
+    enabled: bool = True
+    path: str = "journal"  # Directory holding snapshot.json and event segments
+    durability: str = "normal"  # off, normal (fsync snapshots) or full (fsync every batch)
+    snapshot_every: int = 1000  # Events between snapshots (older segments are deleted)
+
+
 class OrphanConfig(BaseModel):
     """Configuration for orphan trade adoption."""
     enabled: bool = False
@@ -69,7 +107,10 @@ class Config(BaseModel):
     indicators: Optional[list] = Field(default_factory=list)
     exit_strategies: Optional[list] = Field(default_factory=list)
     orphan_trades: OrphanConfig = Field(default_factory=OrphanConfig)
+    execution: ExecutionConfig = Field(default_factory=ExecutionConfig)
+    observability: ObservabilityConfig = Field(default_factory=ObservabilityConfig)
     database: Dict[str, Any] = Field(default_factory=lambda: {"path": "herald.db"})
+    journal: JournalConfig = Field(default_factory=JournalConfig)
     cache_enabled: bool = True
     logging: Dict[str, Any] = Field(default_factory=dict)
 
@@ -13,6 +13,11 @@ except Exception:
         ORDER_TYPE_BUY = 0
         ORDER_TYPE_SELL = 1
         TRADE_ACTION_DEAL = 0
+        TRADE_ACTION_SLTP = 6
+        TRADE_ACTION_CLOSE_BY = 10
+        SYMBOL_ORDER_CLOSEBY = 64
+        ACCOUNT_MARGIN_MODE_RETAIL_HEDGING = 2
+        DEAL_ENTRY_IN = 0
         ORDER_TIME_GTC = 0
         ORDER_FILLING_FOK = 3
         TRADE_RETCODE_DONE = 10009
@@ -1,5 +1,12 @@
 """Execution module"""
 
-from .engine import ExecutionEngine, OrderRequest, ExecutionResult, OrderType, OrderStatus
+from .engine import ExecutionEngine, OrderRequest, ExecutionResult, OrderType, OrderStatus, SLTPModification, OrderTimeline
+from .idempotency import IdempotencyStore
+from .pipeline import OrderPipeline, CompletedOrder
+from .netting import NettingPlanner, NettingPlan, NettingLeg, CloseByPair, MarketClose
 
-__all__ = ["ExecutionEngine", "OrderRequest", "ExecutionResult", "OrderType", "OrderStatus"]
+__all__ = [
+    "ExecutionEngine", "OrderRequest", "ExecutionResult", "OrderType", "OrderStatus", "SLTPModification", "OrderTimeline",
+    "OrderPipeline", "CompletedOrder", "IdempotencyStore",
+    "NettingPlanner", "NettingPlan", "NettingLeg", "CloseByPair", "MarketClose",
+]
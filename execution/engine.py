@@ -7,12 +7,18 @@ Supports market/limit orders with idempotent submission and external reconciliat
 
 from herald.connector.mt5_connector import mt5
 import logging
-from typing import Optional, Dict, Any
+import time
+import hashlib
+import json
+from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
 from herald.strategy.base import Signal, SignalType
+from herald.execution.netting import NettingPlanner, NettingLeg, NettingPlan
+from herald.execution.idempotency import IdempotencyStore
+from herald.observability.execution_metrics import ExecutionMetrics
 
 
 class OrderType(Enum):
@@ -100,6 +106,75 @@ class ExecutionResult:
         return self.error
 
 
+@dataclass
+class OrderTimeline:
+    """
+    Per-order lifecycle timestamps (epoch seconds).
+    
+    Attributes:
+        enqueued_at: Order handed to the execution pipeline
+        sent_at: order_send issued to the broker
+        acked_at: Broker response received
+        filled_at: Fill confirmed (equal to acked_at for market deals)
+    """
+    enqueued_at: Optional[float] = None
+    sent_at: Optional[float] = None
+    acked_at: Optional[float] = None
+    filled_at: Optional[float] = None
+    
+    @staticmethod
+    def _ms(start: Optional[float], end: Optional[float]) -> Optional[float]:
+        if start is None or end is None:
+            return None
+        return (end - start) * 1000.0
+        
+    @property
+    def queue_ms(self) -> Optional[float]:
+        """Time spent waiting in the submission queue."""
+        return self._ms(self.enqueued_at, self.sent_at)
+        
+    @property
+    def broker_ms(self) -> Optional[float]:
+        """Broker round-trip time (send to ack)."""
+        return self._ms(self.sent_at, self.acked_at)
+        
+    @property
+    def total_ms(self) -> Optional[float]:
+        """End-to-end time from enqueue (or send) to fill (or ack)."""
+        return self._ms(self.enqueued_at or self.sent_at, self.filled_at or self.acked_at)
+        
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        """Convert to dictionary for logging and storage."""
+        return {
+            'enqueued_at': self.enqueued_at,
+            'sent_at': self.sent_at,
+            'acked_at': self.acked_at,
+            'filled_at': self.filled_at,
+            'queue_ms': self.queue_ms,
+            'broker_ms': self.broker_ms,
+            'total_ms': self.total_ms,
+        }
+
+
+@dataclass
+class SLTPModification:
+    """
+    Broker-side stop loss / take profit modification for an open position.
+    
+    Attributes:
+        ticket: Position ticket
+        symbol: Trading symbol
+        sl: New stop loss price (0.0 = none)
+        tp: Take profit price to keep on the position (0.0 = none)
+        metadata: Additional modification data
+    """
+    ticket: int
+    symbol: str
+    sl: float
+    tp: float = 0.0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
 class ExecutionEngine:
     """
     Order execution and management engine.
@@ -112,7 +187,10 @@ class ExecutionEngine:
     - Order modification and cancellation
     """
     
-    def __init__(self, connector, magic_number: int = 20241206, slippage: int = 10):
+    def __init__(self, connector, magic_number: int = 20241206, slippage: int = 10,
+                 account_check_ttl_secs: float = 5.0,
+                 idempotency_store: Optional[IdempotencyStore] = None,
+                 metrics: Optional[ExecutionMetrics] = None):
         """
         Initialize execution engine.
         
@@ -120,24 +198,40 @@ class ExecutionEngine:
             connector: MT5Connector instance
             magic_number: Unique identifier for bot orders
             slippage: Maximum allowed slippage in points
+            account_check_ttl_secs: How long a trade_allowed check is reused before re-querying the account
+            idempotency_store: Store of submitted client tags (default: in-memory only)
+            metrics: Send latency / slippage / reject instrumentation (shared with PositionManager)
         """
         self.connector = connector
         self.magic_number = magic_number
         self.slippage = slippage
+        self.account_check_ttl_secs = account_check_ttl_secs
         self.logger = logging.getLogger("herald.execution")
         
         # Order tracking for idempotency
-        self._submitted_orders: Dict[str, int] = {}
+        self._submitted_orders = idempotency_store if idempotency_store is not None else IdempotencyStore()
+        
+        # Symbol digits cache for price normalization
+        self._symbol_digits: Dict[str, int] = {}
         
-    def place_order(self, order_req: OrderRequest) -> ExecutionResult:
+        # Order send instrumentation
+        self.metrics = metrics if metrics is not None else ExecutionMetrics()
+        
+        # Cached trade_allowed check: (allowed, monotonic timestamp)
+        self._trade_allowed_cache: Optional[tuple] = None
+        
+        # Close-by netting for multi-position exits
+        self._netting_planner = NettingPlanner()
+        
+    def ensure_client_tag(self, order_req: OrderRequest) -> str:
         """
-        Place order with idempotency check.
+        Assign a deterministic client tag if the request has none.
         
         Args:
             order_req: Order request
             
         Returns:
-            ExecutionResult with order outcome
+            The request's client tag
         """
         # Ensure metadata present
         if order_req.metadata is None:
@@ -146,7 +240,6 @@ class ExecutionEngine:
         # If client_tag not provided, generate a deterministic tag based on order content
         if not order_req.client_tag:
             try:
-                import hashlib, json
                 canonical = json.dumps({
                     'signal_id': order_req.signal_id,
                     'symbol': order_req.symbol,
@@ -162,10 +255,36 @@ class ExecutionEngine:
             except Exception as _:
                 from datetime import datetime as _dt
                 order_req.client_tag = f"autogen:{int(_dt.now().timestamp())}"
+        return order_req.client_tag
+        
+    def place_order(self, order_req: OrderRequest, timeline: Optional[OrderTimeline] = None) -> ExecutionResult:
+        """
+        Place order with idempotency check.
+        
+        Send, ack and fill times are recorded in result.metadata['timeline'].
+        
+        Args:
+            order_req: Order request
+            timeline: Timeline to stamp (created if not provided, e.g. by OrderPipeline)
+            
+        Returns:
+            ExecutionResult with order outcome
+        """
+        timeline = timeline or OrderTimeline()
+        result = self._send_order(order_req, timeline)
+        if result.status == OrderStatus.FILLED and timeline.filled_at is None:
+            # Market deals are filled by the time the broker acknowledges them
+            timeline.filled_at = timeline.acked_at
+        result.metadata['timeline'] = timeline
+        return result
+        
+    def _send_order(self, order_req: OrderRequest, timeline: OrderTimeline) -> ExecutionResult:
+        """Validate, send and interpret a single order."""
+        self.ensure_client_tag(order_req)
 
         # Check if already submitted (idempotency)
-        if order_req.client_tag in self._submitted_orders:
-            existing_ticket = self._submitted_orders[order_req.client_tag]
+        existing_ticket = self._submitted_orders.get(order_req.client_tag)
+        if existing_ticket is not None:
             self.logger.warning(f"Order {order_req.client_tag} already submitted as ticket #{existing_ticket}")
             return ExecutionResult(
                 order_id=existing_ticket,
@@ -198,34 +317,37 @@ class ExecutionEngine:
                 f"{order_req.side} {order_req.volume} {order_req.symbol}"
             )
             
-            result = mt5.order_send(request)
-            
-            if result is None:
-                error = mt5.last_error()
-                self.logger.error(f"Order submission failed: {error}")
+            # Check trading is allowed before anything reaches the broker
+            if not self._trade_allowed():
+                self.logger.error("Trading not allowed on the connected account")
                 return ExecutionResult(
                     order_id=None,
                     status=OrderStatus.REJECTED,
                     executed_price=None,
                     executed_volume=None,
                     timestamp=datetime.now(),
-                    error=str(error)
+                    error="Trade not allowed on account",
+                    metadata={'trade_allowed': False}
                 )
                 
-            # Check if trading is allowed - ensure account is permitted before processing result
-            account_info = self.connector.get_account_info()
-            if account_info is None or not account_info.get('trade_allowed', False):
-                self.logger.error("Trading not allowed on the connected account")
+            timeline.sent_at = time.time()
+            sent = time.perf_counter()
+            result = mt5.order_send(request)
+            self.metrics.record_request(order_req.symbol, "open", request, time.perf_counter() - sent, result)
+            timeline.acked_at = time.time()
+            
+            if result is None:
+                error = mt5.last_error()
+                self.logger.error(f"Order submission failed: {error}")
                 return ExecutionResult(
                     order_id=None,
                     status=OrderStatus.REJECTED,
                     executed_price=None,
                     executed_volume=None,
                     timestamp=datetime.now(),
-                    error="Trade not allowed on account",
-                    metadata={'trade_allowed': False}
+                    error=str(error)
                 )
-
+                
             # Check result
             if result.retcode == mt5.TRADE_RETCODE_DONE:
                 # Track for idempotency
@@ -277,6 +399,35 @@ class ExecutionEngine:
                 error=str(e)
             )
             
+    def rebuild_idempotency(self, lookback_hours: float = 24.0) -> int:
+        """
+        Restore submitted client tags from recent deals after a restart.
+        
+        Args:
+            lookback_hours: How far back to scan deal history
+            
+        Returns:
+            Number of tags restored
+        """
+        return self._submitted_orders.rebuild_from_deals(self.magic_number, lookback_hours)
+        
+    def _trade_allowed(self) -> bool:
+        """
+        Check the account's trade_allowed flag, reusing the last answer for account_check_ttl_secs.
+        
+        Returns:
+            True if the account may trade
+        """
+        now = time.monotonic()
+        cached = self._trade_allowed_cache
+        if cached is not None and now - cached[1] < self.account_check_ttl_secs:
+            return cached[0]
+            
+        account_info = self.connector.get_account_info()
+        allowed = bool(account_info and account_info.get('trade_allowed', False))
+        self._trade_allowed_cache = (allowed, now)
+        return allowed
+        
     def close_position(self, ticket: int, volume: Optional[float] = None) -> ExecutionResult:
         """
         Close an existing position.
@@ -329,7 +480,9 @@ class ExecutionEngine:
             }
             
             # Submit close order
+            sent = time.perf_counter()
             result = mt5.order_send(request)
+            self.metrics.record_request(position.symbol, "close", request, time.perf_counter() - sent, result)
             
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 self.logger.info(f"Position closed: #{ticket} | Profit: {result.profit:.2f}")
@@ -363,6 +516,362 @@ class ExecutionEngine:
                 error=str(e)
             )
             
+    def plan_close_many(self, tickets: List[int]) -> NettingPlan:
+        """
+        Plan the exit of several positions with close-by netting.
+        
+        Args:
+            tickets: Position tickets to exit
+            
+        Returns:
+            NettingPlan (close-by pairs + residual market closes)
+        """
+        wanted = set(tickets)
+        return self.plan_netting([
+            NettingLeg(
+                ticket=p.ticket,
+                symbol=p.symbol,
+                side="BUY" if p.type == mt5.ORDER_TYPE_BUY else "SELL",
+                volume=p.volume
+            )
+            for p in (mt5.positions_get() or []) if p.ticket in wanted
+        ])
+        
+    def plan_netting(self, legs: List[NettingLeg]) -> NettingPlan:
+        """
+        Plan close-by netting for known legs.
+        
+        Close-by is only planned on hedging accounts and for symbols whose
+        broker settings permit it; everything else closes at market.
+        
+        Args:
+            legs: Positions to exit
+            
+        Returns:
+            NettingPlan (close-by pairs + residual market closes)
+        """
+        by_symbol: Dict[str, List[NettingLeg]] = {}
+        for leg in legs:
+            by_symbol.setdefault(leg.symbol, []).append(leg)
+            
+        hedging = self._is_hedging_account()
+        plan = NettingPlan()
+        for symbol, symbol_legs in by_symbol.items():
+            symbol_plan = self._netting_planner.plan(
+                symbol_legs, allow_close_by=hedging and self._close_by_allowed(symbol)
+            )
+            plan.close_by.extend(symbol_plan.close_by)
+            plan.market.extend(symbol_plan.market)
+        return plan
+        
+    def close_many(self, tickets: List[int], comment: str = "Herald close") -> List[ExecutionResult]:
+        """
+        Exit several positions, netting opposite sides with TRADE_ACTION_CLOSE_BY.
+        
+        Opposite BUY/SELL volumes on the same symbol are closed against each
+        other (no spread, one request per pair); only the residual net volume
+        is closed at market. On netting accounts, or symbols where the broker
+        does not allow close-by, every position is closed at market.
+        
+        Args:
+            tickets: Position tickets to exit
+            comment: Order comment
+            
+        Returns:
+            List of ExecutionResult objects, one per request (plus one per unknown ticket)
+        """
+        if not self.connector.is_connected():
+            self.logger.error("Not connected to MT5")
+            return [
+                ExecutionResult(
+                    order_id=None,
+                    status=OrderStatus.REJECTED,
+                    executed_price=None,
+                    executed_volume=None,
+                    timestamp=datetime.now(),
+                    error="MT5 not connected",
+                    metadata={'ticket': ticket}
+                )
+                for ticket in tickets
+            ]
+            
+        results: List[ExecutionResult] = []
+        try:
+            plan = self.plan_close_many(tickets)
+        except Exception as e:
+            self.logger.error(f"Close-many planning error: {e}")
+            return [
+                ExecutionResult(
+                    order_id=None,
+                    status=OrderStatus.REJECTED,
+                    executed_price=None,
+                    executed_volume=None,
+                    timestamp=datetime.now(),
+                    error=str(e),
+                    metadata={'ticket': ticket}
+                )
+                for ticket in tickets
+            ]
+            
+        planned = {p.ticket for p in plan.close_by} | {p.ticket_by for p in plan.close_by} | {m.ticket for m in plan.market}
+        for ticket in tickets:
+            if ticket not in planned:
+                results.append(ExecutionResult(
+                    order_id=None,
+                    status=OrderStatus.REJECTED,
+                    executed_price=None,
+                    executed_volume=None,
+                    timestamp=datetime.now(),
+                    error=f"Position #{ticket} not found",
+                    metadata={'ticket': ticket}
+                ))
+                
+        for symbol in plan.symbols():
+            failed = False
+            for pair in (p for p in plan.close_by if p.symbol == symbol):
+                if failed:
+                    break
+                request = {
+                    "action": mt5.TRADE_ACTION_CLOSE_BY,
+                    "position": pair.ticket,
+                    "position_by": pair.ticket_by,
+                    "magic": self.magic_number,
+                    "comment": comment,
+                }
+                result = self._send_close_request(
+                    symbol, request, pair.volume, {'ticket': pair.ticket, 'ticket_by': pair.ticket_by}
+                )
+                failed = result.status != OrderStatus.FILLED
+                results.append(result)
+                
+            market = [m for m in plan.market if m.symbol == symbol]
+            if failed:
+                # Residual volumes assume every close-by of the symbol succeeded
+                for close in market:
+                    results.append(ExecutionResult(
+                        order_id=None,
+                        status=OrderStatus.REJECTED,
+                        executed_price=None,
+                        executed_volume=None,
+                        timestamp=datetime.now(),
+                        error="Skipped after failed close-by",
+                        metadata={'ticket': close.ticket}
+                    ))
+                continue
+                
+            try:
+                tick = mt5.symbol_info_tick(symbol) if market else None
+            except Exception as e:
+                self.logger.error(f"Tick lookup failed for {symbol}: {e}")
+                tick = None
+            if market and tick is None:
+                for close in market:
+                    results.append(ExecutionResult(
+                        order_id=None,
+                        status=OrderStatus.REJECTED,
+                        executed_price=None,
+                        executed_volume=None,
+                        timestamp=datetime.now(),
+                        error=f"No tick for {symbol}",
+                        metadata={'ticket': close.ticket}
+                    ))
+                continue
+                
+            for close in market:
+                if close.side == "BUY":
+                    order_type, price = mt5.ORDER_TYPE_SELL, tick.bid
+                else:
+                    order_type, price = mt5.ORDER_TYPE_BUY, tick.ask
+                request = {
+                    "action": mt5.TRADE_ACTION_DEAL,
+                    "symbol": symbol,
+                    "volume": close.volume,
+                    "type": order_type,
+                    "position": close.ticket,
+                    "price": price,
+                    "deviation": self.slippage,
+                    "magic": self.magic_number,
+                    "comment": comment,
+                    "type_time": mt5.ORDER_TIME_GTC,
+                    "type_filling": mt5.ORDER_FILLING_IOC,
+                }
+                results.append(self._send_close_request(symbol, request, close.volume, {'ticket': close.ticket}))
+                
+        closed_by = sum(1 for r in results if r.status == OrderStatus.FILLED and r.metadata.get('close_by'))
+        self.logger.info(
+            f"Close-many: {len(tickets)} tickets | {plan.round_trips} requests | "
+            f"close-by pairs: {closed_by} | netted: {plan.netted_volume:.2f} | market: {plan.market_volume:.2f}"
+        )
+        return results
+        
+    def _send_close_request(self, symbol: str, request: Dict[str, Any], volume: float,
+                            metadata: Dict[str, Any]) -> ExecutionResult:
+        """Send a close / close-by request and wrap the outcome."""
+        metadata = dict(metadata, close_by=request["action"] == mt5.TRADE_ACTION_CLOSE_BY)
+        try:
+            sent = time.perf_counter()
+            result = mt5.order_send(request)
+            self.metrics.record_request(
+                symbol, "close_by" if metadata['close_by'] else "close", request, time.perf_counter() - sent, result
+            )
+            if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+                metadata['profit'] = getattr(result, 'profit', 0.0)
+                return ExecutionResult(
+                    order_id=result.order,
+                    status=OrderStatus.FILLED,
+                    executed_price=result.price,
+                    executed_volume=volume,
+                    timestamp=datetime.now(),
+                    metadata=metadata
+                )
+            error = f"{result.retcode}: {result.comment}" if result else str(mt5.last_error())
+        except Exception as e:
+            error = str(e)
+        self.logger.error(f"Close request failed for {metadata}: {error}")
+        return ExecutionResult(
+            order_id=None,
+            status=OrderStatus.REJECTED,
+            executed_price=None,
+            executed_volume=None,
+            timestamp=datetime.now(),
+            error=error,
+            metadata=metadata
+        )
+        
+    def _is_hedging_account(self) -> bool:
+        """Check whether the account allows opposite positions on one symbol."""
+        try:
+            account = mt5.account_info()
+            return account is not None and account.margin_mode == mt5.ACCOUNT_MARGIN_MODE_RETAIL_HEDGING
+        except Exception:
+            return False
+            
+    def _close_by_allowed(self, symbol: str) -> bool:
+        """Check whether the broker permits TRADE_ACTION_CLOSE_BY for a symbol."""
+        try:
+            info = mt5.symbol_info(symbol)
+            return info is not None and bool(info.order_mode & mt5.SYMBOL_ORDER_CLOSEBY)
+        except Exception:
+            return False
+            
+    def modify_position_sltp(self, modification: SLTPModification) -> ExecutionResult:
+        """
+        Move stop loss / take profit of an open position on the broker side.
+        
+        Args:
+            modification: SL/TP modification to apply
+            
+        Returns:
+            ExecutionResult with modification outcome
+        """
+        try:
+            digits = self._get_symbol_digits(modification.symbol)
+            sl = round(modification.sl, digits) if modification.sl else 0.0
+            tp = round(modification.tp, digits) if modification.tp else 0.0
+            
+            request = {
+                "action": mt5.TRADE_ACTION_SLTP,
+                "symbol": modification.symbol,
+                "position": modification.ticket,
+                "sl": sl,
+                "tp": tp,
+                "magic": self.magic_number,
+            }
+            
+            sent = time.perf_counter()
+            result = mt5.order_send(request)
+            self.metrics.record_request(modification.symbol, "sltp", request, time.perf_counter() - sent, result)
+            
+            if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+                self.logger.debug(f"SL/TP modified: #{modification.ticket} | SL: {sl} | TP: {tp}")
+                return ExecutionResult(
+                    order_id=modification.ticket,
+                    status=OrderStatus.FILLED,
+                    executed_price=sl,
+                    executed_volume=None,
+                    timestamp=datetime.now(),
+                    metadata={'ticket': modification.ticket, 'sl': sl, 'tp': tp}
+                )
+            else:
+                error = f"{result.retcode}: {result.comment}" if result else str(mt5.last_error())
+                self.logger.error(f"SL/TP modification failed for #{modification.ticket}: {error}")
+                return ExecutionResult(
+                    order_id=None,
+                    status=OrderStatus.REJECTED,
+                    executed_price=None,
+                    executed_volume=None,
+                    timestamp=datetime.now(),
+                    error=error,
+                    metadata={'ticket': modification.ticket, 'sl': sl, 'tp': tp}
+                )
+                
+        except Exception as e:
+            self.logger.error(f"SL/TP modification error: {e}")
+            return ExecutionResult(
+                order_id=None,
+                status=OrderStatus.REJECTED,
+                executed_price=None,
+                executed_volume=None,
+                timestamp=datetime.now(),
+                error=str(e),
+                metadata={'ticket': modification.ticket}
+            )
+            
+    def modify_positions_sltp(self, modifications: List[SLTPModification]) -> List[ExecutionResult]:
+        """
+        Apply a batch of SL/TP modifications in a single pass.
+        
+        Duplicate tickets are collapsed (last modification wins) and requests
+        are grouped per symbol so symbol lookups happen once per batch.
+        
+        Args:
+            modifications: SL/TP modifications to apply
+            
+        Returns:
+            List of ExecutionResult objects, one per distinct ticket
+        """
+        latest: Dict[int, SLTPModification] = {}
+        for modification in modifications:
+            latest[modification.ticket] = modification
+            
+        if not latest:
+            return []
+            
+        if not self.connector.is_connected():
+            self.logger.error("Not connected to MT5")
+            return [
+                ExecutionResult(
+                    order_id=None,
+                    status=OrderStatus.REJECTED,
+                    executed_price=None,
+                    executed_volume=None,
+                    timestamp=datetime.now(),
+                    error="MT5 not connected",
+                    metadata={'ticket': ticket}
+                )
+                for ticket in latest
+            ]
+            
+        by_symbol: Dict[str, List[SLTPModification]] = {}
+        for modification in latest.values():
+            by_symbol.setdefault(modification.symbol, []).append(modification)
+            
+        results = []
+        for symbol_mods in by_symbol.values():
+            for modification in symbol_mods:
+                results.append(self.modify_position_sltp(modification))
+                
+        return results
+        
+    def _get_symbol_digits(self, symbol: str) -> int:
+        """Get (cached) price digits for a symbol."""
+        digits = self._symbol_digits.get(symbol)
+        if digits is None:
+            info = self.connector.get_symbol_info(symbol)
+            digits = int(info['digits']) if info and info.get('digits') is not None else 5
+            self._symbol_digits[symbol] = digits
+        return digits
+        
     def _build_mt5_request(self, order_req: OrderRequest) -> Dict[str, Any]:
         """Build MT5 order request dictionary."""
         # Determine MT5 order type
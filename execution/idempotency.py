@@ -0,0 +1,200 @@
+"""
+Idempotency Store
+
+Bounded client_tag -> ticket map used by ExecutionEngine to reject duplicate
+order submissions. Entries are kept in an LRU with time-based expiry,
+persisted to an append-only JSON-lines file, and can be rebuilt at startup
+from recent broker deals whose comment carries the client tag.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from herald.connector.mt5_connector import mt5
+
+
+class IdempotencyStore:
+    """
+    LRU + TTL map of submitted client tags.
+
+    Lookups and inserts are O(1) (OrderedDict). Expired entries are dropped
+    lazily on access and from the LRU end on insert. When a backing file is
+    configured every insert is appended and flushed, and the file is
+    compacted once it holds more than twice max_entries lines.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 10000,
+                 ttl_secs: float = 7 * 24 * 3600):
+        """
+        Initialize idempotency store.
+
+        Args:
+            path: Append-only backing file (None = memory only)
+            max_entries: Maximum tags kept in memory
+            ttl_secs: Tag lifetime in seconds
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_secs = ttl_secs
+        self.logger = logging.getLogger("herald.execution.idempotency")
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_lines = 0
+
+        if path:
+            self._load()
+
+    def get(self, client_tag: str) -> Optional[int]:
+        """
+        Look up the ticket recorded for a client tag.
+
+        Args:
+            client_tag: Client order identifier
+
+        Returns:
+            Ticket, or None if unknown or expired
+        """
+        with self._lock:
+            entry = self._entries.get(client_tag)
+            if entry is None:
+                return None
+            ticket, recorded_at = entry
+            if time.time() - recorded_at > self.ttl_secs:
+                del self._entries[client_tag]
+                return None
+            self._entries.move_to_end(client_tag)
+            return ticket
+
+    def put(self, client_tag: str, ticket: int, recorded_at: Optional[float] = None):
+        """
+        Record a submitted order.
+
+        Args:
+            client_tag: Client order identifier
+            ticket: Broker order/position ticket
+            recorded_at: Epoch seconds of submission (default: now)
+        """
+        recorded_at = recorded_at if recorded_at is not None else time.time()
+        with self._lock:
+            self._insert(client_tag, ticket, recorded_at)
+            self._append(client_tag, ticket, recorded_at)
+
+    def __contains__(self, client_tag: str) -> bool:
+        return self.get(client_tag) is not None
+
+    def __getitem__(self, client_tag: str) -> int:
+        ticket = self.get(client_tag)
+        if ticket is None:
+            raise KeyError(client_tag)
+        return ticket
+
+    def __setitem__(self, client_tag: str, ticket: int):
+        self.put(client_tag, ticket)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def rebuild_from_deals(self, magic_number: int, lookback_hours: float = 24.0) -> int:
+        """
+        Re-learn client tags from recent entry deals placed by this bot.
+
+        ExecutionEngine sends the client tag as the order comment, so entry
+        deals with our magic number map comment -> position ticket.
+
+        Args:
+            magic_number: Bot magic number
+            lookback_hours: How far back to scan deal history
+
+        Returns:
+            Number of tags added
+        """
+        now = datetime.now()
+        try:
+            deals = mt5.history_deals_get(now - timedelta(hours=lookback_hours), now) or []
+        except Exception as e:
+            self.logger.error(f"Failed to read deal history: {e}")
+            return 0
+
+        added = 0
+        for deal in deals:
+            if deal.magic != magic_number or deal.entry != mt5.DEAL_ENTRY_IN:
+                continue
+            client_tag = (deal.comment or "").strip()
+            if not client_tag or client_tag in self:
+                continue
+            ticket = getattr(deal, 'position_id', None) or deal.order
+            self.put(client_tag, ticket, recorded_at=float(deal.time))
+            added += 1
+
+        if added:
+            self.logger.info(f"Rebuilt {added} idempotency tag(s) from deal history")
+        return added
+
+    def close(self):
+        """Close the backing file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _insert(self, client_tag: str, ticket: int, recorded_at: float):
+        """Insert into the LRU and evict expired / overflow entries (lock held)."""
+        self._entries[client_tag] = (ticket, recorded_at)
+        self._entries.move_to_end(client_tag)
+
+        cutoff = time.time() - self.ttl_secs
+        while self._entries:
+            oldest_tag, (_, oldest_at) = next(iter(self._entries.items()))
+            if len(self._entries) > self.max_entries or oldest_at < cutoff:
+                del self._entries[oldest_tag]
+            else:
+                break
+
+    def _append(self, client_tag: str, ticket: int, recorded_at: float):
+        """Append one record to the backing file (lock held)."""
+        if self._file is None:
+            return
+        try:
+            self._file.write(json.dumps({'tag': client_tag, 'ticket': ticket, 'ts': recorded_at}) + "\n")
+            self._file.flush()
+            self._file_lines += 1
+            if self._file_lines > 2 * self.max_entries:
+                self._compact()
+        except OSError as e:
+            self.logger.error(f"Failed to persist idempotency tag {client_tag}: {e}")
+
+    def _load(self):
+        """Load live entries from the backing file and open it for appending."""
+        cutoff = time.time() - self.ttl_secs
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn final line after a crash
+                        continue
+                    if record['ts'] >= cutoff:
+                        self._insert(record['tag'], record['ticket'], record['ts'])
+            self.logger.info(f"Loaded {len(self._entries)} idempotency tag(s) from {self.path}")
+        self._compact()
+
+    def _compact(self):
+        """Rewrite the backing file with only the live entries (lock held)."""
+        if self._file is not None:
+            self._file.close()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for client_tag, (ticket, recorded_at) in self._entries.items():
+                f.write(json.dumps({'tag': client_tag, 'ticket': ticket, 'ts': recorded_at}) + "\n")
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._file_lines = len(self._entries)
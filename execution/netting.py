@@ -0,0 +1,203 @@
+"""
+Close-By Netting Planner
+
+Plans the cheapest way to exit a set of positions on a hedging account.
+Opposite BUY/SELL volumes on the same symbol are netted against each other
+with TRADE_ACTION_CLOSE_BY (no spread paid, one request per pair) and only
+the net residual is closed with market orders.
+"""
+
+from typing import List, Dict, Iterable
+from dataclasses import dataclass, field
+
+# Volumes are netted in integer units to avoid float drift (1e-8 lot precision)
+_VOLUME_SCALE = 100_000_000
+
+
+@dataclass
+class NettingLeg:
+    """
+    Position leg considered for netting.
+
+    Attributes:
+        ticket: Position ticket
+        symbol: Trading symbol
+        side: BUY or SELL
+        volume: Position volume in lots
+    """
+    ticket: int
+    symbol: str
+    side: str
+    volume: float
+
+
+@dataclass
+class CloseByPair:
+    """
+    Close-by operation netting two opposite positions.
+
+    Attributes:
+        symbol: Trading symbol
+        ticket: BUY position ticket
+        ticket_by: SELL position ticket
+        volume: Volume netted (the smaller of the two remaining volumes)
+    """
+    symbol: str
+    ticket: int
+    ticket_by: int
+    volume: float
+
+
+@dataclass
+class MarketClose:
+    """
+    Residual market close after netting.
+
+    Attributes:
+        symbol: Trading symbol
+        ticket: Position ticket
+        side: Position side (BUY or SELL)
+        volume: Remaining volume to close at market
+    """
+    symbol: str
+    ticket: int
+    side: str
+    volume: float
+
+
+@dataclass
+class NettingPlan:
+    """
+    Ordered exit plan.
+
+    Close-by pairs for a symbol must be executed in order (a leg can be
+    reduced by an earlier pair and netted again later); market closes for
+    a symbol run after its close-by pairs.
+
+    Attributes:
+        close_by: Close-by operations in execution order
+        market: Residual market closes
+    """
+    close_by: List[CloseByPair] = field(default_factory=list)
+    market: List[MarketClose] = field(default_factory=list)
+
+    @property
+    def round_trips(self) -> int:
+        """Number of broker requests needed to execute the plan."""
+        return len(self.close_by) + len(self.market)
+
+    @property
+    def netted_volume(self) -> float:
+        """Total volume closed without paying the spread."""
+        return sum(p.volume for p in self.close_by)
+
+    @property
+    def market_volume(self) -> float:
+        """Total volume closed at market (pays the spread)."""
+        return sum(m.volume for m in self.market)
+
+    def symbols(self) -> List[str]:
+        """Symbols touched by the plan, in first-seen order."""
+        seen: Dict[str, None] = {}
+        for op in list(self.close_by) + list(self.market):
+            seen.setdefault(op.symbol, None)
+        return list(seen)
+
+
+class NettingPlanner:
+    """
+    Pairs opposite BUY and SELL volumes per symbol.
+
+    Market volume after netting always equals the net exposure per symbol,
+    which is the minimum spread cost. Round trips are minimized by first
+    pairing legs of identical volume (one request closes both tickets), then
+    netting the rest largest-first, which fully closes at least one leg per
+    request.
+    """
+
+    def plan(self, legs: Iterable[NettingLeg], allow_close_by: bool = True) -> NettingPlan:
+        """
+        Build an exit plan for the given legs.
+
+        Args:
+            legs: Positions to exit
+            allow_close_by: If False, every leg is closed at market
+
+        Returns:
+            NettingPlan with close-by pairs and residual market closes
+        """
+        plan = NettingPlan()
+        by_symbol: Dict[str, List[NettingLeg]] = {}
+        for leg in legs:
+            by_symbol.setdefault(leg.symbol, []).append(leg)
+
+        for symbol, symbol_legs in by_symbol.items():
+            if allow_close_by:
+                self._plan_symbol(symbol, symbol_legs, plan)
+            else:
+                plan.market.extend(
+                    MarketClose(symbol=symbol, ticket=leg.ticket, side=leg.side, volume=leg.volume)
+                    for leg in symbol_legs
+                )
+
+        return plan
+
+    def _plan_symbol(self, symbol: str, legs: List[NettingLeg], plan: NettingPlan):
+        """Net the legs of one symbol into the plan."""
+        buys = [[leg, _to_units(leg.volume)] for leg in legs if leg.side == "BUY"]
+        sells = [[leg, _to_units(leg.volume)] for leg in legs if leg.side == "SELL"]
+
+        # 1. Identical volumes: a single close-by fully closes both tickets
+        sells_by_units: Dict[int, List[list]] = {}
+        for entry in sells:
+            sells_by_units.setdefault(entry[1], []).append(entry)
+        for buy in buys:
+            candidates = sells_by_units.get(buy[1])
+            if candidates:
+                sell = candidates.pop(0)
+                plan.close_by.append(CloseByPair(
+                    symbol=symbol,
+                    ticket=buy[0].ticket,
+                    ticket_by=sell[0].ticket,
+                    volume=_to_volume(buy[1])
+                ))
+                buy[1] = 0
+                sell[1] = 0
+
+        # 2. Largest-first netting of the remaining volumes
+        buys = sorted((e for e in buys if e[1] > 0), key=lambda e: e[1], reverse=True)
+        sells = sorted((e for e in sells if e[1] > 0), key=lambda e: e[1], reverse=True)
+        i = j = 0
+        while i < len(buys) and j < len(sells):
+            buy, sell = buys[i], sells[j]
+            netted = min(buy[1], sell[1])
+            plan.close_by.append(CloseByPair(
+                symbol=symbol,
+                ticket=buy[0].ticket,
+                ticket_by=sell[0].ticket,
+                volume=_to_volume(netted)
+            ))
+            buy[1] -= netted
+            sell[1] -= netted
+            if buy[1] == 0:
+                i += 1
+            if sell[1] == 0:
+                j += 1
+
+        # 3. Residual exposure closes at market
+        for leg, units in buys[i:] + sells[j:]:
+            if units > 0:
+                plan.market.append(MarketClose(
+                    symbol=symbol,
+                    ticket=leg.ticket,
+                    side=leg.side,
+                    volume=_to_volume(units)
+                ))
+
+
+def _to_units(volume: float) -> int:
+    return int(round(volume * _VOLUME_SCALE))
+
+
+def _to_volume(units: int) -> float:
+    return round(units / _VOLUME_SCALE, 8)
@@ -0,0 +1,224 @@
+"""
+Order Pipeline
+
+Asynchronous order submission for the trading loop. Orders are queued and
+sent by worker threads that own the blocking order_send round trip, so signal
+processing never waits on broker latency. Results are delivered through
+futures, optional callbacks, and a completion queue drained on the trading
+thread.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from herald.execution.engine import (
+    ExecutionEngine, OrderRequest, ExecutionResult, OrderStatus, OrderTimeline
+)
+
+
+@dataclass
+class CompletedOrder:
+    """
+    Finished pipeline order, handed back to the trading thread.
+
+    Attributes:
+        order_req: Submitted order request
+        result: Execution result (metadata['timeline'] holds the OrderTimeline)
+        context: Caller data attached at submit time (e.g. the originating signal)
+    """
+    order_req: OrderRequest
+    result: ExecutionResult
+    context: Any = None
+
+
+class OrderPipeline:
+    """
+    Queue-backed order submission with in-flight tracking.
+
+    At most max_in_flight orders are at the broker at once (one per worker
+    thread); further orders wait in a bounded queue. Orders with the same
+    client tag that are already queued or in flight share a single future
+    instead of being sent twice.
+    """
+
+    def __init__(self, execution_engine: ExecutionEngine, max_in_flight: int = 1, max_queue: int = 64):
+        """
+        Initialize order pipeline.
+
+        Args:
+            execution_engine: ExecutionEngine used to send orders
+            max_in_flight: Maximum concurrent orders at the broker
+            max_queue: Maximum queued orders before submissions are rejected
+        """
+        self.execution_engine = execution_engine
+        self.max_in_flight = max(1, max_in_flight)
+        self.logger = logging.getLogger("herald.execution.pipeline")
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._workers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[Future, str]] = {}
+        self._in_flight = 0
+        self._completed: deque = deque()
+        self._running = False
+
+    def start(self):
+        """Start worker threads."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._workers = [
+                threading.Thread(target=self._worker, name=f"herald-order-{i}", daemon=True)
+                for i in range(self.max_in_flight)
+            ]
+        for worker in self._workers:
+            worker.start()
+        self.logger.info(f"Order pipeline started ({self.max_in_flight} in flight max)")
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop accepting orders, let queued orders finish, and join workers.
+
+        Args:
+            timeout: Maximum seconds to wait per worker
+        """
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+        self.logger.info("Order pipeline stopped")
+
+    def submit(self, order_req: OrderRequest, context: Any = None,
+               callback: Optional[Callable[[ExecutionResult], None]] = None) -> Future:
+        """
+        Queue an order for submission.
+
+        Args:
+            order_req: Order request
+            context: Caller data returned with the CompletedOrder
+            callback: Called with the result on the worker thread
+
+        Returns:
+            Future resolving to the ExecutionResult
+        """
+        client_tag = self.execution_engine.ensure_client_tag(order_req)
+
+        with self._lock:
+            existing = self._pending.get(client_tag)
+            if existing is not None:
+                self.logger.warning(f"Order {client_tag} already in pipeline, not resubmitting")
+                return existing[0]
+
+            future: Future = Future()
+            if not self._running:
+                future.set_result(self._rejected("Order pipeline not running"))
+                return future
+
+            timeline = OrderTimeline(enqueued_at=time.time())
+            try:
+                self._queue.put_nowait((order_req, timeline, context, callback, future))
+            except queue.Full:
+                self.logger.error(f"Order queue full, rejecting {order_req.side} {order_req.symbol}")
+                future.set_result(self._rejected("Order queue full"))
+                return future
+            self._pending[client_tag] = (future, order_req.symbol)
+
+        return future
+
+    def drain_completed(self) -> List[CompletedOrder]:
+        """
+        Pop every order completed since the last call.
+
+        Returns:
+            Completed orders in completion order
+        """
+        completed = []
+        while True:
+            try:
+                completed.append(self._completed.popleft())
+            except IndexError:
+                return completed
+
+    def pending_count(self, symbol: Optional[str] = None) -> int:
+        """
+        Count orders queued or in flight, e.g. to include them in position limits.
+
+        Args:
+            symbol: Optional symbol filter
+
+        Returns:
+            Number of unresolved orders
+        """
+        with self._lock:
+            return sum(1 for _, s in self._pending.values() if symbol is None or s == symbol)
+
+    @property
+    def in_flight(self) -> int:
+        """Orders currently at the broker."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Orders waiting for a worker."""
+        return self._queue.qsize()
+
+    def _worker(self):
+        """Worker loop: send queued orders until a stop sentinel arrives."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            order_req, timeline, context, callback, future = item
+
+            with self._lock:
+                self._in_flight += 1
+            try:
+                result = self.execution_engine.place_order(order_req, timeline=timeline)
+            except Exception as e:
+                self.logger.error(f"Order pipeline error: {e}", exc_info=True)
+                result = self._rejected(str(e))
+                result.metadata['timeline'] = timeline
+
+            with self._lock:
+                # Publish before clearing pending so the order is always visible to one of them
+                self._completed.append(CompletedOrder(order_req=order_req, result=result, context=context))
+                self._in_flight -= 1
+                self._pending.pop(order_req.client_tag, None)
+            future.set_result(result)
+
+            if callback is not None:
+                try:
+                    callback(result)
+                except Exception as e:
+                    self.logger.error(f"Order callback error: {e}", exc_info=True)
+
+            if timeline.total_ms is not None:
+                self.logger.debug(
+                    f"Order {order_req.client_tag} {result.status.name}: "
+                    f"queue {timeline.queue_ms or 0.0:.1f}ms | broker {timeline.broker_ms or 0.0:.1f}ms | "
+                    f"total {timeline.total_ms:.1f}ms"
+                )
+
+    @staticmethod
+    def _rejected(error: str) -> ExecutionResult:
+        return ExecutionResult(
+            order_id=None,
+            status=OrderStatus.REJECTED,
+            executed_price=None,
+            executed_volume=None,
+            timestamp=datetime.now(),
+            error=error
+        )
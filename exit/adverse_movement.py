@@ -82,10 +82,10 @@ class AdverseMovementExit(ExitStrategy):
         ticket = position.ticket
         current_price = current_data.get('current_price')
         if current_price is None:
-            self.logger.warning(f"No current_price for {ticket}")
+            self.logger.warning("No current_price for %s", ticket)
             return None
             
-        current_time = datetime.now()
+        current_time = self.current_time(current_data)
         
         # Check cooldown
         if ticket in self._last_exit:
@@ -113,8 +113,9 @@ class AdverseMovementExit(ExitStrategy):
                 price_pct = (atr / position.open_price) * 100
                 if price_pct > self.volatility_threshold_atr:
                     self.logger.debug(
-                        f"{ticket}: Ignoring adverse check during high volatility "
-                        f"(ATR {price_pct:.2f}% > {self.volatility_threshold_atr}%)"
+                        "%s: Ignoring adverse check during high volatility "
+                        "(ATR %.2f%% > %s%%)",
+                        ticket, price_pct, self.volatility_threshold_atr
                     )
                     return None
                     
@@ -169,8 +170,9 @@ class AdverseMovementExit(ExitStrategy):
             
             if is_adverse and pips_moved >= threshold:
                 self.logger.warning(
-                    f"Adverse movement detected for {ticket}: {pips_moved:.1f} pips "
-                    f"in {self.time_window_seconds}s (threshold: {threshold} pips)"
+                    "Adverse movement detected for %s: %.1f pips "
+                    "in %ss (threshold: %s pips)",
+                    ticket, pips_moved, self.time_window_seconds, threshold
                 )
                 self._last_exit[ticket] = current_time
                 return self._create_exit_signal(
@@ -188,8 +190,9 @@ class AdverseMovementExit(ExitStrategy):
             
             if is_adverse and pct_moved >= threshold:
                 self.logger.warning(
-                    f"Adverse movement detected for {ticket}: {pct_moved:.2f}% "
-                    f"in {self.time_window_seconds}s (threshold: {threshold}%)"
+                    "Adverse movement detected for %s: %.2f%% "
+                    "in %ss (threshold: %s%%)",
+                    ticket, pct_moved, self.time_window_seconds, threshold
                 )
                 self._last_exit[ticket] = current_time
                 return self._create_exit_signal(
@@ -238,6 +241,27 @@ class AdverseMovementExit(ExitStrategy):
             }
         )
         
+    def export_state(self) -> Dict[int, Any]:
+        """Get price history and cooldowns per position (epoch seconds)."""
+        states = {}
+        for ticket in set(self._price_history) | set(self._last_exit):
+            last_exit = self._last_exit.get(ticket)
+            states[ticket] = {
+                'history': [[t.timestamp(), price] for t, price in self._price_history.get(ticket, ())],
+                'last_exit': last_exit.timestamp() if last_exit else None
+            }
+        return states
+        
+    def restore_state(self, states: Dict[int, Any]):
+        """Restore price history and cooldowns."""
+        for ticket, state in states.items():
+            ticket = int(ticket)
+            self._price_history[ticket] = deque(
+                ((datetime.fromtimestamp(t), price) for t, price in state['history']), maxlen=100
+            )
+            if state['last_exit']:
+                self._last_exit[ticket] = datetime.fromtimestamp(state['last_exit'])
+                
     def reset(self):
         """Reset adverse movement tracking state."""
         super().reset()
@@ -250,4 +274,4 @@ class AdverseMovementExit(ExitStrategy):
             del self._price_history[ticket]
         if ticket in self._last_exit:
             del self._last_exit[ticket]
-        self.logger.debug(f"Removed adverse movement tracking for {ticket}")
+        self.logger.debug("Removed adverse movement tracking for %s", ticket)
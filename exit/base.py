@@ -4,12 +4,12 @@ Base Exit Strategy Module
 Abstract base class for all exit strategies.
 """
 
-import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from herald.observability.logger import HeraldLogger
 from herald.position.manager import PositionInfo
 
 
@@ -62,7 +62,7 @@ class ExitStrategy(ABC):
         self.name = name
         self.params = params
         self.priority = priority
-        self.logger = logging.getLogger(f"herald.exit.{name}")
+        self.logger = HeraldLogger(f"herald.exit.{name}")
         self._state: Dict[str, Any] = {}
         self._enabled = True
         
@@ -82,12 +82,21 @@ class ExitStrategy(ABC):
                 - 'current_data': Latest OHLCV bar (pd.Series)
                 - 'account_info': Account information dict
                 - 'indicators': Optional indicator values
+                - 'timestamp': Optional time of the data (e.g. a backtest
+                  bar); defaults to now
                 
         Returns:
             ExitSignal if exit conditions met, None otherwise
         """
         pass
         
+    @staticmethod
+    def current_time(current_data: Optional[Dict[str, Any]]) -> datetime:
+        """Time the market data refers to ('timestamp' if given, else now)."""
+        if current_data and current_data.get('timestamp') is not None:
+            return current_data['timestamp']
+        return datetime.now()
+        
     def configure(self, params: Dict[str, Any]):
         """
         Update strategy parameters.
@@ -96,17 +105,17 @@ class ExitStrategy(ABC):
             params: Parameter dictionary
         """
         self.params.update(params)
-        self.logger.info(f"Exit strategy {self.name} reconfigured: {params}")
+        self.logger.info("Exit strategy %s reconfigured: %s", self.name, params)
         
     def enable(self):
         """Enable this exit strategy."""
         self._enabled = True
-        self.logger.info(f"Exit strategy {self.name} enabled")
+        self.logger.info("Exit strategy %s enabled", self.name)
         
     def disable(self):
         """Disable this exit strategy."""
         self._enabled = False
-        self.logger.info(f"Exit strategy {self.name} disabled")
+        self.logger.info("Exit strategy %s disabled", self.name)
         
     def is_enabled(self) -> bool:
         """Check if strategy is enabled."""
@@ -115,7 +124,7 @@ class ExitStrategy(ABC):
     def reset(self):
         """Reset strategy internal state."""
         self._state.clear()
-        self.logger.debug(f"{self.name} state reset")
+        self.logger.debug("%s state reset", self.name)
         
     def state(self) -> Dict[str, Any]:
         """
@@ -132,6 +141,24 @@ class ExitStrategy(ABC):
             'state': self._state.copy()
         }
         
+    def export_state(self) -> Dict[int, Any]:
+        """
+        Get per-position state for the trading journal.
+        
+        Returns:
+            Dictionary of ticket -> JSON-serializable state
+        """
+        return {}
+        
+    def restore_state(self, states: Dict[int, Any]):
+        """
+        Restore per-position state recovered from the trading journal.
+        
+        Args:
+            states: Dictionary of ticket -> state as produced by export_state()
+        """
+        pass
+        
     def get_metadata(self) -> Dict[str, Any]:
         """
         Get strategy metadata for exit signal enrichment.
@@ -56,7 +56,7 @@ class ProfitTargetExit(ExitStrategy):
         # Example: [(1.0, 0.5), (2.0, 0.5)] = 50% at +1%, remaining 50% at +2%
         self.target_levels = params.get('target_levels', None)
         if self.target_levels and self.partial_close_enabled:
-            self.logger.info(f"Partial close enabled with levels: {self.target_levels}")
+            self.logger.info("Partial close enabled with levels: %s", self.target_levels)
             
         # Track which targets hit per position
         self._targets_hit: Dict[int, List[int]] = {}
@@ -82,7 +82,7 @@ class ProfitTargetExit(ExitStrategy):
         ticket = position.ticket
         current_price = current_data.get('current_price')
         if current_price is None:
-            self.logger.warning(f"No current_price for {ticket}")
+            self.logger.warning("No current_price for %s", ticket)
             return None
             
         # Calculate current profit
@@ -108,7 +108,7 @@ class ProfitTargetExit(ExitStrategy):
                 atr_pct = (atr / position.open_price) * 100
                 scaling_factor = max(0.5, min(2.0, atr_pct / 1.0))  # Clamp 0.5x to 2.0x
                 target_metric = target_metric * scaling_factor
-                self.logger.debug(f"{ticket}: ATR-scaled target to {target_metric:.2f}{metric_name}")
+                self.logger.debug("%s: ATR-scaled target to %.2f%s", ticket, target_metric, metric_name)
                 
         # Check for partial close targets
         if self.partial_close_enabled and self.target_levels:
@@ -122,8 +122,9 @@ class ProfitTargetExit(ExitStrategy):
         # Single target check
         if profit_metric >= target_metric:
             self.logger.info(
-                f"Profit target hit for {ticket}: {profit_metric:.2f}{metric_name} >= "
-                f"{target_metric:.2f}{metric_name}"
+                "Profit target hit for %s: %.2f%s >= "
+                "%.2f%s",
+                ticket, profit_metric, metric_name, target_metric, metric_name
             )
             return ExitSignal(
                 ticket=position.ticket,
@@ -182,8 +183,10 @@ class ProfitTargetExit(ExitStrategy):
                 self._targets_hit[ticket].append(i)
                 
                 self.logger.info(
-                    f"Partial target {i+1} hit for {ticket}: {profit_metric:.2f}{metric_name} >= "
-                    f"{target_level:.2f}{metric_name}, closing {close_pct}% ({partial_volume:.2f} lots)"
+                    "Partial target %s hit for %s: %.2f%s >= "
+                    "%.2f%s, closing %s%% (%.2f lots)",
+                    i + 1, ticket, profit_metric, metric_name,
+                    target_level, metric_name, close_pct, partial_volume
                 )
                 
                 # Check if this is the last target (close everything)
@@ -211,6 +214,15 @@ class ProfitTargetExit(ExitStrategy):
                 
         return None
         
+    def export_state(self) -> Dict[int, Any]:
+        """Get partial target levels already hit per position."""
+        return {ticket: sorted(hit) for ticket, hit in self._targets_hit.items()}
+        
+    def restore_state(self, states: Dict[int, Any]):
+        """Restore partial target hits so a level is never closed twice."""
+        for ticket, hit in states.items():
+            self._targets_hit[int(ticket)] = list(hit)
+            
     def reset(self):
         """Reset target tracking state."""
         super().reset()
@@ -220,7 +232,7 @@ class ProfitTargetExit(ExitStrategy):
         """Remove position from tracking when closed externally."""
         if ticket in self._targets_hit:
             del self._targets_hit[ticket]
-            self.logger.debug(f"Removed profit target tracking for {ticket}")
+            self.logger.debug("Removed profit target tracking for %s", ticket)
             
     def get_distance_to_target(self, position: PositionInfo) -> Optional[float]:
         """
@@ -70,7 +70,7 @@ class TimeBasedExit(ExitStrategy):
             hour, minute = map(int, time_str.split(':'))
             return dt_time(hour=hour, minute=minute)
         except Exception as e:
-            self.logger.error(f"Failed to parse time {time_str}: {e}")
+            self.logger.error("Failed to parse time %s: %s", time_str, e)
             return dt_time(hour=16, minute=0)
             
     def should_exit(
@@ -91,7 +91,7 @@ class TimeBasedExit(ExitStrategy):
         if not self._enabled:
             return None
             
-        current_time = datetime.now()
+        current_time = self.current_time(current_data)
         
         # Check max hold time
         exit_signal = self._check_max_hold_time(position, current_time)
@@ -118,12 +118,13 @@ class TimeBasedExit(ExitStrategy):
         current_time: datetime
     ) -> Optional[ExitSignal]:
         """Check if position exceeded maximum hold time."""
-        age_hours = position.get_age_hours()
+        age_hours = position.get_age_hours(current_time)
         
         if age_hours >= self.max_hold_hours:
             self.logger.info(
-                f"Position {position.ticket} exceeded max hold time: "
-                f"{age_hours:.1f}h >= {self.max_hold_hours}h"
+                "Position %s exceeded max hold time: "
+                "%.1fh >= %sh",
+                position.ticket, age_hours, self.max_hold_hours
             )
             return ExitSignal(
                 ticket=position.ticket,
@@ -151,8 +152,9 @@ class TimeBasedExit(ExitStrategy):
             # Check if past Friday close time
             if current_time.time() >= self._friday_time:
                 self.logger.info(
-                    f"Position {position.ticket} closing for weekend protection "
-                    f"at {current_time.time()}"
+                    "Position %s closing for weekend protection "
+                    "at %s",
+                    position.ticket, current_time.time()
                 )
                 return ExitSignal(
                     ticket=position.ticket,
@@ -176,8 +178,9 @@ class TimeBasedExit(ExitStrategy):
         """Check if should close for end of day (day trading mode)."""
         if current_time.time() >= self._eod_time:
             self.logger.info(
-                f"Position {position.ticket} closing for EOD "
-                f"at {current_time.time()}"
+                "Position %s closing for EOD "
+                "at %s",
+                position.ticket, current_time.time()
             )
             return ExitSignal(
                 ticket=position.ticket,
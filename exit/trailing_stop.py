@@ -5,12 +5,13 @@ Dynamic trailing stop implementation with ATR adjustment.
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from datetime import datetime
 import pandas as pd
 
 from .base import ExitStrategy, ExitSignal
 from herald.position.manager import PositionInfo
+from herald.execution.engine import SLTPModification, OrderStatus
 
 
 class TrailingStop(ExitStrategy):
@@ -22,13 +23,17 @@ class TrailingStop(ExitStrategy):
     - Activation after minimum profit threshold
     - Never moves stop against profit direction
     - Adapts to volatility changes
+    - Optional server-side mode: the trailing level is pushed to MT5 as the
+      position SL so the broker enforces it at tick speed and it survives restarts
     
     Configuration parameters:
         atr_multiplier: Multiplier for ATR distance (default: 2.0)
         activation_profit_pct: Minimum profit % to activate trailing (default: 0.5)
         activation_profit_pips: Minimum profit pips to activate (alternative to pct)
         min_stop_distance_pips: Minimum stop distance in pips (default: 10)
-        update_frequency_secs: Update frequency in seconds (default: 60)
+        update_frequency_secs: Minimum seconds between broker SL updates per position (default: 60)
+        server_side: Push trailing level to MT5 via TRADE_ACTION_SLTP (default: False)
+        min_step_pips: Minimum SL improvement in pips before pushing an update (default: 1.0)
     """
     
     def __init__(self, params: Dict[str, Any]):
@@ -50,10 +55,15 @@ class TrailingStop(ExitStrategy):
         self.activation_profit_pips = params.get('activation_profit_pips', None)
         self.min_stop_distance_pips = params.get('min_stop_distance_pips', 10.0)
         self.update_frequency = params.get('update_frequency_secs', 60)
+        self.server_side = params.get('server_side', False)
+        self.min_step_pips = params.get('min_step_pips', 1.0)
         
         # State: track highest favorable price per position
         self._trailing_stops: Dict[int, Dict[str, Any]] = {}
         
+        # Server-side mode: SL modifications waiting to be flushed to the broker
+        self._pending_modifications: Dict[int, SLTPModification] = {}
+        
     def should_exit(
         self,
         position: PositionInfo,
@@ -75,7 +85,7 @@ class TrailingStop(ExitStrategy):
         ticket = position.ticket
         current_price = current_data.get('current_price')
         if current_price is None:
-            self.logger.warning(f"No current_price for {ticket}")
+            self.logger.warning("No current_price for %s", ticket)
             return None
             
         # Get ATR from indicators if available
@@ -102,9 +112,16 @@ class TrailingStop(ExitStrategy):
                 'best_price': current_price,
                 'stop_price': None,
                 'last_update': datetime.now(),
-                'activated': True
+                'activated': True,
+                'broker_stop': None,
+                'last_push': None
             }
-            self.logger.info(f"Trailing stop activated for {ticket} at {current_price}")
+            # A broker SL already on the position (e.g. pushed before a restart)
+            # seeds the trailing level so the stop never loosens
+            if self.server_side and position.stop_loss:
+                self._trailing_stops[ticket]['stop_price'] = position.stop_loss
+                self._trailing_stops[ticket]['broker_stop'] = position.stop_loss
+            self.logger.info("Trailing stop activated for %s at %s", ticket, current_price)
             
         state = self._trailing_stops[ticket]
         
@@ -113,11 +130,11 @@ class TrailingStop(ExitStrategy):
         if is_long:
             if current_price > state['best_price']:
                 state['best_price'] = current_price
-                self.logger.debug(f"{ticket}: New best price {current_price}")
+                self.logger.debug("%s: New best price %s", ticket, current_price)
         else:
             if current_price < state['best_price']:
                 state['best_price'] = current_price
-                self.logger.debug(f"{ticket}: New best price {current_price}")
+                self.logger.debug("%s: New best price %s", ticket, current_price)
                 
         # Calculate trailing stop distance
         if atr is not None:
@@ -141,12 +158,18 @@ class TrailingStop(ExitStrategy):
             else:
                 state['stop_price'] = max(state['stop_price'], new_stop)
                 
+            if self._manage_server_side(position, state, is_long):
+                return None
+                
             # Check if stop hit
             if current_price <= state['stop_price']:
                 self.logger.info(
-                    f"Trailing stop hit for {ticket}: price={current_price}, "
-                    f"stop={state['stop_price']}, best={state['best_price']}"
+                    "Trailing stop hit for %s: price=%s, "
+                    "stop=%s, best=%s",
+                    ticket, current_price, state['stop_price'], state['best_price']
                 )
+                # An SL beyond the price would be rejected by the broker
+                self._pending_modifications.pop(ticket, None)
                 return self._create_exit_signal(
                     position=position,
                     price=current_price,
@@ -161,12 +184,18 @@ class TrailingStop(ExitStrategy):
             else:
                 state['stop_price'] = min(state['stop_price'], new_stop)
                 
+            if self._manage_server_side(position, state, is_long):
+                return None
+                
             # Check if stop hit
             if current_price >= state['stop_price']:
                 self.logger.info(
-                    f"Trailing stop hit for {ticket}: price={current_price}, "
-                    f"stop={state['stop_price']}, best={state['best_price']}"
+                    "Trailing stop hit for %s: price=%s, "
+                    "stop=%s, best=%s",
+                    ticket, current_price, state['stop_price'], state['best_price']
                 )
+                # An SL beyond the price would be rejected by the broker
+                self._pending_modifications.pop(ticket, None)
                 return self._create_exit_signal(
                     position=position,
                     price=current_price,
@@ -178,6 +207,98 @@ class TrailingStop(ExitStrategy):
         state['last_update'] = datetime.now()
         return None
         
+    def _manage_server_side(self, position: PositionInfo, state: Dict[str, Any], is_long: bool) -> bool:
+        """
+        Queue a broker SL update for the current trailing level when due.
+        
+        Updates are throttled per position by update_frequency_secs and only
+        issued when the stop improves by at least min_step_pips.
+        
+        Args:
+            position: Position information
+            state: Trailing state for the position
+            is_long: True for BUY positions
+            
+        Returns:
+            True if the broker already enforces a stop at least as tight as
+            the trailing level (skip local check)
+        """
+        if not self.server_side:
+            return False
+            
+        now = datetime.now()
+        stop_price = state['stop_price']
+        broker_stop = state['broker_stop']
+        min_step = self.min_step_pips * 0.0001
+        
+        if broker_stop is None:
+            improvement = float('inf')
+        elif is_long:
+            improvement = stop_price - broker_stop
+        else:
+            improvement = broker_stop - stop_price
+            
+        throttled = (
+            state['last_push'] is not None
+            and (now - state['last_push']).total_seconds() < self.update_frequency
+        )
+        
+        if improvement >= min_step and not throttled:
+            self._pending_modifications[position.ticket] = SLTPModification(
+                ticket=position.ticket,
+                symbol=position.symbol,
+                sl=stop_price,
+                tp=position.take_profit or 0.0,
+                metadata={'best_price': state['best_price']}
+            )
+            state['last_push'] = now
+            
+        state['last_update'] = now
+        
+        # Fall back to local monitoring while the broker stop is missing or
+        # lags the trailing level (push throttled or rejected); the tolerance
+        # only absorbs float noise against the broker's rounded SL
+        return improvement <= 1e-9
+        
+    def pending_modifications(self) -> List[SLTPModification]:
+        """Get SL modifications queued for the broker."""
+        return list(self._pending_modifications.values())
+        
+    def flush_modifications(self, execution_engine) -> int:
+        """
+        Send queued SL modifications to MT5 in one batch.
+        
+        Args:
+            execution_engine: ExecutionEngine used to send TRADE_ACTION_SLTP requests
+            
+        Returns:
+            Number of modifications accepted by the broker
+        """
+        if not self._pending_modifications:
+            return 0
+            
+        modifications = list(self._pending_modifications.values())
+        self._pending_modifications.clear()
+        
+        results = execution_engine.modify_positions_sltp(modifications)
+        
+        accepted = 0
+        for result in results:
+            ticket = result.metadata.get('ticket')
+            state = self._trailing_stops.get(ticket)
+            if state is None:
+                continue
+            if result.status == OrderStatus.FILLED:
+                state['broker_stop'] = result.metadata.get('sl', state['stop_price'])
+                accepted += 1
+            else:
+                # Allow an immediate retry on the next evaluation
+                state['last_push'] = None
+                
+        if accepted:
+            self.logger.debug("Pushed %s/%s trailing stops to broker", accepted, len(results))
+        return accepted
+        
     def _create_exit_signal(
         self,
         position: PositionInfo,
@@ -203,16 +324,42 @@ class TrailingStop(ExitStrategy):
             }
         )
         
+    def export_state(self) -> Dict[int, Any]:
+        """Get trailing levels per position (last push as epoch seconds)."""
+        return {
+            ticket: {
+                'best_price': state['best_price'],
+                'stop_price': state['stop_price'],
+                'broker_stop': state['broker_stop'],
+                'last_push': state['last_push'].timestamp() if state['last_push'] else None
+            }
+            for ticket, state in self._trailing_stops.items()
+        }
+        
+    def restore_state(self, states: Dict[int, Any]):
+        """Restore trailing levels so a restart never loosens a stop."""
+        for ticket, state in states.items():
+            self._trailing_stops[int(ticket)] = {
+                'best_price': state['best_price'],
+                'stop_price': state['stop_price'],
+                'last_update': datetime.now(),
+                'activated': True,
+                'broker_stop': state['broker_stop'],
+                'last_push': datetime.fromtimestamp(state['last_push']) if state['last_push'] else None
+            }
+            
     def reset(self):
         """Reset trailing stop state."""
         super().reset()
         self._trailing_stops.clear()
+        self._pending_modifications.clear()
         
     def remove_position(self, ticket: int):
         """Remove position from tracking when closed externally."""
+        self._pending_modifications.pop(ticket, None)
         if ticket in self._trailing_stops:
             del self._trailing_stops[ticket]
-            self.logger.debug(f"Removed trailing stop tracking for {ticket}")
+            self.logger.debug("Removed trailing stop tracking for %s", ticket)
 
 
 class TrailingStopExit(TrailingStop):
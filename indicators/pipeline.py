@@ -0,0 +1,82 @@
+"""
+Indicator Pipeline
+
+Adds the columns strategies and exit strategies read from a bar frame:
+the strategy's SMAs, ATR, and any configured Indicator outputs. Shared by
+the trading loop and the backtester so both see identical values.
+"""
+
+from typing import Iterable, Sequence
+
+import pandas as pd
+
+
+def sma_columns(df: pd.DataFrame, windows: Iterable[int]) -> pd.DataFrame:
+    """
+    Add sma_<window> columns (simple moving averages of close).
+
+    Args:
+        df: Bar frame with a close column
+        windows: SMA periods
+
+    Returns:
+        The same frame
+    """
+    for window in windows:
+        df[f'sma_{window}'] = df['close'].rolling(window=window).mean()
+    return df
+
+
+def atr_column(df: pd.DataFrame, period: int = 14, column: str = 'atr') -> pd.DataFrame:
+    """
+    Add the atr column (rolling mean of true range).
+
+    Args:
+        df: Bar frame with high, low, close columns
+        period: ATR period
+        column: Output column name
+
+    Returns:
+        The same frame
+    """
+    high_low = df['high'] - df['low']
+    high_close = (df['high'] - df['close'].shift()).abs()
+    low_close = (df['low'] - df['close'].shift()).abs()
+    true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+    df[column] = true_range.rolling(window=period).mean()
+    return df
+
+
+def compute_indicators(
+    df: pd.DataFrame,
+    indicators: Sequence = (),
+    sma_windows: Iterable[int] = (20, 50),
+    atr_period: int = 14
+) -> pd.DataFrame:
+    """
+    Compute every indicator column over the whole frame in vectorized calls.
+
+    Args:
+        df: Bar frame (DatetimeIndex; open, high, low, close, volume)
+        indicators: Configured Indicator instances
+        sma_windows: SMA periods the strategy reads
+        atr_period: ATR period
+
+    Returns:
+        Frame with indicator columns joined
+    """
+    sma_columns(df, sma_windows)
+    atr_column(df, atr_period)
+    for indicator in indicators:
+        indicator_data = indicator.calculate(df)
+        if indicator_data is not None:
+            df = df.join(indicator_data, how='left')
+    return df
+
+
+def strategy_sma_windows(strategy) -> tuple:
+    """SMA periods a strategy reads (sma_crossover: short and long window)."""
+    return tuple(
+        window for window in (getattr(strategy, 'short_window', 20), getattr(strategy, 'long_window', 50))
+        if window
+    )
@@ -4,14 +4,20 @@ Observability Module
 Structured logging, metrics collection, health checks, and Prometheus export.
 """
 
-from .logger import setup_logger, get_logger
+from .logger import setup_logger, get_logger, shutdown_logging, JsonFormatter
 from .metrics import MetricsCollector, PerformanceMetrics
 from .health import HealthChecker, HealthStatus, HealthCheckResult
-from .prometheus import PrometheusExporter, PrometheusMetric
+from .prometheus import PrometheusExporter, PrometheusMetric, MetricsRegistry
+from .execution_metrics import ExecutionMetrics
+from .http_server import ObservabilityServer
+from .profiler import LoopProfiler
+from .sampler import StackSampler
 
 __all__ = [
     "setup_logger",
     "get_logger",
+    "shutdown_logging",
+    "JsonFormatter",
     "MetricsCollector",
     "PerformanceMetrics",
     "HealthChecker",
@@ -19,4 +25,9 @@ __all__ = [
     "HealthCheckResult",
     "PrometheusExporter",
     "PrometheusMetric",
+    "MetricsRegistry",
+    "ExecutionMetrics",
+    "ObservabilityServer",
+    "LoopProfiler",
+    "StackSampler",
 ]
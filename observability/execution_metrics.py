@@ -0,0 +1,154 @@
+"""
+Execution Metrics
+
+Hot-path instrumentation for order sends: broker round-trip latency,
+requested-vs-filled slippage in points, and requote / reject counts per
+symbol. Writers never take a lock: each thread updates its own shard and
+readers merge the shards when metrics are exported.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from herald.connector.mt5_connector import mt5
+from herald.observability.prometheus import MetricsRegistry
+
+# MT5 trade server return codes
+RETCODE_DONE = 10009
+RETCODE_PLACED = 10008
+RETCODE_DONE_PARTIAL = 10010
+REQUOTE_RETCODES = frozenset({10004, 10020, 10021})  # REQUOTE, PRICE_CHANGED, PRICE_OFF
+SUCCESS_RETCODES = frozenset({RETCODE_DONE, RETCODE_PLACED, RETCODE_DONE_PARTIAL})
+
+# Default bucket upper bounds
+LATENCY_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SLIPPAGE_BUCKETS_POINTS = (-50.0, -20.0, -10.0, -5.0, -2.0, 0.0, 2.0, 5.0, 10.0, 20.0, 50.0)
+
+
+class ExecutionMetrics:
+    """
+    Order send instrumentation shared by ExecutionEngine and PositionManager.
+
+    Series (labelled by symbol):
+    - order_send_latency_seconds{symbol,action} histogram
+    - order_slippage_points{symbol,side} histogram (positive = adverse)
+    - order_requotes_total{symbol} counter
+    - order_rejects_total{symbol,retcode} counter
+    """
+
+    def __init__(self,
+                 registry: Optional[MetricsRegistry] = None,
+                 prefix: str = "herald",
+                 latency_buckets: Tuple[float, ...] = LATENCY_BUCKETS_SECONDS,
+                 slippage_buckets: Tuple[float, ...] = SLIPPAGE_BUCKETS_POINTS):
+        """
+        Initialize execution metrics.
+
+        Args:
+            registry: Registry to register the series in (a private one is created if omitted)
+            prefix: Metric name prefix
+            latency_buckets: Send latency bucket bounds in seconds
+            slippage_buckets: Slippage bucket bounds in points
+        """
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.latency = self.registry.histogram(
+            f"{prefix}_order_send_latency_seconds", "order_send round-trip latency", latency_buckets
+        )
+        self.slippage = self.registry.histogram(
+            f"{prefix}_order_slippage_points",
+            "Fill price minus requested price in points (positive = adverse)",
+            slippage_buckets
+        )
+        self.requotes = self.registry.counter(
+            f"{prefix}_order_requotes_total", "Requotes / price changes returned by the broker"
+        )
+        self.rejects = self.registry.counter(
+            f"{prefix}_order_rejects_total", "Order sends not completed by the broker"
+        )
+        self._points: Dict[str, float] = {}
+
+    def record_send(
+        self,
+        symbol: str,
+        action: str,
+        side: str,
+        latency_secs: float,
+        retcode: Optional[int],
+        requested_price: Optional[float] = None,
+        fill_price: Optional[float] = None
+    ):
+        """
+        Record one order_send round trip.
+
+        Args:
+            symbol: Trading symbol
+            action: Request kind (open, close, close_by, sltp)
+            side: Deal side (BUY or SELL)
+            latency_secs: order_send duration
+            retcode: Broker return code (None if order_send returned None)
+            requested_price: Price sent in the request
+            fill_price: Price reported in the result
+        """
+        self.latency.labels(symbol=symbol, action=action).observe(latency_secs)
+
+        if retcode in REQUOTE_RETCODES:
+            self.requotes.labels(symbol=symbol).inc()
+        if retcode not in SUCCESS_RETCODES:
+            self.rejects.labels(symbol=symbol, retcode=retcode).inc()
+            return
+
+        if requested_price and fill_price:
+            point = self.point_for(symbol)
+            if point:
+                diff = fill_price - requested_price if side == "BUY" else requested_price - fill_price
+                self.slippage.labels(symbol=symbol, side=side).observe(diff / point)
+
+    def record_request(self, symbol: str, action: str, request: Dict, latency_secs: float, result):
+        """
+        Record an order_send call from its MT5 request dict and result.
+
+        Args:
+            symbol: Trading symbol
+            action: Request kind (open, close, close_by, sltp)
+            request: Request passed to order_send
+            latency_secs: order_send duration
+            result: order_send return value (may be None)
+        """
+        self.record_send(
+            symbol=symbol,
+            action=action,
+            side="BUY" if request.get("type") == mt5.ORDER_TYPE_BUY else "SELL",
+            latency_secs=latency_secs,
+            retcode=getattr(result, 'retcode', None) if result is not None else None,
+            requested_price=request.get("price"),
+            fill_price=getattr(result, 'price', None) if result is not None else None
+        )
+
+    def point_for(self, symbol: str) -> Optional[float]:
+        """
+        Symbol point size, cached after the first lookup.
+
+        Args:
+            symbol: Trading symbol
+
+        Returns:
+            Point size or None if unavailable
+        """
+        point = self._points.get(symbol)
+        if point is None:
+            try:
+                info = mt5.symbol_info(symbol)
+                point = float(info.point) if info is not None else None
+            except Exception:
+                point = None
+            if point:
+                self._points[symbol] = point
+        return point
+
+    def render_prometheus(self) -> str:
+        """
+        Render the execution series in Prometheus text exposition format.
+
+        Returns:
+            Exposition text
+        """
+        return self.registry.render()
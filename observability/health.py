@@ -258,6 +258,38 @@ class HealthChecker:
             "service": "herald"
         }
     
+    def readiness_from(self, connected: bool, account_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Readiness computed from state the caller already fetched.
+        
+        Same verdict as readiness() without extra MT5 round trips, for
+        snapshots published by the trading loop.
+        
+        Args:
+            connected: MT5 connection status
+            account_info: Account info dict (connector.get_account_info())
+        """
+        reason = None
+        if not connected:
+            reason = "Not connected to MT5"
+        elif not account_info:
+            reason = "Failed to get account info"
+        else:
+            margin_level = account_info.get("margin_level", 0)
+            if margin_level > 0 and margin_level < 100:
+                reason = f"Low margin level: {margin_level:.1f}%"
+            elif not account_info.get("trade_allowed", False):
+                reason = "Trading not allowed on account"
+                
+        result = {
+            "status": "ready" if reason is None else "not_ready",
+            "timestamp": datetime.now().isoformat(),
+            "service": "herald"
+        }
+        if reason is not None:
+            result["reason"] = reason
+        return result
+    
     def readiness(self) -> Dict[str, Any]:
         """
         Kubernetes readiness probe.
@@ -0,0 +1,140 @@
+"""
+Observability HTTP Server
+
+Embedded, non-blocking endpoint server for Prometheus scrapes and probes:
+- /metrics  Prometheus text exposition
+- /healthz  Liveness (process and trading loop alive)
+- /readyz   Readiness (MT5 connected and account tradeable)
+
+Responses come from snapshots the trading loop publishes; request handlers
+never touch the MT5 terminal, the exporter, or any trading state, so a
+scrape costs the trading thread nothing beyond the periodic publish.
+"""
+
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+
+class _Snapshot:
+    """Immutable response bodies published by the trading loop."""
+
+    __slots__ = ("metrics", "ready", "readiness", "published_at")
+
+    def __init__(self, metrics: bytes, ready: bool, readiness: bytes, published_at: float):
+        self.metrics = metrics
+        self.ready = ready
+        self.readiness = readiness
+        self.published_at = published_at
+
+
+class ObservabilityServer:
+    """
+    Serves cached metrics and health snapshots on a background thread.
+
+    publish() swaps a single reference to a pre-encoded snapshot, so
+    handlers read a consistent view without locks and the trading thread
+    never waits on a client.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9108, stale_after_secs: float = 300.0):
+        """
+        Initialize observability server.
+
+        Args:
+            host: Bind address
+            port: Bind port (0 = pick a free port)
+            stale_after_secs: Snapshot age after which /healthz and /readyz fail
+        """
+        self.host = host
+        self.port = port
+        self.stale_after_secs = stale_after_secs
+        self.logger = logging.getLogger("herald.observability.http")
+
+        self._snapshot = _Snapshot(b"", False, b'{"status": "starting"}', time.time())
+        self._started_at = time.time()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, metrics_text: str, readiness: Dict[str, Any]):
+        """
+        Publish a new snapshot (called from the trading loop).
+
+        Args:
+            metrics_text: Prometheus exposition text
+            readiness: Readiness dict (HealthChecker.readiness() format)
+        """
+        self._snapshot = _Snapshot(
+            metrics=metrics_text.encode("utf-8"),
+            ready=readiness.get("status") == "ready",
+            readiness=json.dumps(readiness, default=str).encode("utf-8"),
+            published_at=time.time()
+        )
+
+    def start(self):
+        """Bind and serve on a daemon thread."""
+        if self._httpd is not None:
+            return
+        handler = self._make_handler()
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            name="herald-observability-http",
+            daemon=True
+        )
+        self._thread.start()
+        self.logger.info(f"Observability endpoints on http://{self.host}:{self.port} (/metrics, /healthz, /readyz)")
+
+    def stop(self):
+        """Stop serving and release the socket."""
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._httpd = None
+        self._thread = None
+        self.logger.info("Observability server stopped")
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                snapshot = server._snapshot
+                age = time.time() - snapshot.published_at
+                fresh = age <= server.stale_after_secs
+                path = self.path.split("?", 1)[0]
+
+                if path == "/metrics":
+                    self._send(200, snapshot.metrics, "text/plain; version=0.0.4; charset=utf-8")
+                elif path == "/healthz":
+                    body = json.dumps({
+                        "status": "healthy" if fresh else "stale",
+                        "service": "herald",
+                        "uptime_seconds": round(time.time() - server._started_at, 1),
+                        "snapshot_age_seconds": round(age, 1)
+                    }).encode("utf-8")
+                    self._send(200 if fresh else 503, body, "application/json")
+                elif path == "/readyz":
+                    ok = snapshot.ready and fresh
+                    self._send(200 if ok else 503, snapshot.readiness, "application/json")
+                else:
+                    self._send(404, b"not found\n", "text/plain")
+
+            def _send(self, code: int, body: bytes, content_type: str):
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes every second would flood the trading log
+                server.logger.debug("%s %s", self.address_string(), format % args)
+
+        return Handler
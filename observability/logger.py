@@ -3,19 +3,153 @@ Logging Module
 
 Structured logging configuration.
 JSON format for production, human-readable for development.
+
+Records are handed to a bounded queue on the calling thread and written by
+a QueueListener thread, so console and file I/O never run on the trading
+loop. When the queue is full the overflow policy decides what is lost:
+- drop_new: discard the incoming record (default)
+- drop_oldest: evict the oldest queued record to make room
+- block: wait for space (restores back-pressure; not for the hot path)
+Records at WARNING and above are never discarded for space under drop_new;
+they evict the oldest queued record instead.
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
-from typing import Optional
+import traceback
+from datetime import datetime
+from typing import Dict, Optional
 from pathlib import Path
 
+OVERFLOW_POLICIES = ("drop_new", "drop_oldest", "block")
+
+# Attributes every LogRecord has; anything else came from `extra=`
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line.
+    
+    Structured fields passed with `extra=` (e.g. symbol, ticket, stage) are
+    emitted as top-level keys; values that are not JSON-native are
+    stringified.
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler over a bounded queue with an overflow policy.
+    
+    Only message interpolation and traceback capture happen on the calling
+    thread; formatting and I/O happen on the listener thread.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, overflow: str = "drop_new"):
+        """
+        Initialize bounded queue handler.
+        
+        Args:
+            log_queue: Bounded queue shared with the QueueListener
+            overflow: One of OVERFLOW_POLICIES
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+        self._reported_dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve args and tracebacks now: they may reference objects that
+        # change (or frames that vanish) before the listener gets to them
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.overflow == "drop_new" and record.levelno < logging.WARNING:
+                self.dropped += 1
+                return
+            self._evict_oldest()
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+                return
+        self._report_dropped()
+    
+    def _evict_oldest(self):
+        try:
+            self.queue.get_nowait()
+            self.dropped += 1
+        except queue.Empty:
+            pass
+    
+    def _report_dropped(self):
+        if self.dropped == self._reported_dropped:
+            return
+        lost = self.dropped - self._reported_dropped
+        notice = logging.LogRecord(
+            "herald.logging", logging.WARNING, __file__, 0,
+            f"Log queue full: dropped {lost} records ({self.dropped} total)", None, None
+        )
+        try:
+            self.queue.put_nowait(notice)
+            self._reported_dropped = self.dropped
+        except queue.Full:
+            # Retried after the next record that finds room
+            pass
+
+
+class _Listener(logging.handlers.QueueListener):
+    """QueueListener whose stop sentinel waits for space in a full queue."""
+    
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
 
 def setup_logger(
     name: str = "herald",
     level: str = "INFO",
     log_file: Optional[str] = None,
-    json_format: bool = False
+    json_format: bool = False,
+    async_logging: bool = True,
+    queue_size: int = 10000,
+    overflow: str = "drop_new",
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5
 ) -> logging.Logger:
     """
     Configure structured logger.
@@ -23,28 +157,27 @@ def setup_logger(
     Args:
         name: Logger name
         level: Log level (DEBUG, INFO, WARNING, ERROR)
-        log_file: Optional file path for logs
+        log_file: Optional file path for logs (rotated at max_bytes)
         json_format: Use JSON format (for production)
-        
+        async_logging: Write through a background listener thread
+        queue_size: Maximum records waiting for the listener
+        overflow: Full-queue policy (drop_new, drop_oldest, block)
+        max_bytes: Log file size that triggers rotation (0 = never rotate)
+        backup_count: Rotated log files to keep
+    
     Returns:
         Configured logger
     """
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper()))
     
-    # Clear existing handlers
+    # Clear existing handlers (and the listener feeding them)
+    shutdown_logging(name)
     logger.handlers.clear()
     
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, level.upper()))
-    
     if json_format:
         # JSON format for production
-        formatter = logging.Formatter(
-            '{"timestamp":"%(asctime)s","level":"%(levelname)s","name":"%(name)s","message":"%(message)s"}',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        formatter = JsonFormatter()
     else:
         # Human-readable format for development
         formatter = logging.Formatter(
@@ -52,29 +185,140 @@ def setup_logger(
             datefmt='%Y-%m-%d %H:%M:%S'
         )
     
+    # Console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(getattr(logging, level.upper()))
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # File handler (optional)
     if log_file:
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
-        file_handler = logging.FileHandler(log_file)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
         file_handler.setLevel(logging.DEBUG)  # Log everything to file
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    if async_logging:
+        log_queue = queue.Queue(maxsize=queue_size)
+        logger.addHandler(BoundedQueueHandler(log_queue, overflow=overflow))
+        listener = _Listener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
     
     return logger
 
 
+def shutdown_logging(name: Optional[str] = None):
+    """
+    Flush queued records and stop background listeners.
+    
+    Args:
+        name: Logger whose listener to stop (None = all)
+    """
+    names = list(_listeners) if name is None else [name]
+    for key in names:
+        listener = _listeners.pop(key, None)
+        if listener is None:
+            continue
+        listener.stop()
+        for handler in listener.handlers:
+            handler.flush()
+            if isinstance(handler, logging.FileHandler):
+                handler.close()
+
+
+atexit.register(shutdown_logging)
+
+
+class HeraldLogger:
+    """
+    Logger facade for hot paths.
+    
+    Messages take %-style arguments, so nothing is formatted unless a
+    record is actually emitted. Level checks go through the stdlib's
+    per-logger isEnabledFor cache (invalidated by setLevel), so a suppressed
+    call costs one dict lookup. Use `debug_enabled` to skip building
+    expensive arguments. Anything else is delegated to the wrapped logger.
+    """
+    
+    __slots__ = ("_logger",)
+    
+    def __init__(self, name: str):
+        """
+        Initialize logger facade.
+        
+        Args:
+            name: Logger name
+        """
+        self._logger = logging.getLogger(name)
+        
+    @property
+    def logger(self) -> logging.Logger:
+        """Wrapped stdlib logger."""
+        return self._logger
+        
+    @property
+    def debug_enabled(self) -> bool:
+        """True if DEBUG records would be emitted."""
+        return self._logger.isEnabledFor(logging.DEBUG)
+        
+    def isEnabledFor(self, level: int) -> bool:
+        return self._logger.isEnabledFor(level)
+        
+    def log(self, level: int, msg: str, *args, **kwargs):
+        if self._logger.isEnabledFor(level):
+            kwargs.setdefault("stacklevel", 2)
+            self._logger._log(level, msg, args, **kwargs)
+            
+    def debug(self, msg: str, *args, **kwargs):
+        if self._logger.isEnabledFor(logging.DEBUG):
+            kwargs.setdefault("stacklevel", 2)
+            self._logger._log(logging.DEBUG, msg, args, **kwargs)
+            
+    def info(self, msg: str, *args, **kwargs):
+        if self._logger.isEnabledFor(logging.INFO):
+            kwargs.setdefault("stacklevel", 2)
+            self._logger._log(logging.INFO, msg, args, **kwargs)
+            
+    def warning(self, msg: str, *args, **kwargs):
+        if self._logger.isEnabledFor(logging.WARNING):
+            kwargs.setdefault("stacklevel", 2)
+            self._logger._log(logging.WARNING, msg, args, **kwargs)
+            
+    def error(self, msg: str, *args, **kwargs):
+        if self._logger.isEnabledFor(logging.ERROR):
+            kwargs.setdefault("stacklevel", 2)
+            self._logger._log(logging.ERROR, msg, args, **kwargs)
+            
+    def exception(self, msg: str, *args, exc_info=True, **kwargs):
+        if self._logger.isEnabledFor(logging.ERROR):
+            kwargs.setdefault("stacklevel", 2)
+            self._logger._log(logging.ERROR, msg, args, exc_info=exc_info, **kwargs)
+            
+    def critical(self, msg: str, *args, **kwargs):
+        if self._logger.isEnabledFor(logging.CRITICAL):
+            kwargs.setdefault("stacklevel", 2)
+            self._logger._log(logging.CRITICAL, msg, args, **kwargs)
+            
+    def __getattr__(self, name):
+        return getattr(self._logger, name)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get existing logger.
     
     Args:
         name: Logger name
-        
+    
     Returns:
         Logger instance
     """
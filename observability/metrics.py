@@ -3,13 +3,29 @@ Metrics Module
 
 Performance metrics collection and reporting.
 Tracks PnL, trades, win rate, Sharpe ratio, max drawdown.
+
+All statistics are maintained incrementally (Welford running mean and
+variance, running profit factor and drawdown, time-windowed deques for
+rolling periods), so recording a trade and building a summary cost O(1)
+regardless of how long the process has been running. Per-trade history is
+spilled to the database instead of being kept in memory.
 """
 
+import json
 import logging
-from typing import Dict, List, Optional
+import math
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
-from datetime import datetime
-import statistics
+from datetime import datetime, timedelta
+
+
+# Rolling periods reported alongside the lifetime statistics
+DEFAULT_WINDOWS = {
+    '1d': timedelta(days=1),
+    '7d': timedelta(days=7),
+    '30d': timedelta(days=30),
+}
 
 
 @dataclass
@@ -28,7 +44,139 @@ class PerformanceMetrics:
     profit_factor: float = 0.0
     max_drawdown: float = 0.0
     sharpe_ratio: float = 0.0
-    returns: List[float] = field(default_factory=list)
+    returns: List[float] = field(default_factory=list)  # Most recent results only
+    rolling: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+class RunningStats:
+    """
+    Welford running mean and variance.
+    
+    Supports removal so the same accumulator can back a sliding window.
+    """
+    
+    __slots__ = ("count", "mean", "_m2")
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+    
+    def add(self, value: float):
+        """Add an observation."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+    
+    def remove(self, value: float):
+        """Remove a previously added observation."""
+        if self.count <= 1:
+            self.count = 0
+            self.mean = 0.0
+            self._m2 = 0.0
+            return
+        self.count -= 1
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self._m2 = max(0.0, self._m2 - delta * (value - self.mean))
+    
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 with fewer than two observations)."""
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+    
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+
+
+def _sharpe(stats: RunningStats) -> float:
+    std = stats.stdev
+    if std > 0:
+        return (stats.mean / std) * (252 ** 0.5)  # Annualized
+    return 0.0
+
+
+class WindowedStats:
+    """
+    Trade statistics over a trailing time window.
+    
+    Trades older than the window (or beyond max_trades) are evicted from
+    the front of a deque and subtracted from the running totals, so each
+    trade is added and removed exactly once.
+    """
+    
+    def __init__(self, span: timedelta, max_trades: int = 10000):
+        """
+        Initialize windowed statistics.
+        
+        Args:
+            span: Window length
+            max_trades: Hard cap on trades held in the window
+        """
+        self.span = span
+        self.max_trades = max_trades
+        self._trades: Deque[Tuple[datetime, float]] = deque()
+        self._stats = RunningStats()
+        self._wins = 0
+        self._gross_profit = 0.0
+        self._gross_loss = 0.0
+    
+    def add(self, timestamp: datetime, profit: float):
+        """Add a trade result and evict anything that fell out of the window."""
+        self._trades.append((timestamp, profit))
+        self._stats.add(profit)
+        if profit > 0:
+            self._wins += 1
+            self._gross_profit += profit
+        elif profit < 0:
+            self._gross_loss -= profit
+        self.evict(timestamp)
+    
+    def evict(self, now: datetime):
+        """Drop trades older than the window."""
+        cutoff = now - self.span
+        trades = self._trades
+        while trades and (trades[0][0] < cutoff or len(trades) > self.max_trades):
+            _, profit = trades.popleft()
+            self._stats.remove(profit)
+            if profit > 0:
+                self._wins -= 1
+                self._gross_profit -= profit
+            elif profit < 0:
+                self._gross_loss += profit
+    
+    def snapshot(self, now: Optional[datetime] = None) -> Dict[str, float]:
+        """
+        Current window statistics.
+        
+        Args:
+            now: Evaluation time (defaults to now)
+        
+        Returns:
+            Dict with trades, net_profit, win_rate, profit_factor, sharpe_ratio
+        """
+        self.evict(now or datetime.now())
+        count = self._stats.count
+        return {
+            'trades': count,
+            'net_profit': self._gross_profit - self._gross_loss,
+            'win_rate': self._wins / count if count else 0.0,
+            'profit_factor': self._gross_profit / self._gross_loss if self._gross_loss > 0 else 0.0,
+            'sharpe_ratio': _sharpe(self._stats),
+        }
+    
+    def clear(self):
+        """Drop all trades."""
+        self._trades.clear()
+        self._stats = RunningStats()
+        self._wins = 0
+        self._gross_profit = 0.0
+        self._gross_loss = 0.0
 
 
 class MetricsCollector:
@@ -41,15 +189,36 @@ class MetricsCollector:
     - Sharpe ratio
     - Maximum drawdown
     - Trade statistics
+    - Rolling 1d/7d/30d windows
     """
     
-    def __init__(self):
-        """Initialize metrics collector."""
+    def __init__(
+        self,
+        database=None,
+        windows: Optional[Dict[str, timedelta]] = None,
+        recent_returns: int = 100,
+        max_window_trades: int = 10000
+    ):
+        """
+        Initialize metrics collector.
+        
+        Args:
+            database: Database receiving every trade result (metric 'trade_pnl')
+            windows: Rolling periods by label (default 1d, 7d, 30d)
+            recent_returns: Most recent results kept for PerformanceMetrics.returns
+            max_window_trades: Hard cap on trades held per rolling window
+        """
         self.logger = logging.getLogger("herald.metrics")
-        self.trade_results: List[float] = []
-        self.equity_curve: List[float] = [0.0]
+        self.database = database
+        self.equity: float = 0.0
         self.peak_equity: float = 0.0
         self.max_drawdown: float = 0.0
+        self.recent_returns: Deque[float] = deque(maxlen=recent_returns)
+        self.windows = {
+            label: WindowedStats(span, max_window_trades)
+            for label, span in (windows or DEFAULT_WINDOWS).items()
+        }
+        self._stats = RunningStats()
         
         # Counters
         self.total_trades = 0
@@ -57,16 +226,20 @@ class MetricsCollector:
         self.losing_trades = 0
         self.total_profit = 0.0
         self.total_loss = 0.0
-        
-    def record_trade(self, profit: float):
+    
+    def record_trade(self, profit: float, symbol: Optional[str] = None, timestamp: Optional[datetime] = None):
         """
         Record trade result.
         
         Args:
             profit: Trade profit/loss
+            symbol: Trading symbol (stored with the spilled history)
+            timestamp: Close time (defaults to now)
         """
+        timestamp = timestamp or datetime.now()
         self.total_trades += 1
-        self.trade_results.append(profit)
+        self._stats.add(profit)
+        self.recent_returns.append(profit)
         
         if profit > 0:
             self.winning_trades += 1
@@ -74,10 +247,13 @@ class MetricsCollector:
         elif profit < 0:
             self.losing_trades += 1
             self.total_loss += abs(profit)
-            
-        # Update equity curve
-        current_equity = self.equity_curve[-1] + profit
-        self.equity_curve.append(current_equity)
+        
+        for window in self.windows.values():
+            window.add(timestamp, profit)
+        
+        # Update equity
+        self.equity += profit
+        current_equity = self.equity
         
         # Update drawdown
         if current_equity > self.peak_equity:
@@ -87,13 +263,20 @@ class MetricsCollector:
             drawdown = (self.peak_equity - current_equity) / self.peak_equity
             if drawdown > self.max_drawdown:
                 self.max_drawdown = drawdown
-                
+        
+        if self.database is not None:
+            self.database.record_metric(
+                "trade_pnl",
+                profit,
+                json.dumps({'symbol': symbol, 'equity': current_equity, 'closed_at': timestamp.isoformat()})
+            )
+        
         self.logger.debug(
             f"Trade recorded: {profit:+.2f} | "
             f"Total trades: {self.total_trades} | "
             f"Net P&L: {current_equity:+.2f}"
         )
-        
+    
     def get_metrics(self) -> PerformanceMetrics:
         """
         Calculate current performance metrics.
@@ -101,7 +284,8 @@ class MetricsCollector:
         Returns:
             PerformanceMetrics snapshot
         """
-        metrics = PerformanceMetrics(timestamp=datetime.now())
+        now = datetime.now()
+        metrics = PerformanceMetrics(timestamp=now)
         
         metrics.total_trades = self.total_trades
         metrics.winning_trades = self.winning_trades
@@ -115,31 +299,28 @@ class MetricsCollector:
         # Win rate
         if self.total_trades > 0:
             metrics.win_rate = self.winning_trades / self.total_trades
-            
+        
         # Average win/loss
         if self.winning_trades > 0:
             metrics.avg_win = self.total_profit / self.winning_trades
         if self.losing_trades > 0:
             metrics.avg_loss = self.total_loss / self.losing_trades
-            
+        
         # Profit factor
         if self.total_loss > 0:
             metrics.profit_factor = self.total_profit / self.total_loss
-            
+        
         # Max drawdown
         metrics.max_drawdown = self.max_drawdown
         
         # Sharpe ratio (simplified)
-        if len(self.trade_results) > 1:
-            avg_return = statistics.mean(self.trade_results)
-            std_return = statistics.stdev(self.trade_results)
-            if std_return > 0:
-                metrics.sharpe_ratio = (avg_return / std_return) * (252 ** 0.5)  # Annualized
-                
-        metrics.returns = self.trade_results.copy()
+        metrics.sharpe_ratio = _sharpe(self._stats)
         
-        return metrics
+        metrics.returns = list(self.recent_returns)
+        metrics.rolling = {label: window.snapshot(now) for label, window in self.windows.items()}
         
+        return metrics
+    
     def print_summary(self):
         """Print metrics summary to log."""
         metrics = self.get_metrics()
@@ -157,12 +338,21 @@ class MetricsCollector:
         self.logger.info(f"Profit Factor:   {metrics.profit_factor:.2f}")
         self.logger.info(f"Max Drawdown:    {metrics.max_drawdown:.1%}")
         self.logger.info(f"Sharpe Ratio:    {metrics.sharpe_ratio:.2f}")
+        for label, window in metrics.rolling.items():
+            self.logger.info(
+                f"Rolling {label:<4}     {window['trades']} trades, "
+                f"net {window['net_profit']:+.2f}, win {window['win_rate']:.1%}, "
+                f"PF {window['profit_factor']:.2f}"
+            )
         self.logger.info("=" * 60)
-        
+    
     def reset(self):
         """Reset all metrics."""
-        self.trade_results.clear()
-        self.equity_curve = [0.0]
+        self.recent_returns.clear()
+        for window in self.windows.values():
+            window.clear()
+        self._stats = RunningStats()
+        self.equity = 0.0
         self.peak_equity = 0.0
         self.max_drawdown = 0.0
         self.total_trades = 0
@@ -0,0 +1,220 @@
+"""
+Loop Profiler
+
+Per-stage timing for the trading loop using perf_counter_ns. Keeps rolling
+p50/p95/p99 per stage, warns when a stage exceeds its latency budget, and
+exports timings to Prometheus and the database. When disabled every call
+returns immediately, so instrumentation can stay in the loop permanently.
+"""
+
+import json
+import logging
+import time
+from collections import deque
+from typing import Dict, Optional, Deque
+
+_perf_ns = time.perf_counter_ns
+
+
+class _Span:
+    """Context manager timing one stage."""
+
+    __slots__ = ("_profiler", "_stage", "_start")
+
+    def __init__(self, profiler: "LoopProfiler", stage: str):
+        self._profiler = profiler
+        self._stage = stage
+        self._start = 0
+
+    def __enter__(self):
+        self._start = _perf_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler.record(self._stage, _perf_ns() - self._start)
+        return False
+
+
+class _NullSpan:
+    """Shared no-op span used when profiling is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class LoopProfiler:
+    """
+    Stage timing for the trading loop.
+
+    Two ways to time stages:
+    - span(stage): context manager around a block
+    - begin_loop() / lap(stage) / end_loop(): lap timer where each lap
+      records the time since the previous mark, for sequential stages that
+      may `continue` out of the loop early
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        window: int = 512,
+        budgets_ms: Optional[Dict[str, float]] = None,
+        exporter=None,
+        database=None,
+        persist_every_loops: int = 100,
+        warn_interval_secs: float = 60.0
+    ):
+        """
+        Initialize loop profiler.
+
+        Args:
+            enabled: If False, all timing calls are no-ops
+            window: Samples kept per stage for rolling percentiles
+            budgets_ms: Stage -> latency budget in milliseconds
+            exporter: PrometheusExporter receiving stage observations
+            database: Database receiving periodic percentile snapshots
+            persist_every_loops: Loops between database snapshots (0 = never)
+            warn_interval_secs: Minimum seconds between budget warnings per stage
+        """
+        self.enabled = enabled
+        self.window = window
+        self.budgets_ms = dict(budgets_ms or {})
+        self.exporter = exporter
+        self.database = database
+        self.persist_every_loops = persist_every_loops
+        self.warn_interval_secs = warn_interval_secs
+        self.logger = logging.getLogger("herald.profiler")
+
+        self._samples: Dict[str, Deque[int]] = {}
+        self._budget_ns = {stage: int(ms * 1_000_000) for stage, ms in self.budgets_ms.items()}
+        self._over_budget: Dict[str, int] = {}
+        self._last_warning: Dict[str, float] = {}
+        self._loop_start = 0
+        self._last_mark = 0
+        self._loops = 0
+
+    def span(self, stage: str):
+        """
+        Time a block as one stage.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            Context manager
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage)
+
+    def begin_loop(self):
+        """Mark the start of a loop iteration."""
+        if self.enabled:
+            self._loop_start = self._last_mark = _perf_ns()
+
+    def lap(self, stage: str):
+        """
+        Record the time since the previous mark as one stage.
+
+        Args:
+            stage: Stage name
+        """
+        if not self.enabled:
+            return
+        now = _perf_ns()
+        self.record(stage, now - self._last_mark)
+        self._last_mark = now
+
+    def end_loop(self):
+        """Record the whole iteration as stage 'loop' and persist periodically."""
+        if not self.enabled:
+            return
+        self.record("loop", _perf_ns() - self._loop_start)
+        self._loops += 1
+        if self.database is not None and self.persist_every_loops and self._loops % self.persist_every_loops == 0:
+            self.persist()
+
+    def record(self, stage: str, duration_ns: int):
+        """
+        Record a stage duration.
+
+        Args:
+            stage: Stage name
+            duration_ns: Duration in nanoseconds
+        """
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = deque(maxlen=self.window)
+        samples.append(duration_ns)
+
+        if self.exporter is not None:
+            self.exporter.observe_stage(stage, duration_ns / 1e9)
+
+        budget = self._budget_ns.get(stage)
+        if budget is not None and duration_ns > budget:
+            self._over_budget[stage] = self._over_budget.get(stage, 0) + 1
+            now = time.monotonic()
+            if now - self._last_warning.get(stage, 0.0) >= self.warn_interval_secs:
+                self._last_warning[stage] = now
+                self.logger.warning(
+                    f"Stage '{stage}' took {duration_ns / 1e6:.1f}ms "
+                    f"(budget {budget / 1e6:.1f}ms, {self._over_budget[stage]} overruns)"
+                )
+
+    def percentiles(self, stage: str) -> Dict[str, float]:
+        """
+        Rolling percentiles for a stage in milliseconds.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            Dict with count, p50, p95, p99, max (empty if no samples)
+        """
+        samples = self._samples.get(stage)
+        if not samples:
+            return {}
+        ordered = sorted(samples)
+        n = len(ordered)
+
+        def pct(q: float) -> float:
+            return ordered[min(n - 1, int(q * n))] / 1e6
+
+        return {
+            'count': n,
+            'p50': pct(0.50),
+            'p95': pct(0.95),
+            'p99': pct(0.99),
+            'max': ordered[-1] / 1e6,
+            'over_budget': self._over_budget.get(stage, 0),
+        }
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Rolling percentiles for every stage."""
+        return {stage: self.percentiles(stage) for stage in list(self._samples)}
+
+    def persist(self):
+        """Write current percentiles to the database metrics table."""
+        if self.database is None:
+            return
+        for stage, stats in self.summary().items():
+            if not stats:
+                continue
+            metadata = json.dumps(stats)
+            self.database.record_metric(f"loop_stage_{stage}_p95_ms", stats['p95'], metadata)
+
+    def log_summary(self):
+        """Log rolling percentiles per stage."""
+        for stage, stats in self.summary().items():
+            if stats:
+                self.logger.info(
+                    f"Stage {stage:<14} p50={stats['p50']:.2f}ms p95={stats['p95']:.2f}ms "
+                    f"p99={stats['p99']:.2f}ms max={stats['max']:.2f}ms n={stats['count']}"
+                )
@@ -3,15 +3,29 @@ Prometheus Metrics Exporter
 
 Exports trading metrics in Prometheus format for monitoring and alerting.
 Can be served via HTTP or written to a file for node_exporter textfile collector.
+
+Metrics live in a MetricsRegistry of counter, gauge and histogram families.
+Each family holds one series per label set, so e.g. per-symbol PnL and
+per-stage loop timings are independent series rather than one overwritten
+value.
 """
 
+import io
 import logging
+import math
+import threading
 import time
-from typing import Dict, Any, Optional, List
+from bisect import bisect_left
+from typing import Dict, Any, Optional, List, Tuple, Callable, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Default loop stage timing buckets (seconds)
+STAGE_BUCKETS_SECONDS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
 
 @dataclass
 class PrometheusMetric:
@@ -41,46 +55,377 @@ class PrometheusMetric:
         return "\n".join(lines)
 
 
+class ShardedCounter:
+    """
+    Monotonic counter with per-thread shards.
+    
+    inc() only touches the calling thread's shard, so concurrent writers
+    never contend or lose updates; readers sum the shards.
+    """
+    
+    def __init__(self):
+        self._shards: List[list] = []
+        self._local = threading.local()
+    
+    def inc(self, amount: float = 1.0):
+        """Increment the counter."""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = [0.0]
+            self._local.shard = shard
+            self._shards.append(shard)
+        shard[0] += amount
+    
+    @property
+    def value(self) -> float:
+        """Current total across shards."""
+        return sum(shard[0] for shard in list(self._shards))
+
+
+class GaugeValue:
+    """Settable value (single writer: the trading loop)."""
+    
+    def __init__(self):
+        self.value = 0.0
+    
+    def set(self, value: float):
+        """Set the gauge."""
+        self.value = float(value)
+    
+    def inc(self, amount: float = 1.0):
+        """Increase the gauge."""
+        self.value += amount
+    
+    def dec(self, amount: float = 1.0):
+        """Decrease the gauge."""
+        self.value -= amount
+
+
+class ShardedHistogram:
+    """
+    Fixed-bucket histogram with per-thread shards.
+    
+    observe() only touches the calling thread's shard, so concurrent writers
+    (trading loop, order pipeline workers) never contend or lose updates.
+    """
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        """
+        Initialize histogram.
+        
+        Args:
+            buckets: Sorted bucket upper bounds (+Inf is implicit)
+        """
+        self.buckets = tuple(buckets)
+        self._shards: List[list] = []
+        self._local = threading.local()
+    
+    def _shard(self) -> list:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            # [bucket counts (+Inf last), sum, count]
+            shard = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            self._local.shard = shard
+            self._shards.append(shard)
+        return shard
+    
+    def observe(self, value: float):
+        """Record one observation."""
+        shard = self._shard()
+        shard[0][bisect_left(self.buckets, value)] += 1
+        shard[1] += value
+        shard[2] += 1
+    
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        """
+        Merge shards.
+        
+        Returns:
+            (cumulative bucket counts incl. +Inf, sum, count)
+        """
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        n = 0
+        for shard in list(self._shards):
+            for i, c in enumerate(shard[0]):
+                counts[i] += c
+            total += shard[1]
+            n += shard[2]
+        cumulative = []
+        running = 0
+        for c in counts:
+            running += c
+            cumulative.append(running)
+        return cumulative, total, n
+
+
+class MetricFamily:
+    """
+    All series of one metric name, keyed by label set.
+    
+    labels(**kv) returns the series for that label set, creating it on
+    first use. Unlabelled families use labels() with no arguments, or the
+    inc/set/observe shortcuts.
+    """
+    
+    def __init__(self, name: str, help_text: str, metric_type: str, factory: Callable[[], Any]):
+        self.name = name
+        self.help_text = help_text
+        self.metric_type = metric_type
+        self._factory = factory
+        self._series: Dict[LabelKey, Any] = {}
+    
+    def labels(self, **labels) -> Any:
+        """Get or create the series for a label set."""
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        child = self._series.get(key)
+        if child is None:
+            # setdefault keeps the first instance if two threads race on a new label set
+            child = self._series.setdefault(key, self._factory())
+        return child
+    
+    def remove(self, **labels):
+        """Drop the series for a label set (e.g. a symbol no longer traded)."""
+        self._series.pop(tuple(sorted((k, str(v)) for k, v in labels.items())), None)
+    
+    def series(self) -> List[Tuple[LabelKey, Any]]:
+        """Snapshot of (labels, series) pairs, sorted by labels."""
+        return sorted(self._series.items(), key=lambda item: item[0])
+    
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+    
+    def set(self, value: float):
+        self.labels().set(value)
+    
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+
+class MetricsRegistry:
+    """
+    Registry of metric families rendered in Prometheus text format.
+    
+    Rendering streams straight into a reusable StringIO buffer instead of
+    building intermediate strings per metric.
+    """
+    
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._buffer = io.StringIO()
+    
+    def counter(self, name: str, help_text: str) -> MetricFamily:
+        """Get or create a counter family."""
+        return self._family(name, help_text, "counter", ShardedCounter)
+    
+    def gauge(self, name: str, help_text: str) -> MetricFamily:
+        """Get or create a gauge family."""
+        return self.gauge_family(name, help_text)
+    
+    def gauge_family(self, name: str, help_text: str, metric_type: str = "gauge") -> MetricFamily:
+        """
+        Get or create a family of settable values.
+        
+        Args:
+            name: Metric name
+            help_text: HELP line
+            metric_type: Exposed TYPE; "counter" suits running totals that
+                are set rather than incremented
+        
+        Returns:
+            MetricFamily of GaugeValue children
+        """
+        return self._family(name, help_text, metric_type, GaugeValue)
+    
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...]) -> MetricFamily:
+        """Get or create a histogram family with fixed buckets."""
+        buckets = tuple(buckets)
+        return self._family(name, help_text, "histogram", lambda: ShardedHistogram(buckets))
+    
+    def get(self, name: str) -> Optional[MetricFamily]:
+        """Look up a family by name."""
+        return self._families.get(name)
+    
+    def families(self) -> List[MetricFamily]:
+        """All registered families in registration order."""
+        return list(self._families.values())
+    
+    def render(self, extra: Sequence['MetricsRegistry'] = ()) -> str:
+        """
+        Render every family in Prometheus exposition format.
+        
+        Args:
+            extra: Further registries appended to the same exposition
+        
+        Returns:
+            Exposition text
+        """
+        buf = self._buffer
+        buf.seek(0)
+        buf.truncate()
+        self.write_to(buf)
+        for registry in extra:
+            registry.write_to(buf)
+        return buf.getvalue()
+    
+    def write_to(self, out):
+        """
+        Stream the exposition text into a writable text buffer.
+        
+        Args:
+            out: Object with a write(str) method
+        """
+        write = out.write
+        for family in self.families():
+            series = family.series()
+            if not series:
+                continue
+            name = family.name
+            write(f"# HELP {name} {family.help_text}\n# TYPE {name} {family.metric_type}\n")
+            if family.metric_type == "histogram":
+                for labels, histogram in series:
+                    cumulative, total, count = histogram.snapshot()
+                    for bound, c in zip(histogram.buckets, cumulative):
+                        write(f"{name}_bucket{format_labels(labels, ('le', format_value(bound)))} {c}\n")
+                    write(f"{name}_bucket{format_labels(labels, ('le', '+Inf'))} {cumulative[-1]}\n")
+                    write(f"{name}_sum{format_labels(labels)} {format_value(total)}\n")
+                    write(f"{name}_count{format_labels(labels)} {count}\n")
+            else:
+                for labels, child in series:
+                    write(f"{name}{format_labels(labels)} {format_value(child.value)}\n")
+    
+    def _family(self, name: str, help_text: str, metric_type: str, factory) -> MetricFamily:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families.setdefault(name, MetricFamily(name, help_text, metric_type, factory))
+        elif family.metric_type != metric_type:
+            raise ValueError(f"Metric {name} already registered as {family.metric_type}")
+        return family
+
+
+def format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Format a label set as {k="v",...} (empty string if none)."""
+    if extra is not None:
+        labels = labels + (extra,)
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return f"{{{body}}}"
+
+
+def format_value(value: float) -> str:
+    """Format a sample value per the exposition format."""
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
 class PrometheusExporter:
     """
     Prometheus metrics exporter for Herald trading system.
     
     Exports metrics such as:
-    - Trade count (total, wins, losses)
-    - PnL (net profit, daily, per symbol)
-    - Performance (win rate, profit factor, Sharpe)
+    - Trade count (total, wins, losses) per symbol
+    - PnL (net profit, realized and unrealized per symbol)
+    - Performance (win rate, profit factor)
+    - Loop stage timings
     - System health (MT5 connected, uptime)
     """
     
-    def __init__(self, prefix: str = "herald"):
+    def __init__(self, prefix: str = "herald", registry: Optional[MetricsRegistry] = None):
         """
         Initialize Prometheus exporter.
         
         Args:
             prefix: Metric name prefix
+            registry: Registry to populate (a private one is created if omitted)
         """
         self.logger = logging.getLogger("herald.prometheus")
         self.prefix = prefix
+        self.registry = registry if registry is not None else MetricsRegistry()
         self._start_time = time.time()
-        self._metrics_cache: Dict[str, PrometheusMetric] = {}
         
-        # Initialize counters
+        # Additional registries rendered after ours (e.g. ExecutionMetrics)
+        self._collectors: List[MetricsRegistry] = []
+        
+        # Aggregate counters for derived ratios
         self._trade_count = 0
         self._win_count = 0
         self._loss_count = 0
         self._total_profit = 0.0
         self._total_loss = 0.0
         
+        p = prefix
+        r = self.registry
+        self._trades = r.counter(f"{p}_trades_total", "Total number of trades")
+        self._trades_won = r.counter(f"{p}_trades_won", "Number of winning trades")
+        self._trades_lost = r.counter(f"{p}_trades_lost", "Number of losing trades")
+        self._profit = r.counter(f"{p}_profit_total", "Total gross profit")
+        self._loss = r.counter(f"{p}_loss_total", "Total gross loss")
+        self._pnl = r.gauge(f"{p}_pnl_total", "Total net realized profit/loss")
+        self._unrealized = r.gauge(f"{p}_unrealized_pnl", "Unrealized profit/loss of open positions")
+        self._stage_seconds = r.histogram(
+            f"{p}_loop_stage_seconds", "Trading loop stage duration", STAGE_BUCKETS_SECONDS
+        )
+    
     def record_trade(self, profit: float, symbol: str = "unknown"):
         """Record a trade result."""
         self._trade_count += 1
+        self._trades.labels(symbol=symbol).inc()
+        self._pnl.labels(symbol=symbol).inc(profit)
         if profit > 0:
             self._win_count += 1
             self._total_profit += profit
+            self._trades_won.labels(symbol=symbol).inc()
+            self._profit.labels(symbol=symbol).inc(profit)
         elif profit < 0:
             self._loss_count += 1
             self._total_loss += abs(profit)
-            
+            self._trades_lost.labels(symbol=symbol).inc()
+            self._loss.labels(symbol=symbol).inc(abs(profit))
+    
+    def set_unrealized_pnl(self, pnl_by_symbol: Dict[str, float]):
+        """
+        Set unrealized PnL per symbol; symbols without open positions drop to zero.
+        
+        Args:
+            pnl_by_symbol: Symbol -> unrealized PnL
+        """
+        for labels, gauge in self._unrealized.series():
+            symbol = dict(labels).get('symbol')
+            if symbol not in pnl_by_symbol:
+                gauge.set(0.0)
+        for symbol, pnl in pnl_by_symbol.items():
+            self._unrealized.labels(symbol=symbol).set(pnl)
+    
+    def observe_stage(self, stage: str, seconds: float):
+        """
+        Record the duration of one trading loop stage.
+        
+        Args:
+            stage: Stage name (e.g. market_data, indicators, exits, loop)
+            seconds: Stage duration
+        """
+        self._stage_seconds.labels(stage=stage).observe(seconds)
+    
+    def attach_execution_metrics(self, execution_metrics):
+        """
+        Export order latency / slippage histograms and requote / reject counters.
+        
+        Args:
+            execution_metrics: ExecutionMetrics shared by ExecutionEngine and PositionManager
+        """
+        if execution_metrics.registry is not self.registry and execution_metrics.registry not in self._collectors:
+            self._collectors.append(execution_metrics.registry)
+    
     def set_connection_status(self, connected: bool):
         """Set MT5 connection status."""
         self._update_metric(
@@ -89,7 +434,7 @@ class PrometheusExporter:
             "gauge",
             "MT5 terminal connection status (1=connected, 0=disconnected)"
         )
-        
+    
     def set_account_balance(self, balance: float, equity: float):
         """Set account balance metrics."""
         self._update_metric(
@@ -104,7 +449,7 @@ class PrometheusExporter:
             "gauge",
             "Current account equity"
         )
-        
+    
     def set_open_positions(self, count: int, total_volume: float = 0.0):
         """Set open positions metrics."""
         self._update_metric(
@@ -119,7 +464,7 @@ class PrometheusExporter:
             "gauge",
             "Total volume of open positions"
         )
-        
+    
     def set_drawdown(self, drawdown_pct: float):
         """Set current drawdown percentage."""
         self._update_metric(
@@ -128,22 +473,29 @@ class PrometheusExporter:
             "gauge",
             "Current drawdown percentage"
         )
-        
+    
     def _update_metric(self, name: str, value: float, metric_type: str, help_text: str, labels: Dict[str, str] = None):
-        """Update or create a metric."""
-        self._metrics_cache[name] = PrometheusMetric(
-            name=name,
-            value=value,
-            metric_type=metric_type,
-            help_text=help_text,
-            labels=labels
-        )
-        
+        """Set the series of a gauge-like metric (counter type is used for values that only grow)."""
+        family = self.registry.get(name) or self.registry.gauge_family(name, help_text, metric_type)
+        family.labels(**(labels or {})).set(value)
+    
     def get_all_metrics(self) -> List[PrometheusMetric]:
-        """Get all current metrics."""
+        """Get all current counter and gauge series (histograms are only in export_text)."""
         # Update computed metrics
         self._update_computed_metrics()
-        return list(self._metrics_cache.values())
+        metrics = []
+        for family in self.registry.families():
+            if family.metric_type == "histogram":
+                continue
+            for labels, child in family.series():
+                metrics.append(PrometheusMetric(
+                    name=family.name,
+                    value=child.value,
+                    metric_type=family.metric_type,
+                    help_text=family.help_text,
+                    labels=dict(labels) or None
+                ))
+        return metrics
     
     def _update_computed_metrics(self):
         """Update computed/derived metrics."""
@@ -156,47 +508,6 @@ class PrometheusExporter:
             "Herald uptime in seconds"
         )
         
-        # Trade counters
-        self._update_metric(
-            f"{self.prefix}_trades_total",
-            self._trade_count,
-            "counter",
-            "Total number of trades"
-        )
-        self._update_metric(
-            f"{self.prefix}_trades_won",
-            self._win_count,
-            "counter",
-            "Number of winning trades"
-        )
-        self._update_metric(
-            f"{self.prefix}_trades_lost",
-            self._loss_count,
-            "counter",
-            "Number of losing trades"
-        )
-        
-        # PnL
-        net_profit = self._total_profit - self._total_loss
-        self._update_metric(
-            f"{self.prefix}_pnl_total",
-            net_profit,
-            "gauge",
-            "Total net profit/loss"
-        )
-        self._update_metric(
-            f"{self.prefix}_profit_total",
-            self._total_profit,
-            "counter",
-            "Total gross profit"
-        )
-        self._update_metric(
-            f"{self.prefix}_loss_total",
-            self._total_loss,
-            "counter",
-            "Total gross loss"
-        )
-        
         # Win rate
         win_rate = self._win_count / self._trade_count if self._trade_count > 0 else 0
         self._update_metric(
@@ -222,14 +533,8 @@ class PrometheusExporter:
         Returns:
             String in Prometheus exposition format
         """
-        metrics = self.get_all_metrics()
-        lines = []
-        
-        for metric in metrics:
-            lines.append(metric.to_prometheus_format())
-            lines.append("")  # Empty line between metrics
-        
-        return "\n".join(lines)
+        self._update_computed_metrics()
+        return self.registry.render(self._collectors)
     
     def write_to_file(self, path: str = "/tmp/herald_metrics.prom"):
         """
@@ -253,7 +558,10 @@ class PrometheusExporter:
         Get metrics as dictionary (for JSON export).
         
         Returns:
-            Dict of metric names to values
+            Dict of metric names (with labels when present) to values
         """
         metrics = self.get_all_metrics()
-        return {m.name: m.value for m in metrics}
+        return {
+            m.name + format_labels(tuple(sorted(m.labels.items())) if m.labels else ()): m.value
+            for m in metrics
+        }
@@ -0,0 +1,255 @@
+"""
+Stack Sampler
+
+On-demand sampling profiler for the running trading loop. Periodically
+captures the main thread's Python stack and writes a collapsed-stack file
+(one `frame;frame;frame count` line per unique stack) that flamegraph.pl,
+speedscope or inferno render directly.
+
+Two sampling modes:
+- wall: a daemon thread reads the main thread's frame via
+  sys._current_frames(); sees time blocked in MT5 calls and sleeps.
+  Works on every platform.
+- cpu: signal.setitimer(ITIMER_PROF) delivers SIGPROF on CPU time; only
+  on-CPU stacks are captured. POSIX only.
+
+Overhead is bounded by a minimum sampling interval, a maximum stack depth,
+a cap on distinct stacks and a fixed run duration; the time spent sampling
+is reported when the profile is written.
+"""
+
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+MIN_INTERVAL_MS = 1.0
+TRUNCATED_STACK = "[truncated]"
+
+
+class StackSampler:
+    """
+    Samples the main thread's stack for a fixed duration.
+
+    Start with start(), a config flag, or by sending the signal registered
+    through install_signal() (SIGUSR1 by default); the same signal stops a
+    running profile early. The profile is written when the duration elapses
+    or stop() is called.
+    """
+
+    def __init__(
+        self,
+        interval_ms: float = 5.0,
+        duration_secs: float = 30.0,
+        output_dir: str = "profiles",
+        mode: str = "wall",
+        max_depth: int = 64,
+        max_stacks: int = 10000
+    ):
+        """
+        Initialize stack sampler.
+
+        Args:
+            interval_ms: Time between samples (clamped to MIN_INTERVAL_MS)
+            duration_secs: Profile length before the file is written
+            output_dir: Directory for collapsed-stack files
+            mode: 'wall' (thread, portable) or 'cpu' (SIGPROF, POSIX)
+            max_depth: Innermost frames kept per stack
+            max_stacks: Distinct stacks kept; further stacks count as '[truncated]'
+        """
+        if mode not in ("wall", "cpu"):
+            raise ValueError(f"Unknown sampling mode: {mode}")
+        if mode == "cpu" and not hasattr(signal, "setitimer"):
+            raise ValueError("cpu sampling requires signal.setitimer (POSIX only)")
+
+        self.interval_secs = max(interval_ms, MIN_INTERVAL_MS) / 1000.0
+        self.duration_secs = duration_secs
+        self.output_dir = output_dir
+        self.mode = mode
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+        self.logger = logging.getLogger("herald.sampler")
+
+        self._lock = threading.Lock()
+        self._running = False
+        self._counts: Dict[str, int] = {}
+        self._samples = 0
+        self._sampling_ns = 0
+        self._started_at = 0.0
+        self._deadline = 0.0
+        self._target_thread_id = threading.main_thread().ident
+        self._thread: Optional[threading.Thread] = None
+        self._timer: Optional[threading.Timer] = None
+        self._sigprof_installed = False
+        self.last_output: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        """True while a profile is being collected."""
+        return self._running
+
+    def install_signal(self, signum: Optional[int] = None) -> bool:
+        """
+        Register the toggle signal handler (call from the main thread).
+
+        Args:
+            signum: Signal number (default SIGUSR1)
+
+        Returns:
+            True if installed, False if the platform lacks the signal
+        """
+        if signum is None:
+            signum = getattr(signal, "SIGUSR1", None)
+        if signum is None:
+            return False
+        signal.signal(signum, self.handle_signal)
+        return True
+
+    def handle_signal(self, signum, frame):
+        """Signal handler: start a profile, or stop the running one."""
+        self.toggle()
+
+    def toggle(self) -> bool:
+        """
+        Start a profile if idle, otherwise stop and write it.
+
+        Returns:
+            True if a profile is now running
+        """
+        if self._running:
+            self.stop()
+            return False
+        return self.start()
+
+    def start(self, duration_secs: Optional[float] = None) -> bool:
+        """
+        Start sampling.
+
+        Args:
+            duration_secs: Override the configured duration
+
+        Returns:
+            True if started, False if a profile was already running
+        """
+        with self._lock:
+            if self._running:
+                return False
+            duration = duration_secs if duration_secs is not None else self.duration_secs
+            self._counts = {}
+            self._samples = 0
+            self._sampling_ns = 0
+            self._started_at = time.monotonic()
+            self._deadline = self._started_at + duration
+            self._running = True
+
+        if self.mode == "cpu":
+            if not self._sigprof_installed:
+                signal.signal(signal.SIGPROF, self._on_sigprof)
+                self._sigprof_installed = True
+            signal.setitimer(signal.ITIMER_PROF, self.interval_secs, self.interval_secs)
+            # SIGPROF only fires on CPU time, so an idle loop needs a wall-clock stop
+            self._timer = threading.Timer(duration, self.stop)
+            self._timer.daemon = True
+            self._timer.start()
+        else:
+            self._thread = threading.Thread(target=self._run, name="herald-stack-sampler", daemon=True)
+            self._thread.start()
+
+        self.logger.info(
+            f"Stack sampler started ({self.mode}, every {self.interval_secs * 1000:.1f}ms for {duration:.0f}s)"
+        )
+        return True
+
+    def stop(self) -> Optional[str]:
+        """
+        Stop sampling and write the collapsed-stack file.
+
+        Returns:
+            Path of the written file, or None if nothing was running
+        """
+        with self._lock:
+            if not self._running:
+                return None
+            self._running = False
+
+        if self.mode == "cpu":
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            timer, self._timer = self._timer, None
+            if timer is not None and timer is not threading.current_thread():
+                timer.cancel()
+        else:
+            thread, self._thread = self._thread, None
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout=max(1.0, self.interval_secs * 10))
+
+        return self._write()
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text for the samples collected so far."""
+        counts = dict(self._counts)
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(counts.items()))
+
+    def _run(self):
+        frames = sys._current_frames
+        target = self._target_thread_id
+        while self._running:
+            if time.monotonic() >= self._deadline:
+                self.stop()
+                return
+            frame = frames().get(target)
+            if frame is not None:
+                self._sample(frame)
+            del frame
+            time.sleep(self.interval_secs)
+
+    def _on_sigprof(self, signum, frame):
+        if not self._running:
+            return
+        if time.monotonic() >= self._deadline:
+            # Writing from the handler would stall the loop; hand it off
+            threading.Thread(target=self.stop, name="herald-stack-sampler-stop", daemon=True).start()
+            return
+        self._sample(frame)
+
+    def _sample(self, frame):
+        start = time.perf_counter_ns()
+        names = []
+        depth = 0
+        while frame is not None and depth < self.max_depth:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+            depth += 1
+        names.reverse()
+        stack = ";".join(names)
+
+        counts = self._counts
+        if stack not in counts and len(counts) >= self.max_stacks:
+            stack = TRUNCATED_STACK
+        counts[stack] = counts.get(stack, 0) + 1
+        self._samples += 1
+        self._sampling_ns += time.perf_counter_ns() - start
+
+    def _write(self) -> Optional[str]:
+        elapsed = time.monotonic() - self._started_at
+        if not self._samples:
+            self.logger.info("Stack sampler stopped with no samples")
+            return None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.output_dir, f"herald-{self.mode}-{stamp}.collapsed")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(self.collapsed())
+
+        overhead_pct = (self._sampling_ns / 1e9) / elapsed * 100 if elapsed > 0 else 0.0
+        self.logger.info(
+            f"Stack profile written to {path} ({self._samples} samples, "
+            f"{len(self._counts)} stacks, sampling overhead {overhead_pct:.2f}%)"
+        )
+        self.last_output = path
+        return path
@@ -5,9 +5,23 @@ Database operations for trade logging, signal recording, and metrics storage.
 """
 
 from .database import Database, TradeRecord, SignalRecord
+from .writer import DatabaseWriter
+from .bar_archive import BarArchive
+from .shared_bars import SharedBarStore, SharedBars
+from .journal import TradingJournal, restore_state
+from .analytics import TradeAnalytics
+from .maintenance import DatabaseMaintenance
 
 __all__ = [
     "Database",
     "TradeRecord",
     "SignalRecord",
+    "DatabaseWriter",
+    "BarArchive",
+    "SharedBarStore",
+    "SharedBars",
+    "TradingJournal",
+    "restore_state",
+    "TradeAnalytics",
+    "DatabaseMaintenance",
 ]
@@ -0,0 +1,303 @@
+"""
+Trade Analytics
+
+Read-side query layer over the trades and signals tables for reports and
+dashboards. Aggregates are pushed into SQLite and answered from covering
+indexes (see persistence.migrations), results are built as DataFrame
+columns straight from the cursor's tuples, and trade listings are
+keyset-paginated so the cost of a page does not grow with the table.
+
+Queries run on a separate read-only connection, so they can be served from
+a dashboard thread while the trading loop writes.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from herald.persistence.columns import from_epoch_ms, to_epoch_ms
+from herald.persistence.migrations import STATUS_NAMES, TRADE_SIDES, encode_status
+
+_CLOSED = encode_status('CLOSED')
+_DAY_MS = 86400000
+
+TRADE_PAGE_COLUMNS = (
+    'id', 'signal_id', 'order_id', 'symbol', 'side', 'volume', 'entry_price', 'exit_price',
+    'entry_time', 'exit_time', 'profit', 'status', 'exit_reason', 'strategy_name',
+)
+
+
+def _frame(cursor: sqlite3.Cursor, columns: Sequence[str]) -> pd.DataFrame:
+    """Build a DataFrame from the cursor's result tuples (no per-row objects)."""
+    return pd.DataFrame.from_records(cursor.fetchall(), columns=list(columns))
+
+
+def _timestamps(values: pd.Series) -> pd.Series:
+    """Convert stored epoch milliseconds to datetime64 in one pass."""
+    if values.dtype == object:
+        # Text written by a pre-migration release, or an empty result
+        return pd.to_datetime(values.map(from_epoch_ms))
+    return pd.to_datetime(values, unit='ms')
+
+
+def _range(column: str, start: Optional[datetime], end: Optional[datetime], params: List[Any]) -> str:
+    """SQL for an optional [start, end) filter on a timestamp column."""
+    clause = ""
+    if start is not None:
+        clause += f" AND {column} >= ?"
+        params.append(to_epoch_ms(start))
+    if end is not None:
+        clause += f" AND {column} < ?"
+        params.append(to_epoch_ms(end))
+    return clause
+
+
+class TradeAnalytics:
+    """
+    Aggregates and paginated listings over recorded trades and signals.
+
+    Realized figures are attributed to a trade's exit time.
+    """
+
+    def __init__(self, database):
+        """
+        Initialize analytics.
+
+        Args:
+            database: Database whose file is queried (pending background
+                writes are flushed before each query)
+        """
+        self.database = database
+        self.logger = logging.getLogger("herald.persistence.analytics")
+        self.conn = sqlite3.connect(
+            f"file:{database.db_path}?mode=ro", uri=True, check_same_thread=False
+        )
+
+    def _execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        self.database.flush()
+        return self.conn.execute(sql, params)
+
+    def pnl_by_symbol(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Realized P&L per symbol.
+
+        Args:
+            start: Exit time lower bound (inclusive)
+            end: Exit time upper bound (exclusive)
+
+        Returns:
+            DataFrame with symbol, trades, wins, profit
+        """
+        params: List[Any] = []
+        where = _range("exit_time", start, end, params)
+        cursor = self._execute(f"""
+            SELECT symbol, COUNT(*), SUM(profit > 0), SUM(profit)
+            FROM trades
+            WHERE status = {_CLOSED}{where}
+            GROUP BY symbol
+            ORDER BY symbol
+        """, params)
+        return _frame(cursor, ('symbol', 'trades', 'wins', 'profit'))
+
+    def pnl_by_day(
+        self,
+        symbol: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Realized P&L per exit day and symbol.
+
+        Args:
+            symbol: Restrict to one symbol
+            start: Exit time lower bound (inclusive)
+            end: Exit time upper bound (exclusive)
+
+        Returns:
+            DataFrame with day, symbol, trades, profit
+        """
+        params: List[Any] = []
+        where = _range("exit_time", start, end, params)
+        if symbol is not None:
+            where += " AND symbol = ?"
+            params.append(symbol)
+        cursor = self._execute(f"""
+            SELECT exit_time / {_DAY_MS} AS day, symbol, COUNT(*), SUM(profit)
+            FROM trades
+            WHERE status = {_CLOSED}{where}
+            GROUP BY day, symbol
+            ORDER BY day, symbol
+        """, params)
+        df = _frame(cursor, ('day', 'symbol', 'trades', 'profit'))
+        df['day'] = pd.to_datetime(df['day'], unit='D')
+        return df
+
+    def strategy_win_rates(self) -> pd.DataFrame:
+        """
+        Closed-trade win rate and P&L per strategy.
+
+        Returns:
+            DataFrame with strategy_name, trades, wins, win_rate, profit
+        """
+        cursor = self._execute(f"""
+            SELECT strategy_name, COUNT(*), SUM(profit > 0), SUM(profit)
+            FROM trades
+            WHERE status = {_CLOSED}
+            GROUP BY strategy_name
+            ORDER BY strategy_name
+        """)
+        df = _frame(cursor, ('strategy_name', 'trades', 'wins', 'profit'))
+        df.insert(3, 'win_rate', df['wins'] / df['trades'] if len(df) else [])
+        return df
+
+    def exit_reasons(self) -> pd.DataFrame:
+        """
+        Closed trades grouped by exit reason.
+
+        Returns:
+            DataFrame with exit_reason, trades, profit, avg_profit
+        """
+        cursor = self._execute(f"""
+            SELECT exit_reason, COUNT(*), SUM(profit), AVG(profit)
+            FROM trades
+            WHERE status = {_CLOSED}
+            GROUP BY exit_reason
+            ORDER BY COUNT(*) DESC
+        """)
+        return _frame(cursor, ('exit_reason', 'trades', 'profit', 'avg_profit'))
+
+    def signals_by_strategy(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Signals generated per strategy and day.
+
+        Args:
+            start: Signal time lower bound (inclusive)
+            end: Signal time upper bound (exclusive)
+
+        Returns:
+            DataFrame with strategy_name, day, signals
+        """
+        params: List[Any] = []
+        where = _range("timestamp", start, end, params)
+        cursor = self._execute(f"""
+            SELECT strategy_name, timestamp / {_DAY_MS} AS day, COUNT(*)
+            FROM signals
+            WHERE 1 = 1{where}
+            GROUP BY strategy_name, day
+            ORDER BY strategy_name, day
+        """, params)
+        df = _frame(cursor, ('strategy_name', 'day', 'signals'))
+        df['day'] = pd.to_datetime(df['day'], unit='D')
+        return df
+
+    def equity_curve(
+        self,
+        initial_equity: float = 0.0,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Realized equity after each closed trade, in exit order.
+
+        Args:
+            initial_equity: Equity before the first trade in range
+            start: Exit time lower bound (inclusive)
+            end: Exit time upper bound (exclusive)
+
+        Returns:
+            DataFrame indexed by exit time with profit, equity, drawdown
+        """
+        params: List[Any] = []
+        where = _range("exit_time", start, end, params)
+        cursor = self._execute(f"""
+            SELECT exit_time, profit
+            FROM trades
+            WHERE status = {_CLOSED}{where}
+            ORDER BY exit_time
+        """, params)
+        df = _frame(cursor, ('exit_time', 'profit'))
+        profit = df['profit'].to_numpy(dtype=float)
+        equity = initial_equity + np.cumsum(profit)
+        peak = np.maximum.accumulate(np.concatenate(([initial_equity], equity)))[1:]
+        return pd.DataFrame(
+            {'profit': profit, 'equity': equity, 'drawdown': peak - equity},
+            index=pd.DatetimeIndex(_timestamps(df['exit_time']), name='exit_time')
+        )
+
+    def page_trades(
+        self,
+        status: str = 'CLOSED',
+        symbol: Optional[str] = None,
+        limit: int = 1000,
+        after: Optional[Tuple[int, int]] = None
+    ) -> Tuple[pd.DataFrame, Optional[Tuple[int, int]]]:
+        """
+        One page of trades in entry order (keyset pagination).
+
+        Args:
+            status: OPEN or CLOSED
+            symbol: Restrict to one symbol
+            limit: Page size
+            after: Cursor returned by the previous page (None = first page)
+
+        Returns:
+            (page, cursor for the next page or None when exhausted)
+        """
+        params: List[Any] = [encode_status(status)]
+        where = ""
+        if symbol is not None:
+            where += " AND symbol = ?"
+            params.append(symbol)
+        if after is not None:
+            where += " AND (entry_time, id) > (?, ?)"
+            params.extend(after)
+        params.append(limit)
+        cursor = self._execute(f"""
+            SELECT {', '.join(TRADE_PAGE_COLUMNS)}
+            FROM trades
+            WHERE status = ?{where}
+            ORDER BY entry_time, id
+            LIMIT ?
+        """, params)
+        page = _frame(cursor, TRADE_PAGE_COLUMNS)
+        after = None
+        if len(page) == limit:
+            after = (int(page['entry_time'].iloc[-1]), int(page['id'].iloc[-1]))
+        page['side'] = page['side'].map(TRADE_SIDES)
+        page['status'] = page['status'].map(STATUS_NAMES)
+        page['entry_time'] = _timestamps(page['entry_time'])
+        page['exit_time'] = _timestamps(page['exit_time'])
+        return page, after
+
+    def iter_trades(
+        self,
+        status: str = 'CLOSED',
+        symbol: Optional[str] = None,
+        page_size: int = 1000
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Iterate over all matching trades page by page.
+
+        Args:
+            status: OPEN or CLOSED
+            symbol: Restrict to one symbol
+            page_size: Rows per page
+
+        Yields:
+            DataFrame pages
+        """
+        after = None
+        while True:
+            page, after = self.page_trades(status, symbol, page_size, after)
+            if len(page):
+                yield page
+            if after is None:
+                return
+
+    def close(self):
+        """Close the read connection."""
+        self.conn.close()
@@ -0,0 +1,275 @@
+"""
+Bar Archive
+
+On-disk OHLC history partitioned by symbol, timeframe and month:
+
+    <root>/<SYMBOL>/<TIMEFRAME>/<YYYY-MM>.bars
+
+Each partition is a flat file of fixed-size records in the MT5 copy_rates
+layout (RATES_DTYPE), sorted by time. Reads memory-map the partitions, so
+a month of M1 bars is a zero-copy numpy view and a warm start or offline
+study never touches the terminal. Writes are append-only: only bars newer
+than the last archived bar are written, and a torn tail record left by a
+crash is ignored on read and trimmed on the next append.
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from herald.persistence.columns import column_values, epoch_seconds
+
+# Field layout of MetaTrader5.copy_rates_* results
+RATES_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('tick_volume', '<u8'),
+    ('spread', '<i4'),
+    ('real_volume', '<u8'),
+])
+
+PARTITION_SUFFIX = ".bars"
+
+
+def to_rates(bars) -> np.ndarray:
+    """
+    Convert bars to a RATES_DTYPE array sorted by time.
+
+    Args:
+        bars: MT5 rates array, DataFrame (time column or DatetimeIndex), dict
+            of columns, or list of bar dicts as returned by
+            MT5Connector.get_rates() (datetime objects are converted with
+            datetime.timestamp(), matching the connector)
+
+    Returns:
+        Structured numpy array
+    """
+    if isinstance(bars, np.ndarray) and bars.dtype == RATES_DTYPE:
+        out = bars
+    else:
+        if isinstance(bars, list):
+            bars = {name: [bar.get(name, 0) for bar in bars] for name in RATES_DTYPE.names}
+            times = bars['time']
+            if times and isinstance(times[0], datetime):
+                bars['time'] = [int(t.timestamp()) for t in times]
+        out = np.zeros(len(column_values(bars, 'time')), dtype=RATES_DTYPE)
+        for name in RATES_DTYPE.names:
+            values = column_values(bars, name)
+            if values is None:
+                if name in ('tick_volume', 'spread', 'real_volume'):
+                    continue
+                raise ValueError(f"bars missing column '{name}'")
+            out[name] = epoch_seconds(values) if name == 'time' else values
+    if len(out) > 1 and np.any(np.diff(out['time']) < 0):
+        out = np.sort(out, order='time')
+    return out
+
+
+def _month_key(seconds: int) -> str:
+    return str(np.datetime64(int(seconds), 's').astype('datetime64[M]'))
+
+
+class BarArchive:
+    """
+    Append-only, memory-mapped bar store.
+
+    Responsibilities:
+    - Append closed bars from the live loop (newer than the last archived bar)
+    - Zero-copy reads of a time range or the most recent N bars
+    """
+
+    def __init__(self, root: str = "data/bars"):
+        """
+        Initialize bar archive.
+
+        Args:
+            root: Archive root directory
+        """
+        self.root = root
+        self.logger = logging.getLogger("herald.persistence.archive")
+        self._last_time: Dict[tuple, Optional[int]] = {}
+
+    def _dir(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self.root, symbol, str(timeframe))
+
+    def partitions(self, symbol: str, timeframe: str) -> List[str]:
+        """
+        Partition files for a symbol/timeframe, oldest first.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe label (e.g. "M1")
+
+        Returns:
+            List of file paths
+        """
+        directory = self._dir(symbol, timeframe)
+        if not os.path.isdir(directory):
+            return []
+        names = sorted(n for n in os.listdir(directory) if n.endswith(PARTITION_SUFFIX))
+        return [os.path.join(directory, n) for n in names]
+
+    def _map(self, path: str) -> np.ndarray:
+        """Memory-map a partition (ignoring a torn trailing record)."""
+        count = os.path.getsize(path) // RATES_DTYPE.itemsize
+        if count == 0:
+            return np.zeros(0, dtype=RATES_DTYPE)
+        return np.memmap(path, dtype=RATES_DTYPE, mode='r', shape=(count,))
+
+    def last_time(self, symbol: str, timeframe: str) -> Optional[int]:
+        """
+        Time of the newest archived bar.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe label
+
+        Returns:
+            Epoch seconds, or None if nothing is archived
+        """
+        key = (symbol, str(timeframe))
+        if key not in self._last_time:
+            last = None
+            for path in reversed(self.partitions(symbol, timeframe)):
+                mapped = self._map(path)
+                if len(mapped):
+                    last = int(mapped['time'][-1])
+                    break
+            self._last_time[key] = last
+        return self._last_time[key]
+
+    def append(self, symbol: str, timeframe: str, bars) -> int:
+        """
+        Append closed bars newer than the last archived bar.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe label
+            bars: Bars in any format accepted by to_rates()
+
+        Returns:
+            Number of bars written
+        """
+        rates = to_rates(bars)
+        last = self.last_time(symbol, timeframe)
+        if last is not None:
+            rates = rates[rates['time'] > last]
+        if len(rates) == 0:
+            return 0
+
+        directory = self._dir(symbol, timeframe)
+        os.makedirs(directory, exist_ok=True)
+        months = rates['time'].astype('datetime64[s]').astype('datetime64[M]')
+        boundaries = np.flatnonzero(months[1:] != months[:-1]) + 1
+        for chunk in np.split(rates, boundaries):
+            path = os.path.join(directory, _month_key(chunk['time'][0]) + PARTITION_SUFFIX)
+            with open(path, 'ab') as fh:
+                # Drop a torn record left by an interrupted write
+                size = fh.tell()
+                if size % RATES_DTYPE.itemsize:
+                    fh.truncate(size - size % RATES_DTYPE.itemsize)
+                fh.write(chunk.tobytes())
+
+        self._last_time[(symbol, str(timeframe))] = int(rates['time'][-1])
+        return len(rates)
+
+    def read(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Bars in [start, end] (epoch seconds).
+
+        A range inside one partition is returned as a zero-copy memmap
+        view; ranges spanning months are concatenated.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe label
+            start: First bar time, inclusive (None = from the beginning)
+            end: Last bar time, inclusive (None = to the end)
+
+        Returns:
+            RATES_DTYPE array
+        """
+        first_month = _month_key(start) if start is not None else None
+        last_month = _month_key(end) if end is not None else None
+        pieces = []
+        for path in self.partitions(symbol, timeframe):
+            month = os.path.basename(path)[:-len(PARTITION_SUFFIX)]
+            if (first_month and month < first_month) or (last_month and month > last_month):
+                continue
+            mapped = self._map(path)
+            times = mapped['time']
+            lo = int(np.searchsorted(times, start, 'left')) if start is not None else 0
+            hi = int(np.searchsorted(times, end, 'right')) if end is not None else len(mapped)
+            if hi > lo:
+                pieces.append(mapped[lo:hi])
+        if not pieces:
+            return np.zeros(0, dtype=RATES_DTYPE)
+        if len(pieces) == 1:
+            return pieces[0]
+        return np.concatenate(pieces)
+
+    def tail(self, symbol: str, timeframe: str, count: int) -> np.ndarray:
+        """
+        The most recent `count` archived bars.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe label
+            count: Number of bars
+
+        Returns:
+            RATES_DTYPE array (may be shorter than count)
+        """
+        pieces, remaining = [], count
+        for path in reversed(self.partitions(symbol, timeframe)):
+            if remaining <= 0:
+                break
+            mapped = self._map(path)
+            take = mapped[-remaining:] if remaining < len(mapped) else mapped
+            pieces.append(take)
+            remaining -= len(take)
+        if not pieces:
+            return np.zeros(0, dtype=RATES_DTYPE)
+        if len(pieces) == 1:
+            return pieces[0]
+        return np.concatenate(pieces[::-1])
+
+    def tail_rates(self, symbol: str, timeframe: str, count: int) -> List[Dict[str, Any]]:
+        """
+        The most recent archived bars in MT5Connector.get_rates() format.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe label
+            count: Number of bars
+
+        Returns:
+            List of rate dictionaries, oldest first
+        """
+        bars = self.tail(symbol, timeframe, count)
+        columns = {name: bars[name].tolist() for name in RATES_DTYPE.names}
+        return [
+            {
+                'time': datetime.fromtimestamp(t),
+                'open': o,
+                'high': h,
+                'low': lo,
+                'close': c,
+                'tick_volume': tv,
+                'spread': sp,
+                'real_volume': rv
+            }
+            for t, o, h, lo, c, tv, sp, rv in zip(*(columns[name] for name in RATES_DTYPE.names))
+        ]
@@ -0,0 +1,103 @@
+"""
+Column Helpers
+
+Conversions shared by the persistence modules. Bars and metrics are
+accepted as a DataFrame, a numpy structured array (MT5 copy_rates result)
+or a dict of columns; timestamps are stored as integer epoch seconds (bar
+times) or milliseconds (everything else), with naive datetimes taken as
+UTC.
+"""
+
+import numbers
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+EPOCH_UNITS = {
+    's': pd.Timedelta(seconds=1),
+    'ms': pd.Timedelta(milliseconds=1),
+}
+
+_EPOCH = datetime(1970, 1, 1)
+_MS = timedelta(milliseconds=1)
+
+
+def column_values(data, name: str):
+    """Fetch one column from a DataFrame, structured array or dict of columns."""
+    if isinstance(data, pd.DataFrame):
+        if name in data.columns:
+            return data[name].to_numpy()
+        if name == 'time' and isinstance(data.index, pd.DatetimeIndex):
+            return data.index
+        return None
+    if isinstance(data, np.ndarray):
+        return data[name] if data.dtype.names and name in data.dtype.names else None
+    return data.get(name)
+
+
+def epoch_times(values, unit: str = 's') -> List[int]:
+    """
+    Convert times to integer epoch values.
+
+    Args:
+        values: datetimes (naive = UTC), ISO text, datetime64 values, or
+            numbers already in `unit`
+        unit: 's' or 'ms' (see EPOCH_UNITS)
+
+    Returns:
+        Epoch values as Python ints
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in 'iuf':
+        return arr.astype(np.int64).tolist()
+    index = pd.DatetimeIndex(pd.to_datetime(values, utc=True))
+    # Resolution varies (s/ms/ns) in pandas 2, so divide rather than read asi8
+    return ((index - pd.Timestamp(0, tz='UTC')) // EPOCH_UNITS[unit]).tolist()
+
+
+def epoch_seconds(values) -> List[int]:
+    """Convert bar times to integer epoch seconds (see epoch_times)."""
+    return epoch_times(values, 's')
+
+
+def epoch_millis(values) -> List[int]:
+    """Convert timestamps to integer epoch milliseconds (see epoch_times)."""
+    return epoch_times(values, 'ms')
+
+
+def to_epoch_ms(value) -> Optional[int]:
+    """
+    Stored form of a timestamp.
+
+    Args:
+        value: datetime (naive = UTC), epoch milliseconds, ISO text or None
+
+    Returns:
+        Epoch milliseconds, or None
+    """
+    if value is None:
+        return None
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, datetime):
+        # Per-record writes skip pandas; same rule as epoch_times
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return (value - _EPOCH) // _MS
+    return epoch_millis([value])[0]
+
+
+def from_epoch_ms(value) -> Optional[datetime]:
+    """
+    Naive (UTC) datetime for a stored timestamp.
+
+    Text values written before migration 3 (e.g. by a process still running
+    an older release) are parsed as well.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return _EPOCH + value * _MS
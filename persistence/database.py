@@ -7,11 +7,28 @@ Provides historical retention and export capabilities.
 
 import sqlite3
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
 
+import pandas as pd
+
+from herald.persistence.columns import column_values, epoch_millis, epoch_seconds, from_epoch_ms, to_epoch_ms
+from herald.persistence.migrations import (
+    STATUS_CODES, STATUS_NAMES, TRADE_SIDES, encode_side, encode_status, migrate
+)
+from herald.persistence.writer import DatabaseWriter, apply_pragmas
+
+
+# Bar columns in MT5 copy_rates order; the first five are required
+BAR_COLUMNS = ('time', 'open', 'high', 'low', 'close', 'tick_volume', 'spread', 'real_volume')
+REQUIRED_BAR_COLUMNS = BAR_COLUMNS[:5]
+
+
+def _to_list(values) -> list:
+    return values.tolist() if hasattr(values, 'tolist') else list(values)
+
 
 @dataclass
 class TradeRecord:
@@ -32,6 +49,8 @@ class TradeRecord:
     status: str = "OPEN"
     exit_reason: str = ""
     metadata: str = ""  # JSON string
+    strategy_name: str = ""
+    commission: float = 0.0
 
 
 @dataclass
@@ -52,6 +71,7 @@ class SignalRecord:
     executed: bool = False
     metadata: str = ""  # JSON string
     execution_timestamp: Optional[datetime] = None
+    strategy_name: str = ""
 
 
 class Database:
@@ -63,18 +83,36 @@ class Database:
     - Provide query interface for analytics
     - Historical data retention
     - Export capabilities
+    
+    The file runs in WAL mode. With async_writes (default) inserts and
+    updates go through a DatabaseWriter thread that group-commits them, so
+    the trading thread never waits on an fsync; reads flush pending writes
+    first so they always see them.
     """
     
-    def __init__(self, db_path: str = "herald.db"):
+    def __init__(
+        self,
+        db_path: str = "herald.db",
+        async_writes: bool = True,
+        durability: str = "normal",
+        batch_size: int = 256,
+        max_batch_delay_ms: float = 20.0
+    ):
         """
         Initialize database connection.
         
         Args:
             db_path: Path to SQLite database file
+            async_writes: Queue writes to a background group-commit thread
+            durability: off, normal or full (see persistence.writer)
+            batch_size: Maximum statements per group commit
+            max_batch_delay_ms: Maximum wait for a batch to fill
         """
         self.db_path = Path(db_path)
         self.logger = logging.getLogger("herald.persistence")
         self.conn: Optional[sqlite3.Connection] = None
+        self.durability = durability
+        self.writer: Optional[DatabaseWriter] = None
         
         # Create database directory if needed
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -82,87 +120,81 @@ class Database:
         # Initialize database
         self._initialize_db()
         
-    def _initialize_db(self):
-        """Create database tables if they don't exist."""
-        try:
-            self.conn = sqlite3.connect(
+        if async_writes:
+            self.writer = DatabaseWriter(
                 self.db_path,
-                detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+                durability=durability,
+                batch_size=batch_size,
+                max_batch_delay_ms=max_batch_delay_ms
             )
+            self.writer.start()
+            
+    def _initialize_db(self):
+        """Open the connection and bring the schema up to date (see persistence.migrations)."""
+        try:
+            # Timestamps are stored as epoch ms and converted by the readers,
+            # so no per-column type detection
+            self.conn = sqlite3.connect(self.db_path)
             self.conn.row_factory = sqlite3.Row
+            # Only takes effect on a new file (see persistence.maintenance)
+            self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            apply_pragmas(self.conn, self.durability)
             
-            cursor = self.conn.cursor()
+            migrate(self.conn)
             
-            # Trades table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS trades (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    signal_id TEXT NOT NULL,
-                    order_id INTEGER,
-                    symbol TEXT NOT NULL,
-                    side TEXT NOT NULL,
-                    volume REAL NOT NULL,
-                    entry_price REAL NOT NULL,
-                    exit_price REAL,
-                    stop_loss REAL,
-                    take_profit REAL,
-                    entry_time TIMESTAMP NOT NULL,
-                    exit_time TIMESTAMP,
-                    profit REAL,
-                    status TEXT DEFAULT 'OPEN',
-                    exit_reason TEXT,
-                    metadata TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Signals table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS signals (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    signal_id TEXT UNIQUE NOT NULL,
-                    timestamp TIMESTAMP NOT NULL,
-                    symbol TEXT NOT NULL,
-                    timeframe TEXT NOT NULL,
-                    side TEXT NOT NULL,
-                    action TEXT NOT NULL,
-                    confidence REAL NOT NULL,
-                    price REAL,
-                    stop_loss REAL,
-                    take_profit REAL,
-                    reason TEXT,
-                    executed BOOLEAN DEFAULT FALSE,
-                    execution_timestamp TIMESTAMP,
-                    metadata TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Metrics table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TIMESTAMP NOT NULL,
-                    metric_name TEXT NOT NULL,
-                    metric_value REAL NOT NULL,
-                    metadata TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Create indexes
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_signals_symbol ON signals(symbol)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_signals_timestamp ON signals(timestamp)")
-            
-            self.conn.commit()
             self.logger.info(f"Database initialized: {self.db_path}")
             
         except Exception as e:
             self.logger.error(f"Database initialization failed: {e}", exc_info=True)
             raise
             
+    def _queued(self) -> bool:
+        """True if writes go to the writer thread (dropped if it has stopped)."""
+        if self.writer is None:
+            return False
+        if self.writer.running:
+            return True
+        self.logger.error("Database writer stopped; writing on the calling thread from now on")
+        self.writer = None
+        return False
+        
+    def _write(self, sql: str, params: tuple) -> Optional[sqlite3.Cursor]:
+        """
+        Run a write statement.
+        
+        Queued to the writer thread when async writes are on (returns None),
+        otherwise executed and committed on the calling thread.
+        """
+        if self._queued():
+            self.writer.submit(sql, params)
+            return None
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
+        self.conn.commit()
+        return cursor
+        
+    def _write_many(self, sql: str, rows: List[Sequence[Any]]):
+        """Run one executemany in a single transaction (queued when async)."""
+        if self._queued():
+            self.writer.submit_many(sql, rows)
+            return
+        with self.conn:
+            self.conn.executemany(sql, rows)
+            
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all queued writes are committed.
+        
+        Args:
+            timeout: Maximum seconds to wait (None = forever)
+            
+        Returns:
+            True if every queued write was committed in time
+        """
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout)
+        
     def record_signal(self, signal_record: SignalRecord) -> int:
         """
         Record a trading signal.
@@ -171,21 +203,21 @@ class Database:
             signal_record: Signal record to store
             
         Returns:
-            Database row ID
+            Database row ID (0 if queued to the background writer)
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
+            cursor = self._write("""
                 INSERT INTO signals (
                     signal_id, timestamp, symbol, timeframe, side, action,
-                    confidence, price, stop_loss, take_profit, reason, executed, execution_timestamp, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    confidence, price, stop_loss, take_profit, reason, executed, execution_timestamp, metadata,
+                    strategy_name
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 signal_record.signal_id,
-                signal_record.timestamp,
+                to_epoch_ms(signal_record.timestamp),
                 signal_record.symbol,
                 signal_record.timeframe,
-                signal_record.side,
+                encode_side(signal_record.side),
                 signal_record.action,
                 signal_record.confidence,
                 signal_record.price,
@@ -193,13 +225,13 @@ class Database:
                 signal_record.take_profit,
                 signal_record.reason,
                 int(signal_record.executed),
-                signal_record.execution_timestamp,
-                signal_record.metadata
+                to_epoch_ms(signal_record.execution_timestamp),
+                signal_record.metadata,
+                signal_record.strategy_name
             ))
-            self.conn.commit()
             
-            row_id = cursor.lastrowid
-            self.logger.debug(f"Signal recorded: {signal_record.signal_id} (ID: {row_id})")
+            row_id = cursor.lastrowid if cursor is not None else 0
+            self.logger.debug(f"Signal recorded: {signal_record.signal_id} (ID: {row_id or 'queued'})")
             return row_id
             
         except Exception as e:
@@ -214,32 +246,32 @@ class Database:
             trade_record: Trade record to store
             
         Returns:
-            Database row ID
+            Database row ID (0 if queued to the background writer)
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
+            cursor = self._write("""
                 INSERT INTO trades (
                     signal_id, order_id, symbol, side, volume, entry_price,
-                    stop_loss, take_profit, entry_time, status, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    stop_loss, take_profit, entry_time, status, metadata, strategy_name, commission
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 trade_record.signal_id,
                 trade_record.order_id,
                 trade_record.symbol,
-                trade_record.side,
+                encode_side(trade_record.side),
                 trade_record.volume,
                 trade_record.entry_price,
                 trade_record.stop_loss,
                 trade_record.take_profit,
-                trade_record.entry_time,
-                trade_record.status,
-                trade_record.metadata
+                to_epoch_ms(trade_record.entry_time),
+                encode_status(trade_record.status),
+                trade_record.metadata,
+                trade_record.strategy_name,
+                trade_record.commission
             ))
-            self.conn.commit()
             
-            row_id = cursor.lastrowid
-            self.logger.info(f"Trade recorded: {trade_record.symbol} {trade_record.side} (ID: {row_id})")
+            row_id = cursor.lastrowid if cursor is not None else 0
+            self.logger.info(f"Trade recorded: {trade_record.symbol} {trade_record.side} (ID: {row_id or 'queued'})")
             return row_id
             
         except Exception as e:
@@ -265,20 +297,25 @@ class Database:
             exit_reason: Reason for exit
             
         Returns:
-            True if updated successfully
+            True if updated successfully (or queued to the background writer)
         """
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
+        sql = """
                 UPDATE trades
                 SET exit_price = ?,
                     exit_time = ?,
                     profit = ?,
-                    status = 'CLOSED',
+                    status = ?,
                     exit_reason = ?
                 WHERE order_id = ?
-            """, (exit_price, exit_time, profit, exit_reason, order_id))
-            self.conn.commit()
+            """
+        params = (exit_price, to_epoch_ms(exit_time), profit, STATUS_CODES['CLOSED'], exit_reason, order_id)
+        try:
+            if self._queued():
+                future = self.writer.execute(sql, params)
+                future.add_done_callback(lambda f: self._log_trade_exit(f, order_id, profit))
+                return True
+                
+            cursor = self._write(sql, params)
             
             if cursor.rowcount > 0:
                 self.logger.info(f"Trade exit recorded: Order #{order_id} | Profit: {profit:.2f}")
@@ -291,6 +328,16 @@ class Database:
             self.logger.error(f"Failed to update trade exit: {e}", exc_info=True)
             return False
             
+    def _log_trade_exit(self, future, order_id: int, profit: float):
+        """Report the outcome of a queued trade-exit update."""
+        if future.exception() is not None:
+            return  # Already logged by the writer
+        _, rowcount = future.result()
+        if rowcount > 0:
+            self.logger.info(f"Trade exit recorded: Order #{order_id} | Profit: {profit:.2f}")
+        else:
+            self.logger.warning(f"Trade not found for update: Order #{order_id}")
+            
     def get_open_trades(self) -> List[TradeRecord]:
         """
         Get all open trades.
@@ -299,12 +346,13 @@ class Database:
             List of open trade records
         """
         try:
+            self.flush()
             cursor = self.conn.cursor()
             cursor.execute("""
                 SELECT * FROM trades
-                WHERE status = 'OPEN'
+                WHERE status = ?
                 ORDER BY entry_time DESC
-            """)
+            """, (STATUS_CODES['OPEN'],))
             
             trades = []
             for row in cursor.fetchall():
@@ -313,18 +361,20 @@ class Database:
                     signal_id=row['signal_id'],
                     order_id=row['order_id'],
                     symbol=row['symbol'],
-                    side=row['side'],
+                    side=TRADE_SIDES.get(row['side'], ""),
                     volume=row['volume'],
                     entry_price=row['entry_price'],
                     exit_price=row['exit_price'],
                     stop_loss=row['stop_loss'],
                     take_profit=row['take_profit'],
-                    entry_time=row['entry_time'],
-                    exit_time=row['exit_time'],
+                    entry_time=from_epoch_ms(row['entry_time']),
+                    exit_time=from_epoch_ms(row['exit_time']),
                     profit=row['profit'],
-                    status=row['status'],
+                    status=STATUS_NAMES[row['status']],
                     exit_reason=row['exit_reason'],
-                    metadata=row['metadata']
+                    metadata=row['metadata'],
+                    strategy_name=row['strategy_name'] or "",
+                    commission=row['commission'] or 0.0
                 ))
             
             return trades
@@ -346,20 +396,178 @@ class Database:
             True if recorded successfully
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
+            self._write("""
                 INSERT INTO metrics (timestamp, metric_name, metric_value, metadata)
                 VALUES (?, ?, ?, ?)
-            """, (datetime.now(), name, value, metadata))
-            self.conn.commit()
+            """, (to_epoch_ms(datetime.now()), name, value, metadata))
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to record metric: {e}", exc_info=True)
             return False
             
+    def record_metrics_bulk(self, metrics, timestamp: Optional[datetime] = None) -> int:
+        """
+        Record many metrics in one transaction.
+        
+        Args:
+            metrics: Rows of (name, value[, metadata[, timestamp]]), or columns
+                as a dict/DataFrame with 'name', 'value' and optional
+                'metadata', 'timestamp'
+            timestamp: Timestamp for rows without one (defaults to now)
+            
+        Returns:
+            Number of rows written (or queued), -1 on error
+        """
+        try:
+            default_ms = to_epoch_ms(timestamp or datetime.now())
+            if isinstance(metrics, (dict, pd.DataFrame)):
+                names = _to_list(column_values(metrics, 'name'))
+                values = _to_list(column_values(metrics, 'value'))
+                metadata = column_values(metrics, 'metadata')
+                metadata = _to_list(metadata) if metadata is not None else [""] * len(names)
+                stamps = column_values(metrics, 'timestamp')
+                stamps = epoch_millis(stamps) if stamps is not None else [default_ms] * len(names)
+                rows = list(zip(stamps, names, values, metadata))
+            else:
+                rows = []
+                for row in metrics:
+                    name, value = row[0], row[1]
+                    meta = row[2] if len(row) > 2 else ""
+                    ts = to_epoch_ms(row[3]) if len(row) > 3 else default_ms
+                    rows.append((ts, name, value, meta))
+                    
+            self._write_many("""
+                INSERT INTO metrics (timestamp, metric_name, metric_value, metadata)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            return len(rows)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to record metrics: {e}", exc_info=True)
+            return -1
+            
+    def record_bars_bulk(self, symbol: str, timeframe: str, bars) -> int:
+        """
+        Upsert OHLC bars in one transaction.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe label (e.g. "H1")
+            bars: MT5 rates structured array, DataFrame (time column or
+                DatetimeIndex), dict of columns, or list of bar dicts
+            
+        Returns:
+            Number of rows written (or queued), -1 on error
+        """
+        try:
+            if isinstance(bars, list):
+                bars = {name: [bar.get(name) for bar in bars] for name in BAR_COLUMNS}
+            columns = {}
+            for name in BAR_COLUMNS:
+                values = column_values(bars, name)
+                if values is None:
+                    if name in REQUIRED_BAR_COLUMNS:
+                        raise ValueError(f"bars missing column '{name}'")
+                    continue
+                columns[name] = epoch_seconds(values) if name == 'time' else _to_list(values)
+                
+            count = len(columns['time'])
+            symbols = [symbol] * count
+            timeframes = [str(timeframe)] * count
+            missing = [None] * count
+            rows = list(zip(
+                symbols, timeframes,
+                *(columns.get(name, missing) for name in BAR_COLUMNS)
+            ))
+            
+            self._write_many("""
+                INSERT OR REPLACE INTO bars (
+                    symbol, timeframe, time, open, high, low, close,
+                    tick_volume, spread, real_volume
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            return count
+            
+        except Exception as e:
+            self.logger.error(f"Failed to record bars: {e}", exc_info=True)
+            return -1
+            
+    def get_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Read stored bars.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe label
+            start: First bar time, epoch seconds (inclusive)
+            end: Last bar time, epoch seconds (inclusive)
+            
+        Returns:
+            DataFrame indexed by UTC bar time
+        """
+        self.flush()
+        query = "SELECT time, open, high, low, close, tick_volume, spread, real_volume FROM bars WHERE symbol = ? AND timeframe = ?"
+        params: List[Any] = [symbol, str(timeframe)]
+        if start is not None:
+            query += " AND time >= ?"
+            params.append(int(start))
+        if end is not None:
+            query += " AND time <= ?"
+            params.append(int(end))
+        query += " ORDER BY time"
+        
+        df = pd.DataFrame(self.conn.execute(query, params).fetchall(), columns=list(BAR_COLUMNS))
+        df.index = pd.to_datetime(df.pop('time'), unit='s', utc=True)
+        return df
+        
+    def get_metric_rollups(
+        self,
+        name: str,
+        resolution: int = 60,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Read metric aggregates produced by DatabaseMaintenance.
+        
+        Args:
+            name: Metric name
+            resolution: Bucket size in seconds (60, 3600 or 86400)
+            start: First bucket, epoch seconds (inclusive)
+            end: Last bucket, epoch seconds (inclusive)
+            
+        Returns:
+            DataFrame indexed by bucket start with count, min, max, avg
+        """
+        query = (
+            "SELECT bucket, count, min, max, sum / count FROM metric_rollups "
+            "WHERE metric_name = ? AND resolution = ?"
+        )
+        params: List[Any] = [name, int(resolution)]
+        if start is not None:
+            query += " AND bucket >= ?"
+            params.append(int(start))
+        if end is not None:
+            query += " AND bucket <= ?"
+            params.append(int(end))
+        query += " ORDER BY bucket"
+        
+        df = pd.DataFrame(self.conn.execute(query, params).fetchall(), columns=['bucket', 'count', 'min', 'max', 'avg'])
+        df.index = pd.to_datetime(df.pop('bucket'), unit='s', utc=True)
+        return df
+        
     def close(self):
-        """Close database connection."""
+        """Flush queued writes and close database connections."""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
         if self.conn:
             self.conn.close()
             self.logger.info("Database connection closed")
@@ -0,0 +1,597 @@
+"""
+Trading Journal
+
+Append-only binary log of domain events with periodic snapshots, used to
+rebuild live state after a restart: tracked positions, exit strategy state
+(trailing levels, partial targets hit, adverse-move history) and the risk
+manager's daily P&L.
+
+Layout of the journal directory:
+
+    snapshot.json             Projection of every event up to its "seq"
+    journal-<first seq>.bin   Event segments written after that snapshot
+
+Each event is one frame: a fixed header (payload length, CRC32, sequence
+number, event type, timestamp) followed by a compact JSON payload. Frames
+are encoded on the caller's thread and handed to a writer thread that
+appends whole batches with a single write, so the trading loop never waits
+on disk. Recovery loads the snapshot and replays newer frames, stopping at
+the first torn or corrupt frame of a segment.
+"""
+
+import copy
+import json
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from herald.persistence.writer import DURABILITY_LEVELS
+
+EVENT_TYPES = {
+    'signal': 1,
+    'order': 2,
+    'fill': 3,
+    'modify': 4,
+    'exit': 5,
+    'state': 6,
+}
+_EVENT_NAMES = {code: name for name, code in EVENT_TYPES.items()}
+
+# payload length, crc32, seq, event type, timestamp
+_HEADER = struct.Struct('<IIQBd')
+_CRC_FIELDS = struct.Struct('<QBd')
+
+SNAPSHOT_FILE = "snapshot.json"
+SEGMENT_PREFIX = "journal-"
+SEGMENT_SUFFIX = ".bin"
+
+
+def empty_state() -> Dict[str, Any]:
+    """Projection before any event."""
+    return {
+        'positions': {},
+        'orders': {},
+        'exit_state': {},
+        'risk': {'date': None, 'daily_pnl': 0.0, 'trade_count': 0},
+    }
+
+
+def apply_event(state: Dict[str, Any], event_type: str, payload: Dict[str, Any], timestamp: float):
+    """
+    Fold one event into the projection.
+
+    Tickets are stored as strings so the projection round-trips through JSON.
+
+    Args:
+        state: Projection to update in place
+        event_type: Key of EVENT_TYPES
+        payload: Event data
+        timestamp: Event time (epoch seconds)
+    """
+    positions = state['positions']
+    if event_type == 'order':
+        state['orders'][payload['signal_id']] = payload
+    elif event_type == 'fill':
+        if payload.get('signal_id'):
+            state['orders'].pop(payload['signal_id'], None)
+        positions[str(payload['ticket'])] = payload
+    elif event_type == 'modify':
+        position = positions.get(str(payload['ticket']))
+        if position is not None:
+            position.update(payload)
+    elif event_type == 'exit':
+        ticket = str(payload['ticket'])
+        position = positions.get(ticket)
+        remaining = payload.get('remaining_volume')
+        if position is not None and remaining:
+            position['volume'] = remaining
+        else:
+            positions.pop(ticket, None)
+            for states in state['exit_state'].values():
+                states.pop(ticket, None)
+        if payload.get('profit') is not None:
+            risk = state['risk']
+            day = date.fromtimestamp(timestamp).isoformat()
+            if risk['date'] != day:
+                risk.update(date=day, daily_pnl=0.0, trade_count=0)
+            risk['daily_pnl'] += payload['profit']
+            risk['trade_count'] += 1
+    elif event_type == 'state':
+        states = state['exit_state'].setdefault(payload['strategy'], {})
+        if payload['state'] is None:
+            states.pop(str(payload['ticket']), None)
+        else:
+            states[str(payload['ticket'])] = payload['state']
+
+
+def _encode(seq: int, event_type: str, payload: Dict[str, Any], timestamp: float) -> bytes:
+    code = EVENT_TYPES[event_type]
+    body = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+    crc = zlib.crc32(body, zlib.crc32(_CRC_FIELDS.pack(seq, code, timestamp)))
+    return _HEADER.pack(len(body), crc, seq, code, timestamp) + body
+
+
+def read_segment(path: str) -> Iterator[Tuple[int, str, Dict[str, Any], float]]:
+    """
+    Decode the frames of one segment.
+
+    Stops silently at a torn or corrupt frame (a crash mid-write).
+
+    Args:
+        path: Segment file
+
+    Yields:
+        (seq, event_type, payload, timestamp)
+    """
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    offset, end = 0, len(data)
+    while offset + _HEADER.size <= end:
+        length, crc, seq, code, timestamp = _HEADER.unpack_from(data, offset)
+        body = data[offset + _HEADER.size:offset + _HEADER.size + length]
+        if len(body) < length or code not in _EVENT_NAMES:
+            return
+        if zlib.crc32(body, zlib.crc32(_CRC_FIELDS.pack(seq, code, timestamp))) != crc:
+            return
+        yield seq, _EVENT_NAMES[code], json.loads(body), timestamp
+        offset += _HEADER.size + length
+
+
+class _Snapshot:
+    """Queue marker: persist a snapshot and start a new segment."""
+
+    __slots__ = ("seq", "data")
+
+    def __init__(self, seq: int, data: bytes):
+        self.seq = seq
+        self.data = data
+
+
+class _Barrier:
+    """Queue marker: set once every earlier frame is written."""
+
+    __slots__ = ("event",)
+
+    def __init__(self):
+        self.event = threading.Event()
+
+
+_STOP = object()
+
+
+class TradingJournal:
+    """
+    Event journal with snapshot + replay recovery.
+
+    Usage:
+        journal = TradingJournal("journal")
+        state = journal.recover()
+        restore_state(state, position_manager, exit_strategies, risk_manager)
+        journal.start()
+        ...
+        journal.record_exit(...)
+        journal.close()
+    """
+
+    def __init__(
+        self,
+        directory: str = "journal",
+        durability: str = "normal",
+        snapshot_every: int = 1000,
+        max_batch_delay_ms: float = 20.0,
+        queue_size: int = 10000
+    ):
+        """
+        Initialize trading journal.
+
+        Args:
+            directory: Journal directory
+            durability: One of DURABILITY_LEVELS ('off': never fsync,
+                'normal': fsync snapshots and on close, 'full': fsync every batch)
+            snapshot_every: Events between automatic snapshots
+            max_batch_delay_ms: How long the writer gathers frames before a write
+            queue_size: Maximum queued frames (appends block when full)
+        """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level: {durability}")
+        self.directory = directory
+        self.durability = durability
+        self.snapshot_every = snapshot_every
+        self.max_batch_delay = max_batch_delay_ms / 1000.0
+        self.logger = logging.getLogger("herald.persistence.journal")
+
+        self.state = empty_state()
+        self.seq = 0
+        self._since_snapshot = 0
+        self._recovered = False
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._segment = None
+
+        # Counters (written by the writer thread only)
+        self.written_events = 0
+        self.written_batches = 0
+
+    @property
+    def running(self) -> bool:
+        """True while the writer thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _segments(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(
+            n for n in os.listdir(self.directory)
+            if n.startswith(SEGMENT_PREFIX) and n.endswith(SEGMENT_SUFFIX)
+        )
+        return [os.path.join(self.directory, n) for n in names]
+
+    def recover(self) -> Dict[str, Any]:
+        """
+        Rebuild the projection from the snapshot and newer events.
+
+        Returns:
+            Recovered state (see empty_state())
+        """
+        started = time.perf_counter()
+        state, seq = empty_state(), 0
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, 'r', encoding='utf-8') as fh:
+                snapshot = json.load(fh)
+            state, seq = snapshot['state'], snapshot['seq']
+
+        replayed = 0
+        for path in self._segments():
+            for event_seq, event_type, payload, timestamp in read_segment(path):
+                if event_seq <= seq:
+                    continue
+                apply_event(state, event_type, payload, timestamp)
+                seq = event_seq
+                replayed += 1
+
+        self.state, self.seq = state, seq
+        self._since_snapshot = replayed
+        self._recovered = True
+        self.logger.info(
+            "Journal recovered to seq %s (%s events replayed, %s positions) in %.1f ms",
+            seq, replayed, len(state['positions']), (time.perf_counter() - started) * 1000
+        )
+        return copy.deepcopy(state)
+
+    def start(self):
+        """Open a new segment and start the writer thread."""
+        if self.running:
+            return
+        if not self._recovered:
+            self.recover()
+        os.makedirs(self.directory, exist_ok=True)
+        self._open_segment(self.seq + 1)
+        self._thread = threading.Thread(target=self._run, name="herald-journal", daemon=True)
+        self._thread.start()
+
+    def append(self, event_type: str, payload: Dict[str, Any], timestamp: Optional[float] = None):
+        """
+        Record an event.
+
+        Args:
+            event_type: Key of EVENT_TYPES
+            payload: JSON-serializable event data
+            timestamp: Event time (default: now)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        self.seq += 1
+        apply_event(self.state, event_type, payload, timestamp)
+        if self.running:
+            self._queue.put(_encode(self.seq, event_type, payload, timestamp))
+        self._since_snapshot += 1
+        if self.snapshot_every and self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self):
+        """Persist the current projection and compact older segments."""
+        self._since_snapshot = 0
+        if not self.running:
+            return
+        data = json.dumps({'seq': self.seq, 'state': self.state}, separators=(',', ':')).encode('utf-8')
+        self._queue.put(_Snapshot(self.seq, data))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every event recorded so far is written.
+
+        Args:
+            timeout: Maximum seconds to wait (None = forever)
+
+        Returns:
+            True if the barrier was reached
+        """
+        if not self.running:
+            return self._queue.empty()
+        barrier = _Barrier()
+        self._queue.put(barrier)
+        return barrier.event.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """Take a final snapshot, drain the queue and stop the writer."""
+        if not self.running:
+            return
+        self.snapshot()
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    # Domain events
+
+    def record_signal(self, signal):
+        """
+        Record a strategy signal.
+
+        Args:
+            signal: Signal from the strategy
+        """
+        self.append('signal', {
+            'signal_id': signal.id,
+            'symbol': signal.symbol,
+            'side': signal.side.name,
+            'confidence': signal.confidence,
+            'price': signal.price,
+            'stop_loss': signal.stop_loss,
+            'take_profit': signal.take_profit,
+        })
+
+    def record_order(self, order_request):
+        """
+        Record an entry order handed to the broker.
+
+        Args:
+            order_request: OrderRequest being submitted
+        """
+        self.append('order', {
+            'signal_id': order_request.signal_id,
+            'symbol': order_request.symbol,
+            'side': order_request.side,
+            'volume': order_request.volume,
+            'sl': order_request.sl,
+            'tp': order_request.tp,
+        })
+
+    def record_fill(self, position, signal_id: Optional[str] = None):
+        """
+        Record a newly tracked position.
+
+        Args:
+            position: PositionInfo
+            signal_id: Originating signal (None for reconciled/adopted positions)
+        """
+        self.append('fill', {
+            'ticket': position.ticket,
+            'signal_id': signal_id,
+            'symbol': position.symbol,
+            'side': position.side,
+            'volume': position.volume,
+            'open_price': position.open_price,
+            'open_time': position.open_time.timestamp(),
+            'stop_loss': position.stop_loss,
+            'take_profit': position.take_profit,
+            'magic_number': position.magic_number,
+            'comment': position.comment,
+        })
+
+    def record_exit(
+        self,
+        ticket: int,
+        reason: str,
+        price: Optional[float] = None,
+        profit: Optional[float] = None,
+        remaining_volume: Optional[float] = None
+    ):
+        """
+        Record a position exit decision that was filled.
+
+        Args:
+            ticket: Position ticket
+            reason: Exit reason
+            price: Exit fill price
+            profit: Realized P&L counted against the daily limit
+            remaining_volume: Volume still open after a partial close
+        """
+        self.append('exit', {
+            'ticket': ticket,
+            'reason': reason,
+            'price': price,
+            'profit': profit,
+            'remaining_volume': remaining_volume,
+        })
+
+    def sync_positions(self, positions: Iterable):
+        """
+        Journal differences between tracked positions and the projection.
+
+        New tickets are recorded as fills, SL/TP/volume changes as
+        modifications and vanished tickets (closed at the broker) as exits
+        without P&L.
+
+        Args:
+            positions: Current PositionInfo objects
+        """
+        seen = set()
+        for position in positions:
+            key = str(position.ticket)
+            seen.add(key)
+            known = self.state['positions'].get(key)
+            if known is None:
+                self.record_fill(position)
+            elif (known['stop_loss'], known['take_profit'], known['volume']) != (
+                position.stop_loss, position.take_profit, position.volume
+            ):
+                self.append('modify', {
+                    'ticket': position.ticket,
+                    'stop_loss': position.stop_loss,
+                    'take_profit': position.take_profit,
+                    'volume': position.volume,
+                })
+        for key in [k for k in self.state['positions'] if k not in seen]:
+            self.record_exit(int(key), "Closed at broker")
+
+    def record_exit_states(self, exit_strategies: Iterable):
+        """
+        Journal per-position exit strategy state that changed.
+
+        Args:
+            exit_strategies: ExitStrategy instances
+        """
+        for strategy in exit_strategies:
+            # Normalize through JSON so tuples/ints compare equal to the projection
+            current = json.loads(json.dumps({str(k): v for k, v in strategy.export_state().items()}))
+            known = self.state['exit_state'].get(strategy.name, {})
+            for ticket, state in current.items():
+                if known.get(ticket) != state:
+                    self.append('state', {'strategy': strategy.name, 'ticket': ticket, 'state': state})
+            for ticket in [t for t in known if t not in current]:
+                self.append('state', {'strategy': strategy.name, 'ticket': ticket, 'state': None})
+
+    # Writer thread
+
+    def _open_segment(self, first_seq: int):
+        path = os.path.join(self.directory, f"{SEGMENT_PREFIX}{first_seq:016d}{SEGMENT_SUFFIX}")
+        self._segment = open(path, 'wb')
+
+    def _sync(self):
+        self._segment.flush()
+        if self.durability != 'off':
+            os.fsync(self._segment.fileno())
+
+    def _run(self):
+        try:
+            stop = False
+            while not stop:
+                item = self._queue.get()
+                frames, markers, stop = self._collect(item)
+                if frames:
+                    self._segment.write(b''.join(frames))
+                    if self.durability == 'full':
+                        self._sync()
+                    else:
+                        self._segment.flush()
+                    self.written_events += len(frames)
+                    self.written_batches += 1
+                for marker in markers:
+                    if isinstance(marker, _Snapshot):
+                        self._write_snapshot(marker)
+                    else:
+                        marker.event.set()
+        except Exception as e:
+            self.logger.error("Journal writer failed: %s", e, exc_info=True)
+        finally:
+            self._sync()
+            self._segment.close()
+
+    def _collect(self, first):
+        """Gather frames until a marker, the batch delay or a stop request."""
+        frames, markers = [], []
+        stop = False
+        item = first
+        deadline = time.monotonic() + self.max_batch_delay
+        while True:
+            if item is _STOP:
+                stop = True
+                break
+            if isinstance(item, (_Snapshot, _Barrier)):
+                markers.append(item)
+                break
+            frames.append(item)
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+        return frames, markers, stop
+
+    def _write_snapshot(self, snapshot: _Snapshot):
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, 'wb') as fh:
+            fh.write(snapshot.data)
+            fh.flush()
+            if self.durability != 'off':
+                os.fsync(fh.fileno())
+        os.replace(tmp, path)
+
+        # Everything up to snapshot.seq is in the snapshot: start a new segment
+        # and drop the old ones
+        self._sync()
+        self._segment.close()
+        old = self._segments()
+        self._open_segment(snapshot.seq + 1)
+        current = self._segment.name
+        for segment in old:
+            if segment != current:
+                os.remove(segment)
+
+
+def restore_state(
+    state: Dict[str, Any],
+    position_manager=None,
+    exit_strategies: Iterable = (),
+    risk_manager=None
+) -> int:
+    """
+    Apply a recovered projection to live components.
+
+    Positions are re-registered before broker reconciliation, which only
+    adds tickets missing from the journal; any that closed while Herald was
+    down are dropped by the next PositionManager.monitor_positions() as
+    closed externally. Exit strategy state is handed to each strategy by
+    name; the risk manager's daily P&L is restored if it belongs to today.
+
+    Args:
+        state: Projection from TradingJournal.recover()
+        position_manager: PositionManager to repopulate
+        exit_strategies: ExitStrategy instances
+        risk_manager: RiskManager whose daily counters are restored
+
+    Returns:
+        Number of positions restored
+    """
+    from herald.position.manager import PositionInfo
+
+    restored = 0
+    if position_manager is not None:
+        for data in state['positions'].values():
+            ticket = int(data['ticket'])
+            if position_manager.get_position(ticket) is not None:
+                continue
+            position_manager.add_position(PositionInfo(
+                ticket=ticket,
+                symbol=data['symbol'],
+                side=data['side'],
+                volume=data['volume'],
+                open_price=data['open_price'],
+                open_time=datetime.fromtimestamp(data['open_time']),
+                stop_loss=data['stop_loss'],
+                take_profit=data['take_profit'],
+                magic_number=data.get('magic_number', 0),
+                comment=data.get('comment', ""),
+            ))
+            restored += 1
+
+    for strategy in exit_strategies:
+        states = state['exit_state'].get(strategy.name)
+        if states:
+            strategy.restore_state(states)
+
+    risk = state['risk']
+    if risk_manager is not None and risk['date'] == date.today().isoformat():
+        risk_manager.daily_pnl = risk['daily_pnl']
+        risk_manager.trade_count = risk['trade_count']
+        risk_manager.current_date = date.today()
+
+    return restored
@@ -0,0 +1,279 @@
+"""
+Database Maintenance
+
+Background jobs that keep the metrics table bounded:
+
+- Rollup: raw metric points are folded into 1 minute, 1 hour and 1 day
+  aggregates (count, min, max, sum) in metric_rollups. Progress is tracked
+  by a high-water mark on metrics.id, so each run only reads new rows and
+  buckets are merged with an upsert (a bucket can span several runs).
+- Retention: raw points older than raw_retention_days are deleted once they
+  have been rolled up; rollups expire per resolution.
+- Vacuum: freed pages are returned to the OS with PRAGMA incremental_vacuum
+  (databases created before auto_vacuum=INCREMENTAL need one full VACUUM,
+  see enable_incremental_vacuum()).
+
+Jobs run on their own thread and connection in small transactions, so the
+DatabaseWriter only ever waits for one chunk (busy_timeout) and WAL readers
+are never blocked.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from herald.persistence.columns import to_epoch_ms
+from herald.persistence.writer import apply_pragmas
+
+# Rollup resolutions (seconds) -> rollup retention in days (None = keep forever)
+DEFAULT_ROLLUP_RETENTION: Dict[int, Optional[float]] = {
+    60: 30,
+    3600: 365,
+    86400: None,
+}
+
+_WATERMARK_KEY = "metrics_rollup_id"
+
+
+class DatabaseMaintenance:
+    """
+    Periodic rollup, retention and vacuum for the Herald database.
+
+    Usage:
+        maintenance = DatabaseMaintenance("herald.db")
+        maintenance.start()
+        ...
+        maintenance.stop()
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        interval_secs: float = 300.0,
+        raw_retention_days: float = 7.0,
+        rollup_retention: Optional[Dict[int, Optional[float]]] = None,
+        chunk_rows: int = 20000,
+        vacuum_pages: int = 1000
+    ):
+        """
+        Initialize maintenance.
+
+        Args:
+            db_path: Path to SQLite database file
+            interval_secs: Time between maintenance runs
+            raw_retention_days: Age after which rolled-up raw points are deleted
+            rollup_retention: Resolution (seconds) -> retention in days
+            chunk_rows: Raw rows processed per transaction
+            vacuum_pages: Free pages released per run
+        """
+        self.db_path = str(db_path)
+        self.interval_secs = interval_secs
+        self.raw_retention_days = raw_retention_days
+        self.rollup_retention = dict(DEFAULT_ROLLUP_RETENTION if rollup_retention is None else rollup_retention)
+        self.chunk_rows = chunk_rows
+        self.vacuum_pages = vacuum_pages
+        self.logger = logging.getLogger("herald.persistence.maintenance")
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._warned_vacuum = False
+
+    @property
+    def running(self) -> bool:
+        """True while the maintenance thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the maintenance thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="herald-db-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0):
+        """Stop the maintenance thread (an in-flight chunk finishes first)."""
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval_secs):
+            try:
+                self.run_once()
+            except Exception as e:
+                self.logger.error("Database maintenance failed: %s", e, exc_info=True)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        apply_pragmas(conn)
+        return conn
+
+    def run_once(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Run every job once.
+
+        Args:
+            now: Reference time for retention (default: now)
+
+        Returns:
+            Dictionary with rolled_up, raw_deleted, rollups_deleted, pages_freed
+        """
+        now = now or datetime.now()
+        started = time.perf_counter()
+        conn = self._connect()
+        try:
+            stats = {
+                'rolled_up': self.rollup(conn),
+                'raw_deleted': self.purge_raw(conn, now),
+                'rollups_deleted': self.purge_rollups(conn, now),
+                'pages_freed': self.incremental_vacuum(conn),
+            }
+            conn.execute("PRAGMA optimize")
+        finally:
+            conn.close()
+        self.logger.info(
+            "Database maintenance: %s rolled up, %s raw and %s rollup rows deleted, %s pages freed in %.0f ms",
+            stats['rolled_up'], stats['raw_deleted'], stats['rollups_deleted'], stats['pages_freed'],
+            (time.perf_counter() - started) * 1000
+        )
+        return stats
+
+    def _watermark(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT value FROM maintenance_state WHERE key = ?", (_WATERMARK_KEY,)).fetchone()
+        return row[0] if row else 0
+
+    def rollup(self, conn: sqlite3.Connection) -> int:
+        """
+        Fold raw points added since the last run into every resolution.
+
+        Args:
+            conn: Maintenance connection
+
+        Returns:
+            Number of raw points rolled up
+        """
+        low = self._watermark(conn)
+        high = conn.execute("SELECT COALESCE(MAX(id), 0) FROM metrics").fetchone()[0]
+        total = 0
+        while low < high and not self._stop.is_set():
+            upper = min(low + self.chunk_rows, high)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for resolution in self.rollup_retention:
+                    conn.execute("""
+                        INSERT INTO metric_rollups (metric_name, resolution, bucket, count, min, max, sum)
+                        SELECT metric_name, ?, timestamp / 1000 / ? * ? AS bucket,
+                               COUNT(*), MIN(metric_value), MAX(metric_value), SUM(metric_value)
+                        FROM metrics
+                        WHERE id > ? AND id <= ?
+                        GROUP BY metric_name, bucket
+                        ON CONFLICT (metric_name, resolution, bucket) DO UPDATE SET
+                            count = count + excluded.count,
+                            min = MIN(min, excluded.min),
+                            max = MAX(max, excluded.max),
+                            sum = sum + excluded.sum
+                    """, (resolution, resolution, resolution, low, upper))
+                total += conn.execute(
+                    "SELECT COUNT(*) FROM metrics WHERE id > ? AND id <= ?", (low, upper)
+                ).fetchone()[0]
+                conn.execute(
+                    "INSERT OR REPLACE INTO maintenance_state (key, value) VALUES (?, ?)", (_WATERMARK_KEY, upper)
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            low = upper
+        return total
+
+    def purge_raw(self, conn: sqlite3.Connection, now: datetime) -> int:
+        """
+        Delete rolled-up raw points older than the retention window.
+
+        Args:
+            conn: Maintenance connection
+            now: Reference time
+
+        Returns:
+            Rows deleted
+        """
+        cutoff = now - timedelta(days=self.raw_retention_days)
+        watermark = self._watermark(conn)
+        deleted = 0
+        while not self._stop.is_set():
+            cursor = conn.execute("""
+                DELETE FROM metrics WHERE id IN (
+                    SELECT id FROM metrics WHERE id <= ? AND timestamp < ? ORDER BY id LIMIT ?
+                )
+            """, (watermark, to_epoch_ms(cutoff), self.chunk_rows))
+            deleted += cursor.rowcount
+            if cursor.rowcount < self.chunk_rows:
+                break
+        return deleted
+
+    def purge_rollups(self, conn: sqlite3.Connection, now: datetime) -> int:
+        """
+        Delete rollups past their resolution's retention.
+
+        Args:
+            conn: Maintenance connection
+            now: Reference time
+
+        Returns:
+            Rows deleted
+        """
+        # Buckets use the same naive-as-UTC epoch as the stored timestamps
+        epoch_now = to_epoch_ms(now) // 1000
+        deleted = 0
+        for resolution, days in self.rollup_retention.items():
+            if days is None:
+                continue
+            cursor = conn.execute(
+                "DELETE FROM metric_rollups WHERE resolution = ? AND bucket < ?",
+                (resolution, epoch_now - int(days * 86400))
+            )
+            deleted += cursor.rowcount
+        return deleted
+
+    def incremental_vacuum(self, conn: sqlite3.Connection) -> int:
+        """
+        Release up to vacuum_pages free pages.
+
+        Args:
+            conn: Maintenance connection
+
+        Returns:
+            Pages freed (0 if the file is not in incremental auto-vacuum mode)
+        """
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            if not self._warned_vacuum:
+                self.logger.info(
+                    "Incremental vacuum unavailable for %s; run enable_incremental_vacuum() once", self.db_path
+                )
+                self._warned_vacuum = True
+            return 0
+        before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        # executescript steps the pragma to completion (execute frees one page per step)
+        conn.executescript(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)});")
+        return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    def enable_incremental_vacuum(self):
+        """
+        Switch an existing database to incremental auto-vacuum.
+
+        Runs a full VACUUM, which rewrites the file and blocks writers for
+        its duration: call it while Herald is stopped.
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        self._warned_vacuum = False
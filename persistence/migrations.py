@@ -0,0 +1,411 @@
+"""
+Schema Migrations
+
+Single source of the Herald database schema. Each migration moves the
+schema one version forward and the applied version is kept in
+PRAGMA user_version, so opening a database only runs the migrations it has
+not seen. Every migration runs in its own BEGIN IMMEDIATE transaction and
+re-checks the version once it holds the write lock, so two processes
+opening the same file cannot apply a step twice.
+
+Database runs migrate() on open; scripts/init_db.py goes through Database.
+
+Versions:
+1. Baseline: the layout Database created before versioning (tables left by
+   the old scripts/init_db.py layout are renamed to *_legacy)
+2. Integer enums for trades/signals side and status; indexes match the
+   queries the trading loop and persistence.analytics run
+3. Timestamps stored as INTEGER epoch milliseconds (naive datetimes are
+   taken as UTC, matching bar times); existing text values are converted
+"""
+
+import logging
+import sqlite3
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger("herald.persistence.migrations")
+
+# Compact integer codes stored in the side and status columns
+SIDE_CODES = {'BUY': 1, 'LONG': 1, 'SELL': -1, 'SHORT': -1, 'CLOSE': 2, 'NONE': 0}
+TRADE_SIDES = {1: 'BUY', -1: 'SELL'}
+SIGNAL_SIDES = {1: 'LONG', -1: 'SHORT', 2: 'CLOSE', 0: 'NONE'}
+STATUS_CODES = {'OPEN': 0, 'CLOSED': 1}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+
+def encode_side(side) -> int:
+    """Integer code for a side name (BUY/LONG, SELL/SHORT, CLOSE, NONE)."""
+    if isinstance(side, int):
+        return side
+    return SIDE_CODES[str(side).upper()]
+
+
+def encode_status(status) -> int:
+    """Integer code for a trade status (OPEN, CLOSED)."""
+    if isinstance(status, int):
+        return status
+    return STATUS_CODES[str(status).upper()]
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _ensure_column(conn: sqlite3.Connection, table: str, column: str, definition: str):
+    """Add a column to a table created by an older release."""
+    if column not in _columns(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _set_aside_legacy(conn: sqlite3.Connection, table: str, marker: str):
+    """
+    Rename a table from the old init_db layout (identified by a missing column).
+
+    Index names are global and stay with the renamed table, so its indexes
+    are recreated as <index>_legacy to free the names the schema uses.
+    """
+    columns = _columns(conn, table)
+    if columns and marker not in columns:
+        logger.warning("Moving %s created by the old init_db layout to %s_legacy", table, table)
+        indexes = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)
+        ).fetchall()
+        conn.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+        for name, sql in indexes:
+            conn.execute(f'DROP INDEX "{name}"')
+            kind = "UNIQUE INDEX" if sql.upper().startswith("CREATE UNIQUE") else "INDEX"
+            conn.execute(f'CREATE {kind} "{name}_legacy" ON "{table}_legacy"{sql[sql.index("("):]}')
+
+
+def _baseline(conn: sqlite3.Connection):
+    """Version 1: the schema Database created before versioning."""
+    _set_aside_legacy(conn, "trades", "entry_time")
+    _set_aside_legacy(conn, "signals", "signal_id")
+    _set_aside_legacy(conn, "metrics", "created_at")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS trades (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            signal_id TEXT NOT NULL,
+            order_id INTEGER,
+            symbol TEXT NOT NULL,
+            side TEXT NOT NULL,
+            volume REAL NOT NULL,
+            entry_price REAL NOT NULL,
+            exit_price REAL,
+            stop_loss REAL,
+            take_profit REAL,
+            entry_time TIMESTAMP NOT NULL,
+            exit_time TIMESTAMP,
+            profit REAL,
+            status TEXT DEFAULT 'OPEN',
+            exit_reason TEXT,
+            metadata TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS signals (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            signal_id TEXT UNIQUE NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            symbol TEXT NOT NULL,
+            timeframe TEXT NOT NULL,
+            side TEXT NOT NULL,
+            action TEXT NOT NULL,
+            confidence REAL NOT NULL,
+            price REAL,
+            stop_loss REAL,
+            take_profit REAL,
+            reason TEXT,
+            executed BOOLEAN DEFAULT FALSE,
+            execution_timestamp TIMESTAMP,
+            metadata TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TIMESTAMP NOT NULL,
+            metric_name TEXT NOT NULL,
+            metric_value REAL NOT NULL,
+            metadata TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # Metric aggregates maintained by persistence.maintenance
+    # (bucket = epoch seconds at the start of the interval)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS metric_rollups (
+            metric_name TEXT NOT NULL,
+            resolution INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            min REAL NOT NULL,
+            max REAL NOT NULL,
+            sum REAL NOT NULL,
+            PRIMARY KEY (metric_name, resolution, bucket)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS maintenance_state (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+    # Bar history (clustered on the key; no separate rowid b-tree)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS bars (
+            symbol TEXT NOT NULL,
+            timeframe TEXT NOT NULL,
+            time INTEGER NOT NULL,
+            open REAL NOT NULL,
+            high REAL NOT NULL,
+            low REAL NOT NULL,
+            close REAL NOT NULL,
+            tick_volume INTEGER,
+            spread INTEGER,
+            real_volume INTEGER,
+            PRIMARY KEY (symbol, timeframe, time)
+        ) WITHOUT ROWID
+    """)
+
+    # Columns added after the first release
+    _ensure_column(conn, "trades", "strategy_name", "TEXT")
+    _ensure_column(conn, "trades", "commission", "REAL DEFAULT 0")
+    _ensure_column(conn, "signals", "strategy_name", "TEXT")
+
+
+def _case(column: str, codes: dict, default: int) -> str:
+    """SQL CASE mapping stored names to their integer codes."""
+    branches = " ".join(f"WHEN '{name}' THEN {code}" for name, code in codes.items())
+    return f"CASE upper({column}) {branches} ELSE {default} END"
+
+
+def _integer_enums(conn: sqlite3.Connection):
+    """Version 2: integer side/status columns and query-driven indexes."""
+    # Column types cannot be altered in place, so both tables are rebuilt
+    conn.execute("""
+        CREATE TABLE trades_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            signal_id TEXT NOT NULL,
+            order_id INTEGER,
+            symbol TEXT NOT NULL,
+            side INTEGER NOT NULL,
+            volume REAL NOT NULL,
+            entry_price REAL NOT NULL,
+            exit_price REAL,
+            stop_loss REAL,
+            take_profit REAL,
+            entry_time TIMESTAMP NOT NULL,
+            exit_time TIMESTAMP,
+            profit REAL,
+            status INTEGER NOT NULL DEFAULT 0,
+            exit_reason TEXT,
+            metadata TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            strategy_name TEXT,
+            commission REAL DEFAULT 0
+        )
+    """)
+    conn.execute(f"""
+        INSERT INTO trades_new
+        SELECT id, signal_id, order_id, symbol, {_case('side', SIDE_CODES, 0)}, volume, entry_price,
+               exit_price, stop_loss, take_profit, entry_time, exit_time, profit,
+               {_case('status', STATUS_CODES, 0)}, exit_reason, metadata, created_at, strategy_name, commission
+        FROM trades
+    """)
+    conn.execute("DROP TABLE trades")
+    conn.execute("ALTER TABLE trades_new RENAME TO trades")
+
+    conn.execute("""
+        CREATE TABLE signals_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            signal_id TEXT UNIQUE NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            symbol TEXT NOT NULL,
+            timeframe TEXT NOT NULL,
+            side INTEGER NOT NULL,
+            action TEXT NOT NULL,
+            confidence REAL NOT NULL,
+            price REAL,
+            stop_loss REAL,
+            take_profit REAL,
+            reason TEXT,
+            executed INTEGER NOT NULL DEFAULT 0,
+            execution_timestamp TIMESTAMP,
+            metadata TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            strategy_name TEXT
+        )
+    """)
+    conn.execute(f"""
+        INSERT INTO signals_new
+        SELECT id, signal_id, timestamp, symbol, timeframe, {_case('side', SIDE_CODES, 0)}, action,
+               confidence, price, stop_loss, take_profit, reason, COALESCE(executed, 0),
+               execution_timestamp, metadata, created_at, strategy_name
+        FROM signals
+    """)
+    conn.execute("DROP TABLE signals")
+    conn.execute("ALTER TABLE signals_new RENAME TO signals")
+
+    # update_trade_exit looks trades up by order_id on every exit.
+    # persistence.analytics: keyset pagination walks (status, symbol,
+    # entry_time, rowid); the others end in profit so aggregates are
+    # answered from the index without touching the table. Symbol-only
+    # indexes had no query behind them and only cost insert time.
+    conn.execute("CREATE INDEX idx_trades_order ON trades(order_id)")
+    conn.execute("CREATE INDEX idx_trades_status_symbol_entry ON trades(status, symbol, entry_time)")
+    conn.execute("CREATE INDEX idx_trades_status_exit ON trades(status, exit_time, symbol, profit)")
+    conn.execute("CREATE INDEX idx_trades_strategy ON trades(status, strategy_name, profit)")
+    conn.execute("CREATE INDEX idx_trades_exit_reason ON trades(status, exit_reason, profit)")
+    conn.execute("CREATE INDEX idx_signals_timestamp ON signals(timestamp)")
+    conn.execute("CREATE INDEX idx_signals_strategy_time ON signals(strategy_name, timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_metrics_name_time ON metrics(metric_name, timestamp)")
+
+
+# SQLite's date functions read the stored text (naive values as UTC, offsets honoured)
+_TEXT_TO_MS = (
+    "CASE typeof({0}) WHEN 'text' THEN CAST(strftime('%s', {0}) AS INTEGER) * 1000 "
+    "+ CAST(substr(strftime('%f', {0}), 4) AS INTEGER) ELSE {0} END"
+)
+_NOW_MS = "(CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER))"
+
+
+def _rebuild(conn: sqlite3.Connection, table: str, ddl: str, converted: Dict[str, str]):
+    """
+    Recreate a table from new DDL, copying rows and re-creating its indexes.
+
+    Args:
+        conn: Connection inside the migration transaction
+        table: Table to rebuild
+        ddl: CREATE TABLE statement with {table} in place of the name
+        converted: Column -> SQL expression used for the copy (others copied as is)
+    """
+    indexes = [
+        row[0] for row in conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)
+        )
+    ]
+    columns = _columns(conn, table)
+    conn.execute(ddl.format(table=f"{table}_new"))
+    select = ", ".join(converted.get(column, column) for column in columns)
+    conn.execute(f"INSERT INTO {table}_new ({', '.join(columns)}) SELECT {select} FROM {table}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+    for sql in indexes:
+        conn.execute(sql)
+
+
+def _epoch_timestamps(conn: sqlite3.Connection):
+    """Version 3: timestamps as INTEGER epoch milliseconds."""
+    def ms(*columns):
+        return {column: _TEXT_TO_MS.format(column) for column in columns}
+
+    _rebuild(conn, "trades", f"""
+        CREATE TABLE {{table}} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            signal_id TEXT NOT NULL,
+            order_id INTEGER,
+            symbol TEXT NOT NULL,
+            side INTEGER NOT NULL,
+            volume REAL NOT NULL,
+            entry_price REAL NOT NULL,
+            exit_price REAL,
+            stop_loss REAL,
+            take_profit REAL,
+            entry_time INTEGER NOT NULL,
+            exit_time INTEGER,
+            profit REAL,
+            status INTEGER NOT NULL DEFAULT 0,
+            exit_reason TEXT,
+            metadata TEXT,
+            created_at INTEGER DEFAULT {_NOW_MS},
+            strategy_name TEXT,
+            commission REAL DEFAULT 0
+        )
+    """, ms("entry_time", "exit_time", "created_at"))
+
+    _rebuild(conn, "signals", f"""
+        CREATE TABLE {{table}} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            signal_id TEXT UNIQUE NOT NULL,
+            timestamp INTEGER NOT NULL,
+            symbol TEXT NOT NULL,
+            timeframe TEXT NOT NULL,
+            side INTEGER NOT NULL,
+            action TEXT NOT NULL,
+            confidence REAL NOT NULL,
+            price REAL,
+            stop_loss REAL,
+            take_profit REAL,
+            reason TEXT,
+            executed INTEGER NOT NULL DEFAULT 0,
+            execution_timestamp INTEGER,
+            metadata TEXT,
+            created_at INTEGER DEFAULT {_NOW_MS},
+            strategy_name TEXT
+        )
+    """, ms("timestamp", "execution_timestamp", "created_at"))
+
+    _rebuild(conn, "metrics", f"""
+        CREATE TABLE {{table}} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp INTEGER NOT NULL,
+            metric_name TEXT NOT NULL,
+            metric_value REAL NOT NULL,
+            metadata TEXT,
+            created_at INTEGER DEFAULT {_NOW_MS}
+        )
+    """, ms("timestamp", "created_at"))
+
+
+# MIGRATIONS[n] upgrades a database from version n to n + 1
+MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    _baseline,
+    _integer_enums,
+    _epoch_timestamps,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Schema version recorded in the database file."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, target: Optional[int] = None) -> int:
+    """
+    Apply pending migrations.
+
+    Args:
+        conn: SQLite connection (no transaction open)
+        target: Version to stop at (default: SCHEMA_VERSION)
+
+    Returns:
+        Schema version after migrating
+
+    Raises:
+        RuntimeError: If the file was written by a newer schema version
+    """
+    target = SCHEMA_VERSION if target is None else target
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = schema_version(conn)
+            if version > SCHEMA_VERSION:
+                raise RuntimeError(
+                    f"Database schema version {version} is newer than supported version {SCHEMA_VERSION}"
+                )
+            if version >= target:
+                conn.execute("COMMIT")
+                return version
+            MIGRATIONS[version](conn)
+            conn.execute(f"PRAGMA user_version = {version + 1}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        logger.info("Database schema migrated to version %d (%s)", version + 1, MIGRATIONS[version].__name__)
@@ -0,0 +1,351 @@
+"""
+Shared Bar Store
+
+Publishes bar frames (OHLCV plus indicator columns) into named shared
+memory segments so other processes read them without pickling or copying.
+
+Each symbol/timeframe gets one segment with a fixed layout: a header
+(sequence counter, capacity, row count, column count), the column names,
+then one int64 time column (epoch nanoseconds) and one float64 array per
+column, each `capacity` rows long. Layout is fixed by the first publish.
+
+A single writer per segment updates it under a seqlock: the sequence is
+made odd before rows are written and even afterwards. Readers either take
+a consistent copy with read(), retrying while the sequence is odd or
+changes underneath them, or use zero-copy read-only views (arrays() /
+frame()) and check `version` to see whether the data moved on.
+
+Usage:
+    store = SharedBarStore()
+    store.publish("EURUSD", "M1", df)              # writer (e.g. the trading loop)
+
+    bars = SharedBars.attach("EURUSD", "M1")       # reader, any process
+    df = bars.frame()                              # zero-copy, read-only
+    version, columns = bars.read()                 # consistent copy
+"""
+
+import logging
+import re
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+MAGIC = 0x48524C4442415253  # "HRLDBARS"
+NAME_BYTES = 32
+MAX_COLUMNS = 128
+HEADER_DTYPE = np.dtype([
+    ('magic', '<u8'),
+    ('sequence', '<u8'),
+    ('capacity', '<i8'),
+    ('length', '<i8'),
+    ('columns', '<i8'),
+])
+HEADER_BYTES = 64
+DATA_OFFSET = HEADER_BYTES + MAX_COLUMNS * NAME_BYTES
+
+
+def segment_name(prefix: str, symbol: str, timeframe: str) -> str:
+    """Shared memory name for a symbol/timeframe (unsafe characters become '_')."""
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', f"{prefix}.{symbol}.{timeframe}")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open an existing segment without handing it to this process's resource tracker."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Before Python 3.13 every attach is tracked, and the tracker unlinks the
+    # segment when the attaching process exits; only the creator should.
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedBars:
+    """
+    One shared memory segment of bar columns.
+
+    Created by SharedBarStore (writer) or SharedBars.attach() (reader).
+    """
+
+    def __init__(self, block: shared_memory.SharedMemory, owner: bool = False):
+        """
+        Map a segment.
+
+        Args:
+            block: Shared memory block with the SharedBars layout
+            owner: This handle created the segment (writes and unlinks it)
+        """
+        self.block = block
+        self.owner = owner
+        self._header = np.ndarray((), dtype=HEADER_DTYPE, buffer=block.buf)
+        if int(self._header['magic']) != MAGIC:
+            raise ValueError(f"Shared memory {block.name} is not a bar segment")
+        self.capacity = int(self._header['capacity'])
+        names = np.ndarray((int(self._header['columns']),), dtype=f'S{NAME_BYTES}', buffer=block.buf, offset=HEADER_BYTES)
+        self.columns: List[str] = [name.decode('utf-8') for name in names]
+
+        self._time = np.ndarray((self.capacity,), dtype='<i8', buffer=block.buf, offset=DATA_OFFSET)
+        data = np.ndarray(
+            (len(self.columns), self.capacity), dtype='<f8', buffer=block.buf,
+            offset=DATA_OFFSET + 8 * self.capacity
+        )
+        self._data = dict(zip(self.columns, data))
+        if not owner:
+            self._time.setflags(write=False)
+            data.setflags(write=False)
+
+    @classmethod
+    def create(cls, name: str, columns: Sequence[str], capacity: int) -> 'SharedBars':
+        """
+        Create a segment.
+
+        Args:
+            name: Shared memory name
+            columns: Float column names (fixed for the segment's lifetime)
+            capacity: Maximum rows
+
+        Returns:
+            Owning SharedBars handle
+        """
+        columns = list(columns)
+        encoded = [column.encode('utf-8') for column in columns]
+        if len(columns) > MAX_COLUMNS:
+            raise ValueError(f"At most {MAX_COLUMNS} columns per segment")
+        if any(len(name) > NAME_BYTES for name in encoded):
+            raise ValueError(f"Column names are limited to {NAME_BYTES} bytes")
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        size = DATA_OFFSET + 8 * capacity * (1 + len(columns))
+        block = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=block.buf)
+        header['sequence'] = 0
+        header['capacity'] = capacity
+        header['length'] = 0
+        header['columns'] = len(columns)
+        names = np.ndarray((len(columns),), dtype=f'S{NAME_BYTES}', buffer=block.buf, offset=HEADER_BYTES)
+        names[:] = encoded
+        header['magic'] = MAGIC
+        del header, names
+        return cls(block, owner=True)
+
+    @classmethod
+    def attach(cls, symbol: str, timeframe: str, prefix: str = "herald") -> 'SharedBars':
+        """
+        Attach read-only to a published symbol/timeframe.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe label
+            prefix: Store prefix used by the writer
+
+        Returns:
+            Reader handle
+
+        Raises:
+            FileNotFoundError: If nothing is published under that name
+        """
+        return cls(_attach(segment_name(prefix, symbol, timeframe)))
+
+    @property
+    def name(self) -> str:
+        """Shared memory name."""
+        return self.block.name
+
+    @property
+    def version(self) -> int:
+        """Number of completed writes (changes whenever the rows do)."""
+        return int(self._header['sequence']) // 2
+
+    def __len__(self) -> int:
+        return int(self._header['length'])
+
+    def write(self, times: np.ndarray, columns: Dict[str, np.ndarray]) -> int:
+        """
+        Replace the rows (owner only).
+
+        Args:
+            times: Bar times as datetime64 or int64 epoch nanoseconds
+            columns: Column name -> values for every segment column
+
+        Returns:
+            New version
+        """
+        if not self.owner:
+            raise PermissionError("Shared bars are read-only for attached readers")
+        missing = set(self.columns) - set(columns)
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(sorted(missing))}")
+        rows = min(len(times), self.capacity)
+        start = len(times) - rows
+
+        sequence = int(self._header['sequence'])
+        self._header['sequence'] = sequence + 1
+        try:
+            self._time[:rows] = np.asarray(times[start:]).view('<i8')
+            for column, target in self._data.items():
+                target[:rows] = columns[column][start:]
+            self._header['length'] = rows
+        finally:
+            self._header['sequence'] = sequence + 2
+        return (sequence + 2) // 2
+
+    def arrays(self) -> Tuple[int, Dict[str, np.ndarray]]:
+        """
+        Zero-copy read-only views of the current rows.
+
+        Views see later writes; compare `version` with the returned one to
+        detect them.
+
+        Returns:
+            Tuple of (version, {'time': epoch ns, column: values})
+        """
+        while True:
+            sequence = int(self._header['sequence'])
+            if sequence & 1:
+                time.sleep(0)
+                continue
+            rows = int(self._header['length'])
+            views = {'time': self._view(self._time, rows)}
+            views.update((column, self._view(values, rows)) for column, values in self._data.items())
+            return sequence // 2, views
+
+    def read(self, columns: Optional[Sequence[str]] = None, retries: int = 10000) -> Tuple[int, Dict[str, np.ndarray]]:
+        """
+        Consistent copy of the rows (seqlock read).
+
+        Args:
+            columns: Columns to copy (default all)
+            retries: Attempts before giving up on a busy writer
+
+        Returns:
+            Tuple of (version, {'time': epoch ns, column: values})
+
+        Raises:
+            TimeoutError: If no stable snapshot was seen
+        """
+        names = self.columns if columns is None else list(columns)
+        for _ in range(retries):
+            sequence = int(self._header['sequence'])
+            if sequence & 1:
+                time.sleep(0)
+                continue
+            rows = int(self._header['length'])
+            copy = {'time': self._time[:rows].copy()}
+            for column in names:
+                copy[column] = self._data[column][:rows].copy()
+            if int(self._header['sequence']) == sequence:
+                return sequence // 2, copy
+        raise TimeoutError(f"No stable snapshot of {self.name} after {retries} attempts")
+
+    def frame(self, copy: bool = False) -> pd.DataFrame:
+        """
+        Rows as a DataFrame indexed by bar time.
+
+        Args:
+            copy: Take a consistent copy instead of zero-copy views
+
+        Returns:
+            DataFrame with the segment columns
+        """
+        _, columns = self.read() if copy else self.arrays()
+        index = pd.DatetimeIndex(columns.pop('time').view('datetime64[ns]'), name='time')
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    @staticmethod
+    def _view(values: np.ndarray, rows: int) -> np.ndarray:
+        view = values[:rows]
+        view.setflags(write=False)
+        return view
+
+    def close(self):
+        """
+        Unmap the segment (and remove it if this handle created it).
+
+        Views and frames taken from this handle must be released first.
+        """
+        self._header = self._time = self._data = None
+        self.block.close()
+        if self.owner:
+            try:
+                self.block.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SharedBarStore:
+    """
+    Writer-side registry of shared bar segments, one per symbol/timeframe.
+
+    Frames from the indicator pipeline are published as they are: every
+    numeric column is stored as float64 next to the bar times (naive UTC).
+    """
+
+    def __init__(self, prefix: str = "herald", capacity: Optional[int] = None):
+        """
+        Initialize store.
+
+        Args:
+            prefix: Segment name prefix (readers attach with the same prefix)
+            capacity: Rows per segment (default: rows of the first publish);
+                larger frames keep their newest rows
+        """
+        self.prefix = prefix
+        self.capacity = capacity
+        self.logger = logging.getLogger("herald.persistence.shared_bars")
+        self._segments: Dict[Tuple[str, str], SharedBars] = {}
+
+    def publish(self, symbol: str, timeframe: str, df: pd.DataFrame) -> int:
+        """
+        Publish a bar frame.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe label
+            df: Frame indexed by bar time (numeric columns are published)
+
+        Returns:
+            Segment version after the write
+
+        Raises:
+            ValueError: If the columns differ from the segment's first publish
+        """
+        columns = {
+            column: df[column].to_numpy(dtype=np.float64)
+            for column in df.columns
+            if column != 'time' and pd.api.types.is_numeric_dtype(df[column])
+        }
+        index = df.index
+        if getattr(index, 'tz', None) is not None:
+            index = index.tz_convert(None)
+        times = index.to_numpy(dtype='datetime64[ns]')
+
+        key = (symbol, timeframe)
+        segment = self._segments.get(key)
+        if segment is None:
+            name = segment_name(self.prefix, symbol, timeframe)
+            segment = SharedBars.create(name, list(columns), self.capacity or max(len(df), 1))
+            self._segments[key] = segment
+            self.logger.info("Publishing %s %s bars to shared memory %s", symbol, timeframe, name)
+        elif list(columns) != segment.columns:
+            raise ValueError(
+                f"Columns of {symbol} {timeframe} changed: {segment.columns} -> {list(columns)}"
+            )
+        return segment.write(times, columns)
+
+    def segment(self, symbol: str, timeframe: str) -> Optional[SharedBars]:
+        """Writer handle for a published symbol/timeframe, if any."""
+        return self._segments.get((symbol, timeframe))
+
+    def close(self):
+        """Remove every segment this store created."""
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
@@ -0,0 +1,368 @@
+"""
+Database Writer
+
+Background writer thread for the SQLite store. The trading thread queues
+statements and moves on; the writer owns its own connection and
+group-commits whatever has accumulated into one transaction, so a burst of
+order/trade/metric writes costs one fsync instead of one per statement.
+
+Durability levels:
+- off:    WAL, synchronous=OFF    (fastest; a power loss can lose recent commits)
+- normal: WAL, synchronous=NORMAL (default; survives process crashes, a power
+          loss can roll back the last commits but never corrupts the file)
+- full:   WAL, synchronous=FULL   (every commit fsynced)
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Iterable, Optional, Sequence
+
+DURABILITY_LEVELS = {
+    'off': 'OFF',
+    'normal': 'NORMAL',
+    'full': 'FULL',
+}
+
+
+def apply_pragmas(conn: sqlite3.Connection, durability: str = "normal"):
+    """
+    Configure a connection for WAL and the requested durability.
+
+    Args:
+        conn: SQLite connection
+        durability: One of DURABILITY_LEVELS
+    """
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError(f"Unknown durability level: {durability}")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={DURABILITY_LEVELS[durability]}")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+
+
+class _Write:
+    """A queued statement (or executemany batch)."""
+
+    __slots__ = ("sql", "params", "many", "future")
+
+    def __init__(self, sql: str, params: Any, many: bool, future: Optional[Future]):
+        self.sql = sql
+        self.params = params
+        self.many = many
+        self.future = future
+
+
+class _Barrier:
+    """Queue marker: set once every earlier write is committed."""
+
+    __slots__ = ("event",)
+
+    def __init__(self):
+        self.event = threading.Event()
+
+
+_STOP = object()
+
+
+class DatabaseWriter:
+    """
+    Queue-fed SQLite writer with group commit.
+
+    submit() is fire-and-forget; execute() returns a Future resolving to
+    the cursor's (lastrowid, rowcount) once the batch holding it commits.
+    flush() is a barrier that waits until everything queued before it is
+    durable at the configured level.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        durability: str = "normal",
+        batch_size: int = 256,
+        max_batch_delay_ms: float = 20.0,
+        queue_size: int = 10000
+    ):
+        """
+        Initialize database writer.
+
+        Args:
+            db_path: Path to SQLite database file
+            durability: One of DURABILITY_LEVELS
+            batch_size: Maximum statements per transaction
+            max_batch_delay_ms: How long the writer waits for more statements
+                before committing a partial batch
+            queue_size: Maximum queued statements (submit blocks when full)
+        """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level: {durability}")
+        self.db_path = str(db_path)
+        self.durability = durability
+        self.batch_size = batch_size
+        self.max_batch_delay = max_batch_delay_ms / 1000.0
+        self.logger = logging.getLogger("herald.persistence.writer")
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._start_error: Optional[BaseException] = None
+
+        # Counters (written by the writer thread only)
+        self.committed_statements = 0
+        self.committed_batches = 0
+        self.failed_statements = 0
+
+    @property
+    def running(self) -> bool:
+        """True while the writer thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Open the writer connection and start the thread."""
+        if self.running:
+            return
+        self._ready.clear()
+        self._start_error = None
+        self._thread = threading.Thread(target=self._run, name="herald-db-writer", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._start_error is not None:
+            raise self._start_error
+
+    def submit(self, sql: str, params: Sequence[Any] = ()):
+        """
+        Queue a statement without waiting for it.
+
+        Args:
+            sql: SQL statement
+            params: Statement parameters
+
+        Raises:
+            RuntimeError: If the writer thread is not running
+        """
+        self._put(_Write(sql, params, False, None))
+
+    def submit_many(self, sql: str, seq_of_params: Iterable[Sequence[Any]]):
+        """
+        Queue an executemany batch without waiting for it.
+
+        Args:
+            sql: SQL statement
+            seq_of_params: Parameter rows
+
+        Raises:
+            RuntimeError: If the writer thread is not running
+        """
+        self._put(_Write(sql, list(seq_of_params), True, None))
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> Future:
+        """
+        Queue a statement and get its outcome.
+
+        Args:
+            sql: SQL statement
+            params: Statement parameters
+
+        Returns:
+            Future resolving to (lastrowid, rowcount) after commit
+
+        Raises:
+            RuntimeError: If the writer thread is not running
+        """
+        future: Future = Future()
+        self._put(_Write(sql, params, False, future))
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every statement queued so far is committed.
+
+        Args:
+            timeout: Maximum seconds to wait (None = forever)
+
+        Returns:
+            True if the barrier was reached
+        """
+        if not self.running:
+            return self._queue.empty()
+        barrier = _Barrier()
+        try:
+            self._put(barrier)
+        except RuntimeError:
+            return False
+        return barrier.event.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """Flush outstanding writes and stop the thread."""
+        if not self.running:
+            return
+        try:
+            self._put(_STOP)
+        except RuntimeError:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _put(self, item):
+        """Queue an item, giving up if the writer stops while the queue is full."""
+        while True:
+            if not self.running:
+                raise RuntimeError("Database writer is not running")
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _run(self):
+        try:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+            apply_pragmas(conn, self.durability)
+        except BaseException as e:
+            self._start_error = e
+            self._ready.set()
+            return
+        self._ready.set()
+
+        try:
+            stop = False
+            while not stop:
+                item = self._queue.get()
+                batch, barriers, stop = self._collect(item)
+                if batch:
+                    try:
+                        self._commit(conn, batch)
+                    except Exception as e:
+                        # Never let one batch take the thread down
+                        self.logger.error("Database write batch failed: %s", e, exc_info=True)
+                        self._rollback(conn)
+                        self._fail(batch, e)
+                for barrier in barriers:
+                    barrier.event.set()
+        except BaseException as e:
+            self.logger.critical("Database writer stopped unexpectedly: %s", e, exc_info=True)
+            self._drain(e)
+            raise
+        finally:
+            conn.close()
+
+    def _drain(self, error: BaseException):
+        """Fail whatever is still queued once the thread cannot continue."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(item, _Barrier):
+                item.event.set()
+            elif isinstance(item, _Write):
+                self._fail([item], error)
+
+    def _collect(self, first):
+        """Gather a batch starting with `first`, waiting briefly for stragglers."""
+        batch, barriers = [], []
+        stop = False
+        item = first
+        deadline = time.monotonic() + self.max_batch_delay
+        while True:
+            if item is _STOP:
+                stop = True
+                # Drain whatever was queued before the stop request
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, _Barrier):
+                        barriers.append(item)
+                    elif isinstance(item, _Write):
+                        batch.append(item)
+                break
+            if isinstance(item, _Barrier):
+                # Commit now rather than waiting out the batch delay
+                barriers.append(item)
+                break
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                break
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+        return batch, barriers, stop
+
+    def _commit(self, conn: sqlite3.Connection, batch):
+        outcomes = []
+        try:
+            conn.execute("BEGIN")
+            for write in batch:
+                outcomes.append(self._apply(conn, write))
+            conn.execute("COMMIT")
+        except Exception as e:
+            self._rollback(conn)
+            self.logger.warning(
+                "Batch of %s statements failed (%s); retrying individually", len(batch), e
+            )
+            self._commit_individually(conn, batch)
+            return
+
+        self.committed_statements += len(batch)
+        self.committed_batches += 1
+        for write, outcome in zip(batch, outcomes):
+            self._resolve(write.future, outcome)
+
+    def _commit_individually(self, conn: sqlite3.Connection, batch):
+        # Isolate the bad statement so the rest of the batch still lands
+        for write in batch:
+            try:
+                conn.execute("BEGIN")
+                outcome = self._apply(conn, write)
+                conn.execute("COMMIT")
+            except Exception as e:
+                self._rollback(conn)
+                self.logger.error("Database write failed: %s | %s", e, write.sql.strip().splitlines()[0])
+                self._fail([write], e)
+                continue
+            self.committed_statements += 1
+            self.committed_batches += 1
+            self._resolve(write.future, outcome)
+
+    def _fail(self, writes, error: BaseException):
+        """Count writes as failed and hand the error to their futures."""
+        self.failed_statements += len(writes)
+        for write in writes:
+            self._resolve(write.future, error=error)
+
+    @staticmethod
+    def _resolve(future: Optional[Future], result: Any = None, error: Optional[BaseException] = None):
+        """Complete a future unless the caller already cancelled it."""
+        if future is None:
+            return
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
+
+    @staticmethod
+    def _rollback(conn: sqlite3.Connection):
+        """Roll back if a transaction is still open (SQLite ends it itself on some errors)."""
+        if conn.in_transaction:
+            try:
+                conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, write: _Write):
+        if write.many:
+            cursor = conn.executemany(write.sql, write.params)
+        else:
+            cursor = conn.execute(write.sql, write.params)
+        return cursor.lastrowid, cursor.rowcount
@@ -4,9 +4,10 @@ Position Management Module
 Real-time position tracking, monitoring, and exit detection.
 """
 
-from .manager import PositionManager, PositionInfo
+from .manager import PositionManager, PositionInfo, BulkCloseReport
 
 __all__ = [
     "PositionManager",
     "PositionInfo",
+    "BulkCloseReport",
 ]
@@ -7,11 +7,16 @@ Integrates with ExecutionEngine for position data and RiskManager for exposure l
 
 from herald.connector.mt5_connector import mt5
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
 from herald.execution.engine import ExecutionResult, ExecutionEngine, OrderType, OrderStatus, OrderRequest
+from herald.execution.netting import NettingLeg
+from herald.observability.execution_metrics import ExecutionMetrics
+from herald.observability.logger import HeraldLogger
 from herald.strategy.base import SignalType
 
 
@@ -58,13 +63,13 @@ class PositionInfo:
     _legacy_position_type: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
     
-    def get_age_seconds(self) -> float:
-        """Get position age in seconds."""
-        return (datetime.now() - self.open_time).total_seconds()
+    def get_age_seconds(self, now: Optional[datetime] = None) -> float:
+        """Get position age in seconds (at now, default: current time)."""
+        return ((now or datetime.now()) - self.open_time).total_seconds()
         
-    def get_age_hours(self) -> float:
-        """Get position age in hours."""
-        return self.get_age_seconds() / 3600.0
+    def get_age_hours(self, now: Optional[datetime] = None) -> float:
+        """Get position age in hours (at now, default: current time)."""
+        return self.get_age_seconds(now) / 3600.0
         
     def get_pnl_pips(self, pip_value: float = 0.0001) -> float:
         """
@@ -132,6 +137,44 @@ class PositionInfo:
             logging.getLogger("herald.position").warning("_legacy_position_type used: prefer `side` in new code")
 
 
+@dataclass
+class BulkCloseReport:
+    """
+    Aggregated outcome of a bulk close.
+    
+    Attributes:
+        results: ExecutionResult per submitted request
+        requested: Number of positions requested to close
+        closed: Number of positions fully closed
+        failed: Number of rejected requests
+        close_by_pairs: Number of opposite pairs netted with TRADE_ACTION_CLOSE_BY
+        market_closes: Number of market close requests sent
+        latencies_ms: Per-request round-trip latency in milliseconds
+        total_ms: Wall-clock duration of the whole bulk close
+    """
+    results: List[ExecutionResult] = field(default_factory=list)
+    requested: int = 0
+    closed: int = 0
+    failed: int = 0
+    close_by_pairs: int = 0
+    market_closes: int = 0
+    latencies_ms: List[float] = field(default_factory=list)
+    total_ms: float = 0.0
+    
+    def latency_stats(self) -> Dict[str, float]:
+        """Get min/avg/p95/max request latency in milliseconds."""
+        if not self.latencies_ms:
+            return {'min': 0.0, 'avg': 0.0, 'p95': 0.0, 'max': 0.0}
+        ordered = sorted(self.latencies_ms)
+        p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+        return {
+            'min': ordered[0],
+            'avg': sum(ordered) / len(ordered),
+            'p95': ordered[p95_index],
+            'max': ordered[-1],
+        }
+
+
 class PositionManager:
     """
     Real-time position tracking and monitoring engine.
@@ -145,17 +188,24 @@ class PositionManager:
     - Reconcile with MT5 positions on reconnect
     """
     
-    def __init__(self, connector=None, execution_engine: Optional[ExecutionEngine]=None):
+    def __init__(self, connector=None, execution_engine: Optional[ExecutionEngine]=None,
+                 metrics: Optional[ExecutionMetrics] = None):
         """
         Initialize position manager.
         
         Args:
             connector: MT5Connector instance
             execution_engine: ExecutionEngine instance
+            metrics: Close-order instrumentation (defaults to the execution engine's)
         """
         self.connector = connector
         self.execution_engine = execution_engine
-        self.logger = logging.getLogger("herald.position")
+        self.logger = HeraldLogger("herald.position")
+        
+        engine_metrics = getattr(execution_engine, 'metrics', None)
+        if metrics is None:
+            metrics = engine_metrics if isinstance(engine_metrics, ExecutionMetrics) else ExecutionMetrics()
+        self.metrics = metrics
         
         # Position registry
         self._positions: Dict[int, PositionInfo] = {}
@@ -176,7 +226,7 @@ class PositionManager:
             PositionInfo object or None if tracking failed
         """
         if execution_result.status != OrderStatus.FILLED:
-            self.logger.warning(f"Cannot track unfilled order: {execution_result.status}")
+            self.logger.warning("Cannot track unfilled order: %s", execution_result.status)
             return None
             
         if execution_result.order_id is None:
@@ -188,7 +238,7 @@ class PositionManager:
             position = mt5.positions_get(ticket=execution_result.order_id)
             
             if position is None or len(position) == 0:
-                self.logger.error(f"Position not found in MT5: ticket #{execution_result.order_id}")
+                self.logger.error("Position not found in MT5: ticket #%s", execution_result.order_id)
                 return None
                 
             pos = position[0]
@@ -219,14 +269,16 @@ class PositionManager:
             self._total_positions_opened += 1
             
             self.logger.info(
-                f"Position tracked: #{position_info.ticket} | "
-                f"{position_info.symbol} {position_info.side} {position_info.volume:.2f} @ {position_info.open_price:.5f}"
+                "Position tracked: #%s | "
+                "%s %s %.2f @ %.5f",
+                position_info.ticket, position_info.symbol, position_info.side,
+                position_info.volume, position_info.open_price
             )
             
             return position_info
             
         except Exception as e:
-            self.logger.error(f"Failed to track position: {e}", exc_info=True)
+            self.logger.error("Failed to track position: %s", e, exc_info=True)
             return None
             
     def monitor_positions(self) -> List[PositionInfo]:
@@ -265,14 +317,14 @@ class PositionManager:
                     
                 else:
                     # Position closed externally - remove from tracking
-                    self.logger.info(f"Position #{ticket} closed externally")
+                    self.logger.info("Position #%s closed externally", ticket)
                     del self._positions[ticket]
                     self._total_positions_closed += 1
                     
             return list(self._positions.values())
             
         except Exception as e:
-            self.logger.error(f"Failed to monitor positions: {e}", exc_info=True)
+            self.logger.error("Failed to monitor positions: %s", e, exc_info=True)
             return list(self._positions.values())
             
     def get_position(self, ticket: int) -> Optional[PositionInfo]:
@@ -350,42 +402,26 @@ class PositionManager:
         """
         position_info = self._positions.get(ticket)
         if not position_info:
-            self.logger.error(f"Cannot close position #{ticket}: not tracked")
+            self.logger.error("Cannot close position #%s: not tracked", ticket)
             return None
             
         try:
-            # Get current price
-            if position_info.side == "BUY":
-                close_price = mt5.symbol_info_tick(position_info.symbol).bid
-                order_type = mt5.ORDER_TYPE_SELL
-            else:
-                close_price = mt5.symbol_info_tick(position_info.symbol).ask
-                order_type = mt5.ORDER_TYPE_BUY
-                
+            tick = mt5.symbol_info_tick(position_info.symbol)
+            
             # Determine volume
             close_volume = partial_volume if partial_volume else position_info.volume
             
-            # Create close request
-            request = {
-                "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": position_info.symbol,
-                "volume": close_volume,
-                "type": order_type,
-                "position": ticket,
-                "price": close_price,
-                "deviation": 10,
-                "magic": self.execution_engine.magic_number,
-                "comment": f"Close: {reason}",
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_FOK,
-            }
+            request = self._build_close_request(position_info, close_volume, reason, tick)
+            close_price = request["price"]
             
             # Send close order
+            sent = time.perf_counter()
             result = mt5.order_send(request)
+            self.metrics.record_request(position_info.symbol, "close", request, time.perf_counter() - sent, result)
             
             if result is None or result.retcode != mt5.TRADE_RETCODE_DONE:
                 error = mt5.last_error() if result is None else f"{result.retcode}: {result.comment}"
-                self.logger.error(f"Failed to close position #{ticket}: {error}")
+                self.logger.error("Failed to close position #%s: %s", ticket, error)
                 return ExecutionResult(
                     order_id=None,
                     status=OrderStatus.REJECTED,
@@ -398,20 +434,15 @@ class PositionManager:
             # Calculate realized P&L
             realized_pnl = position_info.unrealized_pnl
             
-            # Remove from tracking if fully closed
-            if close_volume >= position_info.volume:
-                del self._positions[ticket]
-                self._total_positions_closed += 1
-            else:
-                # Update remaining volume for partial close
-                position_info.volume -= close_volume
+            self._apply_close(position_info, close_volume)
                 
             self.logger.info(
-                f"Position closed: #{ticket} | "
-                f"Volume: {close_volume:.2f} | "
-                f"Price: {close_price:.5f} | "
-                f"P&L: {realized_pnl:+.2f} | "
-                f"Reason: {reason}"
+                "Position closed: #%s | "
+                "Volume: %.2f | "
+                "Price: %.5f | "
+                "P&L: %+.2f | "
+                "Reason: %s",
+                ticket, close_volume, close_price, realized_pnl, reason
             )
             
             return ExecutionResult(
@@ -428,27 +459,243 @@ class PositionManager:
             )
             
         except Exception as e:
-            self.logger.error(f"Failed to close position #{ticket}: {e}", exc_info=True)
+            self.logger.error("Failed to close position #%s: %s", ticket, e, exc_info=True)
             return None
             
-    def close_all_positions(self, reason: str = "Close all") -> List[ExecutionResult]:
+    def _build_close_request(
+        self,
+        position_info: PositionInfo,
+        close_volume: float,
+        reason: str,
+        tick
+    ) -> Dict[str, Any]:
+        """Build market close request for a position using a pre-fetched tick."""
+        if position_info.side == "BUY":
+            close_price = tick.bid
+            order_type = mt5.ORDER_TYPE_SELL
+        else:
+            close_price = tick.ask
+            order_type = mt5.ORDER_TYPE_BUY
+            
+        return {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": position_info.symbol,
+            "volume": close_volume,
+            "type": order_type,
+            "position": position_info.ticket,
+            "price": close_price,
+            "deviation": 10,
+            "magic": self.execution_engine.magic_number,
+            "comment": f"Close: {reason}",
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": mt5.ORDER_FILLING_FOK,
+        }
+        
+    def _apply_close(self, position_info: PositionInfo, close_volume: float) -> bool:
+        """
+        Update the registry after a successful (partial) close.
+        
+        Returns:
+            True if the position is now fully closed
+        """
+        if close_volume >= position_info.volume - 1e-9:
+            if self._positions.pop(position_info.ticket, None) is not None:
+                self._total_positions_closed += 1
+            return True
+        # Update remaining volume for partial close
+        position_info.volume -= close_volume
+        return False
+        
+    def close_all_positions(self, reason: str = "Close all", max_in_flight: int = 4) -> BulkCloseReport:
         """
         Close all tracked positions.
         
         Args:
             reason: Reason for closing all positions
+            max_in_flight: Maximum concurrent close requests
             
         Returns:
-            List of ExecutionResult objects
+            BulkCloseReport with aggregated results and latency stats
         """
-        results = []
+        return self.close_positions_bulk(list(self._positions.keys()), reason, max_in_flight)
+        
+    def close_positions_bulk(
+        self,
+        tickets: List[int],
+        reason: str,
+        max_in_flight: int = 4
+    ) -> BulkCloseReport:
+        """
+        Close many positions with one tick lookup per symbol and bounded concurrency.
+        
+        On hedging accounts, opposite positions on a symbol that permits it are
+        netted with TRADE_ACTION_CLOSE_BY (see ExecutionEngine.plan_netting),
+        which pays no spread; only the residual net volume is closed with
+        market orders. Requests are submitted through a pool capped at
+        max_in_flight concurrent order_send calls.
+        
+        Args:
+            tickets: Tracked position tickets to close
+            reason: Reason for closing
+            max_in_flight: Maximum concurrent close requests
+            
+        Returns:
+            BulkCloseReport with aggregated results and latency stats
+        """
+        start = time.perf_counter()
+        positions = [self._positions[t] for t in tickets if t in self._positions]
+        report = BulkCloseReport(requested=len(positions))
+        
+        for ticket in tickets:
+            if ticket not in self._positions:
+                self.logger.error("Cannot close position #%s: not tracked", ticket)
+                
+        if not positions:
+            return report
+            
+        # Group by symbol and fetch one tick per symbol
+        by_symbol: Dict[str, List[PositionInfo]] = {}
+        for position_info in positions:
+            by_symbol.setdefault(position_info.symbol, []).append(position_info)
+            
+        ticks = {symbol: mt5.symbol_info_tick(symbol) for symbol in by_symbol}
+        plan = self.execution_engine.plan_netting([
+            NettingLeg(ticket=p.ticket, symbol=p.symbol, side=p.side, volume=p.volume)
+            for p in positions
+        ])
         
-        for ticket in list(self._positions.keys()):
-            result = self.close_position(ticket, reason)
-            if result:
-                results.append(result)
+        # Each job is a list of requests sent sequentially; jobs run concurrently.
+        # Close-by pairs of a symbol depend on each other (a leg can be reduced
+        # and netted again), so a symbol's netting runs as a single job.
+        jobs: List[List[Tuple[Dict[str, Any], List[PositionInfo], float]]] = []
+        for symbol in by_symbol:
+            netting_job = []
+            netted_tickets = set()
+            for pair in (p for p in plan.close_by if p.symbol == symbol):
+                request = {
+                    "action": mt5.TRADE_ACTION_CLOSE_BY,
+                    "position": pair.ticket,
+                    "position_by": pair.ticket_by,
+                    "magic": self.execution_engine.magic_number,
+                    "comment": f"Close by: {reason}",
+                }
+                netting_job.append((request, [self._positions[pair.ticket], self._positions[pair.ticket_by]], pair.volume))
+                netted_tickets.update((pair.ticket, pair.ticket_by))
                 
-        return results
+            tick = ticks[symbol]
+            for close in (m for m in plan.market if m.symbol == symbol):
+                position_info = self._positions[close.ticket]
+                if tick is None:
+                    report.failed += 1
+                    report.results.append(ExecutionResult(
+                        order_id=None,
+                        status=OrderStatus.REJECTED,
+                        executed_price=None,
+                        executed_volume=None,
+                        timestamp=datetime.now(),
+                        error=f"No tick for {symbol}",
+                        metadata={'ticket_closed': position_info.ticket}
+                    ))
+                    continue
+                request = self._build_close_request(position_info, close.volume, reason, tick)
+                if close.ticket in netted_tickets:
+                    # Residual of a netted leg must wait for its close-by pairs
+                    netting_job.append((request, [position_info], close.volume))
+                else:
+                    jobs.append([(request, [position_info], close.volume)])
+                    
+            if netting_job:
+                jobs.append(netting_job)
+                
+        def run_job(job):
+            outcomes = []
+            failed = False
+            for request, legs, volume in job:
+                if failed:
+                    # Later steps assume the earlier ones succeeded
+                    outcomes.append((request, legs, volume, None, "Skipped after failed close-by", None))
+                    continue
+                sent = time.perf_counter()
+                try:
+                    result = mt5.order_send(request)
+                    error = None
+                except Exception as e:
+                    result, error = None, str(e)
+                latency_ms = (time.perf_counter() - sent) * 1000.0
+                outcomes.append((request, legs, volume, result, error, latency_ms))
+                failed = result is None or result.retcode != mt5.TRADE_RETCODE_DONE
+            return outcomes
+            
+        workers = max(1, min(max_in_flight, len(jobs))) if jobs else 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="herald-close") as pool:
+            job_outcomes = list(pool.map(run_job, jobs))
+            
+        # Apply registry updates on the calling thread
+        for outcomes in job_outcomes:
+            for request, legs, volume, result, error, latency_ms in outcomes:
+                is_close_by = request["action"] == mt5.TRADE_ACTION_CLOSE_BY
+                if latency_ms is not None:
+                    self.metrics.record_request(
+                        legs[0].symbol, "close_by" if is_close_by else "close", request, latency_ms / 1000.0, result
+                    )
+                    report.latencies_ms.append(latency_ms)
+                    if is_close_by:
+                        report.close_by_pairs += 1
+                    else:
+                        report.market_closes += 1
+                        
+                if result is None or result.retcode != mt5.TRADE_RETCODE_DONE:
+                    if error is None:
+                        error = mt5.last_error() if result is None else f"{result.retcode}: {result.comment}"
+                    self.logger.error("Failed to close position(s) %s: %s", [p.ticket for p in legs], error)
+                    report.failed += 1
+                    report.results.append(ExecutionResult(
+                        order_id=None,
+                        status=OrderStatus.REJECTED,
+                        executed_price=None,
+                        executed_volume=None,
+                        timestamp=datetime.now(),
+                        error=str(error),
+                        metadata={'ticket_closed': legs[0].ticket, 'latency_ms': latency_ms}
+                    ))
+                    continue
+                    
+                realized_pnl = 0.0
+                for position_info in legs:
+                    if position_info.volume > 0:
+                        share = position_info.unrealized_pnl * min(1.0, volume / position_info.volume)
+                        realized_pnl += share
+                        position_info.unrealized_pnl -= share
+                    if self._apply_close(position_info, volume):
+                        report.closed += 1
+                        
+                report.results.append(ExecutionResult(
+                    order_id=result.order,
+                    status=OrderStatus.FILLED,
+                    executed_price=result.price,
+                    executed_volume=volume,
+                    timestamp=datetime.now(),
+                    metadata={
+                        'reason': reason,
+                        'realized_pnl': realized_pnl,
+                        'ticket_closed': legs[0].ticket,
+                        'tickets_closed': [p.ticket for p in legs],
+                        'close_by': is_close_by,
+                        'latency_ms': latency_ms
+                    }
+                ))
+                
+        report.total_ms = (time.perf_counter() - start) * 1000.0
+        stats = report.latency_stats()
+        self.logger.info(
+            "Bulk close: %s/%s closed | "
+            "close-by pairs: %s | market: %s | "
+            "failed: %s | total: %.1fms | "
+            "avg: %.1fms | max: %.1fms | Reason: %s",
+            report.closed, report.requested, report.close_by_pairs, report.market_closes,
+            report.failed, report.total_ms, stats['avg'], stats['max'], reason
+        )
+        return report
         
     def get_total_exposure(self) -> float:
         """
@@ -497,12 +744,13 @@ class PositionManager:
             'swap': position.swap
         }
         
-    def reconcile_positions(self, magic_number: int = 123456) -> int:
+    def reconcile_positions(self, magic_number: Optional[int] = None) -> int:
         """
         Reconcile tracked positions with MT5 after reconnection or at startup.
         
         Args:
             magic_number: Herald's magic number to filter positions
+                (default: the execution engine's magic number)
         
         Returns:
             Number of positions reconciled
@@ -511,6 +759,12 @@ class PositionManager:
             self.logger.warning("Cannot reconcile: not connected to MT5")
             return 0
             
+        if magic_number is None:
+            magic_number = getattr(self.execution_engine, 'magic_number', None)
+            if magic_number is None:
+                self.logger.warning("Cannot reconcile: no magic number configured")
+                return 0
+            
         try:
             # Get all MT5 positions
             mt5_positions = mt5.positions_get()
@@ -544,12 +798,12 @@ class PositionManager:
                     reconciled += 1
                     
             if reconciled > 0:
-                self.logger.info(f"Reconciled {reconciled} positions with MT5")
+                self.logger.info("Reconciled %s positions with MT5", reconciled)
                 
             return reconciled
             
         except Exception as e:
-            self.logger.error(f"Failed to reconcile positions: {e}", exc_info=True)
+            self.logger.error("Failed to reconcile positions: %s", e, exc_info=True)
             return 0
             
     def get_statistics(self) -> Dict[str, Any]:
@@ -5,12 +5,12 @@ Manages external trades not placed by Herald, allowing the bot
 to adopt and manage manual/external trades with its exit strategies.
 """
 
-import logging
 from typing import List, Dict, Any, Optional, Set
 from datetime import datetime
 from dataclasses import dataclass, field
 
 from herald.connector.mt5_connector import mt5
+from herald.observability.logger import HeraldLogger
 from herald.position.manager import PositionInfo, PositionManager
 
 
@@ -74,7 +74,7 @@ class TradeManager:
         self.position_manager = position_manager
         self.policy = policy or TradeAdoptionPolicy()
         self.magic_number = magic_number
-        self.logger = logging.getLogger("herald.trade_manager")
+        self.logger = HeraldLogger("herald.trade_manager")
         
         # Track adopted trades
         self._adopted_tickets: Set[int] = set()
@@ -112,7 +112,7 @@ class TradeManager:
                 if pos.magic == self.magic_number:
                     # Herald trade not in registry - should reconcile
                     self.logger.warning(
-                        f"Herald trade #{pos.ticket} not in registry, reconciling"
+                        "Herald trade #%s not in registry, reconciling", pos.ticket
                     )
                     continue
                     
@@ -124,7 +124,7 @@ class TradeManager:
             return external_trades
             
         except Exception as e:
-            self.logger.error(f"Error scanning for external trades: {e}", exc_info=True)
+            self.logger.error("Error scanning for external trades: %s", e, exc_info=True)
             return []
             
     def _should_adopt(self, pos) -> bool:
@@ -151,7 +151,7 @@ class TradeManager:
             age_hours = (datetime.now().timestamp() - pos.time) / 3600.0
             if age_hours > self.policy.max_adoption_age_hours:
                 self.logger.debug(
-                    f"Skipping trade #{pos.ticket}: too old ({age_hours:.1f}h)"
+                    "Skipping trade #%s: too old (%.1fh)", pos.ticket, age_hours
                 )
                 return False
                 
@@ -202,9 +202,10 @@ class TradeManager:
         if self.policy.log_only:
             for trade in trades:
                 self.logger.info(
-                    f"[LOG ONLY] Detected external trade: #{trade.ticket} "
-                    f"{trade.symbol} {trade.side} {trade.volume:.2f} lots, "
-                    f"P&L: ${trade.unrealized_pnl:.2f}"
+                    "[LOG ONLY] Detected external trade: #%s "
+                    "%s %s %.2f lots, "
+                    "P&L: $%.2f",
+                    trade.ticket, trade.symbol, trade.side, trade.volume, trade.unrealized_pnl
                 )
             return 0
             
@@ -228,16 +229,18 @@ class TradeManager:
                 })
                 
                 self.logger.info(
-                    f"Adopted trade: #{trade.ticket} | "
-                    f"{trade.symbol} {trade.side} {trade.volume:.2f} lots @ {trade.open_price:.5f}, "
-                    f"Current P&L: ${trade.unrealized_pnl:.2f}"
+                    "Adopted trade: #%s | "
+                    "%s %s %.2f lots @ %.5f, "
+                    "Current P&L: $%.2f",
+                    trade.ticket, trade.symbol, trade.side, trade.volume,
+                    trade.open_price, trade.unrealized_pnl
                 )
                 
                 adopted_count += 1
                 
             except Exception as e:
                 self.logger.error(
-                    f"Failed to adopt trade #{trade.ticket}: {e}"
+                    "Failed to adopt trade #%s: %s", trade.ticket, e
                 )
                 
         return adopted_count
@@ -252,7 +255,7 @@ class TradeManager:
         trades = self.scan_for_external_trades()
         
         if trades:
-            self.logger.info(f"Found {len(trades)} external trades")
+            self.logger.info("Found %s external trades", len(trades))
             return self.adopt_trades(trades)
             
         return 0
@@ -5,10 +5,10 @@ Implements position sizing, exposure limits, and trade approval logic.
 Provides hard guards for maximum drawdown, daily limits, and emergency shutdown.
 """
 
-import logging
 from typing import Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 from datetime import date
+from herald.observability.logger import HeraldLogger
 from herald.strategy.base import Signal, SignalType
 
 
@@ -55,7 +55,7 @@ class RiskManager:
             limits: Risk limit configuration
         """
         self.limits = limits
-        self.logger = logging.getLogger("herald.risk")
+        self.logger = HeraldLogger("herald.risk")
         
         # Daily tracking
         self.daily_pnl = 0.0
@@ -67,7 +67,8 @@ class RiskManager:
         self,
         signal: Signal,
         account_state: Dict[str, Any],
-        current_positions: int = 0
+        current_positions: int = 0,
+        today: Optional[date] = None
     ) -> Tuple[bool, str, Optional[float]]:
         """
         Approve trade signal and calculate position size.
@@ -76,6 +77,8 @@ class RiskManager:
             signal: Trading signal to approve
             account_state: Current account information
             current_positions: Number of open positions
+            today: Trading day for the daily limits (default: today; a
+                backtest passes the bar's date)
             
         Returns:
             Tuple of (approved, reason, position_size)
@@ -85,14 +88,14 @@ class RiskManager:
             return False, "Emergency shutdown active", None
             
         # Reset daily tracking if new day
-        self._check_new_day()
+        self._check_new_day(today)
         
         # Check daily loss limit
         balance = account_state.get('balance', 0)
         max_daily_loss = balance * self.limits.max_daily_loss_pct
         
         if self.daily_pnl < -max_daily_loss:
-            self.logger.warning(f"Daily loss limit exceeded: {self.daily_pnl:.2f}")
+            self.logger.warning("Daily loss limit exceeded: %.2f", self.daily_pnl)
             return False, "Daily loss limit exceeded", None
             
         # Check max positions
@@ -123,8 +126,9 @@ class RiskManager:
             return False, "Invalid position size calculated", None
             
         self.logger.info(
-            f"Trade approved: {signal.action} {position_size:.2f} lots | "
-            f"Confidence: {signal.confidence:.2%}"
+            "Trade approved: %s %.2f lots | "
+            "Confidence: %.2f%%",
+            signal.action, position_size, signal.confidence * 100
         )
         
         return True, "Approved", position_size
@@ -247,8 +251,9 @@ class RiskManager:
         lot_size = risk_amount / (risk_in_pips * pip_value_per_lot)
         
         self.logger.debug(
-            f"Lot calculation: risk=${risk_amount:.2f}, risk_pips={risk_in_pips:.1f}, "
-            f"pip_value={pip_value_per_lot:.4f}, lots={lot_size:.4f}"
+            "Lot calculation: risk=$%.2f, risk_pips=%.1f, "
+            "pip_value=%.4f, lots=%.4f",
+            risk_amount, risk_in_pips, pip_value_per_lot, lot_size
         )
         
         return lot_size
@@ -303,8 +308,9 @@ class RiskManager:
         self.trade_count += 1
         
         self.logger.info(
-            f"Trade result recorded: {profit:+.2f} | "
-            f"Daily P&L: {self.daily_pnl:+.2f} ({self.trade_count} trades)"
+            "Trade result recorded: %+.2f | "
+            "Daily P&L: %+.2f (%s trades)",
+            profit, self.daily_pnl, self.trade_count
         )
         
         # Check if daily loss limit hit
@@ -313,7 +319,7 @@ class RiskManager:
             
             if self.daily_pnl < -max_daily_loss:
                 self.logger.critical(
-                    f"Daily loss limit exceeded: {self.daily_pnl:.2f} < -{max_daily_loss:.2f} - consider shutdown"
+                    "Daily loss limit exceeded: %.2f < -%.2f - consider shutdown", self.daily_pnl, max_daily_loss
                 )
             
     def emergency_shutdown(self, reason: str = "Manual"):
@@ -324,19 +330,19 @@ class RiskManager:
             reason: Reason for shutdown
         """
         self.shutdown_triggered = True
-        self.logger.critical(f"EMERGENCY SHUTDOWN TRIGGERED: {reason}")
+        self.logger.critical("EMERGENCY SHUTDOWN TRIGGERED: %s", reason)
         
     def reset_shutdown(self):
         """Reset emergency shutdown flag."""
         self.shutdown_triggered = False
         self.logger.info("Emergency shutdown reset")
         
-    def _check_new_day(self):
+    def _check_new_day(self, today: Optional[date] = None):
         """Check if new trading day and reset counters."""
-        today = date.today()
+        today = today or date.today()
         if today != self.current_date:
             self.logger.info(
-                f"New trading day | Previous P&L: {self.daily_pnl:+.2f} ({self.trade_count} trades)"
+                "New trading day | Previous P&L: %+.2f (%s trades)", self.daily_pnl, self.trade_count
             )
             self.daily_pnl = 0.0
             self.trade_count = 0
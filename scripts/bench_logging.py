@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark deferred log formatting in the exit-check hot path.
+
+Runs TrailingStop.should_exit over N positions with a rising price (so the
+"New best price" debug line fires for every position on every cycle) and
+compares the cost of the suppressed debug calls written as eager f-strings
+against the HeraldLogger %-style form, with DEBUG disabled.
+
+Usage:
+    python -m herald.scripts.bench_logging --positions 500 --cycles 200
+"""
+
+import argparse
+import logging
+import time
+import timeit
+from datetime import datetime
+
+from herald.exit.trailing_stop import TrailingStop
+from herald.observability.logger import HeraldLogger
+from herald.position.manager import PositionInfo
+
+
+def per_call_costs(number: int):
+    """Seconds per suppressed debug call: (eager f-string, lazy facade)."""
+    std_logger = logging.getLogger("herald.bench.eager")
+    lazy_logger = HeraldLogger("herald.bench.lazy")
+    ticket, price = 123456789, 1.23456
+
+    eager = timeit.timeit(lambda: std_logger.debug(f"{ticket}: New best price {price}"), number=number)
+    lazy = timeit.timeit(lambda: lazy_logger.debug("%s: New best price %s", ticket, price), number=number)
+    return eager / number, lazy / number
+
+
+def exit_cycle_cost(positions: int, cycles: int):
+    """Seconds per exit-check cycle across all positions."""
+    strategy = TrailingStop({'activation_profit_pct': 0.0, 'min_stop_distance_pips': 1000.0})
+    book = [
+        PositionInfo(
+            ticket=i, symbol="EURUSD", volume=0.1, open_time=datetime.now(),
+            open_price=1.1000, side="BUY"
+        )
+        for i in range(positions)
+    ]
+    price = 1.1000
+    start = time.perf_counter()
+    for _ in range(cycles):
+        price += 0.0001
+        data = {'current_price': price, 'indicators': {}}
+        for position in book:
+            strategy.should_exit(position, data)
+    return (time.perf_counter() - start) / cycles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark deferred log formatting")
+    parser.add_argument('--positions', type=int, default=500, help="Open positions checked per cycle")
+    parser.add_argument('--cycles', type=int, default=200, help="Exit-check cycles to time")
+    parser.add_argument('--calls', type=int, default=200000, help="Iterations for the per-call timing")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("herald").setLevel(logging.INFO)
+
+    eager, lazy = per_call_costs(args.calls)
+    cycle = exit_cycle_cost(args.positions, args.cycles)
+    saved = (eager - lazy) * args.positions
+
+    print(f"Suppressed debug call, eager f-string: {eager * 1e9:8.1f} ns")
+    print(f"Suppressed debug call, HeraldLogger:   {lazy * 1e9:8.1f} ns")
+    print(f"Exit-check cycle ({args.positions} positions):  {cycle * 1e3:8.3f} ms")
+    print(
+        f"Saved per cycle (1 debug line/position): {saved * 1e6:8.1f} us "
+        f"({saved / (cycle + saved):.1%} of the eager cycle)"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
 """Strategy module"""
 
-from .base import Strategy, Signal, SignalType
+from .base import Strategy, Signal, SignalType, SIGNAL_COLUMNS
 from .sma_crossover import SmaCrossover
 
-__all__ = ["Strategy", "Signal", "SignalType", "SmaCrossover"]
+__all__ = ["Strategy", "Signal", "SignalType", "SIGNAL_COLUMNS", "SmaCrossover"]
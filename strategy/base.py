@@ -22,6 +22,10 @@ class SignalType(Enum):
     NONE = "NONE"
 
 
+# Columns of a Strategy.generate_signals() table; side is 1 (LONG) or -1 (SHORT)
+SIGNAL_COLUMNS = ('side', 'price', 'stop_loss', 'take_profit', 'confidence')
+
+
 @dataclass
 class Signal:
     """
@@ -121,6 +125,51 @@ class Strategy(ABC):
         """
         return None
         
+    def generate_signals(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Compute signals for a whole frame at once (optional fast path).
+        
+        Strategies whose on_bar() can be written as array operations override
+        this for backtests and replays. The table must match calling on_bar()
+        on every row of df with a freshly reset strategy. It does not touch
+        on_bar() state.
+        
+        Args:
+            df: Bars with indicator columns, indexed by bar time
+            
+        Returns:
+            DataFrame indexed by bar time with one row per signal and
+            SIGNAL_COLUMNS (plus any strategy-specific columns), or None if
+            the strategy has no batch path
+        """
+        return None
+        
+    def table_signal(self, bar_time: datetime, row: Dict[str, Any]) -> Signal:
+        """
+        Build the Signal for one row of a generate_signals() table.
+        
+        Args:
+            bar_time: Bar time of the row
+            row: Column -> value mapping of the row
+            
+        Returns:
+            Signal object (extra columns go into metadata)
+        """
+        side = SignalType.LONG if row['side'] > 0 else SignalType.SHORT
+        return Signal(
+            id=self.generate_signal_id(bar_time),
+            timestamp=bar_time,
+            symbol=self.config.get('symbol', 'UNKNOWN'),
+            timeframe=self.config.get('timeframe', '1H'),
+            side=side,
+            action='BUY' if side == SignalType.LONG else 'SELL',
+            price=row['price'],
+            stop_loss=row['stop_loss'],
+            take_profit=row['take_profit'],
+            confidence=row['confidence'],
+            metadata={key: value for key, value in row.items() if key not in SIGNAL_COLUMNS}
+        )
+        
     def configure(self, params: Dict[str, Any]):
         """
         Update strategy parameters.
@@ -145,13 +194,20 @@ class Strategy(ABC):
         self._state.clear()
         self.logger.info(f"Strategy {self.name} reset")
         
-    def generate_signal_id(self) -> str:
+    def generate_signal_id(self, bar_time: Optional[datetime] = None) -> str:
         """
         Generate unique signal ID.
         
+        Args:
+            bar_time: Time of the bar that produced the signal. When given the
+                ID is deterministic, so a signal re-generated after a restart
+                maps to the same order client tag.
+        
         Returns:
             Signal ID string
         """
+        if bar_time is not None:
+            return f"{self.name}_{bar_time.strftime('%Y%m%d_%H%M%S')}"
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
         return f"{self.name}_{timestamp}"
         
@@ -5,6 +5,7 @@ Implementation of SMA crossover strategy.
 Entry on crossovers, exit on opposite signals or stop loss/take profit.
 """
 
+import numpy as np
 import pandas as pd
 from herald.connector.mt5_connector import mt5
 from typing import Optional, Dict, Any
@@ -26,8 +27,13 @@ class SmaCrossover(Strategy):
         atr_period: ATR period for stop loss (default: 14)
         atr_multiplier: ATR multiplier for SL (default: 2.0)
         risk_reward_ratio: Risk/reward ratio (default: 2.0)
+    
+    generate_signals() computes the same signals for a whole frame with
+    numpy (used by the backtester).
     """
     
+    SIGNAL_CONFIDENCE = 0.7
+    
     def __init__(self, config: Dict[str, Any]):
         """Initialize SMA crossover strategy."""
         super().__init__("sma_crossover", config)
@@ -41,7 +47,17 @@ class SmaCrossover(Strategy):
         self.risk_reward_ratio = config.get('risk_reward_ratio', 2.0)
         
         # State
-        self._state = {
+        self._state = self._initial_state()
+        
+        self.logger.info(
+            f"SMA Crossover initialized: short={self.short_window}, "
+            f"long={self.long_window}, atr={self.atr_period}"
+        )
+        
+    @staticmethod
+    def _initial_state() -> Dict[str, Any]:
+        """State before the first bar."""
+        return {
             'last_signal': None,
             'last_crossover': None,
             'sma_short': None,
@@ -49,10 +65,10 @@ class SmaCrossover(Strategy):
             'atr': None
         }
         
-        self.logger.info(
-            f"SMA Crossover initialized: short={self.short_window}, "
-            f"long={self.long_window}, atr={self.atr_period}"
-        )
+    def reset(self):
+        """Reset strategy state (crossover detection restarts from the next bar)."""
+        super().reset()
+        self._state.update(self._initial_state())
         
     def on_bar(self, bar: pd.Series) -> Optional[Signal]:
         """
@@ -96,7 +112,7 @@ class SmaCrossover(Strategy):
             
         # Check for bullish crossover
         if prev_short <= prev_long and sma_short > sma_long:
-            signal = self._create_long_signal(close, atr, bar)
+            signal = self._create_long_signal(close, atr, bar.name, sma_short, sma_long)
             if self.validate_signal(signal):
                 self._state['last_signal'] = SignalType.LONG
                 self._state['last_crossover'] = datetime.now()
@@ -104,7 +120,7 @@ class SmaCrossover(Strategy):
                 
         # Check for bearish crossover
         elif prev_short >= prev_long and sma_short < sma_long:
-            signal = self._create_short_signal(close, atr, bar)
+            signal = self._create_short_signal(close, atr, bar.name, sma_short, sma_long)
             if self.validate_signal(signal):
                 self._state['last_signal'] = SignalType.SHORT
                 self._state['last_crossover'] = datetime.now()
@@ -112,7 +128,84 @@ class SmaCrossover(Strategy):
                 
         return None
         
-    def _create_long_signal(self, price: float, atr: float, bar: pd.Series) -> Signal:
+    def generate_signals(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Compute crossover signals over a whole frame.
+        
+        Same arithmetic and validation as on_bar() applied to arrays, so
+        every value is bit-identical to replaying df bar by bar through a
+        freshly reset strategy.
+        
+        Args:
+            df: Bars with sma_<short>, sma_<long>, atr and close columns
+            
+        Returns:
+            Signal table (SIGNAL_COLUMNS plus sma_short, sma_long, atr), or
+            None if indicator columns are missing
+        """
+        sma_short_col = f'sma_{self.short_window}'
+        sma_long_col = f'sma_{self.long_window}'
+        if sma_short_col not in df or sma_long_col not in df or 'atr' not in df:
+            return None
+            
+        sma_short = df[sma_short_col].to_numpy(dtype=np.float64)
+        sma_long = df[sma_long_col].to_numpy(dtype=np.float64)
+        atr = df['atr'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        prev_short = np.concatenate(([np.nan], sma_short[:-1]))
+        prev_long = np.concatenate(([np.nan], sma_long[:-1]))
+        
+        # Crossover masks (NaN compares False, like the warm-up bars in on_bar)
+        bullish = (prev_short <= prev_long) & (sma_short > sma_long)
+        bearish = ~bullish & (prev_short >= prev_long) & (sma_short < sma_long)
+        
+        # SL/TP exactly as _create_long_signal / _create_short_signal
+        offset = atr * self.atr_multiplier
+        stop_loss = np.where(bullish, close - offset, close + offset)
+        risk = np.where(bullish, close - stop_loss, stop_loss - close)
+        reward = risk * self.risk_reward_ratio
+        take_profit = np.where(bullish, close + reward, close - reward)
+        
+        # validate_signal(): a zero price/SL/TP skips its check, NaN does not
+        checked = (close != 0)
+        sl_set = checked & (stop_loss != 0)
+        tp_set = checked & (take_profit != 0)
+        valid_long = ~(sl_set & (stop_loss >= close)) & ~(tp_set & (take_profit <= close))
+        valid_short = ~(sl_set & (stop_loss <= close)) & ~(tp_set & (take_profit >= close))
+        
+        side = np.zeros(len(df), dtype=np.int8)
+        if self.config.get('symbol', 'UNKNOWN'):
+            side[bullish & valid_long] = 1
+            side[bearish & valid_short] = -1
+        rows = np.flatnonzero(side)
+        
+        return pd.DataFrame(
+            {
+                'side': side[rows],
+                'price': close[rows],
+                'stop_loss': stop_loss[rows],
+                'take_profit': take_profit[rows],
+                'confidence': np.full(len(rows), self.SIGNAL_CONFIDENCE),
+                'sma_short': sma_short[rows],
+                'sma_long': sma_long[rows],
+                'atr': atr[rows],
+            },
+            index=df.index[rows]
+        )
+        
+    def table_signal(self, bar_time: datetime, row: Dict[str, Any]) -> Signal:
+        """Build the Signal on_bar() returns for a generate_signals() row."""
+        create = self._create_long_signal if row['side'] > 0 else self._create_short_signal
+        return create(row['price'], row['atr'], bar_time, row['sma_short'], row['sma_long'])
+        
+    def _create_long_signal(
+        self,
+        price: float,
+        atr: float,
+        bar_time: datetime,
+        sma_short: float,
+        sma_long: float
+    ) -> Signal:
         """Create LONG signal with calculated SL/TP."""
         # Calculate stop loss
         stop_loss = price - (atr * self.atr_multiplier)
@@ -122,8 +215,8 @@ class SmaCrossover(Strategy):
         take_profit = price + (risk * self.risk_reward_ratio)
         
         return Signal(
-            id=self.generate_signal_id(),
-            timestamp=bar.name,
+            id=self.generate_signal_id(bar_time if isinstance(bar_time, datetime) else None),
+            timestamp=bar_time,
             symbol=self.config.get('symbol', 'UNKNOWN'),
             timeframe=self.config.get('timeframe', '1H'),
             side=SignalType.LONG,
@@ -131,18 +224,25 @@ class SmaCrossover(Strategy):
             price=price,
             stop_loss=stop_loss,
             take_profit=take_profit,
-            confidence=0.7,
+            confidence=self.SIGNAL_CONFIDENCE,
             reason=f"SMA crossover: {self.short_window} crossed above {self.long_window}",
             metadata={
-                'sma_short': float(self._state['sma_short']),
-                'sma_long': float(self._state['sma_long']),
+                'sma_short': float(sma_short),
+                'sma_long': float(sma_long),
                 'atr': float(atr),
                 'risk': float(risk),
                 'reward': float(risk * self.risk_reward_ratio)
             }
         )
         
-    def _create_short_signal(self, price: float, atr: float, bar: pd.Series) -> Signal:
+    def _create_short_signal(
+        self,
+        price: float,
+        atr: float,
+        bar_time: datetime,
+        sma_short: float,
+        sma_long: float
+    ) -> Signal:
         """Create SHORT signal with calculated SL/TP."""
         # Calculate stop loss
         stop_loss = price + (atr * self.atr_multiplier)
@@ -152,8 +252,8 @@ class SmaCrossover(Strategy):
         take_profit = price - (risk * self.risk_reward_ratio)
         
         return Signal(
-            id=self.generate_signal_id(),
-            timestamp=bar.name,
+            id=self.generate_signal_id(bar_time if isinstance(bar_time, datetime) else None),
+            timestamp=bar_time,
             symbol=self.config.get('symbol', 'UNKNOWN'),
             timeframe=self.config.get('timeframe', '1H'),
             side=SignalType.SHORT,
@@ -161,11 +261,11 @@ class SmaCrossover(Strategy):
             price=price,
             stop_loss=stop_loss,
             take_profit=take_profit,
-            confidence=0.7,
+            confidence=self.SIGNAL_CONFIDENCE,
             reason=f"SMA crossover: {self.short_window} crossed below {self.long_window}",
             metadata={
-                'sma_short': float(self._state['sma_short']),
-                'sma_long': float(self._state['sma_long']),
+                'sma_short': float(sma_short),
+                'sma_long': float(sma_long),
                 'atr': float(atr),
                 'risk': float(risk),
                 'reward': float(risk * self.risk_reward_ratio)
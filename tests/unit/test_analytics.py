@@ -0,0 +1,137 @@
+"""
+Unit tests for the trade analytics query layer.
+Tests aggregates, keyset pagination, index usage and schema upgrades.
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+
+class TestTradeAnalytics(unittest.TestCase):
+    """Test TradeAnalytics against a populated database."""
+
+    def setUp(self):
+        from herald.persistence.analytics import TradeAnalytics
+        from herald.persistence.database import Database, TradeRecord
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmp.name, "herald.db"), async_writes=False)
+        start = datetime(2025, 3, 3, 9, 0)
+        # (symbol, strategy, profit, exit reason, day offset); two trades share an entry time
+        trades = [
+            ("EURUSD", "SmaCrossover", 10.0, "TP", 0),
+            ("EURUSD", "SmaCrossover", -4.0, "SL", 0),
+            ("XAUUSD", "Breakout", 6.0, "TP", 1),
+            ("EURUSD", "Breakout", -2.0, "Trailing", 1),
+            ("XAUUSD", "SmaCrossover", 5.0, "TP", 2),
+        ]
+        for i, (symbol, strategy, profit, reason, day) in enumerate(trades):
+            entry = start + timedelta(days=day, hours=i if i != 1 else 0)
+            self.db.record_trade(TradeRecord(
+                signal_id=f"s{i}", order_id=100 + i, symbol=symbol, side="BUY", volume=0.1,
+                entry_price=1.0, entry_time=entry, strategy_name=strategy
+            ))
+            self.db.update_trade_exit(100 + i, 1.1, entry + timedelta(minutes=30 + i), profit, reason)
+        self.db.record_trade(TradeRecord(
+            signal_id="open", order_id=200, symbol="EURUSD", side="SELL", volume=0.1,
+            entry_price=1.0, entry_time=start
+        ))
+        self.analytics = TradeAnalytics(self.db)
+
+    def tearDown(self):
+        self.analytics.close()
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_aggregates(self):
+        """Test P&L, win-rate and exit-reason breakdowns over closed trades."""
+        by_symbol = self.analytics.pnl_by_symbol().set_index('symbol')
+        self.assertEqual(by_symbol.loc['EURUSD', 'trades'], 3)
+        self.assertAlmostEqual(by_symbol.loc['XAUUSD', 'profit'], 11.0)
+
+        by_day = self.analytics.pnl_by_day(symbol="EURUSD")
+        self.assertEqual([str(d.date()) for d in by_day['day']], ["2025-03-03", "2025-03-04"])
+        self.assertEqual(list(by_day['profit']), [6.0, -2.0])
+
+        rates = self.analytics.strategy_win_rates().set_index('strategy_name')
+        self.assertAlmostEqual(rates.loc['SmaCrossover', 'win_rate'], 2 / 3)
+        self.assertEqual(self.analytics.exit_reasons()['exit_reason'].iloc[0], "TP")
+
+        windowed = self.analytics.pnl_by_symbol(start=datetime(2025, 3, 4), end=datetime(2025, 3, 5))
+        self.assertEqual(int(windowed['trades'].sum()), 2)
+
+    def test_equity_curve(self):
+        """Test cumulative equity and drawdown follow exit order."""
+        curve = self.analytics.equity_curve(initial_equity=1000.0)
+        self.assertEqual(list(curve['equity']), [1010.0, 1006.0, 1012.0, 1010.0, 1015.0])
+        self.assertEqual(curve['drawdown'].max(), 4.0)
+        self.assertTrue(curve.index.is_monotonic_increasing)
+
+    def test_keyset_pagination(self):
+        """Test pages cover every trade exactly once, including entry-time ties."""
+        pages = list(self.analytics.iter_trades(page_size=2))
+        self.assertEqual([len(p) for p in pages], [2, 2, 1])
+        ids = [i for page in pages for i in page['order_id']]
+        self.assertEqual(sorted(ids), [100, 101, 102, 103, 104])
+
+        page, after = self.analytics.page_trades(status='OPEN')
+        self.assertEqual(list(page['order_id']), [200])
+        self.assertIsNone(after)
+
+    def test_queries_use_indexes(self):
+        """Test aggregate and page queries are served from the new indexes."""
+        plans = {
+            "SELECT strategy_name, COUNT(*), SUM(profit) FROM trades WHERE status = 1 GROUP BY strategy_name":
+                "COVERING INDEX idx_trades_strategy",
+            "SELECT exit_time, profit FROM trades WHERE status = 1 ORDER BY exit_time":
+                "COVERING INDEX idx_trades_status_exit",
+            "SELECT id FROM trades WHERE status = 1 AND symbol = 'EURUSD' "
+            "AND (entry_time, id) > (0, 0) ORDER BY entry_time, id LIMIT 10":
+                "idx_trades_status_symbol_entry",
+            "SELECT strategy_name, COUNT(*) FROM signals WHERE timestamp >= 0 GROUP BY strategy_name":
+                "idx_signals_strategy_time",
+        }
+        for query, index in plans.items():
+            plan = " ".join(row[3] for row in self.analytics.conn.execute("EXPLAIN QUERY PLAN " + query))
+            self.assertIn(index, plan)
+            self.assertNotIn("TEMP B-TREE FOR ORDER BY", plan)
+
+
+class TestSchemaUpgrade(unittest.TestCase):
+    """Test databases created before strategy_name existed are upgraded."""
+
+    def test_missing_columns_are_added(self):
+        from herald.persistence.database import Database, TradeRecord
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "old.db")
+            conn = sqlite3.connect(path)
+            conn.execute("""
+                CREATE TABLE trades (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, signal_id TEXT NOT NULL, order_id INTEGER,
+                    symbol TEXT NOT NULL, side TEXT NOT NULL, volume REAL NOT NULL, entry_price REAL NOT NULL,
+                    exit_price REAL, stop_loss REAL, take_profit REAL, entry_time TIMESTAMP NOT NULL,
+                    exit_time TIMESTAMP, profit REAL, status TEXT DEFAULT 'OPEN', exit_reason TEXT,
+                    metadata TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.close()
+
+            db = Database(path, async_writes=False)
+            try:
+                db.record_trade(TradeRecord(
+                    signal_id="s1", order_id=1, symbol="EURUSD", side="BUY", volume=0.1,
+                    entry_price=1.0, entry_time=datetime.now(), strategy_name="SmaCrossover", commission=-0.7
+                ))
+                trade = db.get_open_trades()[0]
+                self.assertEqual(trade.strategy_name, "SmaCrossover")
+                self.assertEqual(trade.commission, -0.7)
+            finally:
+                db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
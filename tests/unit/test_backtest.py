@@ -0,0 +1,155 @@
+"""
+Unit tests for the backtest engine.
+Tests fills, broker-side stops, bar-clock exits and rates conversion.
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+
+def _bars(closes, start=datetime(2025, 3, 3, 10, 0), step=timedelta(hours=1)):
+    """Hourly bars with open = previous close and 2-pip wicks."""
+    import pandas as pd
+
+    opens = [closes[0]] + list(closes[:-1])
+    return pd.DataFrame(
+        {
+            'open': opens,
+            'high': [max(o, c) + 0.0002 for o, c in zip(opens, closes)],
+            'low': [min(o, c) - 0.0002 for o, c in zip(opens, closes)],
+            'close': closes,
+            'volume': 100,
+        },
+        index=pd.DatetimeIndex([start + step * i for i in range(len(closes))])
+    )
+
+
+def _scripted_strategy(entries):
+    """Strategy emitting a LONG on the given bar numbers (SL 10 pips, TP 20 pips)."""
+    from herald.strategy.base import Signal, SignalType, Strategy
+
+    class Scripted(Strategy):
+        def on_bar(self, bar):
+            count = self._state['bars'] = self._state.get('bars', 0) + 1
+            if count - 1 not in entries:
+                return None
+            close = bar['close']
+            return Signal(
+                id=self.generate_signal_id(bar.name), timestamp=bar.name, symbol="EURUSD",
+                timeframe="H1", side=SignalType.LONG, action="BUY", price=close,
+                stop_loss=close - 0.0010, take_profit=close + 0.0020
+            )
+
+    return Scripted("scripted", {'symbol': "EURUSD"})
+
+
+class TestBacktestEngine(unittest.TestCase):
+    """Test BacktestEngine.run() against hand-computed fills."""
+
+    def test_entry_fills_next_open_and_stops_out(self):
+        """Test a long enters at the next open plus spread and exits at its stop."""
+        from herald.backtest import BacktestEngine, FillModel
+
+        closes = [1.1000, 1.1000, 1.1005, 1.1004, 1.0980, 1.0990]
+        engine = BacktestEngine(
+            _scripted_strategy({1}), fill_model=FillModel(spread=0.0001), initial_balance=10000.0
+        )
+        result = engine.run(_bars(closes))
+
+        self.assertEqual(len(result.trades), 1)
+        trade = result.trades.iloc[0]
+        self.assertEqual(trade['entry_time'], datetime(2025, 3, 3, 12, 0))
+        self.assertAlmostEqual(trade['entry_price'], 1.1001)
+        self.assertEqual(trade['exit_reason'], "SL")
+        self.assertAlmostEqual(trade['exit_price'], 1.0990)
+        self.assertAlmostEqual(trade['profit'], (1.0990 - 1.1001) * trade['volume'] * 100000)
+        self.assertAlmostEqual(result.equity.iloc[-1], 10000.0 + trade['profit'])
+        self.assertEqual(result.summary()['trades'], 1)
+
+    def test_gap_through_stop_fills_at_open(self):
+        """Test a bar opening beyond the stop fills at the open, not the stop."""
+        from herald.backtest import BacktestEngine
+
+        closes = [1.1000, 1.1000, 1.1000, 1.0950, 1.0950]
+        bars = _bars(closes)
+        bars.iloc[3, bars.columns.get_loc('open')] = 1.0960
+        result = BacktestEngine(_scripted_strategy({1})).run(bars)
+
+        self.assertEqual(result.trades.iloc[0]['exit_reason'], "SL")
+        self.assertAlmostEqual(result.trades.iloc[0]['exit_price'], 1.0960)
+
+    def test_time_exit_uses_bar_clock(self):
+        """Test exit strategies see the bar time, not the wall clock."""
+        from herald.backtest import BacktestEngine
+        from herald.exit import TimeBasedExit
+
+        closes = [1.1000] * 8
+        engine = BacktestEngine(
+            _scripted_strategy({1}),
+            exit_strategies=[TimeBasedExit({'max_hold_hours': 3, 'weekend_protection': False})]
+        )
+        result = engine.run(_bars(closes))
+
+        self.assertEqual(len(result.trades), 1)
+        trade = result.trades.iloc[0]
+        self.assertEqual(trade['exit_time'] - trade['entry_time'], timedelta(hours=3))
+        self.assertIn("Max hold time", trade['exit_reason'])
+
+    def test_run_is_repeatable(self):
+        """Test a second run on the same engine starts from clean state."""
+        from herald.backtest import BacktestEngine
+        from herald.strategy.sma_crossover import SmaCrossover
+
+        closes = [1.1 + 0.001 * ((i // 15) % 2) + 0.0001 * (i % 15) for i in range(200)]
+        bars = _bars(closes)
+        engine = BacktestEngine(SmaCrossover({'symbol': "EURUSD", 'short_window': 5, 'long_window': 10}))
+        first = engine.run(bars)
+        second = engine.run(bars)
+
+        self.assertGreater(first.signals, 0)
+        self.assertTrue(first.trades.equals(second.trades))
+        self.assertTrue(first.equity.equals(second.equity))
+
+    def test_signal_table_matches_on_bar_replay(self):
+        """Test the generate_signals() fast path produces the same trades as on_bar()."""
+        from herald.backtest import BacktestEngine, FillModel
+        from herald.exit import TrailingStop
+        from herald.strategy.sma_crossover import SmaCrossover
+
+        class BarByBar(SmaCrossover):
+            def generate_signals(self, df):
+                return None
+
+        closes = [1.1 + 0.001 * ((i // 15) % 2) + 0.0001 * (i % 15) for i in range(300)]
+        bars = _bars(closes)
+        results = []
+        for strategy_class in (SmaCrossover, BarByBar):
+            strategy = strategy_class({'symbol': "EURUSD", 'short_window': 5, 'long_window': 10})
+            engine = BacktestEngine(
+                strategy, exit_strategies=[TrailingStop({})], fill_model=FillModel(spread=0.0001)
+            )
+            results.append(engine.run(bars))
+
+        self.assertGreater(len(results[0].trades), 0)
+        self.assertTrue(results[0].trades.equals(results[1].trades))
+        self.assertTrue(results[0].equity.equals(results[1].equity))
+
+    def test_bars_frame_from_rates(self):
+        """Test MT5 rates become a time-indexed frame the engine accepts."""
+        import numpy as np
+        from herald.backtest import bars_frame
+        from herald.persistence.bar_archive import RATES_DTYPE
+
+        rates = np.zeros(2, dtype=RATES_DTYPE)
+        rates['time'] = [1741000000, 1741000060]
+        rates['close'] = [1.1, 1.2]
+        rates['tick_volume'] = [5, 7]
+        frame = bars_frame(rates)
+
+        self.assertEqual(frame.index[1], datetime(1970, 1, 1) + timedelta(seconds=1741000060))
+        self.assertEqual(frame['volume'].tolist(), [5, 7])
+        self.assertEqual(frame['close'].tolist(), [1.1, 1.2])
+
+
+if __name__ == '__main__':
+    unittest.main()
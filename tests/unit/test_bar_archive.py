@@ -0,0 +1,138 @@
+"""
+Unit tests for the bar archive.
+Tests month partitioning, append-only writes, range reads and warm-start fetches.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import Mock
+
+import numpy as np
+
+
+def make_rates(start, count, step=60):
+    from herald.persistence.bar_archive import RATES_DTYPE
+
+    rates = np.zeros(count, dtype=RATES_DTYPE)
+    rates['time'] = start + step * np.arange(count)
+    rates['close'] = np.arange(count, dtype=float)
+    rates['open'] = rates['high'] = rates['low'] = rates['close']
+    return rates
+
+
+# 2024-01-31 23:50:00 UTC
+JAN_END = 1706745000
+
+
+class TestBarArchive(unittest.TestCase):
+    """Test BarArchive storage and reads."""
+
+    def setUp(self):
+        from herald.persistence.bar_archive import BarArchive
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive = BarArchive(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_partitions_by_month_and_skips_archived_bars(self):
+        """Test bars split across month files and re-sent bars are not duplicated."""
+        rates = make_rates(JAN_END, 20)
+        self.assertEqual(self.archive.append("EURUSD", "M1", rates), 20)
+        self.assertEqual(self.archive.append("EURUSD", "M1", rates[-5:]), 0)
+        self.assertEqual(self.archive.append("EURUSD", "M1", make_rates(JAN_END, 25)), 5)
+
+        names = [os.path.basename(p) for p in self.archive.partitions("EURUSD", "M1")]
+        self.assertEqual(names, ["2024-01.bars", "2024-02.bars"])
+        stored = self.archive.read("EURUSD", "M1")
+        self.assertEqual(len(stored), 25)
+        self.assertTrue(np.all(np.diff(stored['time']) == 60))
+
+    def test_range_read_within_partition_is_memory_mapped(self):
+        """Test a single-month range is a view over the partition file."""
+        self.archive.append("EURUSD", "M1", make_rates(JAN_END, 20))
+
+        window = self.archive.read("EURUSD", "M1", start=JAN_END + 60, end=JAN_END + 240)
+        self.assertEqual(list(window['close']), [1.0, 2.0, 3.0, 4.0])
+        self.assertIsInstance(window, np.memmap)
+
+        spanning = self.archive.read("EURUSD", "M1", start=JAN_END + 540, end=JAN_END + 660)
+        self.assertEqual(list(spanning['close']), [9.0, 10.0, 11.0])
+
+    def test_tail_and_torn_record(self):
+        """Test tail reads across partitions and a partial trailing record is ignored."""
+        from herald.persistence.bar_archive import BarArchive
+
+        self.archive.append("EURUSD", "M1", make_rates(JAN_END, 20))
+        path = self.archive.partitions("EURUSD", "M1")[-1]
+        with open(path, 'ab') as fh:
+            fh.write(b'\x00' * 7)
+
+        fresh = BarArchive(self.tmp.name)
+        self.assertEqual(list(fresh.tail("EURUSD", "M1", 12)['close']), list(np.arange(8, 20, dtype=float)))
+        self.assertEqual(fresh.append("EURUSD", "M1", make_rates(JAN_END, 21)), 1)
+        self.assertEqual(len(fresh.read("EURUSD", "M1")), 21)
+
+    def test_rate_dicts_round_trip(self):
+        """Test connector-style rate dicts are archived and returned unchanged."""
+        bars = [
+            {'time': datetime.fromtimestamp(JAN_END + 60 * i), 'open': 1.0, 'high': 2.0, 'low': 0.5,
+             'close': 1.5, 'tick_volume': 10, 'spread': 2, 'real_volume': 0}
+            for i in range(3)
+        ]
+        self.archive.append("XAUUSD", "H1", bars)
+        self.assertEqual(self.archive.tail_rates("XAUUSD", "H1", 3), bars)
+        self.assertEqual(self.archive.tail_rates("XAUUSD", "M5", 3), [])
+
+
+class TestFetchRates(unittest.TestCase):
+    """Test the main loop's archive-backed market data fetch."""
+
+    def _bars(self, start, count):
+        return [
+            {'time': datetime.fromtimestamp(JAN_END + 60 * i), 'open': 1.0, 'high': 1.0, 'low': 1.0,
+             'close': float(i), 'tick_volume': 0, 'spread': 0, 'real_volume': 0}
+            for i in range(start, start + count)
+        ]
+
+    def test_warm_archive_fetches_only_recent_bars(self):
+        """Test a full archive only asks the terminal for the refresh window."""
+        from herald.__main__ import fetch_rates
+        from herald.persistence.bar_archive import BarArchive
+
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = BarArchive(tmp)
+            connector = Mock()
+            connector.get_rates.return_value = self._bars(0, 50)
+
+            rates = fetch_rates(connector, archive, "EURUSD", 1, "M1", 50, 5)
+            self.assertEqual(connector.get_rates.call_args.kwargs['count'], 50)
+            self.assertEqual(len(archive.read("EURUSD", "M1")), 49)
+
+            connector.get_rates.return_value = self._bars(47, 5)
+            rates = fetch_rates(connector, archive, "EURUSD", 1, "M1", 50, 5)
+            self.assertEqual(connector.get_rates.call_args.kwargs['count'], 5)
+            self.assertEqual([bar['close'] for bar in rates], [float(i) for i in range(2, 52)])
+            self.assertEqual(len(archive.read("EURUSD", "M1")), 51)
+
+    def test_gap_falls_back_to_full_window(self):
+        """Test recent bars that do not overlap the archive trigger a full fetch."""
+        from herald.__main__ import fetch_rates
+        from herald.persistence.bar_archive import BarArchive
+
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = BarArchive(tmp)
+            archive.append("EURUSD", "M1", self._bars(0, 50))
+            connector = Mock()
+            connector.get_rates.side_effect = [self._bars(100, 5), self._bars(55, 50)]
+
+            rates = fetch_rates(connector, archive, "EURUSD", 1, "M1", 50, 5)
+            self.assertEqual(connector.get_rates.call_count, 2)
+            self.assertEqual(rates[0]['close'], 55.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Unit tests for Database bulk ingestion.
+Tests metric and bar bulk inserts from columnar and row inputs.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+RATES_DTYPE = np.dtype([
+    ('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+    ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')
+])
+
+
+class TestBulkIngestion(unittest.TestCase):
+    """Test record_metrics_bulk and record_bars_bulk."""
+
+    def setUp(self):
+        from herald.persistence.database import Database
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmp.name, "herald.db"), async_writes=False)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_bars_from_mt5_rates_upsert_on_key(self):
+        """Test structured rates arrays are stored and re-sent bars replace the old row."""
+        rates = np.zeros(3, dtype=RATES_DTYPE)
+        rates['time'] = [1700000000, 1700000060, 1700000120]
+        rates['open'] = rates['high'] = rates['low'] = rates['close'] = [1.1, 1.2, 1.3]
+        self.assertEqual(self.db.record_bars_bulk("EURUSD", "M1", rates), 3)
+
+        forming = rates[-1:].copy()
+        forming['close'] = 1.35
+        self.db.record_bars_bulk("EURUSD", "M1", forming)
+
+        bars = self.db.get_bars("EURUSD", "M1")
+        self.assertEqual(len(bars), 3)
+        self.assertAlmostEqual(bars['close'].iloc[-1], 1.35)
+        self.assertEqual(int(bars.index[0].timestamp()), 1700000000)
+        self.assertEqual(len(self.db.get_bars("EURUSD", "M1", start=1700000060)), 2)
+
+    def test_bars_from_dataframe_and_dicts(self):
+        """Test DataFrames with a DatetimeIndex and lists of bar dicts are accepted."""
+        index = pd.to_datetime([1700000000, 1700003600], unit='s')
+        df = pd.DataFrame({'open': [1.0, 2.0], 'high': [1.0, 2.0], 'low': [1.0, 2.0], 'close': [1.0, 2.0]}, index=index)
+        self.assertEqual(self.db.record_bars_bulk("XAUUSD", "H1", df), 2)
+
+        bars = [{'time': 1700007200, 'open': 3.0, 'high': 3.0, 'low': 3.0, 'close': 3.0, 'tick_volume': 5}]
+        self.assertEqual(self.db.record_bars_bulk("XAUUSD", "H1", bars), 1)
+
+        stored = self.db.get_bars("XAUUSD", "H1")
+        self.assertEqual(list(stored['close']), [1.0, 2.0, 3.0])
+        self.assertEqual(stored['tick_volume'].iloc[-1], 5)
+
+    def test_bars_missing_required_column(self):
+        """Test incomplete bars are rejected without writing anything."""
+        self.assertEqual(self.db.record_bars_bulk("EURUSD", "M1", {'time': [1], 'open': [1.0]}), -1)
+        self.assertEqual(len(self.db.get_bars("EURUSD", "M1")), 0)
+
+    def test_metrics_bulk_rows_and_columns(self):
+        """Test metrics from row tuples and from columns land in one call each."""
+        now = datetime.now()
+        self.assertEqual(self.db.record_metrics_bulk([("a", 1.0), ("b", 2.0, '{"k": 1}')], timestamp=now), 2)
+        columns = {'name': np.array(["c"] * 1000), 'value': np.arange(1000, dtype=float)}
+        self.assertEqual(self.db.record_metrics_bulk(columns), 1000)
+
+        count, total = self.db.conn.execute("SELECT COUNT(*), SUM(metric_value) FROM metrics").fetchone()
+        self.assertEqual(count, 1002)
+        self.assertAlmostEqual(total, 3.0 + sum(range(1000)))
+
+    def test_timestamp_converters_agree(self):
+        """Test scalar and column timestamps follow the same naive-is-UTC rule."""
+        from datetime import timedelta, timezone
+        from herald.persistence.columns import epoch_millis, epoch_seconds, from_epoch_ms, to_epoch_ms
+
+        naive = datetime(2025, 3, 4, 10, 0, 0, 123000)
+        aware = datetime(2025, 3, 4, 12, 0, 0, 123000, tzinfo=timezone(timedelta(hours=2)))
+        values = [naive, aware, "2025-03-04T10:00:00.123", pd.Timestamp(naive)]
+
+        expected = 1741082400123
+        self.assertEqual([to_epoch_ms(v) for v in values], [expected] * 4)
+        self.assertEqual(epoch_millis(values), [expected] * 4)
+        self.assertEqual(epoch_seconds(pd.DatetimeIndex([naive])), [expected // 1000])
+        self.assertEqual(from_epoch_ms(expected), naive)
+
+
+if __name__ == '__main__':
+    unittest.main()
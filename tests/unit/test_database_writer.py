@@ -0,0 +1,176 @@
+"""
+Unit tests for the background database writer.
+Tests WAL setup, group commit, flush barriers and failure isolation.
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+
+
+class TestDatabaseWriter(unittest.TestCase):
+    """Test DatabaseWriter batching and durability."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "writer.db")
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v INTEGER UNIQUE)")
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _count(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_group_commit_and_flush_barrier(self):
+        """Test queued writes are committed in few transactions and visible after flush."""
+        from herald.persistence.writer import DatabaseWriter
+
+        writer = DatabaseWriter(self.path, batch_size=500, max_batch_delay_ms=200)
+        writer.start()
+        try:
+            for i in range(300):
+                writer.submit("INSERT INTO t (v) VALUES (?)", (i,))
+            self.assertTrue(writer.flush(timeout=5))
+            self.assertEqual(self._count(), 300)
+            self.assertEqual(writer.committed_statements, 300)
+            self.assertLess(writer.committed_batches, 10)
+        finally:
+            writer.close()
+
+    def test_failed_statement_does_not_poison_batch(self):
+        """Test a constraint violation only fails its own statement."""
+        from herald.persistence.writer import DatabaseWriter
+
+        writer = DatabaseWriter(self.path, max_batch_delay_ms=200)
+        writer.start()
+        try:
+            writer.submit("INSERT INTO t (v) VALUES (?)", (1,))
+            duplicate = writer.execute("INSERT INTO t (v) VALUES (?)", (1,))
+            ok = writer.execute("INSERT INTO t (v) VALUES (?)", (2,))
+            writer.flush(timeout=5)
+
+            self.assertIsInstance(duplicate.exception(timeout=5), sqlite3.IntegrityError)
+            self.assertEqual(ok.result(timeout=5)[1], 1)
+            self.assertEqual(self._count(), 2)
+            self.assertEqual(writer.failed_statements, 1)
+        finally:
+            writer.close()
+
+    def test_close_commits_pending_writes(self):
+        """Test close() drains the queue before stopping."""
+        from herald.persistence.writer import DatabaseWriter
+
+        writer = DatabaseWriter(self.path, max_batch_delay_ms=500)
+        writer.start()
+        writer.submit_many("INSERT INTO t (v) VALUES (?)", [(i,) for i in range(50)])
+        writer.close()
+
+        self.assertFalse(writer.running)
+        self.assertEqual(self._count(), 50)
+        with self.assertRaises(RuntimeError):
+            writer.submit("INSERT INTO t (v) VALUES (?)", (51,))
+
+    def test_writer_survives_rolled_back_and_cancelled_writes(self):
+        """Test an error SQLite already rolled back and a cancelled future keep the thread alive."""
+        from herald.persistence.writer import DatabaseWriter
+
+        class DiskFull(DatabaseWriter):
+            @staticmethod
+            def _apply(conn, write):
+                if write.params == (99,):
+                    # SQLITE_FULL ends the transaction on its own
+                    conn.execute("ROLLBACK")
+                    raise sqlite3.OperationalError("database or disk is full")
+                return DatabaseWriter._apply(conn, write)
+
+        writer = DiskFull(self.path, max_batch_delay_ms=200)
+        writer.start()
+        try:
+            writer.submit("INSERT INTO t (v) VALUES (?)", (1,))
+            full = writer.execute("INSERT INTO t (v) VALUES (?)", (99,))
+            cancelled = writer.execute("INSERT INTO t (v) VALUES (?)", (2,))
+            cancelled.cancel()
+            self.assertTrue(writer.flush(timeout=5))
+
+            self.assertIsInstance(full.exception(timeout=5), sqlite3.OperationalError)
+            self.assertTrue(writer.running)
+            writer.submit("INSERT INTO t (v) VALUES (?)", (3,))
+            self.assertTrue(writer.flush(timeout=5))
+            self.assertEqual(self._count(), 3)
+            self.assertEqual(writer.failed_statements, 1)
+        finally:
+            writer.close()
+
+    def test_wal_and_durability(self):
+        """Test pragmas are applied and unknown durability levels are rejected."""
+        from herald.persistence.writer import DatabaseWriter, apply_pragmas
+
+        conn = sqlite3.connect(self.path)
+        apply_pragmas(conn, "full")
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 2)
+        conn.close()
+
+        with self.assertRaises(ValueError):
+            DatabaseWriter(self.path, durability="paranoid")
+
+
+class TestDatabaseAsyncWrites(unittest.TestCase):
+    """Test Database routed through the background writer."""
+
+    def test_records_are_visible_to_reads(self):
+        """Test signal, trade and exit writes land and reads see them."""
+        from herald.persistence.database import Database, SignalRecord, TradeRecord
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(os.path.join(tmp, "herald.db"))
+            try:
+                self.assertEqual(db.record_signal(SignalRecord(
+                    signal_id="s1", timestamp=datetime.now(), symbol="EURUSD", timeframe="H1",
+                    side="LONG", action="BUY", confidence=0.8
+                )), 0)
+                db.record_trade(TradeRecord(
+                    signal_id="s1", order_id=7, symbol="EURUSD", side="BUY",
+                    volume=0.1, entry_price=1.1, entry_time=datetime.now()
+                ))
+                self.assertEqual([t.order_id for t in db.get_open_trades()], [7])
+
+                db.update_trade_exit(7, 1.2, datetime.now(), 10.0, "tp")
+                db.flush()
+                self.assertEqual(db.get_open_trades(), [])
+                signals = db.conn.execute("SELECT COUNT(*) FROM signals").fetchone()[0]
+                self.assertEqual(signals, 1)
+            finally:
+                db.close()
+
+    def test_stopped_writer_falls_back_to_direct_writes(self):
+        """Test writes are not dropped once the writer thread is gone."""
+        from herald.persistence.database import Database, SignalRecord
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(os.path.join(tmp, "herald.db"))
+            try:
+                db.writer.close()
+                row_id = db.record_signal(SignalRecord(
+                    signal_id="s1", timestamp=datetime.now(), symbol="EURUSD", timeframe="H1",
+                    side="LONG", action="BUY", confidence=0.8
+                ))
+                self.assertGreater(row_id, 0)
+                self.assertIsNone(db.writer)
+                self.assertTrue(db.flush())
+            finally:
+                db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
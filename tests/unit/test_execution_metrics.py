@@ -0,0 +1,95 @@
+"""
+Unit tests for order execution instrumentation.
+Tests sharded histograms, slippage/reject accounting and Prometheus export.
+"""
+
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+class TestShardedHistogram(unittest.TestCase):
+    """Test ShardedHistogram bucketing across threads."""
+
+    def test_concurrent_observations_are_not_lost(self):
+        """Test observations from several threads all land in the merged snapshot."""
+        from herald.observability.prometheus import ShardedHistogram
+
+        histogram = ShardedHistogram((1.0, 2.0))
+
+        def writer():
+            for _ in range(1000):
+                histogram.observe(1.5)
+
+        threads = [threading.Thread(target=writer) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        histogram.observe(0.5)
+        histogram.observe(9.0)
+
+        cumulative, total, count = histogram.snapshot()
+        self.assertEqual(cumulative, [1, 4001, 4002])
+        self.assertEqual(count, 4002)
+        self.assertAlmostEqual(total, 6009.5)
+
+
+class TestExecutionMetrics(unittest.TestCase):
+    """Test ExecutionMetrics recording and rendering."""
+
+    def test_slippage_sign_is_adverse_positive(self):
+        """Test a BUY filled above and a SELL filled below the request both count as adverse."""
+        from herald.observability.execution_metrics import ExecutionMetrics
+
+        metrics = ExecutionMetrics()
+        metrics._points["EURUSD"] = 0.00001
+        metrics.record_send("EURUSD", "open", "BUY", 0.02, 10009, requested_price=1.10000, fill_price=1.10003)
+        metrics.record_send("EURUSD", "open", "SELL", 0.02, 10009, requested_price=1.10000, fill_price=1.09998)
+
+        buy = metrics.slippage.labels(symbol="EURUSD", side="BUY").snapshot()
+        sell = metrics.slippage.labels(symbol="EURUSD", side="SELL").snapshot()
+        self.assertAlmostEqual(buy[1], 3.0, places=6)
+        self.assertAlmostEqual(sell[1], 2.0, places=6)
+
+    def test_requotes_and_rejects_counted_per_symbol(self):
+        """Test requote and reject retcodes are counted with labels."""
+        from herald.observability.execution_metrics import ExecutionMetrics
+
+        metrics = ExecutionMetrics()
+        metrics.record_send("EURUSD", "open", "BUY", 0.01, 10004)
+        metrics.record_send("EURUSD", "open", "BUY", 0.01, 10004)
+        metrics.record_send("GBPUSD", "close", "SELL", 0.01, None)
+
+        text = metrics.render_prometheus()
+        self.assertIn('herald_order_requotes_total{symbol="EURUSD"} 2.0', text)
+        self.assertIn('herald_order_rejects_total{retcode="10004",symbol="EURUSD"} 2.0', text)
+        self.assertIn('herald_order_rejects_total{retcode="None",symbol="GBPUSD"} 1.0', text)
+        self.assertIn('herald_order_send_latency_seconds_bucket{action="open",symbol="EURUSD",le="+Inf"} 2', text)
+
+    def test_engine_records_send_latency(self):
+        """Test ExecutionEngine.place_order feeds the shared metrics."""
+        from herald.execution.engine import ExecutionEngine, OrderRequest, OrderType
+        from herald.observability.prometheus import PrometheusExporter
+
+        connector = MagicMock()
+        connector.is_connected.return_value = True
+        connector.get_account_info.return_value = {'trade_allowed': True}
+        connector.get_symbol_info.return_value = {'ask': 1.1, 'bid': 1.0999}
+        engine = ExecutionEngine(connector=connector)
+
+        with patch('herald.execution.engine.mt5') as mock_mt5:
+            mock_mt5.TRADE_RETCODE_DONE = 10009
+            mock_mt5.order_send.return_value = MagicMock(retcode=10009, order=1, price=1.1, volume=0.1)
+            engine.place_order(OrderRequest(
+                signal_id="s1", symbol="EURUSD", side="BUY", volume=0.1, order_type=OrderType.MARKET
+            ))
+
+        exporter = PrometheusExporter()
+        exporter.attach_execution_metrics(engine.metrics)
+        text = exporter.export_text()
+        self.assertIn('herald_order_send_latency_seconds_count{action="open",symbol="EURUSD"} 1', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
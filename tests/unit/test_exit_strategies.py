@@ -300,6 +300,99 @@ class TestTimeBasedExit(unittest.TestCase):
         self.assertIsNone(signal)
 
 
+class TestTrailingStopServerSide(unittest.TestCase):
+    """Test server-side trailing stop mode (broker-enforced SL)."""
+    
+    def _position(self, current_price, stop_loss=0.0):
+        from herald.position.manager import PositionInfo
+        
+        return PositionInfo(
+            ticket=12345,
+            symbol="EURUSD",
+            volume=1.0,
+            open_price=1.1000,
+            current_price=current_price,
+            open_time=datetime.now(),
+            side="BUY",
+            stop_loss=stop_loss,
+            take_profit=1.1500,
+            unrealized_pnl=200.0
+        )
+    
+    def test_server_side_queues_sl_modification(self):
+        """Test trailing level is queued for the broker instead of closing locally."""
+        from herald.exit.trailing_stop import TrailingStop
+        
+        strategy = TrailingStop({'server_side': True, 'min_stop_distance_pips': 10.0})
+        
+        signal = strategy.should_exit(self._position(1.1200), {'current_price': 1.1200})
+        
+        self.assertIsNone(signal)
+        pending = strategy.pending_modifications()
+        self.assertEqual(len(pending), 1)
+        self.assertAlmostEqual(pending[0].sl, 1.1190)
+        self.assertEqual(pending[0].tp, 1.1500)
+    
+    def test_server_side_throttles_and_flushes(self):
+        """Test updates are throttled and broker stop recorded after flush."""
+        from unittest.mock import MagicMock
+        from herald.exit.trailing_stop import TrailingStop
+        from herald.execution.engine import ExecutionResult, OrderStatus
+        
+        strategy = TrailingStop({'server_side': True, 'update_frequency_secs': 60})
+        strategy.should_exit(self._position(1.1200), {'current_price': 1.1200})
+        
+        engine = MagicMock()
+        engine.modify_positions_sltp.return_value = [
+            ExecutionResult(
+                order_id=12345,
+                status=OrderStatus.FILLED,
+                executed_price=1.1190,
+                executed_volume=None,
+                timestamp=datetime.now(),
+                metadata={'ticket': 12345, 'sl': 1.1190, 'tp': 1.1500}
+            )
+        ]
+        self.assertEqual(strategy.flush_modifications(engine), 1)
+        self.assertEqual(strategy.pending_modifications(), [])
+        
+        # Price falls through the stop the broker holds: no local exit
+        signal = strategy.should_exit(self._position(1.1150), {'current_price': 1.1150})
+        self.assertIsNone(signal)
+        
+        # Better price within the throttle window: nothing new queued
+        strategy.should_exit(self._position(1.1300), {'current_price': 1.1300})
+        self.assertEqual(strategy.pending_modifications(), [])
+    
+    def test_server_side_exits_locally_when_broker_stop_lags(self):
+        """Test a throttled push leaves the tighter trailing level to the local check."""
+        from herald.exit.trailing_stop import TrailingStop
+        
+        strategy = TrailingStop({'server_side': True, 'update_frequency_secs': 60})
+        # Broker still holds the original signal SL, well below the trailing level
+        strategy.should_exit(self._position(1.1200, stop_loss=1.1000), {'current_price': 1.1200})
+        strategy.should_exit(self._position(1.1300, stop_loss=1.1000), {'current_price': 1.1300})
+        self.assertEqual(len(strategy.pending_modifications()), 1)
+        
+        strategy._trailing_stops[12345]['last_push'] = datetime.now()
+        strategy.should_exit(self._position(1.1400, stop_loss=1.1000), {'current_price': 1.1400})
+        signal = strategy.should_exit(self._position(1.1350, stop_loss=1.1000), {'current_price': 1.1350})
+        
+        self.assertIsNotNone(signal)
+        self.assertAlmostEqual(signal.metadata['stop_price'], 1.1390)
+        self.assertEqual(strategy.pending_modifications(), [])
+    
+    def test_server_side_seeds_from_existing_broker_sl(self):
+        """Test an SL already on the position is never loosened after restart."""
+        from herald.exit.trailing_stop import TrailingStop
+        
+        strategy = TrailingStop({'server_side': True})
+        strategy.should_exit(self._position(1.1200, stop_loss=1.1195), {'current_price': 1.1200})
+        
+        self.assertEqual(strategy._trailing_stops[12345]['stop_price'], 1.1195)
+        self.assertEqual(strategy.pending_modifications(), [])
+
+
 class TestExitStrategyManager(unittest.TestCase):
     """Test ExitStrategyManager coordinating multiple strategies."""
     
@@ -0,0 +1,81 @@
+"""
+Unit tests for the observability HTTP server.
+Tests /metrics, /healthz and /readyz served from published snapshots.
+"""
+
+import json
+import time
+import unittest
+import urllib.error
+import urllib.request
+
+
+class TestObservabilityServer(unittest.TestCase):
+    """Test ObservabilityServer endpoints."""
+
+    def setUp(self):
+        from herald.observability.http_server import ObservabilityServer
+
+        self.server = ObservabilityServer(host="127.0.0.1", port=0, stale_after_secs=60)
+        self.server.start()
+        self.base = f"http://127.0.0.1:{self.server.port}"
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _get(self, path):
+        try:
+            with urllib.request.urlopen(self.base + path, timeout=5) as resp:
+                return resp.status, resp.read().decode("utf-8")
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode("utf-8")
+
+    def test_not_ready_before_first_publish(self):
+        """Test /readyz fails until the trading loop publishes a ready snapshot."""
+        status, _ = self._get("/readyz")
+        self.assertEqual(status, 503)
+
+    def test_serves_published_snapshot(self):
+        """Test endpoints return the last published metrics and readiness."""
+        self.server.publish("herald_up 1\n", {"status": "ready", "service": "herald"})
+
+        status, body = self._get("/metrics")
+        self.assertEqual(status, 200)
+        self.assertEqual(body, "herald_up 1\n")
+
+        status, body = self._get("/readyz")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["status"], "ready")
+
+        status, body = self._get("/healthz")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["status"], "healthy")
+
+    def test_stale_snapshot_fails_probes(self):
+        """Test probes fail when the trading loop stops publishing."""
+        self.server.publish("", {"status": "ready"})
+        self.server._snapshot.published_at = time.time() - 120
+
+        self.assertEqual(self._get("/healthz")[0], 503)
+        self.assertEqual(self._get("/readyz")[0], 503)
+        self.assertEqual(self._get("/unknown")[0], 404)
+
+
+class TestReadinessFrom(unittest.TestCase):
+    """Test HealthChecker.readiness_from verdicts."""
+
+    def test_readiness_from_account_state(self):
+        """Test readiness is derived without querying the connector."""
+        from herald.observability.health import HealthChecker
+
+        checker = HealthChecker()
+        self.assertEqual(checker.readiness_from(True, {"trade_allowed": True})["status"], "ready")
+        self.assertEqual(checker.readiness_from(False, None)["reason"], "Not connected to MT5")
+        self.assertEqual(
+            checker.readiness_from(True, {"trade_allowed": True, "margin_level": 50.0})["status"],
+            "not_ready"
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
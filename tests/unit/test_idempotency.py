@@ -0,0 +1,99 @@
+"""
+Unit tests for the order idempotency store.
+Tests LRU/TTL bounds, file persistence and rebuild from deal history.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+class TestIdempotencyStore(unittest.TestCase):
+    """Test IdempotencyStore bounds and persistence."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "orders.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_lru_evicts_least_recently_used(self):
+        """Test the store never holds more than max_entries tags."""
+        from herald.execution.idempotency import IdempotencyStore
+
+        store = IdempotencyStore(max_entries=2)
+        store["a"] = 1
+        store["b"] = 2
+        self.assertEqual(store.get("a"), 1)  # a becomes most recent
+        store["c"] = 3
+
+        self.assertEqual(len(store), 2)
+        self.assertNotIn("b", store)
+        self.assertEqual(store["a"], 1)
+
+    def test_expired_tags_are_dropped(self):
+        """Test tags older than the TTL are treated as unknown."""
+        from herald.execution.idempotency import IdempotencyStore
+
+        store = IdempotencyStore(ttl_secs=60)
+        store.put("old", 1, recorded_at=time.time() - 120)
+        store.put("new", 2)
+
+        self.assertIsNone(store.get("old"))
+        self.assertEqual(store.get("new"), 2)
+
+    def test_survives_restart_and_compacts(self):
+        """Test tags are reloaded from the append-only file."""
+        from herald.execution.idempotency import IdempotencyStore
+
+        store = IdempotencyStore(path=self.path, max_entries=2)
+        for i in range(6):
+            store.put(f"tag{i}", i)
+        store.close()
+
+        with open(self.path) as f:
+            self.assertLessEqual(len(f.readlines()), 4)
+
+        reloaded = IdempotencyStore(path=self.path, max_entries=2)
+        self.assertEqual(reloaded.get("tag5"), 5)
+        self.assertIsNone(reloaded.get("tag0"))
+        reloaded.close()
+
+    def test_torn_last_line_is_ignored(self):
+        """Test a partially written record after a crash does not break loading."""
+        from herald.execution.idempotency import IdempotencyStore
+
+        with open(self.path, "w") as f:
+            f.write('{"tag": "a", "ticket": 7, "ts": %f}\n{"tag": "b", "tic' % time.time())
+
+        store = IdempotencyStore(path=self.path)
+        self.assertEqual(store.get("a"), 7)
+        self.assertEqual(len(store), 1)
+        store.close()
+
+    def test_rebuild_from_deals_matches_magic_and_entry(self):
+        """Test entry deals with our magic number restore their comment tags."""
+        from herald.execution.idempotency import IdempotencyStore
+
+        now = time.time()
+        deals = [
+            MagicMock(magic=111, entry=0, comment="abc123", position_id=10, order=20, time=now),
+            MagicMock(magic=111, entry=1, comment="abc123", position_id=10, order=21, time=now),
+            MagicMock(magic=999, entry=0, comment="other", position_id=11, order=22, time=now),
+            MagicMock(magic=111, entry=0, comment="", position_id=12, order=23, time=now),
+        ]
+        store = IdempotencyStore()
+        with patch('herald.execution.idempotency.mt5') as mock_mt5:
+            mock_mt5.DEAL_ENTRY_IN = 0
+            mock_mt5.history_deals_get.return_value = deals
+            added = store.rebuild_from_deals(magic_number=111)
+
+        self.assertEqual(added, 1)
+        self.assertEqual(store.get("abc123"), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Unit tests for the trading journal.
+Tests event replay, snapshot compaction, torn frames and state restoration.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+from unittest.mock import Mock, patch
+
+
+def make_position(ticket=1001, volume=0.1, stop_loss=1.09):
+    from herald.position.manager import PositionInfo
+
+    return PositionInfo(
+        ticket=ticket, symbol="EURUSD", side="BUY", volume=volume,
+        open_price=1.1, open_time=datetime(2025, 1, 2, 10, 0), stop_loss=stop_loss
+    )
+
+
+class TestTradingJournal(unittest.TestCase):
+    """Test TradingJournal persistence and recovery."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "journal")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _journal(self, **kwargs):
+        from herald.persistence.journal import TradingJournal
+
+        return TradingJournal(self.path, max_batch_delay_ms=1, **kwargs)
+
+    def _crash(self, journal):
+        """Stop the writer without the final snapshot taken by close()."""
+        from herald.persistence.journal import _STOP
+
+        journal._queue.put(_STOP)
+        journal._thread.join(5)
+        journal._thread = None
+
+    def test_replay_rebuilds_positions_and_daily_pnl(self):
+        """Test fills, modifications and exits replay into the same projection."""
+        journal = self._journal()
+        journal.recover()
+        journal.start()
+        journal.record_fill(make_position(1001), signal_id="s1")
+        journal.record_fill(make_position(1002))
+        journal.sync_positions([make_position(1001, stop_loss=1.095), make_position(1002)])
+        journal.record_exit(1002, "TP", price=1.12, profit=25.0)
+        expected = journal.state
+        self._crash(journal)
+        self.assertFalse(os.path.exists(os.path.join(self.path, "snapshot.json")))
+
+        state = self._journal().recover()
+        self.assertEqual(state, expected)
+        self.assertEqual(list(state['positions']), ["1001"])
+        self.assertEqual(state['positions']["1001"]['stop_loss'], 1.095)
+        self.assertEqual(state['risk']['daily_pnl'], 25.0)
+        self.assertEqual(state['risk']['date'], date.today().isoformat())
+
+    def test_snapshot_compacts_segments(self):
+        """Test a snapshot replaces older segments and recovery resumes after it."""
+        journal = self._journal(snapshot_every=10)
+        journal.start()
+        for ticket in range(25):
+            journal.record_fill(make_position(ticket))
+        journal.close()
+
+        segments = [n for n in os.listdir(self.path) if n.endswith(".bin")]
+        self.assertEqual(len(segments), 1)
+        recovered = self._journal()
+        state = recovered.recover()
+        self.assertEqual(len(state['positions']), 25)
+        self.assertEqual(recovered.seq, 25)
+
+    def test_torn_frame_is_ignored(self):
+        """Test a partially written frame does not stop earlier events replaying."""
+        journal = self._journal(snapshot_every=0)
+        journal.start()
+        journal.record_fill(make_position(1))
+        journal.record_fill(make_position(2))
+        segment = journal._segment.name
+        self._crash(journal)
+
+        with open(segment, 'r+b') as fh:
+            fh.truncate(os.path.getsize(segment) - 3)
+
+        recovered = self._journal()
+        self.assertEqual(list(recovered.recover()['positions']), ["1"])
+        recovered.start()
+        recovered.record_fill(make_position(3))
+        recovered.close()
+        self.assertEqual(sorted(self._journal().recover()['positions']), ["1", "3"])
+
+    def test_exit_state_round_trip(self):
+        """Test changed exit strategy state is journaled once and restored into a fresh strategy."""
+        from herald.exit.trailing_stop import TrailingStop
+        from herald.exit.profit_target import ProfitTargetExit
+        from herald.persistence.journal import restore_state
+        from herald.position.manager import PositionManager
+        from herald.risk.manager import RiskManager, RiskLimits
+
+        trailing = TrailingStop({'activation_profit_pct': 0.0})
+        targets = ProfitTargetExit({})
+        position = make_position(7)
+        position.unrealized_pnl = 10.0
+        trailing.should_exit(position, {'current_price': 1.12, 'indicators': {}})
+        targets._targets_hit[7] = [0]
+
+        journal = self._journal()
+        journal.start()
+        journal.record_fill(position)
+        journal.record_exit_states([trailing, targets])
+        seq = journal.seq
+        journal.record_exit_states([trailing, targets])
+        self.assertEqual(journal.seq, seq)
+        journal.record_exit(99, "manual", profit=-5.0)
+        journal.close()
+
+        manager = PositionManager(connector=Mock(), execution_engine=Mock())
+        restored_trailing = TrailingStop({'activation_profit_pct': 0.0})
+        restored_targets = ProfitTargetExit({})
+        risk = RiskManager(RiskLimits())
+        count = restore_state(
+            self._journal().recover(), manager, [restored_trailing, restored_targets], risk
+        )
+
+        self.assertEqual(count, 1)
+        self.assertEqual(manager.get_position(7).open_price, 1.1)
+        self.assertEqual(restored_trailing._trailing_stops[7]['best_price'], 1.12)
+        self.assertEqual(restored_trailing._trailing_stops[7]['stop_price'], trailing._trailing_stops[7]['stop_price'])
+        self.assertEqual(restored_targets._targets_hit[7], [0])
+        self.assertEqual(risk.daily_pnl, -5.0)
+        self.assertEqual(risk.trade_count, 1)
+
+
+class TestReconcileMagic(unittest.TestCase):
+    """Test reconciliation uses the execution engine's magic number."""
+
+    @patch('herald.position.manager.mt5')
+    def test_default_magic_from_engine(self, mock_mt5):
+        from herald.position.manager import PositionManager
+
+        mock_mt5.ORDER_TYPE_BUY = 0
+        ours = Mock(ticket=1, symbol="EURUSD", type=0, volume=0.1, price_open=1.1, time=1700000000,
+                    sl=0.0, tp=0.0, price_current=1.1, profit=0.0, magic=20241206)
+        theirs = Mock(ticket=2, magic=123456)
+        mock_mt5.positions_get.return_value = [ours, theirs]
+
+        engine = Mock(magic_number=20241206)
+        manager = PositionManager(connector=Mock(), execution_engine=engine)
+        self.assertEqual(manager.reconcile_positions(), 1)
+        self.assertEqual(manager.get_all_positions(), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
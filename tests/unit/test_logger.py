@@ -0,0 +1,160 @@
+"""
+Unit tests for the asynchronous logging pipeline.
+Tests JSON encoding, overflow policies and listener shutdown.
+"""
+
+import json
+import logging
+import os
+import queue
+import sys
+import tempfile
+import unittest
+
+
+def _record(msg, level=logging.INFO, args=None, **extra):
+    record = logging.LogRecord("herald.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJsonFormatter(unittest.TestCase):
+    """Test JsonFormatter output."""
+
+    def test_quotes_and_extra_fields_are_encoded(self):
+        """Test messages with quotes stay valid JSON and extras become keys."""
+        from herald.observability.logger import JsonFormatter
+
+        line = JsonFormatter().format(
+            _record('Closed "%s"', args=("EURUSD",), symbol="EURUSD", ticket=42, stage="exits")
+        )
+        payload = json.loads(line)
+        self.assertEqual(payload["message"], 'Closed "EURUSD"')
+        self.assertEqual(payload["symbol"], "EURUSD")
+        self.assertEqual(payload["ticket"], 42)
+        self.assertEqual(payload["stage"], "exits")
+        self.assertEqual(payload["level"], "INFO")
+
+
+class TestBoundedQueueHandler(unittest.TestCase):
+    """Test BoundedQueueHandler overflow policies."""
+
+    def test_drop_new_discards_info_but_keeps_warnings(self):
+        """Test a full queue drops new INFO records and makes room for warnings."""
+        from herald.observability.logger import BoundedQueueHandler
+
+        q = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(q, overflow="drop_new")
+        handler.handle(_record("a"))
+        handler.handle(_record("b"))
+        handler.handle(_record("c"))
+        self.assertEqual(handler.dropped, 1)
+
+        handler.handle(_record("boom", level=logging.ERROR))
+        messages = [q.get_nowait().msg for _ in range(q.qsize())]
+        self.assertIn("boom", messages)
+        self.assertNotIn("c", messages)
+
+    def test_drop_oldest_keeps_latest_and_reports(self):
+        """Test drop_oldest evicts queued records and queues a drop notice."""
+        from herald.observability.logger import BoundedQueueHandler
+
+        q = queue.Queue(maxsize=3)
+        handler = BoundedQueueHandler(q, overflow="drop_oldest")
+        for msg in ("a", "b", "c", "d"):
+            handler.handle(_record(msg))
+
+        messages = [q.get_nowait().msg for _ in range(q.qsize())]
+        self.assertEqual(messages, ["b", "c", "d"])
+        self.assertEqual(handler.dropped, 1)
+
+        # The drop notice is queued as soon as there is room for it
+        handler.handle(_record("e"))
+        messages = [q.get_nowait().msg for _ in range(q.qsize())]
+        self.assertEqual(messages[0], "e")
+        self.assertIn("dropped 1 records", messages[1])
+
+    def test_prepare_resolves_args_and_exceptions(self):
+        """Test records are made self-contained before crossing threads."""
+        from herald.observability.logger import BoundedQueueHandler
+
+        handler = BoundedQueueHandler(queue.Queue(), overflow="drop_new")
+        try:
+            raise RuntimeError("bad fill")
+        except RuntimeError:
+            record = _record("order %d failed", level=logging.ERROR, args=(7,))
+            record.exc_info = sys.exc_info()
+        prepared = handler.prepare(record)
+        self.assertEqual(prepared.msg, "order 7 failed")
+        self.assertIsNone(prepared.args)
+        self.assertIsNone(prepared.exc_info)
+        self.assertIn("RuntimeError: bad fill", prepared.exc_text)
+
+    def test_unknown_policy_rejected(self):
+        """Test invalid overflow policies are rejected."""
+        from herald.observability.logger import BoundedQueueHandler
+
+        with self.assertRaises(ValueError):
+            BoundedQueueHandler(queue.Queue(), overflow="spill")
+
+
+class TestHeraldLogger(unittest.TestCase):
+    """Test the deferred-formatting logger facade."""
+
+    def test_suppressed_arguments_are_never_formatted(self):
+        """Test arguments of disabled levels are not converted to strings."""
+        from herald.observability.logger import HeraldLogger
+
+        class Probe:
+            formatted = 0
+
+            def __str__(self):
+                Probe.formatted += 1
+                return "probe"
+
+        log = HeraldLogger("herald.test.lazy")
+        log.logger.setLevel(logging.INFO)
+        log.debug("value %s", Probe())
+        self.assertFalse(log.debug_enabled)
+        self.assertEqual(Probe.formatted, 0)
+
+        with self.assertLogs("herald.test.lazy", level="INFO") as logs:
+            log.info("value %s", Probe())
+        self.assertEqual(logs.records[0].getMessage(), "value probe")
+
+    def test_records_report_the_calling_function(self):
+        """Test caller information points at the call site, not the facade."""
+        from herald.observability.logger import HeraldLogger
+
+        log = HeraldLogger("herald.test.caller")
+        with self.assertLogs("herald.test.caller", level="WARNING") as logs:
+            log.warning("careful")
+        self.assertEqual(logs.records[0].funcName, "test_records_report_the_calling_function")
+
+
+class TestSetupLogger(unittest.TestCase):
+    """Test setup_logger with the background listener."""
+
+    def test_async_logger_writes_json_file_on_shutdown(self):
+        """Test records reach the rotating file sink once the listener is flushed."""
+        from herald.observability.logger import setup_logger, shutdown_logging
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "herald.log")
+            logger = setup_logger(
+                name="herald.test.async", level="DEBUG", log_file=path, json_format=True
+            )
+            logger.propagate = False
+            logger.handlers[0].setLevel(logging.DEBUG)
+            logger.info("order sent", extra={"symbol": "XAUUSD", "ticket": 9})
+            shutdown_logging("herald.test.async")
+            logger.handlers.clear()
+
+            with open(path, encoding="utf-8") as fh:
+                lines = [json.loads(line) for line in fh if line.strip()]
+        self.assertEqual(lines[0]["message"], "order sent")
+        self.assertEqual(lines[0]["ticket"], 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
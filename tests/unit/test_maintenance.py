@@ -0,0 +1,84 @@
+"""
+Unit tests for database maintenance.
+Tests metric rollups, retention and incremental vacuum.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+
+class TestDatabaseMaintenance(unittest.TestCase):
+    """Test DatabaseMaintenance jobs against a real database file."""
+
+    def setUp(self):
+        from herald.persistence.database import Database
+        from herald.persistence.maintenance import DatabaseMaintenance
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "herald.db")
+        self.db = Database(self.path, async_writes=False)
+        self.maintenance = DatabaseMaintenance(self.path, raw_retention_days=7, chunk_rows=7)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def _record(self, start, values, step=timedelta(seconds=20)):
+        rows = [("loop_ms", v, "", start + i * step) for i, v in enumerate(values)]
+        self.db.record_metrics_bulk(rows)
+
+    def test_rollup_is_incremental(self):
+        """Test raw points fold into minute/hour/day buckets across runs without double counting."""
+        start = datetime(2025, 3, 3, 10, 0, 0)
+        self._record(start, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        now = start + timedelta(hours=1)
+        self.assertEqual(self.maintenance.run_once(now)['rolled_up'], 6)
+
+        self._record(start + timedelta(seconds=120), [9.0])
+        self.assertEqual(self.maintenance.run_once(now)['rolled_up'], 1)
+        self.assertEqual(self.maintenance.run_once(now)['rolled_up'], 0)
+
+        minutes = self.db.get_metric_rollups("loop_ms", 60)
+        self.assertEqual(list(minutes['count']), [3, 3, 1])
+        self.assertEqual(list(minutes['max']), [3.0, 6.0, 9.0])
+        self.assertAlmostEqual(minutes['avg'].iloc[1], 5.0)
+
+        hours = self.db.get_metric_rollups("loop_ms", 3600)
+        self.assertEqual(list(hours['count']), [7])
+        self.assertEqual(hours['min'].iloc[0], 1.0)
+        self.assertEqual(str(hours.index[0]), "2025-03-03 10:00:00+00:00")
+
+    def test_retention(self):
+        """Test only rolled-up raw points past retention are deleted and rollups expire."""
+        old = datetime(2025, 1, 1)
+        self._record(old, [1.0] * 20)
+        self.maintenance.rollup(self.maintenance._connect())
+        recent = datetime(2025, 3, 3)
+        self._record(recent, [2.0] * 3)
+
+        stats = self.maintenance.run_once(recent)
+        self.assertEqual(stats['raw_deleted'], 20)
+        self.assertEqual(self.db.conn.execute("SELECT COUNT(*) FROM metrics").fetchone()[0], 3)
+
+        self.assertEqual(len(self.db.get_metric_rollups("loop_ms", 60)), 1)
+        self.assertEqual(len(self.db.get_metric_rollups("loop_ms", 86400)), 2)
+
+    def test_incremental_vacuum(self):
+        """Test new databases use incremental auto-vacuum and freed pages are released."""
+        self.assertEqual(self.db.conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+        self._record(datetime(2025, 1, 1), [1.0] * 5000)
+        self.db.conn.execute("DELETE FROM metrics")
+        self.db.conn.commit()
+
+        conn = self.maintenance._connect()
+        try:
+            self.assertGreater(self.maintenance.incremental_vacuum(conn), 0)
+            self.assertEqual(conn.execute("PRAGMA freelist_count").fetchone()[0], 0)
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Unit tests for streaming performance metrics.
+Tests Welford statistics, rolling windows and database spill.
+"""
+
+import statistics
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+
+class TestRunningStats(unittest.TestCase):
+    """Test RunningStats against the statistics module."""
+
+    def test_matches_batch_mean_and_stdev(self):
+        """Test add/remove keep mean and stdev equal to a batch computation."""
+        from herald.observability.metrics import RunningStats
+
+        values = [12.5, -3.0, 7.25, -8.0, 4.0, 19.5, -1.25]
+        stats = RunningStats()
+        for v in values:
+            stats.add(v)
+        self.assertAlmostEqual(stats.mean, statistics.mean(values))
+        self.assertAlmostEqual(stats.stdev, statistics.stdev(values))
+
+        stats.remove(values[0])
+        stats.remove(values[1])
+        self.assertAlmostEqual(stats.mean, statistics.mean(values[2:]))
+        self.assertAlmostEqual(stats.stdev, statistics.stdev(values[2:]))
+
+
+class TestMetricsCollector(unittest.TestCase):
+    """Test MetricsCollector lifetime and rolling statistics."""
+
+    def test_lifetime_metrics(self):
+        """Test counters, profit factor, drawdown and Sharpe are maintained incrementally."""
+        from herald.observability.metrics import MetricsCollector
+
+        collector = MetricsCollector(recent_returns=3)
+        results = [100.0, -50.0, 30.0, -20.0, 40.0]
+        for profit in results:
+            collector.record_trade(profit, symbol="EURUSD")
+
+        m = collector.get_metrics()
+        self.assertEqual(m.total_trades, 5)
+        self.assertEqual(m.winning_trades, 3)
+        self.assertAlmostEqual(m.net_profit, 100.0)
+        self.assertAlmostEqual(m.profit_factor, 170.0 / 70.0)
+        self.assertAlmostEqual(m.max_drawdown, 0.5)
+        expected_sharpe = statistics.mean(results) / statistics.stdev(results) * (252 ** 0.5)
+        self.assertAlmostEqual(m.sharpe_ratio, expected_sharpe)
+        self.assertEqual(m.returns, [30.0, -20.0, 40.0])
+
+    def test_rolling_windows_evict_old_trades(self):
+        """Test trades older than a window no longer count toward it."""
+        from herald.observability.metrics import MetricsCollector
+
+        collector = MetricsCollector()
+        now = datetime.now()
+        collector.record_trade(-40.0, timestamp=now - timedelta(days=10))
+        collector.record_trade(25.0, timestamp=now - timedelta(days=3))
+        collector.record_trade(10.0, timestamp=now - timedelta(hours=2))
+
+        rolling = collector.get_metrics().rolling
+        self.assertEqual(rolling['1d']['trades'], 1)
+        self.assertEqual(rolling['7d']['trades'], 2)
+        self.assertAlmostEqual(rolling['7d']['net_profit'], 35.0)
+        self.assertEqual(rolling['30d']['trades'], 3)
+        self.assertAlmostEqual(rolling['30d']['profit_factor'], 35.0 / 40.0)
+
+    def test_history_spills_to_database(self):
+        """Test each trade is written to the database rather than kept in memory."""
+        from herald.observability.metrics import MetricsCollector
+
+        database = MagicMock()
+        collector = MetricsCollector(database=database)
+        collector.record_trade(12.0, symbol="XAUUSD")
+
+        name, value, metadata = database.record_metric.call_args.args
+        self.assertEqual(name, "trade_pnl")
+        self.assertEqual(value, 12.0)
+        self.assertIn('"symbol": "XAUUSD"', metadata)
+        self.assertFalse(hasattr(collector, 'trade_results'))
+
+
+if __name__ == '__main__':
+    unittest.main()
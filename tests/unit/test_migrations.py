@@ -0,0 +1,187 @@
+"""
+Unit tests for schema migrations.
+Tests fresh databases, upgrades of older layouts and version tracking.
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+
+
+class TestMigrations(unittest.TestCase):
+    """Test migrate() against fresh and pre-versioning database files."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "herald.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fresh_database_is_at_latest_version(self):
+        """Test a new file gets integer enum columns and the indexes queries rely on."""
+        from herald.persistence.database import Database
+        from herald.persistence.migrations import SCHEMA_VERSION, migrate, schema_version
+
+        db = Database(self.path, async_writes=False)
+        try:
+            self.assertEqual(schema_version(db.conn), SCHEMA_VERSION)
+            types = {row[1]: row[2] for row in db.conn.execute("PRAGMA table_info(trades)")}
+            self.assertEqual(types['side'], "INTEGER")
+            self.assertEqual(types['status'], "INTEGER")
+
+            plan = " ".join(
+                row[3] for row in db.conn.execute("EXPLAIN QUERY PLAN SELECT id FROM trades WHERE order_id = 5")
+            )
+            self.assertIn("idx_trades_order", plan)
+            self.assertEqual(migrate(db.conn), SCHEMA_VERSION)
+        finally:
+            db.close()
+
+    def test_upgrade_converts_text_enums(self):
+        """Test rows written by the pre-versioning layout keep their values after the rebuild."""
+        from herald.persistence.database import Database, TradeRecord
+        from herald.persistence.migrations import migrate
+
+        conn = sqlite3.connect(self.path)
+        migrate(conn, target=1)
+        conn.execute(
+            "INSERT INTO trades (signal_id, order_id, symbol, side, volume, entry_price, entry_time, status) "
+            "VALUES ('s1', 7, 'EURUSD', 'LONG', 0.1, 1.1, ?, 'OPEN')", (datetime(2025, 3, 3).isoformat(" "),)
+        )
+        conn.execute(
+            "INSERT INTO trades (signal_id, order_id, symbol, side, volume, entry_price, entry_time, status) "
+            "VALUES ('s2', 8, 'EURUSD', 'SELL', 0.2, 1.2, ?, 'CLOSED')", (datetime(2025, 3, 4).isoformat(" "),)
+        )
+        conn.commit()
+        conn.close()
+
+        db = Database(self.path, async_writes=False)
+        try:
+            trades = db.get_open_trades()
+            self.assertEqual([(t.order_id, t.side, t.status) for t in trades], [(7, "BUY", "OPEN")])
+            self.assertEqual(tuple(db.conn.execute("SELECT side, status FROM trades WHERE order_id = 8").fetchone()), (-1, 1))
+
+            db.update_trade_exit(7, 1.15, datetime(2025, 3, 5), 5.0, "TP")
+            self.assertEqual(db.get_open_trades(), [])
+            next_id = db.record_trade(TradeRecord(
+                signal_id="s3", order_id=9, symbol="EURUSD", side="BUY", volume=0.1,
+                entry_price=1.1, entry_time=datetime(2025, 3, 6)
+            ))
+            self.assertEqual(next_id, 3)
+        finally:
+            db.close()
+
+    def test_text_timestamps_become_epoch_ms(self):
+        """Test stored timestamp text is converted and new writes round-trip as naive UTC."""
+        from datetime import timedelta, timezone
+        from herald.persistence.database import Database, TradeRecord
+        from herald.persistence.columns import from_epoch_ms, to_epoch_ms
+        from herald.persistence.migrations import migrate
+
+        entry = datetime(2025, 3, 3, 10, 0, 0, 250000)
+        conn = sqlite3.connect(self.path)
+        migrate(conn, target=2)
+        conn.execute(
+            "INSERT INTO trades (signal_id, order_id, symbol, side, volume, entry_price, entry_time, status) "
+            "VALUES ('s1', 7, 'EURUSD', 1, 0.1, 1.1, ?, 0)", (entry.isoformat(" "),)
+        )
+        conn.execute(
+            "INSERT INTO metrics (timestamp, metric_name, metric_value) VALUES ('2025-03-03T12:00:00+02:00', 'x', 1)"
+        )
+        conn.commit()
+        conn.close()
+
+        db = Database(self.path, async_writes=False)
+        try:
+            row = db.conn.execute("SELECT typeof(entry_time), entry_time, typeof(created_at) FROM trades").fetchone()
+            self.assertEqual(tuple(row), ("integer", to_epoch_ms(entry), "integer"))
+            self.assertEqual(db.get_open_trades()[0].entry_time, entry)
+            self.assertEqual(
+                db.conn.execute("SELECT timestamp FROM metrics").fetchone()[0],
+                to_epoch_ms(datetime(2025, 3, 3, 10, 0))
+            )
+
+            aware = datetime(2025, 3, 4, 12, 0, tzinfo=timezone(timedelta(hours=2)))
+            db.record_trade(TradeRecord(
+                signal_id="s2", order_id=8, symbol="EURUSD", side="SELL", volume=0.1,
+                entry_price=1.1, entry_time=aware
+            ))
+            self.assertEqual(db.get_open_trades()[0].entry_time, datetime(2025, 3, 4, 10, 0))
+            self.assertEqual(from_epoch_ms("2025-03-04 10:00:00"), datetime(2025, 3, 4, 10, 0))
+        finally:
+            db.close()
+
+    def test_old_init_db_tables_are_set_aside(self):
+        """Test tables from the old init_db layout are renamed rather than reused."""
+        from herald.persistence.database import Database
+
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE signals (id TEXT PRIMARY KEY, timestamp TEXT NOT NULL, symbol TEXT NOT NULL)")
+        conn.execute("INSERT INTO signals VALUES ('abc', '2025-01-01', 'EURUSD')")
+        conn.commit()
+        conn.close()
+
+        db = Database(self.path, async_writes=False)
+        try:
+            self.assertEqual(db.conn.execute("SELECT id FROM signals_legacy").fetchone()[0], "abc")
+            self.assertIn("signal_id", [row[1] for row in db.conn.execute("PRAGMA table_info(signals)")])
+        finally:
+            db.close()
+
+    def test_old_init_db_indexes_do_not_clash(self):
+        """Test a file from the old init_db script, indexes included, opens and migrates."""
+        from herald.persistence.database import Database
+        from herald.persistence.migrations import SCHEMA_VERSION, schema_version
+
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE signals (id TEXT PRIMARY KEY, timestamp TEXT NOT NULL, symbol TEXT NOT NULL)")
+        conn.execute("""
+            CREATE TABLE trades (
+                trade_id INTEGER PRIMARY KEY AUTOINCREMENT, ticket INTEGER UNIQUE,
+                symbol TEXT NOT NULL, status TEXT NOT NULL, open_time TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE metrics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL,
+                metric_type TEXT NOT NULL, metric_name TEXT NOT NULL, metric_value REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_signals_timestamp ON signals(timestamp)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON metrics(timestamp)")
+        conn.commit()
+        conn.close()
+
+        db = Database(self.path, async_writes=False)
+        try:
+            self.assertEqual(schema_version(db.conn), SCHEMA_VERSION)
+            indexes = dict(db.conn.execute(
+                "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+            ).fetchall())
+            self.assertEqual(indexes['idx_signals_timestamp'], "signals")
+            self.assertEqual(indexes['idx_signals_timestamp_legacy'], "signals_legacy")
+            self.assertEqual(indexes['idx_trades_status_legacy'], "trades_legacy")
+            self.assertEqual(indexes['idx_metrics_timestamp_legacy'], "metrics_legacy")
+        finally:
+            db.close()
+
+    def test_newer_schema_is_rejected(self):
+        """Test a file from a newer release is not opened with an older schema."""
+        from herald.persistence.migrations import SCHEMA_VERSION, migrate
+
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+            with self.assertRaises(RuntimeError):
+                migrate(conn)
+            self.assertFalse(conn.in_transaction)
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Unit tests for close-by netting.
+Tests NettingPlanner plans and ExecutionEngine.close_many.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+class TestNettingPlanner(unittest.TestCase):
+    """Test NettingPlanner pairing of opposite volumes."""
+    
+    def _legs(self, *specs):
+        from herald.execution.netting import NettingLeg
+        
+        return [NettingLeg(ticket=t, symbol=s, side=side, volume=v) for t, s, side, v in specs]
+    
+    def test_identical_volumes_pair_first(self):
+        """Test identical BUY/SELL volumes close in one request each."""
+        from herald.execution.netting import NettingPlanner
+        
+        plan = NettingPlanner().plan(self._legs(
+            (1, "EURUSD", "BUY", 0.3),
+            (2, "EURUSD", "BUY", 0.7),
+            (3, "EURUSD", "SELL", 0.7),
+            (4, "EURUSD", "SELL", 0.3),
+        ))
+        
+        pairs = {(p.ticket, p.ticket_by) for p in plan.close_by}
+        self.assertEqual(pairs, {(1, 4), (2, 3)})
+        self.assertEqual(plan.market, [])
+        self.assertEqual(plan.round_trips, 2)
+    
+    def test_residual_equals_net_exposure(self):
+        """Test only the net exposure is closed at market."""
+        from herald.execution.netting import NettingPlanner
+        
+        plan = NettingPlanner().plan(self._legs(
+            (1, "EURUSD", "BUY", 1.0),
+            (2, "EURUSD", "BUY", 0.2),
+            (3, "EURUSD", "SELL", 0.5),
+            (4, "EURUSD", "SELL", 0.4),
+        ))
+        
+        self.assertAlmostEqual(plan.netted_volume, 0.9)
+        self.assertAlmostEqual(plan.market_volume, 0.3)
+        self.assertTrue(all(m.side == "BUY" for m in plan.market))
+        # Largest-first netting closes at least one leg per request
+        self.assertLessEqual(len(plan.close_by), 3)
+    
+    def test_close_by_disabled_uses_market(self):
+        """Test every leg is closed at market when close-by is not allowed."""
+        from herald.execution.netting import NettingPlanner
+        
+        plan = NettingPlanner().plan(self._legs(
+            (1, "EURUSD", "BUY", 1.0),
+            (2, "EURUSD", "SELL", 1.0),
+        ), allow_close_by=False)
+        
+        self.assertEqual(plan.close_by, [])
+        self.assertEqual([m.ticket for m in plan.market], [1, 2])
+    
+    def test_symbols_are_not_netted_together(self):
+        """Test opposite legs on different symbols are never paired."""
+        from herald.execution.netting import NettingPlanner
+        
+        plan = NettingPlanner().plan(self._legs(
+            (1, "EURUSD", "BUY", 1.0),
+            (2, "GBPUSD", "SELL", 1.0),
+        ))
+        
+        self.assertEqual(plan.close_by, [])
+        self.assertEqual(plan.symbols(), ["EURUSD", "GBPUSD"])
+
+
+class TestExecutionEngineCloseMany(unittest.TestCase):
+    """Test ExecutionEngine.close_many netting execution."""
+    
+    def _mock_mt5(self, mock_mt5, positions):
+        mock_mt5.TRADE_RETCODE_DONE = 10009
+        mock_mt5.TRADE_ACTION_DEAL = 1
+        mock_mt5.TRADE_ACTION_CLOSE_BY = 10
+        mock_mt5.ORDER_TYPE_BUY = 0
+        mock_mt5.ORDER_TYPE_SELL = 1
+        mock_mt5.SYMBOL_ORDER_CLOSEBY = 64
+        mock_mt5.ACCOUNT_MARGIN_MODE_RETAIL_HEDGING = 2
+        mock_mt5.account_info.return_value = MagicMock(margin_mode=2)
+        mock_mt5.symbol_info.return_value = MagicMock(order_mode=127)
+        mock_mt5.symbol_info_tick.return_value = MagicMock(bid=1.1000, ask=1.1002)
+        mock_mt5.order_send.return_value = MagicMock(retcode=10009, order=1, price=1.1000, profit=0.0)
+        mock_mt5.positions_get.return_value = [
+            MagicMock(ticket=t, symbol=s, type=0 if side == "BUY" else 1, volume=v)
+            for t, s, side, v in positions
+        ]
+    
+    def test_close_many_nets_then_closes_residual(self):
+        """Test close-by requests precede the residual market close."""
+        from herald.execution.engine import ExecutionEngine, OrderStatus
+        
+        connector = MagicMock()
+        connector.is_connected.return_value = True
+        engine = ExecutionEngine(connector=connector)
+        
+        with patch('herald.execution.engine.mt5') as mock_mt5:
+            self._mock_mt5(mock_mt5, [
+                (1, "EURUSD", "BUY", 1.0),
+                (2, "EURUSD", "SELL", 0.6),
+            ])
+            results = engine.close_many([1, 2, 99])
+            requests = [c.args[0] for c in mock_mt5.order_send.call_args_list]
+            
+        self.assertEqual([r["action"] for r in requests], [10, 1])
+        self.assertEqual((requests[0]["position"], requests[0]["position_by"]), (1, 2))
+        self.assertAlmostEqual(requests[1]["volume"], 0.4)
+        self.assertEqual(requests[1]["type"], 1)
+        
+        missing = [r for r in results if r.metadata.get('ticket') == 99]
+        self.assertEqual(missing[0].status, OrderStatus.REJECTED)
+        self.assertEqual(sum(1 for r in results if r.status == OrderStatus.FILLED), 2)
+    
+    def test_close_many_rejects_residual_without_tick(self):
+        """Test a missing tick rejects the market closes but keeps executed close-bys."""
+        from herald.execution.engine import ExecutionEngine, OrderStatus
+        
+        connector = MagicMock()
+        connector.is_connected.return_value = True
+        engine = ExecutionEngine(connector=connector)
+        
+        with patch('herald.execution.engine.mt5') as mock_mt5:
+            self._mock_mt5(mock_mt5, [
+                (1, "EURUSD", "BUY", 1.0),
+                (2, "EURUSD", "SELL", 0.6),
+            ])
+            mock_mt5.symbol_info_tick.return_value = None
+            results = engine.close_many([1, 2])
+        
+        self.assertEqual(mock_mt5.order_send.call_count, 1)
+        self.assertEqual([r.status for r in results], [OrderStatus.FILLED, OrderStatus.REJECTED])
+        self.assertEqual(results[1].metadata['ticket'], 1)
+        self.assertIn("No tick", results[1].error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Unit tests for the walk-forward optimizer.
+Tests parameter spaces, fold windows and mindset output.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+
+def _rates(n=6000, seed=3):
+    """Random-walk M1 bars as an MT5 rates array."""
+    import numpy as np
+    from herald.persistence.bar_archive import RATES_DTYPE
+
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0002, n))
+    opens = np.concatenate(([close[0]], close[:-1]))
+    rates = np.zeros(n, dtype=RATES_DTYPE)
+    rates['time'] = 1736150400 + 60 * np.arange(n)
+    rates['open'] = opens
+    rates['close'] = close
+    rates['high'] = np.maximum(opens, close) + 0.0001
+    rates['low'] = np.minimum(opens, close) - 0.0001
+    return rates
+
+
+class TestParameterSpace(unittest.TestCase):
+    """Test grid and sampled parameter sets."""
+
+    def test_grid_and_sample(self):
+        """Test sampling decodes distinct grid points with nested sections."""
+        from herald.backtest.optimizer import ParameterSpace
+
+        space = ParameterSpace.from_dict({
+            'strategy': {'short_window': [5, 10], 'long_window': [30, 50, 100]},
+            'exit_strategies': {'time_based': {'max_hold_hours': [4, 24]}},
+        })
+        grid = list(space.grid())
+        self.assertEqual(space.size(), 12)
+        self.assertEqual(len(grid), 12)
+        self.assertEqual(grid[0], {
+            'strategy': {'short_window': 5, 'long_window': 30},
+            'risk': {},
+            'exit_strategies': {'time_based': {'max_hold_hours': 4}},
+        })
+
+        sample = space.sample(5, seed=1)
+        self.assertEqual(len(sample), 5)
+        self.assertTrue(all(params in grid for params in sample))
+        self.assertEqual(len({json.dumps(params, sort_keys=True) for params in sample}), 5)
+        self.assertEqual(sample, space.sample(5, seed=1))
+
+    def test_unknown_risk_limit_rejected(self):
+        """Test risk parameters must be limits the trading loop reads."""
+        from herald.backtest.optimizer import ParameterSpace
+
+        with self.assertRaises(ValueError):
+            ParameterSpace.from_dict({'risk': {'position_size_pct': [1.0]}})
+
+    def test_walk_forward_splits(self):
+        """Test test windows tile the end of the data after their training windows."""
+        from herald.backtest.optimizer import walk_forward_splits
+
+        splits = walk_forward_splits(1000, folds=4, train_ratio=0.6)
+        self.assertEqual(splits[0], (0, 276, 276, 457))
+        self.assertEqual(splits[-1], (543, 819, 819, 1000))
+        anchored = walk_forward_splits(1000, folds=4, train_ratio=0.6, anchored=True)
+        self.assertEqual([split[0] for split in anchored], [0, 0, 0, 0])
+
+
+class TestOptimizer(unittest.TestCase):
+    """Test Optimizer.run() and the mindset it produces."""
+
+    def test_run_writes_applicable_mindset(self):
+        """Test the chosen parameters round-trip through a mindset file into a config."""
+        from herald.backtest.optimizer import Optimizer, ParameterSpace
+        from herald.config.mindsets import MINDSETS, apply_mindset, save_mindset
+
+        space = ParameterSpace.from_dict({
+            'strategy': {'short_window': [5, 10, 60], 'long_window': [30]},
+            'exit_strategies': {'time_based': {'max_hold_hours': [2, 8]}},
+        })
+        optimizer = Optimizer(
+            space, base_params={'strategy': {'atr_multiplier': 2.0}}, objective='net_profit',
+            folds=2, workers=1, symbol="EURUSD"
+        )
+        result = optimizer.run(_rates())
+
+        # short_window 60 >= long_window 30 is skipped
+        self.assertEqual(len(optimizer.candidates()), 4)
+        self.assertEqual(result.evaluated, 4 * 2 + 2)
+        self.assertEqual(len(result.folds), 2)
+        self.assertEqual(result.best, result.folds[-1]['params'])
+        self.assertEqual(result.best['strategy']['atr_multiplier'], 2.0)
+        self.assertEqual(
+            result.out_of_sample['trades'],
+            sum(fold['out_of_sample']['trades'] for fold in result.folds)
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = save_mindset(result.to_mindset("eurusd_m1", MINDSETS["balanced"]), os.path.join(tmp, "eurusd_m1.json"))
+            config = apply_mindset(
+                {'strategy': {'type': 'sma_crossover', 'params': {}},
+                 'exit_strategies': [{'type': 'time_based', 'enabled': True, 'params': {'weekend_protection': True}}]},
+                path
+            )
+
+        self.assertEqual(config['_mindset'], "eurusd_m1")
+        self.assertEqual(config['strategy']['params']['short_window'], result.best['strategy']['short_window'])
+        self.assertEqual(
+            config['exit_strategies'][0]['params'],
+            {'weekend_protection': True, **result.best['exit_strategies']['time_based']}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
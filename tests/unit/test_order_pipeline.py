@@ -0,0 +1,129 @@
+"""
+Unit tests for asynchronous order submission.
+Tests OrderPipeline queueing, in-flight tracking and order timelines.
+"""
+
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+def _order(signal_id="sig-1", symbol="EURUSD"):
+    from herald.execution.engine import OrderRequest, OrderType
+
+    return OrderRequest(
+        signal_id=signal_id,
+        symbol=symbol,
+        side="BUY",
+        volume=0.1,
+        order_type=OrderType.MARKET
+    )
+
+
+def _engine():
+    from herald.execution.engine import ExecutionEngine
+
+    connector = MagicMock()
+    connector.is_connected.return_value = True
+    connector.get_account_info.return_value = {'trade_allowed': True}
+    return ExecutionEngine(connector=connector)
+
+
+def _mock_mt5(mock_mt5):
+    mock_mt5.TRADE_RETCODE_DONE = 10009
+    mock_mt5.order_send.return_value = MagicMock(retcode=10009, order=42, price=1.1, volume=0.1)
+
+
+class TestPlaceOrderTimeline(unittest.TestCase):
+    """Test ExecutionEngine.place_order timestamps and account checks."""
+
+    def test_place_order_records_timeline(self):
+        """Test send, ack and fill times are attached to the result."""
+        from herald.execution.engine import OrderStatus, OrderTimeline
+
+        engine = _engine()
+        with patch('herald.execution.engine.mt5') as mock_mt5:
+            _mock_mt5(mock_mt5)
+            result = engine.place_order(_order())
+
+        self.assertEqual(result.status, OrderStatus.FILLED)
+        timeline = result.metadata['timeline']
+        self.assertIsInstance(timeline, OrderTimeline)
+        self.assertIsNotNone(timeline.broker_ms)
+        self.assertEqual(timeline.filled_at, timeline.acked_at)
+
+    def test_trade_allowed_checked_before_send_and_cached(self):
+        """Test the account check happens before order_send and is reused within the TTL."""
+        from herald.execution.engine import OrderStatus
+
+        engine = _engine()
+        with patch('herald.execution.engine.mt5') as mock_mt5:
+            _mock_mt5(mock_mt5)
+            engine.place_order(_order("sig-1"))
+            engine.place_order(_order("sig-2"))
+            self.assertEqual(engine.connector.get_account_info.call_count, 1)
+
+            engine.connector.get_account_info.return_value = {'trade_allowed': False}
+            engine._trade_allowed_cache = None
+            result = engine.place_order(_order("sig-3"))
+
+            self.assertEqual(result.status, OrderStatus.REJECTED)
+            self.assertEqual(mock_mt5.order_send.call_count, 2)
+
+
+class TestOrderPipeline(unittest.TestCase):
+    """Test OrderPipeline submission and completion."""
+
+    def test_submit_resolves_future_and_completion_queue(self):
+        """Test a submitted order resolves its future and is drained once."""
+        from herald.execution.engine import OrderStatus
+        from herald.execution.pipeline import OrderPipeline
+
+        pipeline = OrderPipeline(_engine(), max_in_flight=2)
+        with patch('herald.execution.engine.mt5') as mock_mt5:
+            _mock_mt5(mock_mt5)
+            pipeline.start()
+            result = pipeline.submit(_order(), context="signal").result(timeout=5)
+            pipeline.stop(timeout=5)
+
+        self.assertEqual(result.status, OrderStatus.FILLED)
+        self.assertIsNotNone(result.metadata['timeline'].queue_ms)
+        completed = pipeline.drain_completed()
+        self.assertEqual([c.context for c in completed], ["signal"])
+        self.assertEqual(pipeline.drain_completed(), [])
+
+    def test_duplicate_in_flight_order_shares_future(self):
+        """Test resubmitting an in-flight order does not send it twice."""
+        from herald.execution.pipeline import OrderPipeline
+
+        release = threading.Event()
+        pipeline = OrderPipeline(_engine(), max_in_flight=1)
+        with patch('herald.execution.engine.mt5') as mock_mt5:
+            _mock_mt5(mock_mt5)
+            reply = mock_mt5.order_send.return_value
+            mock_mt5.order_send.side_effect = lambda request: release.wait(5) and reply
+            pipeline.start()
+            first = pipeline.submit(_order())
+            second = pipeline.submit(_order())
+            self.assertIs(first, second)
+            self.assertEqual(pipeline.pending_count("EURUSD"), 1)
+            release.set()
+            first.result(timeout=5)
+            pipeline.stop(timeout=5)
+
+            self.assertEqual(mock_mt5.order_send.call_count, 1)
+        self.assertEqual(pipeline.pending_count(), 0)
+
+    def test_submit_when_stopped_is_rejected(self):
+        """Test orders are rejected when the pipeline is not running."""
+        from herald.execution.engine import OrderStatus
+        from herald.execution.pipeline import OrderPipeline
+
+        pipeline = OrderPipeline(_engine())
+        result = pipeline.submit(_order()).result(timeout=1)
+
+        self.assertEqual(result.status, OrderStatus.REJECTED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -261,5 +261,96 @@ class TestPositionManager(unittest.TestCase):
         self.assertIsNotNone(total_pnl)
 
 
+class TestBulkClose(unittest.TestCase):
+    """Test batched closes in PositionManager.close_all_positions."""
+    
+    def _manager(self, positions):
+        from unittest.mock import MagicMock
+        from herald.execution.engine import ExecutionEngine
+        from herald.position.manager import PositionManager
+        
+        connector = MagicMock()
+        manager = PositionManager(connector=connector, execution_engine=ExecutionEngine(connector=connector))
+        for pos in positions:
+            manager.add_position(pos)
+        return manager
+    
+    def _position(self, ticket, symbol, side, volume):
+        from herald.position.manager import PositionInfo
+        
+        return PositionInfo(
+            ticket=ticket,
+            symbol=symbol,
+            volume=volume,
+            open_price=1.1000,
+            open_time=datetime.now(),
+            side=side,
+            unrealized_pnl=1.0
+        )
+    
+    def _mock_mt5(self, mock_mt5, hedging=True):
+        from unittest.mock import MagicMock
+        
+        mock_mt5.TRADE_RETCODE_DONE = 10009
+        mock_mt5.TRADE_ACTION_DEAL = 1
+        mock_mt5.TRADE_ACTION_CLOSE_BY = 10
+        mock_mt5.SYMBOL_ORDER_CLOSEBY = 64
+        mock_mt5.ACCOUNT_MARGIN_MODE_RETAIL_HEDGING = 2
+        mock_mt5.account_info.return_value = MagicMock(margin_mode=2 if hedging else 0)
+        mock_mt5.symbol_info.return_value = MagicMock(order_mode=127)
+        mock_mt5.symbol_info_tick.return_value = MagicMock(bid=1.1000, ask=1.1002)
+        mock_mt5.order_send.return_value = MagicMock(retcode=10009, order=1, price=1.1000, volume=1.0)
+    
+    def test_close_all_nets_equal_opposites_with_close_by(self):
+        """Test equal BUY/SELL volumes are netted with one close-by request."""
+        from unittest.mock import patch
+        
+        manager = self._manager([
+            self._position(1, "EURUSD", "BUY", 1.0),
+            self._position(2, "EURUSD", "SELL", 1.0),
+            self._position(3, "EURUSD", "BUY", 0.5),
+            self._position(4, "GBPUSD", "SELL", 0.3),
+        ])
+        
+        with patch('herald.position.manager.mt5') as mock_mt5, patch('herald.execution.engine.mt5', mock_mt5):
+            self._mock_mt5(mock_mt5)
+            report = manager.close_all_positions("test")
+            
+            # One tick lookup per symbol
+            self.assertEqual(mock_mt5.symbol_info_tick.call_count, 2)
+            actions = [c.args[0]["action"] for c in mock_mt5.order_send.call_args_list]
+            
+        self.assertEqual(actions.count(10), 1)
+        self.assertEqual(actions.count(1), 2)
+        self.assertEqual(report.requested, 4)
+        self.assertEqual(report.closed, 4)
+        self.assertEqual(report.close_by_pairs, 1)
+        self.assertEqual(report.market_closes, 2)
+        self.assertEqual(len(report.latencies_ms), 3)
+        self.assertEqual(len(manager.get_all_positions()), 0)
+    
+    def test_close_all_netting_mode_uses_market_closes(self):
+        """Test netting accounts never use close-by and failures stay tracked."""
+        from unittest.mock import patch, MagicMock
+        
+        manager = self._manager([
+            self._position(1, "EURUSD", "BUY", 1.0),
+            self._position(2, "EURUSD", "SELL", 1.0),
+        ])
+        
+        with patch('herald.position.manager.mt5') as mock_mt5, patch('herald.execution.engine.mt5', mock_mt5):
+            self._mock_mt5(mock_mt5, hedging=False)
+            mock_mt5.order_send.side_effect = [
+                MagicMock(retcode=10009, order=1, price=1.1, volume=1.0),
+                MagicMock(retcode=10006, comment="Rejected"),
+            ]
+            report = manager.close_all_positions("test", max_in_flight=1)
+            
+        self.assertEqual(report.close_by_pairs, 0)
+        self.assertEqual(report.closed, 1)
+        self.assertEqual(report.failed, 1)
+        self.assertEqual(len(manager.get_all_positions()), 1)
+
+
 if __name__ == '__main__':
     unittest.main()
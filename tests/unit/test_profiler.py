@@ -0,0 +1,84 @@
+"""
+Unit tests for the trading loop profiler.
+Tests lap timing, rolling percentiles, budget warnings and export.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+
+
+class TestLoopProfiler(unittest.TestCase):
+    """Test LoopProfiler timing and reporting."""
+
+    def test_disabled_profiler_records_nothing(self):
+        """Test a disabled profiler is a no-op and returns the shared null span."""
+        from herald.observability.profiler import LoopProfiler, _NULL_SPAN
+
+        exporter = MagicMock()
+        profiler = LoopProfiler(enabled=False, exporter=exporter)
+        profiler.begin_loop()
+        profiler.lap("market_data")
+        with profiler.span("strategy"):
+            pass
+        profiler.end_loop()
+
+        self.assertIs(profiler.span("strategy"), _NULL_SPAN)
+        self.assertEqual(profiler.summary(), {})
+        exporter.observe_stage.assert_not_called()
+
+    def test_percentiles_over_rolling_window(self):
+        """Test percentiles are computed over the last `window` samples only."""
+        from herald.observability.profiler import LoopProfiler
+
+        profiler = LoopProfiler(window=100)
+        profiler.record("exits", 999_000_000)
+        for i in range(1, 101):
+            profiler.record("exits", i * 1_000_000)
+
+        stats = profiler.percentiles("exits")
+        self.assertEqual(stats['count'], 100)
+        self.assertAlmostEqual(stats['p50'], 51.0)
+        self.assertAlmostEqual(stats['p95'], 96.0)
+        self.assertAlmostEqual(stats['p99'], 100.0)
+        self.assertAlmostEqual(stats['max'], 100.0)
+        self.assertEqual(profiler.percentiles("unknown"), {})
+
+    def test_budget_overrun_warns_once_per_interval(self):
+        """Test budget overruns are counted and warnings are rate-limited."""
+        from herald.observability.profiler import LoopProfiler
+
+        profiler = LoopProfiler(budgets_ms={"market_data": 10.0}, warn_interval_secs=60.0)
+        with self.assertLogs("herald.profiler", level="WARNING") as logs:
+            profiler.record("market_data", 50_000_000)
+            profiler.record("market_data", 60_000_000)
+            profiler.record("market_data", 1_000_000)
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("market_data", logs.output[0])
+        self.assertEqual(profiler.percentiles("market_data")['over_budget'], 2)
+
+    def test_laps_export_and_persist(self):
+        """Test laps feed the exporter and snapshots reach the database."""
+        from herald.observability.profiler import LoopProfiler
+
+        exporter = MagicMock()
+        database = MagicMock()
+        profiler = LoopProfiler(exporter=exporter, database=database, persist_every_loops=2)
+
+        for _ in range(2):
+            profiler.begin_loop()
+            profiler.lap("market_data")
+            profiler.lap("strategy")
+            profiler.end_loop()
+
+        stages = [c.args[0] for c in exporter.observe_stage.call_args_list]
+        self.assertEqual(stages, ["market_data", "strategy", "loop"] * 2)
+        names = {c.args[0] for c in database.record_metric.call_args_list}
+        self.assertEqual(
+            names,
+            {"loop_stage_market_data_p95_ms", "loop_stage_strategy_p95_ms", "loop_stage_loop_p95_ms"}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
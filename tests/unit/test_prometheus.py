@@ -0,0 +1,103 @@
+"""
+Unit tests for the Prometheus metrics registry and exporter.
+Tests labelled series, histogram exposition and per-symbol trade metrics.
+"""
+
+import unittest
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test MetricsRegistry families and rendering."""
+
+    def test_label_sets_are_independent_series(self):
+        """Test the same metric with different labels keeps separate values."""
+        from herald.observability.prometheus import MetricsRegistry
+
+        registry = MetricsRegistry()
+        gauge = registry.gauge("herald_spread", "Spread")
+        gauge.labels(symbol="EURUSD").set(1.2)
+        gauge.labels(symbol="GBPUSD").set(1.8)
+
+        text = registry.render()
+        self.assertIn('herald_spread{symbol="EURUSD"} 1.2', text)
+        self.assertIn('herald_spread{symbol="GBPUSD"} 1.8', text)
+        self.assertEqual(text.count("# TYPE herald_spread gauge"), 1)
+
+    def test_histogram_exposition(self):
+        """Test histogram buckets are cumulative with +Inf, sum and count."""
+        from herald.observability.prometheus import MetricsRegistry
+
+        registry = MetricsRegistry()
+        histogram = registry.histogram("herald_stage_seconds", "Stage time", (0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.labels(stage="exits").observe(value)
+
+        text = registry.render()
+        self.assertIn('herald_stage_seconds_bucket{stage="exits",le="0.1"} 1', text)
+        self.assertIn('herald_stage_seconds_bucket{stage="exits",le="1.0"} 2', text)
+        self.assertIn('herald_stage_seconds_bucket{stage="exits",le="+Inf"} 3', text)
+        self.assertIn('herald_stage_seconds_count{stage="exits"} 3', text)
+        # Buffer is reused between renders
+        self.assertEqual(registry.render(), text)
+
+    def test_type_conflict_rejected(self):
+        """Test a name cannot be registered with two metric types."""
+        from herald.observability.prometheus import MetricsRegistry
+
+        registry = MetricsRegistry()
+        registry.counter("herald_x", "x")
+        with self.assertRaises(ValueError):
+            registry.gauge("herald_x", "x")
+
+    def test_render_appends_extra_registries(self):
+        """Test settable counter families and extra registries share one exposition."""
+        from herald.observability.prometheus import MetricsRegistry
+
+        registry = MetricsRegistry()
+        registry.gauge_family("herald_uptime_seconds", "Uptime", "counter").labels().set(12.0)
+        other = MetricsRegistry()
+        other.counter("herald_orders_total", "Orders").inc(3)
+
+        text = registry.render([other])
+        self.assertIn("# TYPE herald_uptime_seconds counter\nherald_uptime_seconds 12.0", text)
+        self.assertIn("herald_orders_total 3.0", text)
+        self.assertLess(text.index("herald_uptime_seconds"), text.index("herald_orders_total"))
+
+
+class TestPrometheusExporter(unittest.TestCase):
+    """Test PrometheusExporter trade and stage series."""
+
+    def test_record_trade_per_symbol(self):
+        """Test trades and PnL are labelled by symbol."""
+        from herald.observability.prometheus import PrometheusExporter
+
+        exporter = PrometheusExporter()
+        exporter.record_trade(10.0, symbol="EURUSD")
+        exporter.record_trade(-4.0, symbol="EURUSD")
+        exporter.record_trade(3.0, symbol="XAUUSD")
+        exporter.observe_stage("indicators", 0.02)
+
+        values = exporter.get_metrics_dict()
+        self.assertEqual(values['herald_trades_total{symbol="EURUSD"}'], 2.0)
+        self.assertEqual(values['herald_pnl_total{symbol="EURUSD"}'], 6.0)
+        self.assertEqual(values['herald_pnl_total{symbol="XAUUSD"}'], 3.0)
+        self.assertAlmostEqual(values['herald_profit_factor'], 13.0 / 4.0)
+
+        text = exporter.export_text()
+        self.assertIn('herald_loop_stage_seconds_count{stage="indicators"} 1', text)
+
+    def test_unrealized_pnl_resets_closed_symbols(self):
+        """Test symbols without open positions drop back to zero."""
+        from herald.observability.prometheus import PrometheusExporter
+
+        exporter = PrometheusExporter()
+        exporter.set_unrealized_pnl({"EURUSD": 5.0, "GBPUSD": -2.0})
+        exporter.set_unrealized_pnl({"EURUSD": 1.0})
+
+        values = exporter.get_metrics_dict()
+        self.assertEqual(values['herald_unrealized_pnl{symbol="EURUSD"}'], 1.0)
+        self.assertEqual(values['herald_unrealized_pnl{symbol="GBPUSD"}'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Unit tests for the on-demand stack sampler.
+Tests wall-clock sampling, collapsed-stack output and overhead bounds.
+"""
+
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+
+def _busy_target(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        sum(range(200))
+
+
+class TestStackSampler(unittest.TestCase):
+    """Test StackSampler profiles and output."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_wall_profile_writes_collapsed_file(self):
+        """Test a wall-clock profile captures the sampled thread and writes flamegraph lines."""
+        from herald.observability.sampler import StackSampler
+
+        sampler = StackSampler(interval_ms=1.0, duration_secs=10.0, output_dir=self.tmp.name)
+        sampler._target_thread_id = threading.get_ident()
+        self.assertTrue(sampler.start())
+        self.assertFalse(sampler.start())
+        _busy_target(0.2)
+        path = sampler.stop()
+
+        self.assertFalse(sampler.running)
+        self.assertTrue(os.path.exists(path))
+        with open(path, encoding="utf-8") as fh:
+            lines = fh.read().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            self.assertGreater(int(count), 0)
+        self.assertTrue(any("_busy_target" in line for line in lines))
+
+    def test_profile_stops_after_duration(self):
+        """Test the sampler stops itself and writes the file when the duration elapses."""
+        from herald.observability.sampler import StackSampler
+
+        sampler = StackSampler(interval_ms=1.0, duration_secs=0.1, output_dir=self.tmp.name)
+        sampler._target_thread_id = threading.get_ident()
+        sampler.start()
+        _busy_target(0.5)
+
+        self.assertFalse(sampler.running)
+        self.assertIsNotNone(sampler.last_output)
+        self.assertIsNone(sampler.stop())
+
+    def test_bounds_depth_stacks_and_interval(self):
+        """Test stack depth, distinct stacks and interval are capped."""
+        from herald.observability.sampler import StackSampler, TRUNCATED_STACK
+
+        sampler = StackSampler(interval_ms=0.01, max_depth=2, max_stacks=1)
+        self.assertEqual(sampler.interval_secs, 0.001)
+
+        def inner():
+            return sys._getframe(0)
+
+        sampler._sample(inner())
+        sampler._sample(sys._getframe(0))
+
+        stacks = list(sampler._counts)
+        self.assertEqual(len(stacks[0].split(";")), 2)
+        self.assertIn(TRUNCATED_STACK, stacks)
+
+    @unittest.skipUnless(hasattr(signal, "SIGUSR1"), "SIGUSR1 not available")
+    def test_signal_toggles_profile(self):
+        """Test the installed signal starts and then stops a profile."""
+        from herald.observability.sampler import StackSampler
+
+        sampler = StackSampler(interval_ms=1.0, duration_secs=10.0, output_dir=self.tmp.name)
+        previous = signal.getsignal(signal.SIGUSR1)
+        try:
+            self.assertTrue(sampler.install_signal())
+            os.kill(os.getpid(), signal.SIGUSR1)
+            self.assertTrue(sampler.running)
+            _busy_target(0.1)
+            os.kill(os.getpid(), signal.SIGUSR1)
+            self.assertFalse(sampler.running)
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
+
+    def test_rejects_unknown_mode(self):
+        """Test invalid sampling modes are rejected up front."""
+        from herald.observability.sampler import StackSampler
+
+        with self.assertRaises(ValueError):
+            StackSampler(mode="gpu")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Unit tests for the shared bar store.
+Tests publishing, zero-copy attach, seqlock reads and cleanup.
+"""
+
+import os
+import unittest
+
+
+def _read_close(prefix):
+    """Reader in another process: consistent copy of the close column."""
+    from herald.persistence.shared_bars import SharedBars
+
+    bars = SharedBars.attach("EURUSD", "M1", prefix)
+    try:
+        version, columns = bars.read(['close'])
+        return version, columns['close'].tolist()
+    finally:
+        bars.close()
+
+
+class TestSharedBarStore(unittest.TestCase):
+    """Test SharedBarStore writers and SharedBars readers."""
+
+    def setUp(self):
+        import pandas as pd
+        from herald.persistence.shared_bars import SharedBarStore
+
+        self.prefix = f"herald-test-{os.getpid()}"
+        self.store = SharedBarStore(prefix=self.prefix, capacity=4)
+        self.df = pd.DataFrame(
+            {'close': [1.1, 1.2, 1.3], 'volume': [10, 11, 12], 'sma_2': [None, 1.15, 1.25], 'symbol': "EURUSD"},
+            index=pd.date_range("2025-03-03 10:00", periods=3, freq="min")
+        )
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_attach_is_zero_copy_and_read_only(self):
+        """Test readers see published columns through read-only views of the segment."""
+        import numpy as np
+        from herald.persistence.shared_bars import SharedBars
+
+        self.assertEqual(self.store.publish("EURUSD", "M1", self.df), 1)
+        bars = SharedBars.attach("EURUSD", "M1", self.prefix)
+        frame = bars.frame()
+
+        self.assertEqual(bars.columns, ['close', 'volume', 'sma_2'])
+        self.assertTrue(frame.index.equals(self.df.index))
+        self.assertEqual(frame['volume'].tolist(), [10.0, 11.0, 12.0])
+        self.assertTrue(np.isnan(frame['sma_2'].iloc[0]))
+        close = frame['close'].to_numpy()
+        with self.assertRaises(ValueError):
+            close[0] = 2.0
+
+        # Views follow the writer; version tells readers the rows changed
+        self.store.publish("EURUSD", "M1", self.df.assign(close=[2.1, 2.2, 2.3]))
+        self.assertEqual(bars.version, 2)
+        self.assertEqual(close.tolist(), [2.1, 2.2, 2.3])
+        with self.assertRaises(PermissionError):
+            bars.write(self.df.index.to_numpy(), {})
+        del frame, close
+        bars.close()
+
+    def test_capacity_keeps_newest_rows(self):
+        """Test a frame longer than the segment keeps its last rows."""
+        import pandas as pd
+
+        long_df = pd.DataFrame(
+            {'close': [float(i) for i in range(6)], 'volume': 1, 'sma_2': 0.0},
+            index=pd.date_range("2025-03-03", periods=6, freq="min")
+        )
+        self.store.publish("EURUSD", "M1", long_df)
+        version, columns = self.store.segment("EURUSD", "M1").read()
+
+        self.assertEqual(version, 1)
+        self.assertEqual(columns['close'].tolist(), [2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(columns['time'][0], long_df.index[2].value)
+
+        with self.assertRaises(ValueError):
+            self.store.publish("EURUSD", "M1", long_df.drop(columns=['sma_2']))
+
+    def test_read_waits_for_writer(self):
+        """Test read() does not return rows while a write is in progress."""
+        from herald.persistence.shared_bars import SharedBars
+
+        self.store.publish("EURUSD", "M1", self.df)
+        segment = self.store.segment("EURUSD", "M1")
+        segment._header['sequence'] += 1
+        bars = SharedBars.attach("EURUSD", "M1", self.prefix)
+        try:
+            with self.assertRaises(TimeoutError):
+                bars.read(retries=5)
+            segment._header['sequence'] += 1
+            self.assertEqual(bars.read()[0], 2)
+        finally:
+            bars.close()
+
+    def test_other_process_reads_and_close_unlinks(self):
+        """Test a separate process attaches by name, and close() removes the segment."""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from herald.persistence.shared_bars import SharedBars
+
+        self.store.publish("EURUSD", "M1", self.df)
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            version, close = executor.submit(_read_close, self.prefix).result(timeout=60)
+        self.assertEqual((version, close), (1, [1.1, 1.2, 1.3]))
+
+        # The reader exiting must not have removed the segment
+        SharedBars.attach("EURUSD", "M1", self.prefix).close()
+        self.store.close()
+        with self.assertRaises(FileNotFoundError):
+            SharedBars.attach("EURUSD", "M1", self.prefix)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Unit tests for the SMA crossover strategy.
+Tests the vectorized signal table against bar-by-bar on_bar().
+"""
+
+import unittest
+
+
+class TestSmaCrossoverSignals(unittest.TestCase):
+    """Test SmaCrossover.generate_signals() matches on_bar() exactly."""
+
+    def _frame(self, n=3000, seed=7):
+        import numpy as np
+        import pandas as pd
+        from herald.indicators.pipeline import compute_indicators
+
+        rng = np.random.default_rng(seed)
+        close = np.round(1.1 + np.cumsum(rng.normal(0, 0.0003, n)), 4)
+        df = pd.DataFrame(
+            {'open': close, 'high': close + 0.0002, 'low': close - 0.0002, 'close': close, 'volume': 1},
+            index=pd.date_range("2025-01-06", periods=n, freq="min")
+        )
+        return compute_indicators(df, sma_windows=(5, 12), atr_period=14)
+
+    def test_table_is_bit_identical_to_on_bar(self):
+        """Test every signal field, including SL/TP floats, equals the on_bar() result."""
+        from herald.strategy.sma_crossover import SmaCrossover
+
+        df = self._frame()
+        strategy = SmaCrossover({'symbol': "EURUSD", 'short_window': 5, 'long_window': 12})
+
+        expected = []
+        for timestamp, row in df.iterrows():
+            signal = strategy.on_bar(row)
+            if signal is not None:
+                expected.append(signal.to_dict())
+
+        table = strategy.generate_signals(df)
+        actual = [
+            strategy.table_signal(timestamp.to_pydatetime(), row).to_dict()
+            for timestamp, row in zip(table.index, table.to_dict('records'))
+        ]
+
+        self.assertGreater(len(expected), 10)
+        self.assertEqual(actual, expected)
+        self.assertEqual(set(table['side'].unique()), {1, -1})
+
+    def test_missing_indicators_fall_back(self):
+        """Test frames without the strategy's columns have no batch result."""
+        from herald.strategy.sma_crossover import SmaCrossover
+
+        df = self._frame(n=100)
+        self.assertIsNone(SmaCrossover({'short_window': 7, 'long_window': 12}).generate_signals(df))
+
+
+if __name__ == '__main__':
+    unittest.main()